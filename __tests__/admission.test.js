@@ -0,0 +1,149 @@
+const request = require('supertest');
+const express = require('express');
+const { AdmissionController, admission, laneFor, respondIfRejected, rejectWhenBusy } = require('../utils/admission');
+
+describe('Admission Control Tests', () => {
+  let clock;
+  let controller;
+
+  beforeEach(() => {
+    clock = 1_000_000;
+    controller = new AdmissionController({
+      concurrency: 2,
+      now: () => clock,
+      lanes: {
+        document: { maxQueue: 2, maxBytes: 100 },
+        image: { maxQueue: 10, maxBytes: 1000 },
+        media: { maxQueue: 1, maxBytes: 1000 },
+      },
+    });
+  });
+
+  test('should map formats to lanes', () => {
+    expect(laneFor('word')).toBe('document');
+    expect(laneFor('merge')).toBe('document');
+    expect(laneFor('heic-to-jpg')).toBe('image');
+    expect(laneFor('image-batch')).toBe('image');
+    expect(laneFor('mp4')).toBe('media');
+    expect(laneFor('gif')).toBe('media');
+  });
+
+  test('should reject when the queue depth limit is reached', () => {
+    controller.acquire('document', 10);
+    controller.acquire('document', 10);
+
+    expect(() => controller.acquire('document', 10)).toThrow(expect.objectContaining({
+      code: 'ADMISSION_REJECTED',
+      lane: 'document',
+    }));
+    expect(controller.getStatus().lanes.document).toMatchObject({ depth: 2, rejected: 1, saturated: true });
+  });
+
+  test('should reject when queued bytes would exceed the limit', () => {
+    controller.acquire('document', 80);
+
+    expect(controller.check('document', 30)).toMatchObject({ code: 'ADMISSION_REJECTED' });
+    expect(controller.check('document', 20)).toBeNull();
+  });
+
+  test('should count rejections from a check without reserving', () => {
+    controller.acquire('media', 0);
+
+    expect(controller.checkAndRecord('media')).toMatchObject({ lane: 'media' });
+    expect(controller.checkAndRecord('image')).toBeNull();
+    expect(controller.getStatus().lanes.media).toMatchObject({ depth: 1, rejected: 1 });
+    expect(controller.getStatus().lanes.image.rejected).toBe(0);
+  });
+
+  test('should report overloaded only when every lane is saturated', () => {
+    controller.acquire('media', 0);
+
+    expect(controller.getStatus()).toMatchObject({ saturated: true, overloaded: false });
+
+    controller.acquire('document', 0);
+    controller.acquire('document', 0);
+    for (let i = 0; i < 10; i++) controller.acquire('image', 0);
+
+    expect(controller.getStatus()).toMatchObject({ saturated: true, overloaded: true });
+  });
+
+  test('should always admit a single job regardless of size', () => {
+    expect(() => controller.acquire('document', 500)).not.toThrow();
+  });
+
+  test('should free capacity on release', () => {
+    const ticket = controller.acquire('media', 100);
+    expect(controller.check('media')).not.toBeNull();
+
+    controller.release(ticket);
+    controller.release(ticket);
+
+    expect(controller.check('media')).toBeNull();
+    expect(controller.getStatus().lanes.media).toMatchObject({ depth: 0, inFlightBytes: 0 });
+  });
+
+  test('should compute Retry-After from observed throughput', () => {
+    // 최근 1분 동안 30건 완료 → 0.5건/초 → 자리 하나에 2초
+    for (let i = 0; i < 30; i++) {
+      const ticket = controller.acquire('document', 0);
+      clock += 1000;
+      controller.release(ticket, { runMs: 1000 });
+    }
+    controller.acquire('document', 0);
+    controller.acquire('document', 0);
+
+    const rejection = controller.check('document');
+    expect(rejection.retryAfterSec).toBe(2);
+    expect(controller.getStatus().lanes.document.estimatedWaitSec).toBe(4);
+  });
+
+  test('should estimate from job duration before enough completions', () => {
+    const ticket = controller.acquire('document', 0);
+    controller.release(ticket, { runMs: 20000 });
+    controller.acquire('document', 0);
+    controller.acquire('document', 0);
+
+    // 동시 2개, 작업당 20초 → 0.1건/초 → 10초
+    expect(controller.check('document').retryAfterSec).toBe(10);
+  });
+
+  test('should respond with 503 and Retry-After', async () => {
+    const app = express();
+    app.get('/', (req, res) => {
+      try {
+        controller.acquire('media', 0);
+        controller.acquire('media', 0);
+      } catch (error) {
+        if (respondIfRejected(res, error)) return;
+      }
+      res.json({ ok: true });
+    });
+
+    const response = await request(app).get('/');
+
+    expect(response.status).toBe(503);
+    expect(response.headers['retry-after']).toBe('5');
+    expect(response.body.success).toBe(false);
+  });
+
+  test('should reject busy lanes before the route runs', async () => {
+    const app = express();
+    app.get('/:format', rejectWhenBusy((req) => req.params.format), (req, res) => res.json({ ok: true }));
+
+    // 공유 컨트롤러의 media lane을 가득 채움
+    const tickets = [];
+    while (!admission.check('media')) tickets.push(admission.acquire('media', 0));
+    const rejectedBefore = admission.getStatus().lanes.media.rejected;
+
+    try {
+      const busy = await request(app).get('/mp4');
+      const other = await request(app).get('/word');
+
+      expect(busy.status).toBe(503);
+      expect(other.body).toEqual({ ok: true });
+      expect(admission.getStatus().lanes.media.rejected).toBe(rejectedBefore + 1);
+    } finally {
+      tickets.forEach((ticket) => admission.release(ticket));
+    }
+  });
+});
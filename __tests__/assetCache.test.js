@@ -0,0 +1,58 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const zlib = require('zlib');
+const request = require('supertest');
+const express = require('express');
+const { isFingerprinted, setCacheHeaders } = require('../utils/assetCache');
+const { servePrecompressed } = require('../utils/precompressed');
+
+describe('Asset Cache Header Tests', () => {
+  let rootDir;
+  let app;
+
+  beforeAll(() => {
+    rootDir = fs.mkdtempSync(path.join(os.tmpdir(), 'asset-cache-test-'));
+    fs.writeFileSync(path.join(rootDir, 'index.html'), '<link href="styles.1a2b3c4d.css">');
+    fs.writeFileSync(path.join(rootDir, 'styles.css'), 'body {}');
+    fs.writeFileSync(path.join(rootDir, 'styles.1a2b3c4d.css'), 'body {}');
+    fs.writeFileSync(path.join(rootDir, 'styles.1a2b3c4d.css.gz'), zlib.gzipSync('body {}'));
+
+    app = express();
+    app.use(servePrecompressed(rootDir, { setHeaders: setCacheHeaders }));
+    app.use(express.static(rootDir, { setHeaders: setCacheHeaders }));
+  });
+
+  afterAll(() => {
+    fs.rmSync(rootDir, { recursive: true, force: true });
+  });
+
+  test('should detect fingerprinted file names', () => {
+    expect(isFingerprinted('/public/styles.1a2b3c4d.css')).toBe(true);
+    expect(isFingerprinted('/public/og-image.b1aff852.png')).toBe(true);
+    expect(isFingerprinted('/public/styles.css')).toBe(false);
+    expect(isFingerprinted('/public/jquery.min.js')).toBe(false);
+  });
+
+  test('should serve fingerprinted assets as immutable', async () => {
+    const res = await request(app).get('/styles.1a2b3c4d.css').set('Accept-Encoding', 'identity');
+
+    expect(res.status).toBe(200);
+    expect(res.headers['cache-control']).toBe('public, max-age=31536000, immutable');
+  });
+
+  test('should keep immutable headers on precompressed variants', async () => {
+    const res = await request(app).get('/styles.1a2b3c4d.css').set('Accept-Encoding', 'gzip');
+
+    expect(res.headers['content-encoding']).toBe('gzip');
+    expect(res.headers['cache-control']).toBe('public, max-age=31536000, immutable');
+  });
+
+  test('should keep HTML and unhashed assets short-lived', async () => {
+    const html = await request(app).get('/');
+    expect(html.headers['cache-control']).toBe('no-cache');
+
+    const css = await request(app).get('/styles.css');
+    expect(css.headers['cache-control']).toBe('public, max-age=0');
+  });
+});
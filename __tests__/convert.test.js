@@ -1,16 +1,33 @@
 const request = require('supertest');
 const express = require('express');
+const os = require('os');
+const path = require('path');
+
+// 스크래치 디렉토리를 테스트 전용 임시 경로로
+process.env.CONVERTER_SCRATCH_DIR = path.join(os.tmpdir(), `convert-test-${process.pid}`);
 
 // Mock 모듈들
+// prepared statement는 DB별로 캐시되므로 모든 prepare가 같은 statement를 반환
+const mockStatement = {
+  run: jest.fn(() => ({ changes: 1 })),
+  get: jest.fn(() => ({ id: 1, file_id: 'test-id' })),
+};
 jest.mock('../config/db', () => ({
-  prepare: jest.fn(() => ({
-    run: jest.fn(),
-    get: jest.fn(() => ({ id: 1, file_id: 'test-id' })),
-  })),
+  prepare: jest.fn(() => mockStatement),
+  transaction: jest.fn((fn) => fn),
 }));
 
 jest.mock('../config/r2', () => ({
-  downloadFromR2: jest.fn(async () => Buffer.from('%PDF-1.4\nMock PDF')),
+  downloadFromR2ToFile: jest.fn(async (key, filePath) => {
+    const content = Buffer.from('%PDF-1.4\nMock PDF');
+    require('fs').writeFileSync(filePath, content);
+    return content.length;
+  }),
+  downloadFromR2ToFileWithHash: jest.fn(async (key, filePath) => {
+    const content = Buffer.from('%PDF-1.4\nMock PDF');
+    require('fs').writeFileSync(filePath, content);
+    return { size: content.length, sha256: require('crypto').createHash('sha256').update(content).digest('hex') };
+  }),
   uploadToR2: jest.fn(async () => ({ url: 'https://r2.example.com/converted.docx' })),
   deleteFromR2: jest.fn(async () => ({})),
   generateR2Path: jest.fn((name, folder) => `${folder}/1733367890456-def456.docx`),
@@ -30,7 +47,11 @@ jest.mock('../utils/constants', () => ({
     'excel': '.xlsx',
     'ppt': '.pptx',
     'jpg': '.jpg',
-    'png': '.png'
+    'png': '.png',
+    'word2jpg': '.zip'
+  },
+  PIPELINE_STEPS: {
+    'word2jpg': ['word2pdf', 'jpg']
   },
   PORT: 3002,
   NODE_ENV: 'development',
@@ -54,6 +75,10 @@ describe('Convert Routes Tests', () => {
     app.use('/api/convert', convertRoutes);
   });
 
+  afterAll(() => {
+    require('fs').rmSync(process.env.CONVERTER_SCRATCH_DIR, { recursive: true, force: true });
+  });
+
   describe('POST /api/convert', () => {
     test('should convert PDF to Word successfully', async () => {
       const response = await request(app)
@@ -89,6 +114,28 @@ describe('Convert Routes Tests', () => {
       }
     });
 
+    test('should run chained formats as a single pipeline job', async () => {
+      const { convert } = require('../utils/converterPool');
+
+      const response = await request(app)
+        .post('/api/convert')
+        .send({
+          r2Path: 'uploads/1733367890123-abc123.docx',
+          format: 'word2jpg',
+          originalName: 'report.docx'
+        });
+
+      expect(response.status).toBe(200);
+      expect(response.body.fileName).toBe('report_converted.zip');
+      expect(convert).toHaveBeenCalledTimes(1);
+      expect(convert).toHaveBeenCalledWith(
+        expect.stringMatching(/source\.docx$/),
+        'word2jpg',
+        { quality: undefined },
+        expect.objectContaining({ signal: expect.any(Object) })
+      );
+    });
+
     test('should reject invalid format', async () => {
       const response = await request(app)
         .post('/api/convert')
@@ -139,9 +186,9 @@ describe('Convert Routes Tests', () => {
   });
 
   describe('Conversion Workflow', () => {
-    test('should download PDF from R2', async () => {
+    test('should download PDF from R2 to scratch disk', async () => {
       const mockR2 = require('../config/r2');
-      mockR2.downloadFromR2.mockClear();
+      mockR2.downloadFromR2ToFileWithHash.mockClear();
 
       const response = await request(app)
         .post('/api/convert')
@@ -152,7 +199,10 @@ describe('Convert Routes Tests', () => {
         });
 
       expect(response.status).toBe(200);
-      expect(mockR2.downloadFromR2).toHaveBeenCalledWith('uploads/1733367890123-abc123.pdf');
+      expect(mockR2.downloadFromR2ToFileWithHash).toHaveBeenCalledWith(
+        'uploads/1733367890123-abc123.pdf',
+        expect.stringMatching(/source\.pdf$/)
+      );
     });
 
     test('should call Piscina converter', async () => {
@@ -169,10 +219,45 @@ describe('Convert Routes Tests', () => {
 
       expect(response.status).toBe(200);
       expect(mockConverter.convert).toHaveBeenCalled();
-      const [buffer, format] = mockConverter.convert.mock.calls[0];
+      const [input, format] = mockConverter.convert.mock.calls[0];
+      expect(typeof input).toBe('string');
       expect(format).toBe('excel');
     });
 
+    test('should pass the digest computed during download to the converter', async () => {
+      const mockConverter = require('../utils/converterPool');
+      mockConverter.convert.mockClear();
+
+      await request(app)
+        .post('/api/convert')
+        .send({
+          r2Path: 'uploads/1733367890123-abc123.pdf',
+          format: 'word',
+          originalName: 'document.pdf'
+        });
+
+      const expected = require('crypto').createHash('sha256').update('%PDF-1.4\nMock PDF').digest('hex');
+      const [, , , options] = mockConverter.convert.mock.calls[0];
+      expect(options.inputHash).toBe(expected);
+    });
+
+    test('should remove the scratch directory after conversion', async () => {
+      const fs = require('fs');
+      const mockR2 = require('../config/r2');
+      mockR2.downloadFromR2ToFileWithHash.mockClear();
+
+      await request(app)
+        .post('/api/convert')
+        .send({
+          r2Path: 'uploads/1733367890123-abc123.pdf',
+          format: 'word',
+          originalName: 'document.pdf'
+        });
+
+      const [, filePath] = mockR2.downloadFromR2ToFileWithHash.mock.calls[0];
+      expect(fs.existsSync(path.dirname(filePath))).toBe(false);
+    });
+
     test('should upload converted file to R2', async () => {
       const mockR2 = require('../config/r2');
       mockR2.uploadToR2.mockClear();
@@ -208,9 +293,6 @@ describe('Convert Routes Tests', () => {
     });
 
     test('should save file metadata to database', async () => {
-      const mockDb = require('../config/db');
-      const mockPrepare = mockDb.prepare();
-
       const response = await request(app)
         .post('/api/convert')
         .send({
@@ -220,14 +302,20 @@ describe('Convert Routes Tests', () => {
         });
 
       expect(response.status).toBe(200);
-      expect(mockDb.prepare).toHaveBeenCalledWith(expect.stringContaining('INSERT INTO files'));
+      expect(mockStatement.run).toHaveBeenCalledWith(
+        response.body.fileId,
+        response.body.r2Path,
+        'converted',
+        expect.any(String),
+        'active'
+      );
     });
   });
 
   describe('Error Handling', () => {
     test('should handle R2 download failure', async () => {
       const mockR2 = require('../config/r2');
-      mockR2.downloadFromR2.mockRejectedValueOnce(new Error('R2 download failed'));
+      mockR2.downloadFromR2ToFileWithHash.mockRejectedValueOnce(new Error('R2 download failed'));
 
       const response = await request(app)
         .post('/api/convert')
@@ -334,6 +422,29 @@ describe('Convert Routes Tests', () => {
       expect(response.body).toHaveProperty('r2Path');
       expect(response.body).toHaveProperty('fileName');
       expect(response.body).toHaveProperty('message');
+      expect(response.body).not.toHaveProperty('partial');
+    });
+
+    test('partial response should report converted page count', async () => {
+      const mockConverter = require('../utils/converterPool');
+      mockConverter.convert.mockResolvedValueOnce({
+        success: true,
+        buffer: Buffer.from('Partial file content'),
+        partial: { pagesDone: 550, pagesTotal: 600 },
+        format: 'word'
+      });
+
+      const response = await request(app)
+        .post('/api/convert')
+        .send({
+          r2Path: 'uploads/1733367890123-abc123.pdf',
+          format: 'word',
+          originalName: 'document.pdf'
+        });
+
+      expect(response.status).toBe(200);
+      expect(response.body).toMatchObject({ success: true, partial: true, pagesDone: 550, pagesTotal: 600 });
+      expect(response.body.message).toContain('550/600');
     });
 
     test('error response should have required fields', async () => {
@@ -0,0 +1,99 @@
+// 변환 모듈이 로드될 때마다 기록 (jest.mock 팩토리는 처음 require될 때 실행)
+const mockLoaded = [];
+
+jest.mock('piscina', () => ({ workerData: null }));
+
+jest.mock('../utils/converters/convertImage', () => {
+  mockLoaded.push('convertImage');
+  return {
+    jpgToPng: jest.fn(async () => Buffer.from('png')),
+    pngToJpg: jest.fn(async () => Buffer.from('jpg')),
+  };
+});
+
+jest.mock('../utils/converters/convertPdfToWord', () => {
+  mockLoaded.push('convertPdfToWord');
+  return jest.fn(async () => Buffer.from('docx'));
+});
+
+jest.mock('../utils/converters/convertVideo', () => {
+  mockLoaded.push('convertVideo');
+  return { convertVideo: jest.fn(), compressVideo: jest.fn() };
+});
+
+jest.mock('../utils/converters/convertAudio', () => {
+  mockLoaded.push('convertAudio');
+  return { convertAudio: jest.fn() };
+});
+
+jest.mock('../utils/converters/pipeline', () => {
+  mockLoaded.push('pipeline');
+  return { runPipeline: jest.fn() };
+});
+
+const runTask = require('../utils/converters/converter.task');
+
+describe('Converter Worker Task Tests', () => {
+  beforeEach(() => {
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    jest.spyOn(console, 'error').mockImplementation(() => {});
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  test('should not load converter modules at startup', () => {
+    expect(mockLoaded).toEqual([]);
+  });
+
+  test('should load only the module for the requested format', async () => {
+    const result = await runTask({ imageInput: Buffer.from('jpg'), format: 'jpg-to-png' });
+
+    expect(result.success).toBe(true);
+    expect(result.buffer.toString()).toBe('png');
+    expect(mockLoaded).toEqual(['convertImage']);
+  });
+
+  test('should reuse a loaded module for later tasks', async () => {
+    await runTask({ imageInput: Buffer.from('png'), format: 'png-to-jpg', backgroundColor: '#000000' });
+    const result = await runTask({ pdfInput: Buffer.from('%PDF'), format: 'word', deadlineAt: Date.now() + 1000 });
+
+    expect(result.buffer.toString()).toBe('docx');
+    expect(require('../utils/converters/convertPdfToWord')).toHaveBeenCalledWith(
+      Buffer.from('%PDF'),
+      { deadlineAt: expect.any(Number) }
+    );
+    expect(mockLoaded).toEqual(['convertImage', 'convertPdfToWord']);
+  });
+
+  test('should reject unknown formats without loading any module', async () => {
+    const result = await runTask({ format: 'unknown' });
+
+    expect(result.success).toBe(false);
+    expect(result.error).toContain('지원하지 않는 형식');
+    expect(mockLoaded).not.toContain('pipeline');
+  });
+
+  test('should pass the deadline to pipelines and report partial pages', async () => {
+    jest.spyOn(console, 'warn').mockImplementation(() => {});
+    const { runPipeline } = require('../utils/converters/pipeline');
+    const { reportPartial } = require('../utils/deadline');
+    runPipeline.mockImplementation(async () => {
+      // 이미지 단계가 마감에 걸린 경우
+      reportPartial(3, 10);
+      return { result: Buffer.from('zip'), steps: [] };
+    });
+    const deadlineAt = Date.now() + 1000;
+
+    const result = await runTask({
+      pipelineInput: '/uploads/a.docx',
+      pipelineOptions: { quality: 'low' },
+      format: 'word2jpg',
+      deadlineAt
+    });
+
+    expect(runPipeline).toHaveBeenCalledWith('word2jpg', '/uploads/a.docx', { quality: 'low', deadlineAt });
+    expect(result.partial).toEqual({ pagesDone: 3, pagesTotal: 10 });
+  });
+});
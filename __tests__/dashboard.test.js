@@ -0,0 +1,70 @@
+// 실제 스키마/트리거로 메모리 DB 생성
+process.env.DB_PATH = ':memory:';
+
+const db = require('../config/db');
+const {
+  getConversionStats,
+  getFormatStats,
+  getHourlyStats,
+  getSystemStatus
+} = require('../utils/dashboard');
+
+const insertFile = (fileId, r2Path, createdAt = null, status = 'active') => {
+  db.prepare(`
+    INSERT INTO files (file_id, r2_path, file_type, created_at, expires_at, status)
+    VALUES (?, ?, 'converted', COALESCE(?, CURRENT_TIMESTAMP), datetime('now', '+10 minutes'), ?)
+  `).run(fileId, r2Path, createdAt, status);
+};
+
+describe('Dashboard Rollup Tests', () => {
+  beforeEach(() => {
+    db.exec('DELETE FROM files');
+  });
+
+  test('should count inserted files without scanning files table', () => {
+    insertFile('a', 'converted/a.docx');
+    insertFile('b', 'converted/b.docx');
+    insertFile('c', 'converted/c.mp4', "2000-01-01 00:00:00");
+
+    const stats = getConversionStats();
+
+    expect(stats.total).toBe(3);
+    expect(stats.today).toBe(2);
+    expect(stats.last7Days).toBe(2);
+  });
+
+  test('should move counts when status changes', () => {
+    insertFile('a', 'converted/a.docx');
+    insertFile('b', 'converted/b.mp4');
+
+    db.prepare(`UPDATE files SET status='deleted', deleted_at=CURRENT_TIMESTAMP WHERE file_id=?`).run('b');
+
+    expect(getConversionStats().total).toBe(1);
+    expect(getFormatStats()).toEqual([{ format: 'Word (.docx)', count: 1 }]);
+
+    const status = getSystemStatus();
+    expect(status.database.fileCount).toBe(2);
+    expect(status.database.activeFiles).toBe(1);
+    expect(status.database.deletedFiles).toBe(1);
+    // DB_PATH로 연 DB 기준 (메모리 DB는 파일 없음)
+    expect(status.storage.dbFileSizeBytes).toBe(0);
+  });
+
+  test('should decrement counts when rows are deleted', () => {
+    insertFile('a', 'converted/a.docx');
+    db.prepare('DELETE FROM files WHERE file_id=?').run('a');
+
+    expect(getConversionStats().total).toBe(0);
+    expect(getFormatStats()).toEqual([]);
+  });
+
+  test('should report the current hour in hourly stats', () => {
+    insertFile('a', 'converted/a.docx');
+
+    const hourly = getHourlyStats();
+    const currentHour = `${new Date().toISOString().slice(11, 13)}:00`;
+
+    expect(hourly).toHaveLength(24);
+    expect(hourly.find(h => h.hour === currentHour).count).toBe(1);
+  });
+});
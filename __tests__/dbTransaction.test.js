@@ -0,0 +1,106 @@
+// 실제 스키마로 메모리 DB 생성
+process.env.DB_PATH = ':memory:';
+
+const db = require('../config/db');
+const {
+  FileWriteBatcher,
+  getFileMetadata,
+  getExpiredFileKeys,
+  updateFileStatus,
+} = require('../utils/dbTransaction');
+
+const fileData = (fileId, expiresAt = '2000-01-01 00:00:00') => ({
+  fileId,
+  r2Path: `converted/${fileId}.docx`,
+  fileType: 'converted',
+  expiresAt,
+});
+
+describe('DB Transaction Helper Tests', () => {
+  beforeEach(() => {
+    db.exec('DELETE FROM files');
+  });
+
+  test('should prepare each statement once per database', () => {
+    const Database = require('better-sqlite3');
+    const freshDb = new Database(':memory:');
+    freshDb.exec(`CREATE TABLE files (file_id TEXT UNIQUE, status TEXT, deleted_at DATETIME)`);
+    freshDb.exec(`INSERT INTO files (file_id, status) VALUES ('a', 'active')`);
+    const prepareSpy = jest.spyOn(freshDb, 'prepare');
+
+    updateFileStatus(freshDb, 'a', 'failed');
+    updateFileStatus(freshDb, 'a', 'active');
+    getFileMetadata(freshDb, 'a');
+    getFileMetadata(freshDb, 'a');
+
+    expect(prepareSpy).toHaveBeenCalledTimes(2);
+    expect(getFileMetadata(freshDb, 'a').status).toBe('active');
+    freshDb.close();
+  });
+
+  test('should write concurrent inserts and updates in one transaction', async () => {
+    const batcher = new FileWriteBatcher(db);
+
+    const results = await Promise.all([
+      batcher.insert(fileData('a')),
+      batcher.insert(fileData('b')),
+      batcher.updateStatus('a', 'deleted', '2000-01-01 00:10:00'),
+    ]);
+
+    expect(batcher.stats).toEqual({ batches: 1, writes: 3 });
+    expect(results.map((result) => result.changes)).toEqual([1, 1, 1]);
+    expect(getFileMetadata(db, 'a').status).toBe('deleted');
+    expect(getFileMetadata(db, 'b').status).toBe('active');
+  });
+
+  test('should reject only the failing write in a batch', async () => {
+    const batcher = new FileWriteBatcher(db);
+
+    const [first, duplicate, other] = await Promise.allSettled([
+      batcher.insert(fileData('a')),
+      batcher.insert(fileData('a')),
+      batcher.insert(fileData('c')),
+    ]);
+
+    expect(first.status).toBe('fulfilled');
+    expect(duplicate.status).toBe('rejected');
+    expect(duplicate.reason.message).toMatch(/UNIQUE/);
+    expect(other.status).toBe('fulfilled');
+    expect(db.prepare('SELECT COUNT(*) AS count FROM files').get().count).toBe(2);
+  });
+
+  test('should flush immediately when the batch is full', async () => {
+    const batcher = new FileWriteBatcher(db, { maxBatch: 2 });
+
+    await Promise.all([
+      batcher.insert(fileData('a')),
+      batcher.insert(fileData('b')),
+      batcher.insert(fileData('c')),
+    ]);
+
+    expect(batcher.stats).toEqual({ batches: 2, writes: 3 });
+  });
+
+  test('should scan expired files through the partial index', async () => {
+    const batcher = new FileWriteBatcher(db);
+    await Promise.all([
+      batcher.insert(fileData('old-2', '2000-01-02 00:00:00')),
+      batcher.insert(fileData('old-1', '2000-01-01 00:00:00')),
+      batcher.insert(fileData('fresh', '2999-01-01 00:00:00')),
+    ]);
+    updateFileStatus(db, 'old-2', 'deleted', '2000-01-02 00:10:00');
+
+    expect(getExpiredFileKeys(db, 10)).toEqual([
+      { file_id: 'old-1', r2_path: 'converted/old-1.docx' },
+    ]);
+
+    const plan = db.prepare(`
+      EXPLAIN QUERY PLAN
+      SELECT file_id, r2_path FROM files
+      WHERE status = 'active' AND expires_at <= datetime('now')
+      ORDER BY expires_at
+      LIMIT 10
+    `).all();
+    expect(plan.map((step) => step.detail).join('\n')).toMatch(/COVERING INDEX idx_files_active_expires_covering/);
+  });
+});
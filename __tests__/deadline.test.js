@@ -0,0 +1,69 @@
+process.env.CONVERTER_DEADLINE_MARGIN_MS = '1000';
+process.env.SUPERVISOR_TIMEOUT_MS = '60000';
+
+const {
+  stopAt,
+  deadlineArgs,
+  parseScriptSummary,
+  reportPartial,
+  reportScriptSummary,
+  takePartial,
+  takePageCount
+} = require('../utils/deadline');
+
+describe('Conversion Deadline Tests', () => {
+  beforeEach(() => {
+    jest.spyOn(Date, 'now').mockReturnValue(1_000_000);
+    jest.spyOn(console, 'warn').mockImplementation(() => {});
+    takePartial();
+    takePageCount();
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  test('should stop before the earlier of task deadline and process timeout', () => {
+    expect(stopAt(1_010_000)).toBe(1_009_000);
+    expect(stopAt(2_000_000)).toBe(1_060_000 - 1000);
+    expect(stopAt(undefined)).toBe(1_059_000);
+  });
+
+  test('should pass the deadline to scripts in epoch seconds', () => {
+    expect(deadlineArgs(1_010_000)).toEqual(['--deadline', '1009.000']);
+  });
+
+  test('should parse the summary from the last stdout line', () => {
+    const stdout = 'progress 1/2\n{"partial": true, "pages_done": 1, "pages_total": 2}\n';
+    expect(parseScriptSummary(stdout)).toEqual({ partial: true, pages_done: 1, pages_total: 2 });
+    expect(parseScriptSummary('no summary')).toEqual({});
+    expect(parseScriptSummary('')).toEqual({});
+  });
+
+  test('should report partial results once per task', () => {
+    reportScriptSummary({ partial: true, pages_done: 550, pages_total: 600 });
+
+    expect(takePartial()).toEqual({ pagesDone: 550, pagesTotal: 600 });
+    expect(takePartial()).toBeNull();
+  });
+
+  test('should ignore complete results', () => {
+    reportPartial(600, 600);
+    reportScriptSummary({ partial: false, pages_done: 3, pages_total: 3 });
+    reportScriptSummary({});
+
+    expect(takePartial()).toBeNull();
+  });
+
+  test('should remember the page count of complete and partial results', () => {
+    reportScriptSummary({ partial: false, pages_done: 3, pages_total: 3 });
+    expect(takePageCount()).toBe(3);
+    expect(takePageCount()).toBeNull();
+
+    reportPartial(5, 12);
+    expect(takePageCount()).toBe(12);
+
+    reportScriptSummary({});
+    expect(takePageCount()).toBeNull();
+  });
+});
@@ -18,12 +18,30 @@ jest.mock('../config/db', () => ({
   prepare: jest.fn(() => mockStmt)
 }));
 
-jest.mock('../config/r2', () => ({
-  downloadFromR2: jest.fn(async () => Buffer.from('Converted file content')),
-  uploadToR2: jest.fn(),
-  deleteFromR2: jest.fn(),
-  generateR2Path: jest.fn(),
-}));
+jest.mock('../config/r2', () => {
+  const { Readable } = require('stream');
+  const content = Buffer.from('Converted file content');
+  return {
+    getR2ObjectStream: jest.fn(async (key, range) => {
+      if (range) {
+        const [, start, end] = /^bytes=(\d+)-(\d+)$/.exec(range);
+        const slice = content.subarray(Number(start), Number(end) + 1);
+        return {
+          body: Readable.from([slice]),
+          contentLength: slice.length,
+          contentRange: `bytes ${start}-${Number(start) + slice.length - 1}/${content.length}`,
+          eTag: '"etag-1"'
+        };
+      }
+      return { body: Readable.from([content]), contentLength: content.length, eTag: '"etag-1"' };
+    }),
+    getPresignedDownloadUrl: jest.fn(() => 'https://r2.example.com/bucket/converted/file.docx?X-Amz-Signature=abc'),
+    isR2Configured: true,
+    uploadToR2: jest.fn(),
+    deleteFromR2: jest.fn(),
+    generateR2Path: jest.fn(),
+  };
+});
 
 describe('Download Routes Tests', () => {
   let app;
@@ -79,13 +97,13 @@ describe('Download Routes Tests', () => {
 
     test('should download from R2 with correct path', async () => {
       const mockR2 = require('../config/r2');
-      mockR2.downloadFromR2.mockClear();
+      mockR2.getR2ObjectStream.mockClear();
 
       const response = await request(app)
         .get('/api/download/1733367890456-def456');
 
       expect(response.status).toBe(200);
-      expect(mockR2.downloadFromR2).toHaveBeenCalledWith('converted/1733367890456-def456.docx');
+      expect(mockR2.getR2ObjectStream).toHaveBeenCalledWith('converted/1733367890456-def456.docx', undefined);
     });
 
     test('should extract filename from R2 path', async () => {
@@ -113,13 +131,13 @@ describe('Download Routes Tests', () => {
       const mockR2 = require('../config/r2');
 
       mockGet.mockReturnValueOnce(null);
-      mockR2.downloadFromR2.mockClear();
+      mockR2.getR2ObjectStream.mockClear();
 
       const response = await request(app)
         .get('/api/download/nonexistent-id');
 
       expect(response.status).toBe(404);
-      expect(mockR2.downloadFromR2).not.toHaveBeenCalled();
+      expect(mockR2.getR2ObjectStream).not.toHaveBeenCalled();
     });
   });
 
@@ -184,7 +202,7 @@ describe('Download Routes Tests', () => {
   describe('Error Handling', () => {
     test('should handle R2 download failure', async () => {
       const mockR2 = require('../config/r2');
-      mockR2.downloadFromR2.mockRejectedValueOnce(new Error('R2 download failed'));
+      mockR2.getR2ObjectStream.mockRejectedValueOnce(new Error('R2 download failed'));
 
       const response = await request(app)
         .get('/api/download/1733367890456-def456');
@@ -238,6 +256,66 @@ describe('Download Routes Tests', () => {
     });
   });
 
+  describe('Range Requests', () => {
+    test('should return 206 with Content-Range for a byte range', async () => {
+      const response = await request(app)
+        .get('/api/download/1733367890456-def456')
+        .set('Range', 'bytes=0-8');
+
+      expect(response.status).toBe(206);
+      expect(response.headers['content-range']).toBe('bytes 0-8/22');
+      expect(response.headers['content-length']).toBe('9');
+      expect(response.headers['accept-ranges']).toBe('bytes');
+      expect(response.body.toString()).toBe('Converted');
+    });
+
+    test('should ignore multi-range requests and send the full file', async () => {
+      const mockR2 = require('../config/r2');
+
+      const response = await request(app)
+        .get('/api/download/1733367890456-def456')
+        .set('Range', 'bytes=0-1,4-5');
+
+      expect(response.status).toBe(200);
+      expect(mockR2.getR2ObjectStream).toHaveBeenLastCalledWith(expect.any(String), undefined);
+    });
+
+    test('should return 416 for unsatisfiable ranges', async () => {
+      const mockR2 = require('../config/r2');
+      const rangeError = new Error('The requested range is not satisfiable');
+      rangeError.name = 'InvalidRange';
+      mockR2.getR2ObjectStream.mockRejectedValueOnce(rangeError);
+
+      const response = await request(app)
+        .get('/api/download/1733367890456-def456')
+        .set('Range', 'bytes=1000-2000');
+
+      expect(response.status).toBe(416);
+      expect(response.body.success).toBe(false);
+    });
+  });
+
+  describe('Presigned Redirect Mode', () => {
+    test('should redirect to a presigned R2 URL', async () => {
+      let presignApp;
+      process.env.DOWNLOAD_MODE = 'presign';
+      jest.isolateModules(() => {
+        presignApp = express();
+        presignApp.use('/api/download', require('../routes/downloadRoutes'));
+      });
+      delete process.env.DOWNLOAD_MODE;
+
+      const mockR2 = require('../config/r2');
+      const response = await request(presignApp)
+        .get('/api/download/1733367890456-def456');
+
+      expect(response.status).toBe(302);
+      expect(response.headers.location).toContain('X-Amz-Signature');
+      expect(response.headers['cache-control']).toBe('no-store');
+      expect(mockR2.getR2ObjectStream).not.toHaveBeenCalled();
+    });
+  });
+
   describe('Status Check', () => {
     test('should only download active files', async () => {
       mockGet.mockReturnValueOnce({
@@ -0,0 +1,133 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+jest.mock('../utils/converters/convertImage', () => ({
+  jpgToPng: jest.fn(),
+  pngToJpg: jest.fn(),
+  jpgToWebp: jest.fn(),
+  pngToWebp: jest.fn(),
+  webpToJpg: jest.fn(),
+  webpToPng: jest.fn(),
+}));
+
+jest.mock('../utils/converters/convertHeic', () => ({
+  heicToJpg: jest.fn(async (input) => {
+    if (String(input).includes('broken')) throw new Error('unsupported HEIF');
+    return Buffer.from(`jpeg:${input}`);
+  }),
+  heicToPng: jest.fn(),
+  heicToWebp: jest.fn(),
+}));
+
+jest.mock('../utils/converters/resizeImage', () => ({
+  resizeImage: jest.fn(),
+  compressImageOnly: jest.fn(),
+}));
+
+const { convertImageBatch, outputExtension } = require('../utils/converters/imageBatch');
+const { heicToJpg } = require('../utils/converters/convertHeic');
+
+describe('Image Batch Tests', () => {
+  let dir;
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    dir = fs.mkdtempSync(path.join(os.tmpdir(), 'image-batch-test-'));
+  });
+
+  afterEach(() => {
+    fs.rmSync(dir, { recursive: true, force: true });
+  });
+
+  test('should write converted images into a store-only ZIP', async () => {
+    const zipPath = path.join(dir, 'images.zip');
+
+    const result = await convertImageBatch(
+      ['a.heic', 'b.heic', 'c.heic'],
+      ['IMG_1.HEIC', 'IMG_2.HEIC', 'IMG_1.heic'],
+      'heic-to-jpg',
+      { format: 'heic-to-jpg', quality: 85 },
+      zipPath
+    );
+
+    expect(heicToJpg).toHaveBeenCalledTimes(3);
+    expect(heicToJpg).toHaveBeenCalledWith('a.heic', 85);
+    expect(result.items.map((item) => item.entryName)).toEqual(['IMG_1.jpg', 'IMG_2.jpg', 'IMG_1 (2).jpg']);
+
+    const zip = fs.readFileSync(zipPath);
+    // 첫 로컬 헤더의 압축 방식 = 0 (store)
+    expect(zip.readUInt32LE(0)).toBe(0x04034b50);
+    expect(zip.readUInt16LE(8)).toBe(0);
+    expect(zip.includes('jpeg:b.heic')).toBe(true);
+  });
+
+  test('should report per-image failures and keep the rest', async () => {
+    const zipPath = path.join(dir, 'images.zip');
+
+    const result = await convertImageBatch(
+      ['ok.heic', 'broken.heic'],
+      ['ok.heic', 'broken.heic'],
+      'heic-to-jpg',
+      {},
+      zipPath
+    );
+
+    expect(result.items[0]).toMatchObject({ fileName: 'ok.heic', success: true });
+    expect(result.items[1]).toEqual({ fileName: 'broken.heic', success: false, error: 'unsupported HEIF' });
+
+    const zip = fs.readFileSync(zipPath);
+    expect(zip.includes('errors.txt')).toBe(true);
+    expect(zip.includes('broken.heic: unsupported HEIF')).toBe(true);
+  });
+
+  test('should fail when every image fails', async () => {
+    await expect(convertImageBatch(
+      ['broken.heic'],
+      ['broken.heic'],
+      'heic-to-jpg',
+      {},
+      path.join(dir, 'images.zip')
+    )).rejects.toMatchObject({ code: 'IMAGE_BATCH_ALL_FAILED' });
+  });
+
+  test('should fail instead of waiting for entries when the ZIP cannot be written', async () => {
+    await expect(convertImageBatch(
+      ['a.heic', 'b.heic', 'c.heic', 'd.heic'],
+      [],
+      'heic-to-jpg',
+      {},
+      path.join(dir, 'missing', 'images.zip')
+    )).rejects.toMatchObject({ code: 'ENOENT' });
+  });
+
+  test('should not leak a rejection when the ZIP fails while images are still converting', async () => {
+    const unhandled = jest.fn();
+    process.on('unhandledRejection', unhandled);
+    // 출력 파일 열기 오류(ENOENT)가 첫 변환 완료보다 먼저 발생
+    heicToJpg.mockImplementation((input) => new Promise((resolve) => {
+      setTimeout(() => resolve(Buffer.from(`jpeg:${input}`)), 50);
+    }));
+
+    try {
+      await expect(convertImageBatch(
+        ['a.heic', 'b.heic'],
+        [],
+        'heic-to-jpg',
+        {},
+        path.join(dir, 'missing', 'images.zip')
+      )).rejects.toMatchObject({ code: 'ENOENT' });
+      await new Promise((resolve) => setImmediate(resolve));
+    } finally {
+      process.removeListener('unhandledRejection', unhandled);
+    }
+
+    expect(unhandled).not.toHaveBeenCalled();
+  });
+
+  test('should pick output extensions', () => {
+    expect(outputExtension('png-to-webp')).toBe('.webp');
+    expect(outputExtension('resize', { format: 'png' })).toBe('.png');
+    expect(outputExtension('compress-image')).toBe('.jpg');
+  });
+});
@@ -0,0 +1,188 @@
+// 실제 스키마로 메모리 DB 생성
+process.env.DB_PATH = ':memory:';
+process.env.JOB_LEASE_MS = '60000';
+process.env.JOB_RETRY_BASE_MS = '5000';
+process.env.JOB_RETRY_MAX_MS = '300000';
+
+const db = require('../config/db');
+const {
+  enqueueJob,
+  claimJob,
+  heartbeatJob,
+  completeJob,
+  failJob,
+  releaseJob,
+  recoverExpiredJobs,
+  getJob,
+  countQueuedJobs,
+  pruneFinishedJobs
+} = require('../utils/jobQueue');
+const { cachedStatement } = require('../utils/dbTransaction');
+
+const NOW = 1_000_000;
+
+const enqueue = (format = 'word', options = {}) =>
+  enqueueJob(db, { format, payload: { r2Path: `uploads/${format}.pdf` }, ...options });
+
+describe('Job Queue Tests', () => {
+  beforeEach(() => {
+    jest.spyOn(Date, 'now').mockReturnValue(NOW);
+    db.exec('DELETE FROM jobs');
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  test('should enqueue a job with its payload', () => {
+    const job = enqueue('word', { priority: 2 });
+
+    expect(job).toMatchObject({
+      format: 'word',
+      status: 'queued',
+      priority: 2,
+      attempts: 0,
+      max_attempts: 3,
+      run_at: NOW,
+      payload: { r2Path: 'uploads/word.pdf' }
+    });
+    expect(countQueuedJobs(db)).toBe(1);
+  });
+
+  test('should claim by priority, then by age', () => {
+    Date.now.mockReturnValue(NOW - 2);
+    const oldest = enqueue();
+    Date.now.mockReturnValue(NOW - 1);
+    const urgent = enqueue('word', { priority: 5 });
+    Date.now.mockReturnValue(NOW);
+    enqueue();
+
+    const first = claimJob(db, { workerId: 'w1' });
+    const second = claimJob(db, { workerId: 'w1' });
+
+    expect(first.id).toBe(urgent.id);
+    expect(second.id).toBe(oldest.id);
+    expect(first).toMatchObject({ status: 'running', attempts: 1, lease_owner: 'w1', lease_expires_at: NOW + 60000 });
+  });
+
+  test('should never hand the same job to two workers', () => {
+    const job = enqueue();
+
+    expect(claimJob(db, { workerId: 'w1' }).id).toBe(job.id);
+    expect(claimJob(db, { workerId: 'w2' })).toBeNull();
+  });
+
+  test('should only claim formats the worker handles', () => {
+    enqueue('mp3');
+    const word = enqueue('word');
+
+    expect(claimJob(db, { workerId: 'py', formats: ['word', 'excel'] }).id).toBe(word.id);
+    expect(claimJob(db, { workerId: 'py', formats: ['word', 'excel'] })).toBeNull();
+    expect(claimJob(db, { workerId: 'node' }).format).toBe('mp3');
+  });
+
+  test('should extend the lease only for its owner', () => {
+    const job = enqueue();
+    claimJob(db, { workerId: 'w1' });
+
+    Date.now.mockReturnValue(NOW + 30000);
+    expect(heartbeatJob(db, job.id, 'w2')).toBe(false);
+    expect(heartbeatJob(db, job.id, 'w1')).toBe(true);
+    expect(getJob(db, job.id).lease_expires_at).toBe(NOW + 90000);
+  });
+
+  test('should store the result on completion', () => {
+    const job = enqueue();
+    claimJob(db, { workerId: 'w1' });
+
+    expect(completeJob(db, job.id, 'w2', { fileId: 'x' })).toBe(false);
+    expect(completeJob(db, job.id, 'w1', { fileId: 'f1', fileName: 'a.docx' })).toBe(true);
+    expect(getJob(db, job.id)).toMatchObject({
+      status: 'succeeded',
+      result: { fileId: 'f1', fileName: 'a.docx' },
+      lease_owner: null
+    });
+  });
+
+  test('should retry with exponential backoff until attempts run out', () => {
+    const job = enqueue();
+
+    claimJob(db, { workerId: 'w1' });
+    expect(failJob(db, job.id, 'w1', 'boom')).toEqual({ status: 'queued', attempts: 1, run_at: NOW + 5000 });
+
+    // backoff 전에는 점유 불가
+    expect(claimJob(db, { workerId: 'w1' })).toBeNull();
+
+    Date.now.mockReturnValue(NOW + 5000);
+    claimJob(db, { workerId: 'w1' });
+    expect(failJob(db, job.id, 'w1', 'boom')).toMatchObject({ status: 'queued', attempts: 2, run_at: NOW + 5000 + 10000 });
+
+    Date.now.mockReturnValue(NOW + 15000);
+    claimJob(db, { workerId: 'w1' });
+    expect(failJob(db, job.id, 'w1', 'boom')).toMatchObject({ status: 'failed', attempts: 3 });
+    expect(getJob(db, job.id).error).toBe('boom');
+  });
+
+  test('should fail permanently without retry when asked', () => {
+    const job = enqueue();
+    claimJob(db, { workerId: 'w1' });
+
+    expect(failJob(db, job.id, 'w1', 'NoSuchKey', { retry: false }).status).toBe('failed');
+  });
+
+  test('should release a claimed job without counting the attempt', () => {
+    const job = enqueue();
+    claimJob(db, { workerId: 'w1' });
+
+    expect(releaseJob(db, job.id, 'w1')).toBe(true);
+    expect(getJob(db, job.id)).toMatchObject({ status: 'queued', attempts: 0, lease_owner: null });
+  });
+
+  test('should recover jobs whose worker stopped sending heartbeats', () => {
+    const retried = enqueue();
+    const exhausted = enqueue('word', { maxAttempts: 1 });
+    claimJob(db, { workerId: 'dead' });
+    claimJob(db, { workerId: 'dead' });
+
+    Date.now.mockReturnValue(NOW + 59999);
+    expect(recoverExpiredJobs(db)).toEqual([]);
+
+    Date.now.mockReturnValue(NOW + 60000);
+    const recovered = recoverExpiredJobs(db);
+
+    expect(recovered).toEqual(expect.arrayContaining([
+      { id: retried.id, status: 'queued' },
+      { id: exhausted.id, status: 'failed' }
+    ]));
+    // 죽은 워커의 늦은 완료 기록은 무시
+    expect(completeJob(db, retried.id, 'dead', { fileId: 'late' })).toBe(false);
+  });
+
+  test('should prune finished jobs after the retention period', () => {
+    const done = enqueue();
+    claimJob(db, { workerId: 'w1' });
+    completeJob(db, done.id, 'w1', {});
+    const pending = enqueue();
+
+    Date.now.mockReturnValue(NOW + 1000);
+    expect(pruneFinishedJobs(db, 1000)).toBe(1);
+    expect(getJob(db, done.id)).toBeNull();
+    expect(getJob(db, pending.id)).not.toBeNull();
+  });
+
+  test('should share the prepared statement cache with other table modules', () => {
+    const Database = require('better-sqlite3');
+    const freshDb = new Database(':memory:');
+    freshDb.exec(`CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT)`);
+    const prepareSpy = jest.spyOn(freshDb, 'prepare');
+
+    expect(countQueuedJobs(freshDb)).toBe(0);
+    expect(countQueuedJobs(freshDb)).toBe(0);
+
+    expect(prepareSpy).toHaveBeenCalledTimes(1);
+    const [sql] = prepareSpy.mock.calls[0];
+    expect(cachedStatement(freshDb, sql)).toBe(prepareSpy.mock.results[0].value);
+    expect(prepareSpy).toHaveBeenCalledTimes(1);
+    freshDb.close();
+  });
+});
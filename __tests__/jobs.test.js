@@ -0,0 +1,142 @@
+const request = require('supertest');
+const express = require('express');
+const os = require('os');
+const path = require('path');
+
+// 실제 스키마로 메모리 DB 생성, 스크래치 디렉토리는 테스트 전용 임시 경로
+process.env.DB_PATH = ':memory:';
+process.env.CONVERTER_SCRATCH_DIR = path.join(os.tmpdir(), `jobs-test-${process.pid}`);
+
+jest.mock('../config/r2', () => ({
+  downloadFromR2ToFileWithHash: jest.fn(async (key, filePath) => {
+    const content = Buffer.from('%PDF-1.4\nMock PDF');
+    require('fs').writeFileSync(filePath, content);
+    return { size: content.length, sha256: 'a'.repeat(64) };
+  }),
+  uploadToR2: jest.fn(async () => ({ url: 'https://r2.example.com/converted.docx' })),
+  generateR2Path: jest.fn((name, folder) => `${folder}/1733367890456-def456${require('path').extname(name)}`),
+}));
+
+jest.mock('../utils/converterPool', () => ({
+  convert: jest.fn(async () => ({
+    success: true,
+    buffer: Buffer.from('Converted file content'),
+    format: 'docx'
+  })),
+}));
+
+const db = require('../config/db');
+const r2 = require('../config/r2');
+const { convert } = require('../utils/converterPool');
+const { claimJob, completeJob, getJob } = require('../utils/jobQueue');
+const { runConversionJob, isPermanentFailure } = require('../utils/jobRunner');
+const jobRoutes = require('../routes/jobRoutes');
+
+describe('Job Queue API Tests', () => {
+  let app;
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    db.exec('DELETE FROM jobs; DELETE FROM rate_limits');
+
+    app = express();
+    app.use(express.json());
+    app.use('/api/jobs', jobRoutes);
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  afterAll(() => {
+    require('fs').rmSync(process.env.CONVERTER_SCRATCH_DIR, { recursive: true, force: true });
+  });
+
+  describe('POST /api/jobs', () => {
+    test('should enqueue a conversion and return a status URL', async () => {
+      const response = await request(app)
+        .post('/api/jobs')
+        .send({ r2Path: 'uploads/a.pdf', format: 'word', originalName: 'a.pdf', priority: 3 });
+
+      expect(response.status).toBe(202);
+      expect(response.body).toMatchObject({ success: true, status: 'queued' });
+      expect(response.body.statusUrl).toBe(`/api/jobs/${response.body.jobId}`);
+
+      const job = getJob(db, response.body.jobId);
+      expect(job).toMatchObject({ format: 'word', priority: 3, payload: { r2Path: 'uploads/a.pdf', originalName: 'a.pdf' } });
+    });
+
+    test('should reject missing fields and unsupported formats', async () => {
+      const missing = await request(app).post('/api/jobs').send({ format: 'word' });
+      const merge = await request(app).post('/api/jobs').send({ r2Path: 'uploads/a.pdf', format: 'merge' });
+
+      expect(missing.status).toBe(400);
+      expect(merge.status).toBe(400);
+      expect(merge.body.error).toContain('지원하지 않는 형식');
+    });
+  });
+
+  describe('GET /api/jobs/:jobId', () => {
+    test('should report a queued job with a polling hint', async () => {
+      const { body } = await request(app).post('/api/jobs').send({ r2Path: 'uploads/a.pdf', format: 'word' });
+
+      const response = await request(app).get(`/api/jobs/${body.jobId}`);
+
+      expect(response.status).toBe(200);
+      expect(response.headers['retry-after']).toBe('2');
+      expect(response.body).toMatchObject({ jobId: body.jobId, status: 'queued', attempts: 0 });
+    });
+
+    test('should return the result of a finished job', async () => {
+      const { body } = await request(app).post('/api/jobs').send({ r2Path: 'uploads/a.pdf', format: 'word', originalName: 'report.pdf' });
+      const job = claimJob(db, { workerId: 'w1' });
+      const result = await runConversionJob(job);
+      completeJob(db, job.id, 'w1', result);
+
+      const response = await request(app).get(`/api/jobs/${body.jobId}`);
+
+      expect(response.body).toMatchObject({
+        status: 'succeeded',
+        fileId: result.fileId,
+        r2Path: 'converted/1733367890456-def456.docx',
+        fileName: 'report_converted.docx'
+      });
+    });
+
+    test('should return 404 for unknown jobs', async () => {
+      const response = await request(app).get('/api/jobs/unknown');
+
+      expect(response.status).toBe(404);
+    });
+  });
+
+  describe('runConversionJob', () => {
+    test('should download, convert, upload and record the file', async () => {
+      const job = {
+        id: 'job-1',
+        attempts: 1,
+        format: 'png-to-jpg',
+        payload: { r2Path: 'uploads/photo.png', originalName: 'photo.png' }
+      };
+
+      const result = await runConversionJob(job);
+
+      expect(r2.downloadFromR2ToFileWithHash).toHaveBeenCalledWith('uploads/photo.png', expect.stringMatching(/source\.png$/));
+      expect(convert).toHaveBeenCalledWith(expect.any(String), 'png-to-jpg', '#ffffff', { signal: undefined, inputHash: 'a'.repeat(64) });
+      expect(r2.uploadToR2).toHaveBeenCalledWith(result.r2Path, expect.any(Buffer), 'application/octet-stream');
+      expect(db.prepare('SELECT status FROM files WHERE file_id = ?').get(result.fileId)).toEqual({ status: 'active' });
+    });
+
+    test('should mark missing inputs as permanent failures', async () => {
+      const missing = Object.assign(new Error('The specified key does not exist.'), { name: 'NoSuchKey' });
+      r2.downloadFromR2ToFileWithHash.mockRejectedValueOnce(missing);
+
+      const job = { id: 'job-2', attempts: 1, format: 'word', payload: { r2Path: 'uploads/gone.pdf' } };
+      const error = await runConversionJob(job).catch((err) => err);
+
+      expect(isPermanentFailure(error)).toBe(true);
+      expect(isPermanentFailure(new Error('LibreOffice crashed'))).toBe(false);
+    });
+  });
+});
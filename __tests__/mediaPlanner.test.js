@@ -0,0 +1,83 @@
+const { planVideoConversion, planAudioConversion } = require('../utils/converters/mediaPlanner');
+
+const video = (codec, extra = {}) => ({ codec_type: 'video', codec_name: codec, width: 1920, height: 1080, ...extra });
+const audio = (codec, extra = {}) => ({ codec_type: 'audio', codec_name: codec, channels: 2, ...extra });
+const probe = (streams, format = {}) => ({ streams, format });
+
+describe('Media Planner Tests', () => {
+  describe('planVideoConversion', () => {
+    test('should remux H.264/AAC MP4 into MKV and MOV', () => {
+      const metadata = probe([video('h264'), audio('aac')]);
+
+      for (const format of ['mkv', 'mov', 'mp4']) {
+        const plan = planVideoConversion(metadata, format, {});
+        expect(plan).toEqual({ video: 'copy', audio: 'copy', reasons: [] });
+      }
+    });
+
+    test('should re-encode only the incompatible audio stream', () => {
+      const plan = planVideoConversion(probe([video('vp9'), audio('opus')]), 'mkv', {});
+      expect(plan.video).toBe('copy');
+
+      const mp4Plan = planVideoConversion(probe([video('h264'), audio('opus')]), 'mp4', {});
+      expect(mp4Plan.video).toBe('copy');
+      expect(mp4Plan.audio).toBe('encode');
+    });
+
+    test('should re-encode video not allowed in the container', () => {
+      const plan = planVideoConversion(probe([video('h264'), audio('opus')]), 'webm', {});
+
+      expect(plan.video).toBe('encode');
+      expect(plan.audio).toBe('copy');
+      expect(plan.reasons[0]).toContain('not allowed');
+    });
+
+    test('should respect requested codec, resolution and bitrate', () => {
+      const metadata = probe([video('h264', { bit_rate: '8000000' }), audio('aac')]);
+
+      expect(planVideoConversion(metadata, 'mp4', { codec: 'h265' }).video).toBe('encode');
+      expect(planVideoConversion(metadata, 'mp4', { resolution: '1280x720' }).video).toBe('encode');
+      expect(planVideoConversion(metadata, 'mp4', { bitrate: 5000 }).video).toBe('encode');
+      expect(planVideoConversion(metadata, 'mp4', { codec: 'h264', bitrate: 8000, resolution: '1920x1080' }).video).toBe('copy');
+    });
+
+    test('should re-encode when a bitrate cap is requested but unknown', () => {
+      const plan = planVideoConversion(probe([video('h264')], { bit_rate: '1000' }), 'mp4', { bitrate: 5000 });
+
+      expect(plan.video).toBe('encode');
+      expect(plan.audio).toBe('none');
+    });
+
+    test('should ignore attached cover art when picking the video stream', () => {
+      const metadata = probe([video('mjpeg', { disposition: { attached_pic: 1 } }), video('h264'), audio('aac')]);
+
+      expect(planVideoConversion(metadata, 'mp4', {}).video).toBe('copy');
+    });
+  });
+
+  describe('planAudioConversion', () => {
+    test('should copy AAC into M4A within the bitrate cap', () => {
+      const plan = planAudioConversion(probe([audio('aac', { bit_rate: '128000' })]), 'm4a', 192);
+
+      expect(plan).toEqual({ audio: 'copy', reasons: [] });
+    });
+
+    test('should transcode when codec, channels or bitrate do not fit', () => {
+      expect(planAudioConversion(probe([audio('flac')]), 'mp3', 192).audio).toBe('encode');
+      expect(planAudioConversion(probe([audio('aac', { channels: 6, bit_rate: '128000' })]), 'm4a', 192).audio).toBe('encode');
+      expect(planAudioConversion(probe([audio('mp3', { bit_rate: '320000' })]), 'mp3', 192).audio).toBe('encode');
+    });
+
+    test('should use the container bitrate for audio-only files', () => {
+      const plan = planAudioConversion(probe([audio('vorbis')], { bit_rate: '160000' }), 'ogg', 192);
+
+      expect(plan.audio).toBe('copy');
+    });
+
+    test('should not apply a bitrate cap to WAV', () => {
+      const plan = planAudioConversion(probe([audio('pcm_s16le', { bit_rate: '1411200' })]), 'wav', 192);
+
+      expect(plan.audio).toBe('copy');
+    });
+  });
+});
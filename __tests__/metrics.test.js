@@ -0,0 +1,105 @@
+// 메모리 DB로 config/db 대체 (conversion_metrics 스키마는 config/db.js와 동일)
+jest.mock('../config/db', () => {
+  const Database = require('better-sqlite3');
+  const db = new Database(':memory:');
+  db.exec(`
+    CREATE TABLE IF NOT EXISTS conversion_metrics (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      format TEXT NOT NULL,
+      outcome TEXT NOT NULL,
+      input_bytes INTEGER,
+      output_bytes INTEGER,
+      queue_wait_ms INTEGER,
+      run_ms INTEGER,
+      total_ms INTEGER NOT NULL,
+      peak_rss_bytes INTEGER,
+      error_code TEXT,
+      created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+  `);
+  return db;
+});
+
+const db = require('../config/db');
+const { recordConversion, flushMetrics, getPendingCount } = require('../utils/metrics');
+const { getLatencyStats, getThroughputStats } = require('../utils/dashboard');
+
+describe('Conversion Metrics Tests', () => {
+  beforeEach(() => {
+    flushMetrics();
+    db.exec('DELETE FROM conversion_metrics');
+  });
+
+  describe('recordConversion', () => {
+    test('should buffer metrics until flushed', () => {
+      recordConversion({ format: 'word', outcome: 'success', totalMs: 120 });
+
+      expect(getPendingCount()).toBe(1);
+      expect(db.prepare('SELECT COUNT(*) as count FROM conversion_metrics').get().count).toBe(0);
+
+      expect(flushMetrics()).toBe(1);
+      expect(getPendingCount()).toBe(0);
+
+      const row = db.prepare('SELECT * FROM conversion_metrics').get();
+      expect(row.format).toBe('word');
+      expect(row.outcome).toBe('success');
+      expect(row.total_ms).toBe(120);
+      expect(row.output_bytes).toBeNull();
+    });
+
+    test('should write a full batch in one flush', () => {
+      for (let i = 0; i < 100; i++) {
+        recordConversion({ format: 'excel', outcome: 'success', totalMs: i });
+      }
+
+      expect(getPendingCount()).toBe(0);
+      expect(db.prepare('SELECT COUNT(*) as count FROM conversion_metrics').get().count).toBe(100);
+    });
+  });
+
+  describe('getLatencyStats', () => {
+    test('should compute nearest-rank percentiles per format', () => {
+      for (let i = 1; i <= 100; i++) {
+        recordConversion({ format: 'word', outcome: 'success', totalMs: i, queueWaitMs: 1, runMs: i - 1 });
+      }
+      recordConversion({ format: 'word', outcome: 'timeout', totalMs: 300000 });
+      flushMetrics();
+
+      const [word] = getLatencyStats(60);
+
+      expect(word.format).toBe('word');
+      expect(word.total).toBe(101);
+      expect(word.succeeded).toBe(100);
+      expect(word.timedOut).toBe(1);
+      expect(word.latencyMs).toEqual({ p50: 50, p95: 95, p99: 99, max: 100 });
+    });
+
+    test('should filter by format', () => {
+      recordConversion({ format: 'word', outcome: 'success', totalMs: 10 });
+      recordConversion({ format: 'mp4', outcome: 'success', totalMs: 20 });
+      flushMetrics();
+
+      const stats = getLatencyStats(60, 'mp4');
+
+      expect(stats).toHaveLength(1);
+      expect(stats[0].format).toBe('mp4');
+    });
+  });
+
+  describe('getThroughputStats', () => {
+    test('should group jobs into time buckets', () => {
+      recordConversion({ format: 'word', outcome: 'success', totalMs: 10, inputBytes: 100, outputBytes: 50 });
+      recordConversion({ format: 'word', outcome: 'failed', totalMs: 10, inputBytes: 100 });
+      flushMetrics();
+
+      const [bucket] = getThroughputStats(60, 60);
+
+      expect(bucket.format).toBe('word');
+      expect(bucket.count).toBe(2);
+      expect(bucket.succeeded).toBe(1);
+      expect(bucket.failed).toBe(1);
+      expect(bucket.inputBytes).toBe(200);
+      expect(bucket.outputBytes).toBe(50);
+    });
+  });
+});
@@ -0,0 +1,78 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+// 스크래치 디렉토리를 테스트 전용 임시 경로로
+process.env.CONVERTER_SCRATCH_DIR = path.join(os.tmpdir(), `pipeline-test-${process.pid}`);
+
+jest.mock('../utils/converters/convertOfficeToPdf', () => jest.fn(async (input, format, { outputPath }) => {
+  require('fs').writeFileSync(outputPath, `%PDF-1.4 from ${format}`);
+  return outputPath;
+}));
+
+jest.mock('../utils/converters/convertPdfToImage', () => jest.fn(async (input, format) => {
+  const pdf = require('fs').readFileSync(input, 'utf8');
+  return Buffer.from(`${format} zip of [${pdf}]`);
+}));
+
+jest.mock('../utils/converters/compressPdf', () => ({
+  compressPdf: jest.fn(async () => {
+    throw new Error('gs failed');
+  }),
+}));
+
+const { isPipelineFormat, runPipeline } = require('../utils/converters/pipeline');
+const convertOfficeToPdf = require('../utils/converters/convertOfficeToPdf');
+const convertToImage = require('../utils/converters/convertPdfToImage');
+
+describe('Pipeline Tests', () => {
+  beforeEach(() => {
+    jest.clearAllMocks();
+  });
+
+  afterAll(() => {
+    fs.rmSync(process.env.CONVERTER_SCRATCH_DIR, { recursive: true, force: true });
+  });
+
+  test('should recognize pipeline formats only', () => {
+    expect(isPipelineFormat('word2jpg')).toBe(true);
+    expect(isPipelineFormat('ppt2pdf-compress')).toBe(true);
+    expect(isPipelineFormat('word2pdf')).toBe(false);
+    expect(isPipelineFormat('toString')).toBe(false);
+  });
+
+  test('should pass the intermediate PDF as a scratch path', async () => {
+    const { result, steps } = await runPipeline('word2jpg', '/uploads/source.docx');
+
+    const [, , { outputPath }] = convertOfficeToPdf.mock.calls[0];
+    expect(convertOfficeToPdf).toHaveBeenCalledWith('/uploads/source.docx', 'word', expect.any(Object));
+    expect(outputPath.startsWith(process.env.CONVERTER_SCRATCH_DIR)).toBe(true);
+    expect(convertToImage).toHaveBeenCalledWith(outputPath, 'jpg', { deadlineAt: undefined });
+
+    expect(result.toString()).toBe('jpg zip of [%PDF-1.4 from word]');
+    expect(steps.map((step) => step.format)).toEqual(['word2pdf', 'jpg']);
+    expect(steps[0].bytes).toBe('%PDF-1.4 from word'.length);
+
+    // 중간 결과는 스크래치 디렉토리와 함께 정리됨
+    expect(fs.existsSync(outputPath)).toBe(false);
+  });
+
+  test('should pass the task deadline to the image step', async () => {
+    const deadlineAt = Date.now() + 60_000;
+
+    await runPipeline('ppt2png', '/uploads/slides.pptx', { deadlineAt });
+
+    expect(convertToImage).toHaveBeenCalledWith(expect.any(String), 'png', { deadlineAt });
+  });
+
+  test('should clean up intermediates when a step fails', async () => {
+    await expect(runPipeline('excel2pdf-compress', Buffer.from('xlsx'), { quality: 'low' })).rejects.toThrow('gs failed');
+
+    const [, , { outputPath }] = convertOfficeToPdf.mock.calls[0];
+    expect(fs.existsSync(path.dirname(outputPath))).toBe(false);
+  });
+
+  test('should reject unknown pipelines', async () => {
+    await expect(runPipeline('word2gif', '/tmp/x.docx')).rejects.toThrow('지원하지 않는 파이프라인');
+  });
+});
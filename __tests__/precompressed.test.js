@@ -0,0 +1,113 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const zlib = require('zlib');
+const request = require('supertest');
+const express = require('express');
+const compression = require('compression');
+const { buildIndex, selectEncoding, servePrecompressed } = require('../utils/precompressed');
+
+describe('Precompressed Static Assets Tests', () => {
+  let rootDir;
+  let app;
+  const css = 'body { color: red; }\n'.repeat(100);
+
+  beforeAll(() => {
+    rootDir = fs.mkdtempSync(path.join(os.tmpdir(), 'precompressed-test-'));
+    fs.mkdirSync(path.join(rootDir, 'admin'));
+    fs.writeFileSync(path.join(rootDir, 'styles.css'), css);
+    fs.writeFileSync(path.join(rootDir, 'styles.css.gz'), zlib.gzipSync(css));
+    fs.writeFileSync(path.join(rootDir, 'styles.css.br'), zlib.brotliCompressSync(css));
+    fs.writeFileSync(path.join(rootDir, 'index.html'), '<html></html>');
+    fs.writeFileSync(path.join(rootDir, 'index.html.gz'), zlib.gzipSync('<html></html>'));
+    fs.writeFileSync(path.join(rootDir, 'admin', 'script.js'), 'console.log(1);');
+
+    // 빌드 후 원본만 수정된 경우: 형제 파일이 더 오래됨
+    const past = new Date(Date.now() - 60_000);
+    fs.utimesSync(path.join(rootDir, 'index.html.gz'), past, past);
+
+    app = express();
+    app.use(compression({ threshold: 0 }));
+    app.use(servePrecompressed(rootDir));
+    app.use(express.static(rootDir));
+  });
+
+  afterAll(() => {
+    fs.rmSync(rootDir, { recursive: true, force: true });
+  });
+
+  test('should index only fresh siblings', () => {
+    const index = buildIndex(rootDir);
+    expect([...index.keys()]).toEqual(['/styles.css']);
+    expect(Object.keys(index.get('/styles.css')).sort()).toEqual(['br', 'gzip']);
+  });
+
+  test('should prefer br and honor q values', () => {
+    const variants = { br: 'a.br', gzip: 'a.gz' };
+    expect(selectEncoding('gzip, deflate, br', variants)).toBe('br');
+    expect(selectEncoding('gzip, br;q=0.5', variants)).toBe('gzip');
+    expect(selectEncoding('br;q=0, gzip', variants)).toBe('gzip');
+    expect(selectEncoding('*', variants)).toBe('br');
+    expect(selectEncoding('identity', variants)).toBeNull();
+    expect(selectEncoding(undefined, variants)).toBeNull();
+  });
+
+  test('should serve brotli sibling with original content type', async () => {
+    const res = await request(app)
+      .get('/styles.css')
+      .set('Accept-Encoding', 'gzip, br')
+      .buffer(true)
+      .parse((response, callback) => {
+        const chunks = [];
+        response.on('data', (chunk) => chunks.push(chunk));
+        response.on('end', () => callback(null, Buffer.concat(chunks)));
+      });
+
+    expect(res.status).toBe(200);
+    expect(res.headers['content-encoding']).toBe('br');
+    expect(res.headers['content-type']).toMatch(/text\/css/);
+    expect(res.headers['vary']).toMatch(/Accept-Encoding/);
+    expect(zlib.brotliDecompressSync(res.body).toString()).toBe(css);
+  });
+
+  test('should serve gzip sibling without recompressing', async () => {
+    const res = await request(app).get('/styles.css').set('Accept-Encoding', 'gzip');
+
+    expect(res.headers['content-encoding']).toBe('gzip');
+    expect(Number(res.headers['content-length'])).toBe(fs.statSync(path.join(rootDir, 'styles.css.gz')).size);
+    expect(res.text).toBe(css);
+  });
+
+  test('should fall back to static files when no sibling is usable', async () => {
+    const plain = await request(app).get('/styles.css').set('Accept-Encoding', 'identity');
+    expect(plain.headers['content-encoding']).toBeUndefined();
+    expect(plain.text).toBe(css);
+
+    // 오래된 형제 파일은 무시하고 원본 전송
+    const stale = await request(app).get('/').set('Accept-Encoding', 'gzip');
+    expect(stale.text).toBe('<html></html>');
+
+    const missing = await request(app).get('/admin/script.js').set('Accept-Encoding', 'gzip');
+    expect(missing.status).toBe(200);
+  });
+
+  test('should warn in production when no siblings were built', () => {
+    const emptyDir = fs.mkdtempSync(path.join(os.tmpdir(), 'precompressed-empty-'));
+    const originalEnv = process.env.NODE_ENV;
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    const warn = jest.spyOn(console, 'warn').mockImplementation(() => {});
+
+    try {
+      process.env.NODE_ENV = 'production';
+      servePrecompressed(emptyDir);
+      servePrecompressed(rootDir);
+    } finally {
+      process.env.NODE_ENV = originalEnv;
+      jest.restoreAllMocks();
+      fs.rmSync(emptyDir, { recursive: true, force: true });
+    }
+
+    expect(warn).toHaveBeenCalledTimes(1);
+    expect(warn.mock.calls[0][0]).toContain('npm run build');
+  });
+});
@@ -0,0 +1,195 @@
+const fs = require('fs');
+const { spawn } = require('child_process');
+const { EventEmitter } = require('events');
+
+// SIGTERM 무시 프로세스의 SIGKILL 승격을 빠르게 확인하기 위해 유예 시간 단축
+process.env.SUPERVISOR_KILL_GRACE_MS = '200';
+
+const supervisor = require('../utils/processSupervisor');
+
+const describeLinux = process.platform === 'linux' ? describe : describe.skip;
+
+const closed = (child) => new Promise((resolve) => {
+  child.once('close', (code, signal) => resolve({ code, signal }));
+});
+
+const firstLine = (child) => new Promise((resolve) => {
+  child.stdout.once('data', (chunk) => resolve(chunk.toString().trim()));
+});
+
+// 종료 후 init이 회수하기 전의 좀비 상태도 "종료됨"으로 취급
+const isAlive = (pid) => {
+  try {
+    const stat = fs.readFileSync(`/proc/${pid}/stat`, 'utf8');
+    return stat.slice(stat.lastIndexOf(')') + 2, stat.lastIndexOf(')') + 3) !== 'Z';
+  } catch (error) {
+    return false;
+  }
+};
+
+const waitUntil = async (predicate, timeoutMs = 2000) => {
+  const deadline = Date.now() + timeoutMs;
+  while (!predicate()) {
+    if (Date.now() > deadline) throw new Error('waitUntil timed out');
+    await new Promise((resolve) => setTimeout(resolve, 20));
+  }
+};
+
+describeLinux('Process Supervisor Tests', () => {
+  beforeAll(() => {
+    supervisor.attachRegistry(supervisor.createRegistryBuffer());
+  });
+
+  beforeEach(() => {
+    jest.spyOn(console, 'warn').mockImplementation(() => {});
+    supervisor.setCurrentTask(0);
+  });
+
+  afterEach(() => {
+    supervisor.reapAll();
+    jest.restoreAllMocks();
+  });
+
+  describe('registry', () => {
+    test('should register a group while it runs and release it on close', async () => {
+      const before = supervisor.getSupervisorStats();
+      const child = supervisor.spawnSupervised('sleep', ['0.2'], { label: 'sleep' });
+
+      expect(supervisor.getSupervisorStats()).toMatchObject({
+        liveGroups: before.liveGroups + 1,
+        spawned: before.spawned + 1
+      });
+
+      expect(await closed(child)).toEqual({ code: 0, signal: null });
+      expect(supervisor.getSupervisorStats().liveGroups).toBe(before.liveGroups);
+      expect(child.usage).toEqual(expect.objectContaining({ durationMs: expect.any(Number) }));
+      expect(supervisor.getTaskUsage().processes).toBe(1);
+    });
+
+    test('should kill helpers left in the group after the leader exits', async () => {
+      const child = supervisor.spawnSupervised('sh', ['-c', 'sleep 30 & echo $!'], {
+        stdio: ['ignore', 'pipe', 'ignore']
+      });
+      const helperPid = parseInt(await firstLine(child), 10);
+
+      await closed(child);
+      await waitUntil(() => !isAlive(helperPid));
+    });
+  });
+
+  describe('reaping', () => {
+    test('should kill every group of a task, grandchildren included', async () => {
+      supervisor.setCurrentTask(7);
+      const child = supervisor.spawnSupervised('sh', ['-c', 'sleep 30 & echo $!; wait'], {
+        stdio: ['ignore', 'pipe', 'ignore']
+      });
+      const grandchildPid = parseInt(await firstLine(child), 10);
+      const before = supervisor.getSupervisorStats();
+
+      expect(supervisor.reapTask(8)).toBe(0);
+      expect(supervisor.reapTask(7)).toBe(1);
+
+      expect(await closed(child)).toEqual({ code: null, signal: 'SIGKILL' });
+      await waitUntil(() => !isAlive(grandchildPid));
+      expect(supervisor.getSupervisorStats()).toMatchObject({
+        liveGroups: before.liveGroups - 1,
+        reaped: before.reaped + 1
+      });
+    });
+
+    test('should kill all registered groups on shutdown', async () => {
+      supervisor.setCurrentTask(1);
+      const first = supervisor.spawnSupervised('sleep', ['30']);
+      supervisor.setCurrentTask(2);
+      const second = supervisor.spawnSupervised('sleep', ['30']);
+
+      expect(supervisor.reapAll()).toBe(2);
+
+      const results = await Promise.all([closed(first), closed(second)]);
+      expect(results.map((result) => result.signal)).toEqual(['SIGKILL', 'SIGKILL']);
+      expect(supervisor.getSupervisorStats().liveGroups).toBe(0);
+    });
+  });
+
+  describe('termination', () => {
+    test('should stop a group with SIGTERM on timeout', async () => {
+      const before = supervisor.getSupervisorStats();
+      const child = supervisor.spawnSupervised('sleep', ['30'], { timeoutMs: 50 });
+
+      expect(await closed(child)).toEqual({ code: null, signal: 'SIGTERM' });
+      expect(child.killReason).toBe('timeout');
+      expect(supervisor.getSupervisorStats().timedOut).toBe(before.timedOut + 1);
+    });
+
+    test('should escalate to SIGKILL when SIGTERM is ignored', async () => {
+      const child = supervisor.spawnSupervised('sh', ['-c', 'trap "" TERM; sleep 30'], { timeoutMs: 50 });
+      const startedAt = Date.now();
+
+      expect(await closed(child)).toEqual({ code: null, signal: 'SIGKILL' });
+      expect(child.killReason).toBe('timeout');
+      expect(Date.now() - startedAt).toBeGreaterThanOrEqual(200);
+    });
+
+    test('should stop a group when the abort signal fires', async () => {
+      const controller = new AbortController();
+      const child = supervisor.spawnSupervised('sleep', ['30'], { signal: controller.signal });
+
+      controller.abort();
+
+      expect((await closed(child)).signal).toBe('SIGTERM');
+      expect(child.killReason).toBe('aborted');
+    });
+  });
+
+  describe('ffmpeg', () => {
+    // fluent-ffmpeg 명령 객체 대역: 'start' 시점에 ffmpegProc이 설정됨
+    const fakeCommand = (proc) => {
+      const command = new EventEmitter();
+      command.ffmpegProc = proc;
+      return command;
+    };
+
+    test('should track the ffmpeg pid once the command starts', async () => {
+      supervisor.setCurrentTask(11);
+      const proc = spawn('sleep', ['30']);
+      const command = supervisor.superviseFfmpeg(fakeCommand(proc), { label: 'ffmpeg' });
+      const before = supervisor.getSupervisorStats();
+
+      command.emit('start');
+
+      expect(supervisor.getSupervisorStats().liveGroups).toBe(before.liveGroups + 1);
+      expect(supervisor.getLiveUsage()).toEqual([
+        expect.objectContaining({ label: 'ffmpeg', target: -proc.pid })
+      ]);
+
+      // 단일 PID로 등록되어 있으므로 작업 정리 시 해당 프로세스만 종료
+      expect(supervisor.reapTask(11)).toBe(1);
+      expect((await closed(proc)).signal).toBe('SIGKILL');
+
+      command.emit('error', new Error('ffmpeg was killed with signal SIGKILL'));
+      expect(supervisor.getSupervisorStats().liveGroups).toBe(before.liveGroups);
+      expect(supervisor.getLiveUsage()).toEqual([]);
+    });
+
+    test('should kill ffmpeg on timeout', async () => {
+      const proc = spawn('sleep', ['30']);
+      const command = supervisor.superviseFfmpeg(fakeCommand(proc), { timeoutMs: 50 });
+
+      command.emit('start');
+
+      expect((await closed(proc)).signal).toBe('SIGTERM');
+      expect(proc.killReason).toBe('timeout');
+      command.emit('end');
+    });
+
+    test('should ignore commands that never start', () => {
+      const before = supervisor.getSupervisorStats();
+      const command = supervisor.superviseFfmpeg(fakeCommand(undefined));
+
+      command.emit('start');
+      command.emit('end');
+
+      expect(supervisor.getSupervisorStats().liveGroups).toBe(before.liveGroups);
+    });
+  });
+});
@@ -0,0 +1,86 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+function loadProfiler(env) {
+  const saved = { ...process.env };
+  Object.assign(process.env, env);
+  let profiler;
+  jest.isolateModules(() => {
+    profiler = require('../utils/profiler');
+  });
+  process.env = saved;
+  return profiler;
+}
+
+describe('Profiler Tests', () => {
+  let dir;
+
+  beforeEach(() => {
+    dir = fs.mkdtempSync(path.join(os.tmpdir(), 'profiler-test-'));
+  });
+
+  afterEach(() => {
+    fs.rmSync(dir, { recursive: true, force: true });
+  });
+
+  describe('shouldProfile', () => {
+    test('should be disabled by default', () => {
+      const profiler = loadProfiler({ PROFILE_SAMPLE_RATE: '0', PROFILE_FORMATS: '' });
+
+      expect(profiler.isEnabled()).toBe(false);
+      expect(profiler.shouldProfile('word', () => 0)).toBe(false);
+    });
+
+    test('should always profile listed formats', () => {
+      const profiler = loadProfiler({ PROFILE_SAMPLE_RATE: '0', PROFILE_FORMATS: 'word, excel' });
+
+      expect(profiler.shouldProfile('excel', () => 0.99)).toBe(true);
+      expect(profiler.shouldProfile('ppt', () => 0)).toBe(false);
+    });
+
+    test('should sample 1-in-N jobs', () => {
+      const profiler = loadProfiler({ PROFILE_SAMPLE_RATE: '10', PROFILE_FORMATS: '' });
+
+      expect(profiler.shouldProfile('ppt', () => 0.05)).toBe(true);
+      expect(profiler.shouldProfile('ppt', () => 0.5)).toBe(false);
+    });
+  });
+
+  describe('rotateProfiles', () => {
+    function writeJob(id, bytes, mtime) {
+      for (const suffix of ['.cpuprofile', '.json']) {
+        const file = path.join(dir, `${id}${suffix}`);
+        fs.writeFileSync(file, Buffer.alloc(bytes));
+        fs.utimesSync(file, mtime, mtime);
+      }
+    }
+
+    test('should remove oldest jobs first when over the size limit', async () => {
+      const profiler = loadProfiler({});
+      writeJob('1000-word-a', 400, 1000);
+      writeJob('2000-word-b', 400, 2000);
+      writeJob('3000-word-c', 400, 3000);
+
+      const removed = await profiler.rotateProfiles(dir, { maxBytes: 1700, maxFiles: 100 });
+
+      expect(removed).toBe(2);
+      expect(fs.readdirSync(dir).sort()).toEqual([
+        '2000-word-b.cpuprofile',
+        '2000-word-b.json',
+        '3000-word-c.cpuprofile',
+        '3000-word-c.json'
+      ]);
+    });
+
+    test('should keep all files when within limits', async () => {
+      const profiler = loadProfiler({});
+      writeJob('1000-word-a', 10, 1000);
+
+      const removed = await profiler.rotateProfiles(dir, { maxBytes: 1024, maxFiles: 10 });
+
+      expect(removed).toBe(0);
+      expect(fs.readdirSync(dir)).toHaveLength(2);
+    });
+  });
+});
@@ -0,0 +1,189 @@
+// 클러스터 모드처럼 여러 연결이 같은 DB 파일을 공유하도록 임시 파일 사용
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+const tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'rate-limit-'));
+process.env.DB_PATH = path.join(tmpDir, 'test.db');
+
+const Database = require('better-sqlite3');
+const db = require('../config/db');
+const { RATE_LIMIT_BUSY_TIMEOUT_MS, SqliteRateLimitStore, pruneRateLimits } = require('../utils/rateLimitStore');
+
+const WINDOW_MS = 15 * 60 * 1000;
+
+const createStore = (prefix, database = db) => {
+  const store = new SqliteRateLimitStore({ prefix, db: database });
+  store.init({ windowMs: WINDOW_MS });
+  return store;
+};
+
+describe('SQLite Rate Limit Store Tests', () => {
+  let otherProcessDb;
+
+  beforeAll(() => {
+    // 다른 워커 프로세스의 연결
+    otherProcessDb = new Database(process.env.DB_PATH, { timeout: 5000 });
+  });
+
+  beforeEach(() => {
+    jest.spyOn(Date, 'now').mockReturnValue(1_000_000);
+    db.exec('DELETE FROM rate_limits');
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  afterAll(() => {
+    otherProcessDb.close();
+    db.close();
+    fs.rmSync(tmpDir, { recursive: true, force: true });
+  });
+
+  test('should count hits within the window', async () => {
+    const store = createStore('general');
+
+    await store.increment('1.2.3.4');
+    const result = await store.increment('1.2.3.4');
+
+    expect(result.totalHits).toBe(2);
+    expect(result.resetTime.getTime()).toBe(1_000_000 + WINDOW_MS);
+    expect(await store.get('1.2.3.4')).toEqual(result);
+  });
+
+  test('should restart the count after the window ends', async () => {
+    const store = createStore('general');
+    await store.increment('1.2.3.4');
+    await store.increment('1.2.3.4');
+
+    Date.now.mockReturnValue(1_000_000 + WINDOW_MS);
+    expect(await store.get('1.2.3.4')).toBeUndefined();
+
+    const result = await store.increment('1.2.3.4');
+    expect(result.totalHits).toBe(1);
+    expect(result.resetTime.getTime()).toBe(1_000_000 + 2 * WINDOW_MS);
+  });
+
+  test('should share counts between connections to the same file', async () => {
+    const workerA = createStore('login');
+    const workerB = createStore('login', otherProcessDb);
+
+    await workerA.increment('1.2.3.4');
+    await workerB.increment('1.2.3.4');
+    const result = await workerA.increment('1.2.3.4');
+
+    expect(result.totalHits).toBe(3);
+    expect((await workerB.get('1.2.3.4')).totalHits).toBe(3);
+  });
+
+  test('should keep limiters separate by prefix', async () => {
+    const login = createStore('login');
+    const upload = createStore('upload');
+
+    await login.increment('1.2.3.4');
+    await login.increment('1.2.3.4');
+    await upload.increment('1.2.3.4');
+
+    expect((await login.get('1.2.3.4')).totalHits).toBe(2);
+    expect((await upload.get('1.2.3.4')).totalHits).toBe(1);
+
+    await login.resetAll();
+    expect(await login.get('1.2.3.4')).toBeUndefined();
+    expect((await upload.get('1.2.3.4')).totalHits).toBe(1);
+  });
+
+  test('should decrement and reset a key', async () => {
+    const store = createStore('general');
+    await store.increment('1.2.3.4');
+    await store.increment('1.2.3.4');
+
+    await store.decrement('1.2.3.4');
+    expect((await store.get('1.2.3.4')).totalHits).toBe(1);
+
+    await store.resetKey('1.2.3.4');
+    expect(await store.get('1.2.3.4')).toBeUndefined();
+  });
+
+  test('should prune only expired rows', async () => {
+    const store = createStore('general');
+    await store.increment('old');
+    Date.now.mockReturnValue(1_000_000 + WINDOW_MS / 2);
+    await store.increment('new');
+
+    Date.now.mockReturnValue(1_000_000 + WINDOW_MS);
+    expect(pruneRateLimits(db)).toBe(1);
+    expect(await store.get('old')).toBeUndefined();
+    expect((await store.get('new')).totalHits).toBe(1);
+  });
+
+  test('should open its own connection with a short busy timeout', async () => {
+    const store = new SqliteRateLimitStore({ prefix: 'general' });
+    store.init({ windowMs: WINDOW_MS });
+
+    await store.increment('1.2.3.4');
+
+    expect(store.db).not.toBe(db);
+    expect(store.db.pragma('busy_timeout', { simple: true })).toBe(RATE_LIMIT_BUSY_TIMEOUT_MS);
+    expect((await createStore('general').get('1.2.3.4')).totalHits).toBe(1);
+    store.db.close();
+  });
+
+  test('should let requests through when the write lock is busy', async () => {
+    jest.spyOn(console, 'warn').mockImplementation(() => {});
+    const busyDb = new Database(process.env.DB_PATH, { timeout: 10 });
+    const store = createStore('general', busyDb);
+
+    // 다른 프로세스가 쓰기 잠금을 잡고 있는 상태
+    otherProcessDb.exec('BEGIN IMMEDIATE');
+    try {
+      const result = await store.increment('1.2.3.4');
+
+      expect(result.totalHits).toBe(0);
+      expect(result.resetTime.getTime()).toBe(1_000_000 + WINDOW_MS);
+      expect(console.warn).toHaveBeenCalledWith(expect.stringContaining('SQLITE_BUSY'));
+    } finally {
+      otherProcessDb.exec('ROLLBACK');
+    }
+
+    expect((await store.increment('1.2.3.4')).totalHits).toBe(1);
+    busyDb.close();
+  });
+});
+
+describe('Rate Limiter Store Selection Tests', () => {
+  const cluster = require('cluster');
+
+  const constructedStores = () => {
+    let prefixes;
+    jest.isolateModules(() => {
+      const SqliteRateLimitStore = jest.fn().mockImplementation(({ prefix }) => ({
+        prefix,
+        localKeys: false,
+        init: jest.fn(),
+        get: jest.fn(),
+        increment: jest.fn(),
+        decrement: jest.fn(),
+        resetKey: jest.fn()
+      }));
+      jest.doMock('../utils/rateLimitStore', () => ({ SqliteRateLimitStore }));
+      require('../config/rateLimiter');
+      prefixes = SqliteRateLimitStore.mock.calls.map(([options]) => options.prefix);
+    });
+    return prefixes;
+  };
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  test('should keep the default memory store in a single process', () => {
+    expect(constructedStores()).toEqual([]);
+  });
+
+  test('should share counters through SQLite in cluster workers', () => {
+    jest.replaceProperty(cluster, 'isWorker', true);
+
+    expect(constructedStores()).toEqual(['login', 'general', 'upload', 'admin', 'job-poll']);
+  });
+});
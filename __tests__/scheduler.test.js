@@ -0,0 +1,133 @@
+// 실제 스키마로 메모리 DB 생성
+process.env.DB_PATH = ':memory:';
+
+jest.mock('../config/r2', () => {
+  const actual = jest.requireActual('../config/r2');
+  return {
+    ...actual,
+    deleteManyFromR2: jest.fn(),
+  };
+});
+
+const db = require('../config/db');
+const r2 = require('../config/r2');
+const { cleanupExpiredFiles } = require('../utils/scheduler');
+
+const insertFile = (fileId, r2Path, expiresIn = '-1 minutes') => {
+  db.prepare(`
+    INSERT INTO files (file_id, r2_path, file_type, expires_at)
+    VALUES (?, ?, 'converted', datetime('now', ?))
+  `).run(fileId, r2Path, expiresIn);
+};
+
+const statusOf = (fileId) => db.prepare('SELECT status, deleted_at FROM files WHERE file_id = ?').get(fileId);
+
+describe('Scheduler Tests', () => {
+  beforeEach(() => {
+    jest.clearAllMocks();
+    db.exec('DELETE FROM files');
+  });
+
+  describe('cleanupExpiredFiles', () => {
+    test('should delete expired files in one batch and mark per-key failures', async () => {
+      insertFile('a', 'converted/a.docx');
+      insertFile('b', 'converted/b.docx');
+      insertFile('c', 'converted/c.docx');
+      insertFile('fresh', 'converted/fresh.docx', '+10 minutes');
+
+      r2.deleteManyFromR2.mockImplementation(async (keys, { onBatch }) => {
+        const result = {
+          deleted: keys.filter((key) => key !== 'converted/b.docx'),
+          errors: [{ key: 'converted/b.docx', code: 'AccessDenied', message: 'denied' }],
+          retry: [],
+        };
+        await onBatch(result);
+        return result;
+      });
+
+      const result = await cleanupExpiredFiles();
+
+      expect(r2.deleteManyFromR2).toHaveBeenCalledTimes(1);
+      expect(r2.deleteManyFromR2.mock.calls[0][0].sort()).toEqual([
+        'converted/a.docx',
+        'converted/b.docx',
+        'converted/c.docx',
+      ]);
+      expect(result).toEqual({ deleted: 2, failed: 1 });
+      expect(statusOf('a').status).toBe('deleted');
+      expect(statusOf('a').deleted_at).not.toBeNull();
+      expect(statusOf('b').status).toBe('failed');
+      expect(statusOf('c').status).toBe('deleted');
+      expect(statusOf('fresh').status).toBe('active');
+    });
+
+    test('should leave files active when the batch request fails', async () => {
+      insertFile('a', 'converted/a.docx');
+      insertFile('b', 'converted/b.docx');
+
+      jest.spyOn(console, 'error').mockImplementation(() => {});
+      jest.spyOn(console, 'warn').mockImplementation(() => {});
+      const { deleteManyFromR2, r2Client } = jest.requireActual('../config/r2');
+      jest.spyOn(r2Client, 'send').mockImplementation(async () => {
+        throw new Error('socket hang up');
+      });
+      r2.deleteManyFromR2.mockImplementation(deleteManyFromR2);
+
+      const result = await cleanupExpiredFiles();
+      jest.restoreAllMocks();
+
+      expect(result).toEqual({ deleted: 0, failed: 0 });
+      expect(statusOf('a').status).toBe('active');
+      expect(statusOf('b').status).toBe('active');
+    });
+
+    test('should skip R2 when nothing is expired', async () => {
+      insertFile('fresh', 'converted/fresh.docx', '+10 minutes');
+
+      const result = await cleanupExpiredFiles();
+
+      expect(r2.deleteManyFromR2).not.toHaveBeenCalled();
+      expect(result).toEqual({ deleted: 0, failed: 0 });
+    });
+  });
+
+  describe('deleteManyFromR2', () => {
+    const { deleteManyFromR2, r2Client } = jest.requireActual('../config/r2');
+
+    afterEach(() => {
+      jest.restoreAllMocks();
+    });
+
+    test('should split keys into batches of 1000', async () => {
+      const send = jest.spyOn(r2Client, 'send').mockImplementation(async () => ({ Errors: [] }));
+      const keys = Array.from({ length: 2500 }, (_, i) => `converted/${i}.pdf`);
+
+      const result = await deleteManyFromR2(keys, { concurrency: 2 });
+
+      expect(send).toHaveBeenCalledTimes(3);
+      const batchSizes = send.mock.calls.map(([command]) => command.input.Delete.Objects.length);
+      expect(batchSizes.sort()).toEqual([1000, 1000, 500]);
+      expect(result.deleted).toHaveLength(2500);
+      expect(result.errors).toHaveLength(0);
+      expect(result.retry).toHaveLength(0);
+    });
+
+    test('should report key errors and failed requests', async () => {
+      jest.spyOn(r2Client, 'send')
+        .mockImplementationOnce(async () => ({
+          Errors: [{ Key: 'converted/0.pdf', Code: 'InternalError', Message: 'retry' }],
+        }))
+        .mockImplementationOnce(async () => {
+          throw new Error('socket hang up');
+        });
+      const keys = Array.from({ length: 1001 }, (_, i) => `converted/${i}.pdf`);
+
+      const result = await deleteManyFromR2(keys, { concurrency: 1 });
+
+      expect(result.deleted).toHaveLength(999);
+      expect(result.errors).toEqual([{ key: 'converted/0.pdf', code: 'InternalError', message: 'retry' }]);
+      // 요청 실패는 키별 실패가 아니라 재시도 대상
+      expect(result.retry).toEqual(['converted/1000.pdf']);
+    });
+  });
+});
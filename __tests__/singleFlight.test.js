@@ -0,0 +1,123 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { SingleFlight, stableStringify, hashInput } = require('../utils/singleFlight');
+
+function deferred() {
+  let resolve;
+  let reject;
+  const promise = new Promise((res, rej) => {
+    resolve = res;
+    reject = rej;
+  });
+  return { promise, resolve, reject };
+}
+
+describe('Single Flight Tests', () => {
+  let flights;
+
+  beforeEach(() => {
+    flights = new SingleFlight();
+  });
+
+  test('should share one execution between concurrent callers', async () => {
+    const job = deferred();
+    const fn = jest.fn(() => job.promise);
+
+    const first = flights.do('key', fn);
+    const second = flights.do('key', fn);
+    job.resolve('result');
+
+    await expect(Promise.all([first, second])).resolves.toEqual(['result', 'result']);
+    expect(fn).toHaveBeenCalledTimes(1);
+    expect(flights.getStats()).toEqual({ inFlight: 0, leaders: 1, coalesced: 1, cancelled: 0 });
+  });
+
+  test('should fan out errors to every waiter', async () => {
+    const job = deferred();
+    const first = flights.do('key', () => job.promise);
+    const second = flights.do('key', () => job.promise);
+    job.reject(new Error('boom'));
+
+    await expect(first).rejects.toThrow('boom');
+    await expect(second).rejects.toThrow('boom');
+  });
+
+  test('should run again after the previous flight finishes', async () => {
+    const fn = jest.fn(async () => 'done');
+
+    await flights.do('key', fn);
+    await flights.do('key', fn);
+
+    expect(fn).toHaveBeenCalledTimes(2);
+  });
+
+  test('should keep running while at least one waiter remains', async () => {
+    const job = deferred();
+    let jobSignal;
+    const leaving = new AbortController();
+
+    const first = flights.do('key', (signal) => {
+      jobSignal = signal;
+      return job.promise;
+    }, { signal: leaving.signal });
+    const second = flights.do('key', () => job.promise);
+
+    leaving.abort();
+    await expect(first).rejects.toMatchObject({ name: 'AbortError' });
+    expect(jobSignal.aborted).toBe(false);
+
+    job.resolve('result');
+    await expect(second).resolves.toBe('result');
+  });
+
+  test('should cancel the job when every waiter disconnects', async () => {
+    let jobSignal;
+    const a = new AbortController();
+    const b = new AbortController();
+    const fn = (signal) => {
+      jobSignal = signal;
+      return new Promise(() => {});
+    };
+
+    const first = flights.do('key', fn, { signal: a.signal });
+    const second = flights.do('key', fn, { signal: b.signal });
+    await Promise.resolve();
+
+    a.abort();
+    b.abort();
+
+    await expect(first).rejects.toMatchObject({ name: 'AbortError' });
+    await expect(second).rejects.toMatchObject({ name: 'AbortError' });
+    expect(jobSignal.aborted).toBe(true);
+    expect(flights.getStats()).toMatchObject({ inFlight: 0, cancelled: 1 });
+  });
+
+  describe('key helpers', () => {
+    test('should stringify options independent of key order', () => {
+      expect(stableStringify({ b: 1, a: { d: 2, c: 3 } })).toBe(stableStringify({ a: { c: 3, d: 2 }, b: 1 }));
+      expect(stableStringify({ a: 1, b: undefined })).toBe(stableStringify({ a: 1 }));
+    });
+
+    test('should hash file paths and buffers by content', async () => {
+      const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'single-flight-test-'));
+      const filePath = path.join(dir, 'input.pdf');
+      fs.writeFileSync(filePath, 'same content');
+
+      try {
+        expect(await hashInput(filePath)).toBe(await hashInput(Buffer.from('same content')));
+        expect(await hashInput(filePath)).not.toBe(await hashInput(Buffer.from('other content')));
+      } finally {
+        fs.rmSync(dir, { recursive: true, force: true });
+      }
+    });
+
+    test('should match the upload/download digest for a single input', async () => {
+      const content = Buffer.from('same content');
+      const digest = require('crypto').createHash('sha256').update(content).digest('hex');
+
+      expect(await hashInput(content)).toBe(digest);
+      expect(await hashInput([Buffer.from('ab'), Buffer.from('c')])).not.toBe(await hashInput([Buffer.from('a'), Buffer.from('bc')]));
+    });
+  });
+});
@@ -1,30 +1,25 @@
 const request = require('supertest');
 const express = require('express');
-const multer = require('multer');
 
-// Mock R2
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+// 스크래치 디렉토리를 테스트 전용 임시 경로로
+process.env.CONVERTER_SCRATCH_DIR = path.join(os.tmpdir(), `upload-test-${process.pid}`);
+
+// Mock R2 (스크래치 파일이 남아 있는 동안 내용 확인)
 jest.mock('../config/r2', () => ({
-  uploadToR2: jest.fn(async () => ({ url: 'https://r2.example.com/file.pdf' })),
+  uploadFileToR2: jest.fn(async (key, filePath) => {
+    require('fs').accessSync(filePath);
+    return { url: 'https://r2.example.com/file.pdf' };
+  }),
   generateR2Path: jest.fn((name, folder) => `${folder}/1733367890123-abc123.pdf`),
   downloadFromR2: jest.fn(),
   deleteFromR2: jest.fn(),
 }));
 
-// Mock upload middleware
-jest.mock('../middlewares/upload', () => {
-  const multer = require('multer');
-  return multer({
-    storage: multer.memoryStorage(),
-    fileFilter: (req, file, cb) => {
-      if (file.mimetype === 'application/pdf') {
-        cb(null, true);
-      } else {
-        cb(new Error('PDF only'), false);
-      }
-    },
-    limits: { fileSize: 50 * 1024 * 1024 }
-  });
-});
+const PDF_BYTES = Buffer.from('%PDF-1.4\n%fake pdf');
 
 describe('Upload Routes Tests', () => {
   let app;
@@ -41,11 +36,15 @@ describe('Upload Routes Tests', () => {
     app.use('/api/upload', uploadRoutes);
   });
 
+  afterAll(() => {
+    fs.rmSync(process.env.CONVERTER_SCRATCH_DIR, { recursive: true, force: true });
+  });
+
   describe('POST /api/upload', () => {
     test('should upload PDF file successfully', async () => {
       const response = await request(app)
         .post('/api/upload')
-        .attach('file', Buffer.from('%PDF-1.4\n%fake pdf'), 'test.pdf');
+        .attach('file', PDF_BYTES, 'test.pdf');
 
       expect(response.status).toBe(200);
       expect(response.body.success).toBe(true);
@@ -71,34 +70,51 @@ describe('Upload Routes Tests', () => {
 
       const response = await request(app)
         .post('/api/upload')
-        .attach('file', Buffer.from('%PDF-1.4\n%fake pdf'), 'document.pdf');
+        .attach('file', PDF_BYTES, 'document.pdf');
 
       expect(response.status).toBe(200);
       expect(mockR2.generateR2Path).toHaveBeenCalledWith('document.pdf', 'uploads');
     });
 
-    test('should call uploadToR2 with correct parameters', async () => {
+    test('should call uploadFileToR2 with the scratch file path', async () => {
       const mockR2 = require('../config/r2');
-      mockR2.uploadToR2.mockClear();
+      mockR2.uploadFileToR2.mockClear();
 
       const response = await request(app)
         .post('/api/upload')
-        .attach('file', Buffer.from('%PDF-1.4\n%fake pdf'), 'test.pdf');
+        .attach('file', PDF_BYTES, 'test.pdf');
 
       expect(response.status).toBe(200);
-      expect(mockR2.uploadToR2).toHaveBeenCalled();
-      const [path, buffer, contentType] = mockR2.uploadToR2.mock.calls[0];
-      expect(path).toContain('.pdf');
+      expect(mockR2.uploadFileToR2).toHaveBeenCalled();
+      const [r2Path, filePath, contentType] = mockR2.uploadFileToR2.mock.calls[0];
+      expect(r2Path).toContain('.pdf');
+      expect(filePath.startsWith(process.env.CONVERTER_SCRATCH_DIR)).toBe(true);
       expect(contentType).toBe('application/pdf');
     });
 
+    test('should return sha256 and remove the scratch file afterwards', async () => {
+      const mockR2 = require('../config/r2');
+      mockR2.uploadFileToR2.mockClear();
+
+      const response = await request(app)
+        .post('/api/upload')
+        .attach('file', PDF_BYTES, 'test.pdf');
+
+      const expected = require('crypto').createHash('sha256').update(PDF_BYTES).digest('hex');
+      expect(response.body.sha256).toBe(expected);
+      expect(response.body.size).toBe(PDF_BYTES.length);
+
+      const [, filePath] = mockR2.uploadFileToR2.mock.calls[0];
+      expect(fs.existsSync(path.dirname(filePath))).toBe(false);
+    });
+
     test('should handle upload errors gracefully', async () => {
       const mockR2 = require('../config/r2');
-      mockR2.uploadToR2.mockRejectedValueOnce(new Error('R2 upload failed'));
+      mockR2.uploadFileToR2.mockRejectedValueOnce(new Error('R2 upload failed'));
 
       const response = await request(app)
         .post('/api/upload')
-        .attach('file', Buffer.from('%PDF-1.4\n%fake pdf'), 'test.pdf');
+        .attach('file', PDF_BYTES, 'test.pdf');
 
       expect(response.status).toBe(500);
       expect(response.body.success).toBe(false);
@@ -106,6 +122,38 @@ describe('Upload Routes Tests', () => {
     });
   });
 
+  describe('File Type Validation', () => {
+    test('should reject files whose content does not match the declared type', async () => {
+      const response = await request(app)
+        .post('/api/upload')
+        .attach('file', Buffer.from('PK\x03\x04not really a pdf'), 'fake.pdf');
+
+      expect(response.status).toBe(400);
+      expect(response.body.success).toBe(false);
+      expect(response.body.error).toContain('일치하지 않습니다');
+    });
+
+    test('should reject unsupported MIME types', async () => {
+      const response = await request(app)
+        .post('/api/upload')
+        .attach('file', Buffer.from('hello'), 'notes.txt');
+
+      expect(response.status).toBe(400);
+      expect(response.body.error).toContain('지원하지 않는');
+    });
+
+    test('should detect common signatures', () => {
+      const { detectFileType } = require('../middlewares/upload');
+
+      expect(detectFileType(PDF_BYTES)).toBe('pdf');
+      expect(detectFileType(Buffer.from([0xFF, 0xD8, 0xFF, 0xE0]))).toBe('jpeg');
+      expect(detectFileType(Buffer.from('\0\0\0\x18ftypheic\0\0\0\0', 'latin1'))).toBe('heif');
+      expect(detectFileType(Buffer.from('\0\0\0\x18ftypisom\0\0\0\0', 'latin1'))).toBe('mp4');
+      expect(detectFileType(Buffer.from('RIFF\0\0\0\0WAVEfmt ', 'latin1'))).toBe('wav');
+      expect(detectFileType(Buffer.from('plain text'))).toBeNull();
+    });
+  });
+
   describe('File Size Validation', () => {
     test('should accept files under 50MB', async () => {
       const smallBuffer = Buffer.alloc(1024 * 1024); // 1MB
@@ -122,7 +170,7 @@ describe('Upload Routes Tests', () => {
     test('successful response should have correct structure', async () => {
       const response = await request(app)
         .post('/api/upload')
-        .attach('file', Buffer.from('%PDF-1.4\n%fake pdf'), 'test.pdf');
+        .attach('file', PDF_BYTES, 'test.pdf');
 
       if (response.body.success) {
         expect(response.body).toHaveProperty('fileName');
@@ -134,11 +182,11 @@ describe('Upload Routes Tests', () => {
 
     test('error response should have correct structure', async () => {
       const mockR2 = require('../config/r2');
-      mockR2.uploadToR2.mockRejectedValueOnce(new Error('Upload error'));
+      mockR2.uploadFileToR2.mockRejectedValueOnce(new Error('Upload error'));
 
       const response = await request(app)
         .post('/api/upload')
-        .attach('file', Buffer.from('%PDF-1.4\n%fake pdf'), 'test.pdf');
+        .attach('file', PDF_BYTES, 'test.pdf');
 
       expect(response.body).toHaveProperty('success', false);
       expect(response.body).toHaveProperty('error');
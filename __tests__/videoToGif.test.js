@@ -0,0 +1,76 @@
+const { planGif, buildGifFilter } = require('../utils/converters/convertVideoToGif');
+
+describe('Video to GIF Tests', () => {
+  describe('planGif', () => {
+    test('should keep the requested clip when within budget', () => {
+      const plan = planGif({ width: 640, height: 360, duration: 60 }, { startTime: 5, duration: 4, fps: 10 });
+
+      expect(plan).toMatchObject({ startTime: 5, duration: 4, fps: 10, width: 640, height: 360, frames: 40 });
+    });
+
+    test('should clamp duration to the rest of the source', () => {
+      const plan = planGif({ width: 640, height: 360, duration: 8 }, { startTime: 5, duration: 10, fps: 10 });
+
+      expect(plan.duration).toBe(3);
+      expect(plan.frames).toBe(30);
+    });
+
+    test('should lower fps when over the frame limit', () => {
+      const plan = planGif({ width: 640, height: 360, duration: null }, { duration: 60, fps: 30 }, { maxFrames: 120 });
+
+      expect(plan.fps).toBe(2);
+      expect(plan.frames).toBe(120);
+    });
+
+    test('should scale down to stay within the pixel budget', () => {
+      const budget = { pixels: 10 * 1000 * 1000, maxFrames: 300 };
+      const plan = planGif({ width: 1920, height: 1080, duration: null }, { duration: 10, fps: 10 }, budget);
+
+      expect(plan.totalPixels).toBeLessThanOrEqual(budget.pixels);
+      expect(plan.width / plan.height).toBeCloseTo(16 / 9, 1);
+    });
+  });
+
+  describe('planGif validation and aspect ratio', () => {
+    test('should reject a start time past the end of the source', () => {
+      const source = { width: 640, height: 360, duration: 8 };
+
+      expect(() => planGif(source, { startTime: 8 })).toThrow(expect.objectContaining({ code: 'INVALID_CONVERSION_OPTIONS' }));
+      expect(() => planGif(source, { startTime: 20 })).toThrow('영상 길이');
+    });
+
+    test('should keep the ratio of very wide videos', () => {
+      const plan = planGif({ width: 4000, height: 100, duration: null }, { duration: 10, fps: 10 });
+
+      expect(plan.width).toBe(1024);
+      expect(plan.height).toBe(24);
+      expect(plan.totalPixels).toBeLessThanOrEqual(60 * 1000 * 1000);
+    });
+
+    test('should scale small videos up to the minimum size without distortion', () => {
+      const plan = planGif({ width: 40, height: 20, duration: null }, { duration: 1, fps: 10 });
+
+      expect(plan).toMatchObject({ width: 128, height: 64 });
+    });
+
+    test('should stay within a tiny pixel budget', () => {
+      const budget = { pixels: 100 * 1000, maxFrames: 300 };
+      const plan = planGif({ width: 4000, height: 100, duration: null }, { duration: 10, fps: 10 }, budget);
+
+      expect(plan.totalPixels).toBeLessThanOrEqual(budget.pixels);
+      expect(plan.frames).toBe(plan.totalPixels / (plan.width * plan.height));
+    });
+  });
+
+  describe('buildGifFilter', () => {
+    test('should build palette and GIF from a single split graph', () => {
+      const filter = buildGifFilter({ fps: 10, width: 320, height: 180 }, { colors: 64, dither: 'bayer' });
+
+      expect(filter).toBe(
+        'fps=10,scale=320:180:flags=lanczos,split[s0][s1];' +
+        '[s0]palettegen=max_colors=64:stats_mode=diff[p];' +
+        '[s1][p]paletteuse=dither=bayer'
+      );
+    });
+  });
+});
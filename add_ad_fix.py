@@ -2,7 +2,15 @@ import os
 from pathlib import Path
 
 # 프로젝트 루트 경로
-BASE_DIR = Path(r"C:\Users\yj437\OneDrive\Desktop\coding_windows\convert-for-you\public")
+BASE_DIR = Path(__file__).resolve().parent / "public"
+
+AD_FIX_LINK = '  <link rel="stylesheet" href="ad-fix.css">\n'
+
+def add_ad_fix_link(content):
+    """</head> 직전에 ad-fix.css 링크 삽입 (이미 있거나 </head>가 없으면 그대로 반환)"""
+    if 'ad-fix.css' in content or '</head>' not in content:
+        return content
+    return content.replace('</head>', AD_FIX_LINK + '</head>')
 
 def add_ad_fix_css(filepath):
     """HTML 파일의 </head> 태그 직전에 ad-fix.css 추가"""
@@ -23,8 +31,7 @@ def add_ad_fix_css(filepath):
             return False
         
         # </head> 직전에 ad-fix CSS 추가
-        ad_fix_link = '  <link rel="stylesheet" href="ad-fix.css">\n</head>'
-        updated_content = content.replace('</head>', ad_fix_link)
+        updated_content = add_ad_fix_link(content)
         
         # 파일 저장
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -3,7 +3,7 @@ import re
 from pathlib import Path
 
 # 프로젝트 루트 경로
-BASE_DIR = Path(r"C:\Users\yj437\OneDrive\Desktop\coding_windows\convert-for-you\public")
+BASE_DIR = Path(__file__).resolve().parent / "public"
 
 # 광고 스크립트 코드
 AD_SCRIPTS = '''  <!-- Ad Scripts -->
@@ -13,6 +13,12 @@ AD_SCRIPTS = '''  <!-- Ad Scripts -->
   <script type="text/javascript" src="https://pl28277656.effectivegatecpm.com/8a/99/68/8a99687f130453b6e902566e42317ecf.js"></script>
 '''
 
+def add_ad_script_tags(content):
+    """</body> 직전에 광고 스크립트 삽입 (이미 있거나 </body>가 없으면 그대로 반환)"""
+    if 'effectivegatecpm.com' in content or '</body>' not in content:
+        return content
+    return content.replace('</body>', f'{AD_SCRIPTS}</body>')
+
 def add_ad_scripts(filepath):
     """HTML 파일의 </body> 태그 직전에 광고 스크립트 추가"""
     filename = os.path.basename(filepath)
@@ -32,7 +38,7 @@ def add_ad_scripts(filepath):
             return False
         
         # </body> 직전에 광고 스크립트 추가
-        updated_content = content.replace('</body>', f'{AD_SCRIPTS}</body>')
+        updated_content = add_ad_script_tags(content)
         
         # 파일 저장
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -16,6 +16,51 @@ EZOIC_SCRIPTS = '''<script async src="//www.ezojs.com/ezoic/sa.min.js"></script>
 
 ALL_SCRIPTS = GATEKEEPER_SCRIPTS + EZOIC_SCRIPTS
 
+def apply_gatekeeper_scripts(content):
+    """기존 Gatekeeper/Ezoic 스크립트를 제거하고 <head> 바로 다음에 다시 추가 (<head>가 없으면 None)"""
+    # 기존 Gatekeeper 스크립트 제거 (여러 패턴 처리)
+    content = re.sub(
+        r'<script\s+data-cfasync="false"\s+src="https://cmp\.gatekeeperconsent\.com/min\.js"></script>\s*\n?',
+        '',
+        content,
+        flags=re.IGNORECASE
+    )
+    content = re.sub(
+        r'<script\s+data-cfasync="false"\s+src="https://the\.gatekeeperconsent\.com/cmp\.min\.js"></script>\s*\n?',
+        '',
+        content,
+        flags=re.IGNORECASE
+    )
+    
+    # 기존 Ezoic 스크립트 제거
+    content = re.sub(
+        r'<script\s+async\s+src="//www\.ezojs\.com/ezoic/sa\.min\.js"></script>\s*\n?',
+        '',
+        content,
+        flags=re.IGNORECASE
+    )
+    content = re.sub(
+        r'<script>\s*window\.ezstandalone\s*=\s*window\.ezstandalone\s*\|\|\s*{};\s*ezstandalone\.cmd\s*=\s*ezstandalone\.cmd\s*\|\|\s*\[\];\s*</script>\s*\n?',
+        '',
+        content,
+        flags=re.IGNORECASE | re.DOTALL
+    )
+    
+    # <head> 태그 찾기
+    pattern = r'(<head[^>]*>)'
+    
+    if not re.search(pattern, content, re.IGNORECASE):
+        return None
+    
+    # <head> 바로 다음에 스크립트 추가 (뒤따르는 공백을 정리해 여러 번 실행해도 결과가 같도록)
+    return re.sub(
+        pattern + r'\s*',
+        r'\1\n' + ALL_SCRIPTS + '\n',
+        content,
+        count=1,
+        flags=re.IGNORECASE
+    )
+
 def clean_and_add_scripts(file_path):
     """HTML 파일에서 기존 스크립트를 제거하고 새로 추가합니다."""
     try:
@@ -23,51 +68,12 @@ def clean_and_add_scripts(file_path):
             content = f.read()
         
         original_content = content
+        new_content = apply_gatekeeper_scripts(content)
         
-        # 기존 Gatekeeper 스크립트 제거 (여러 패턴 처리)
-        content = re.sub(
-            r'<script\s+data-cfasync="false"\s+src="https://cmp\.gatekeeperconsent\.com/min\.js"></script>\s*\n?',
-            '',
-            content,
-            flags=re.IGNORECASE
-        )
-        content = re.sub(
-            r'<script\s+data-cfasync="false"\s+src="https://the\.gatekeeperconsent\.com/cmp\.min\.js"></script>\s*\n?',
-            '',
-            content,
-            flags=re.IGNORECASE
-        )
-        
-        # 기존 Ezoic 스크립트 제거
-        content = re.sub(
-            r'<script\s+async\s+src="//www\.ezojs\.com/ezoic/sa\.min\.js"></script>\s*\n?',
-            '',
-            content,
-            flags=re.IGNORECASE
-        )
-        content = re.sub(
-            r'<script>\s*window\.ezstandalone\s*=\s*window\.ezstandalone\s*\|\|\s*{};\s*ezstandalone\.cmd\s*=\s*ezstandalone\.cmd\s*\|\|\s*\[\];\s*</script>\s*\n?',
-            '',
-            content,
-            flags=re.IGNORECASE | re.DOTALL
-        )
-        
-        # <head> 태그 찾기
-        pattern = r'(<head[^>]*>)'
-        
-        if not re.search(pattern, content, re.IGNORECASE):
+        if new_content is None:
             print(f"⚠️  {file_path.name} - <head> 태그를 찾을 수 없습니다")
             return False
         
-        # <head> 바로 다음에 스크립트 추가
-        new_content = re.sub(
-            pattern,
-            r'\1\n' + ALL_SCRIPTS,
-            content,
-            count=1,
-            flags=re.IGNORECASE
-        )
-        
         # 변경사항이 있는지 확인
         if new_content == original_content:
             print(f"⏭️  {file_path.name} - 이미 최신 상태입니다")
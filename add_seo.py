@@ -3,7 +3,7 @@ import re
 from pathlib import Path
 
 # 프로젝트 루트 경로
-BASE_DIR = Path(r"C:\Users\yj437\OneDrive\Desktop\coding_windows\convert-for-you\public")
+BASE_DIR = Path(__file__).resolve().parent / "public"
 
 # 각 페이지에 맞는 SEO 메타데이터 정의
 SEO_DATA = {
@@ -252,6 +252,21 @@ def create_seo_head(filename):
   <script defer src="https://cdn.jsdelivr.net/npm/alpinejs@3.x.x/dist/cdn.min.js"></script>
 </head>'''
 
+def apply_seo(content, filename):
+    """head를 SEO 최적화된 버전으로 교체 (SEO 데이터가 없는 파일은 그대로 반환)"""
+    new_head = create_seo_head(filename)
+    if not new_head:
+        return content
+    
+    # 기존 head 교체 (치환 문자열의 역슬래시가 그룹 참조로 해석되지 않도록 함수 사용)
+    updated_content = re.sub(r'<head>.*?</head>', lambda _: new_head, content, flags=re.DOTALL)
+    
+    # "PDF Converter" 브랜드명을 "Convert4U"로 교체 (navbar에서)
+    return updated_content.replace(
+        '<a class="navbar-brand fw-bold text-primary" href="/">PDF Converter</a>',
+        '<a class="navbar-brand fw-bold text-primary" href="/">Convert4U</a>'
+    )
+
 def update_html_file(filepath):
     """HTML 파일의 head 섹션을 SEO 최적화된 버전으로 교체"""
     filename = os.path.basename(filepath)
@@ -265,23 +280,7 @@ def update_html_file(filepath):
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # 기존 head 태그 패턴 찾기
-        head_pattern = r'<head>.*?</head>'
-        
-        # 새로운 SEO head 생성
-        new_head = create_seo_head(filename)
-        
-        if not new_head:
-            return False
-        
-        # head 교체
-        updated_content = re.sub(head_pattern, new_head, content, flags=re.DOTALL)
-        
-        # "PDF Converter" 브랜드명을 "Convert4U"로 교체 (navbar에서)
-        updated_content = updated_content.replace(
-            '<a class="navbar-brand fw-bold text-primary" href="/">PDF Converter</a>',
-            '<a class="navbar-brand fw-bold text-primary" href="/">Convert4U</a>'
-        )
+        updated_content = apply_seo(content, filename)
         
         # 파일 저장
         with open(filepath, 'w', encoding='utf-8') as f:
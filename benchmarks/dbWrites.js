@@ -0,0 +1,160 @@
+/**
+ * ================================
+ * ⏱️ files 테이블 쓰기/만료 스캔 벤치마크
+ * ================================
+ * 동시 변환 N개가 각각 INSERT → 상태 변경을 하는 상황에서
+ * - legacy: 호출마다 db.prepare + 개별 트랜잭션 (기존 구현)
+ * - batched: 캐시된 statement + FileWriteBatcher (틱당 트랜잭션 1개)
+ * 를 비교하고, 만료 스캔을 부분 인덱스 / 기존 단일 컬럼 인덱스로 각각 측정
+ *
+ * 사용법:
+ *   node benchmarks/dbWrites.js [--concurrency 64] [--rounds 50] [--rows 200000]
+ *   임시 디렉토리에 실제 스키마(config/db.js)로 DB 파일을 만들어 사용
+ */
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+function parseArgs(argv) {
+  const args = { concurrency: 64, rounds: 50, rows: 200000 };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i].startsWith('--')) {
+      args[argv[i].slice(2)] = Number(argv[++i]);
+    }
+  }
+  return args;
+}
+
+// 기존 구현과 동일한 쓰기 (호출마다 prepare, 쓰기마다 트랜잭션)
+function legacyInsert(db, fileData) {
+  const insert = db.transaction(() => db.prepare(`
+    INSERT INTO files (file_id, r2_path, file_type, expires_at, status)
+    VALUES (?, ?, ?, ?, ?)
+  `).run(fileData.fileId, fileData.r2Path, fileData.fileType, fileData.expiresAt, 'active'));
+  return insert();
+}
+
+function legacyUpdateStatus(db, fileId, status) {
+  const update = db.transaction(() => db.prepare(`
+    UPDATE files SET status = ? WHERE file_id = ?
+  `).run(status, fileId));
+  return update();
+}
+
+/**
+ * 동시 변환 시뮬레이션: 라운드마다 concurrency개 작업이 동시에 INSERT → 상태 변경
+ * @returns {number} 경과 시간 (ms)
+ */
+async function simulate(label, { concurrency, rounds }, write) {
+  const startedAt = process.hrtime.bigint();
+  for (let round = 0; round < rounds; round++) {
+    await Promise.all(Array.from({ length: concurrency }, async (_, i) => {
+      const fileId = `${label}-${round}-${i}`;
+      await write.insert({
+        fileId,
+        r2Path: `converted/${fileId}.docx`,
+        fileType: 'converted',
+        expiresAt: '2000-01-01 00:00:00'
+      });
+      // R2 업로드 대기 자리
+      await new Promise((resolve) => setImmediate(resolve));
+      await write.updateStatus(fileId, 'deleted');
+    }));
+  }
+  return Number(process.hrtime.bigint() - startedAt) / 1e6;
+}
+
+/**
+ * 만료 스캔 시간 측정 (중앙값)
+ * @returns {{ ms: number, plan: string }}
+ */
+function timeExpiredScan(db, getExpiredFileKeys, runs = 20) {
+  const timings = [];
+  for (let i = 0; i < runs; i++) {
+    const startedAt = process.hrtime.bigint();
+    getExpiredFileKeys(db, 50);
+    timings.push(Number(process.hrtime.bigint() - startedAt) / 1e6);
+  }
+  timings.sort((a, b) => a - b);
+
+  const plan = db.prepare(`
+    EXPLAIN QUERY PLAN
+    SELECT file_id, r2_path FROM files
+    WHERE status = 'active' AND expires_at <= datetime('now')
+    ORDER BY expires_at LIMIT 50
+  `).all().map((step) => step.detail).join(' / ');
+  return { ms: timings[Math.floor(runs / 2)], plan };
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+  const workDir = fs.mkdtempSync(path.join(os.tmpdir(), 'db-bench-'));
+  process.env.DB_PATH = path.join(workDir, 'bench.db');
+
+  const db = require('../config/db');
+  const {
+    getFileWriteBatcher,
+    getExpiredFileKeys,
+    insertFileMetadata,
+    updateFileStatus
+  } = require('../utils/dbTransaction');
+
+  try {
+    const writes = args.concurrency * args.rounds * 2;
+    console.log(`📝 동시 ${args.concurrency}개 × ${args.rounds}라운드 (쓰기 ${writes}회)`);
+
+    const legacyMs = await simulate('legacy', args, {
+      insert: async (fileData) => legacyInsert(db, fileData),
+      updateStatus: async (fileId, status) => legacyUpdateStatus(db, fileId, status)
+    });
+
+    const batcher = getFileWriteBatcher(db);
+    const batchedMs = await simulate('batched', args, {
+      insert: (fileData) => batcher.insert(fileData),
+      updateStatus: (fileId, status) => batcher.updateStatus(fileId, status)
+    });
+
+    console.log(`  legacy   ${legacyMs.toFixed(0).padStart(8)}ms  (트랜잭션 ${writes}회)`);
+    console.log(`  batched  ${batchedMs.toFixed(0).padStart(8)}ms  (트랜잭션 ${batcher.stats.batches}회)`);
+    console.log(`⚡ ${(legacyMs / batchedMs).toFixed(2)}x`);
+
+    console.log(`\n🔍 만료 스캔 (${args.rows}행, active 10%)`);
+    db.exec('DELETE FROM files');
+    db.transaction(() => {
+      for (let i = 0; i < args.rows; i++) {
+        const fileId = `scan-${i}`;
+        const minute = String(i % 60).padStart(2, '0');
+        insertFileMetadata(db, {
+          fileId,
+          r2Path: `converted/${fileId}.docx`,
+          fileType: 'converted',
+          expiresAt: `2000-01-01 00:${minute}:00`
+        });
+        if (i % 10 !== 0) {
+          updateFileStatus(db, fileId, 'deleted');
+        }
+      }
+    })();
+    db.exec('ANALYZE');
+
+    const partial = timeExpiredScan(db, getExpiredFileKeys);
+
+    // 기존 스키마의 단일 컬럼 인덱스로 되돌려 비교
+    db.exec(`
+      DROP INDEX idx_files_active_expires_covering;
+      CREATE INDEX idx_status ON files(status);
+      CREATE INDEX idx_expires_at ON files(expires_at);
+      ANALYZE;
+    `);
+    const legacyIndexes = timeExpiredScan(db, getExpiredFileKeys);
+
+    console.log(`  부분 인덱스    ${partial.ms.toFixed(3).padStart(9)}ms  ${partial.plan}`);
+    console.log(`  단일 인덱스    ${legacyIndexes.ms.toFixed(3).padStart(9)}ms  ${legacyIndexes.plan}`);
+  } finally {
+    db.close();
+    fs.rmSync(workDir, { recursive: true, force: true });
+  }
+}
+
+main();
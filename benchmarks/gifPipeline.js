@@ -0,0 +1,148 @@
+/**
+ * ================================
+ * ⏱️ 비디오 → GIF 파이프라인 벤치마크
+ * ================================
+ * 기존 2-패스(팔레트 생성 → 팔레트 적용)와 단일 패스 파이프라인 비교
+ * - ffmpeg -benchmark 출력(utime/stime/rtime/maxrss)을 파싱해 CPU/메모리 비교
+ *
+ * 사용법:
+ *   node benchmarks/gifPipeline.js [입력 비디오] [--runs 3] [--start 5] [--duration 10] [--fps 10]
+ *   입력을 생략하면 1080p 30초 테스트 영상을 생성해서 사용
+ */
+
+const { spawnSync } = require('child_process');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const ffmpegPath = require('@ffmpeg-installer/ffmpeg').path;
+const { planGif, buildGifFilter } = require('../utils/converters/convertVideoToGif');
+
+function parseArgs(argv) {
+  const args = { input: null, runs: 3, start: 5, duration: 10, fps: 10 };
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i];
+    if (arg.startsWith('--')) {
+      args[arg.slice(2)] = Number(argv[++i]);
+    } else {
+      args.input = arg;
+    }
+  }
+  return args;
+}
+
+/**
+ * ffmpeg 실행 후 -benchmark 결과 파싱
+ * @returns {{ wallMs: number, cpuMs: number, maxRssKb: number }}
+ */
+function runFfmpeg(args) {
+  const startedAt = process.hrtime.bigint();
+  const result = spawnSync(ffmpegPath, ['-hide_banner', '-benchmark', '-y', ...args], { encoding: 'utf8' });
+  const wallMs = Number(process.hrtime.bigint() - startedAt) / 1e6;
+
+  if (result.status !== 0) {
+    throw new Error(`ffmpeg 실패 (${result.status}): ${result.stderr.split('\n').slice(-5).join('\n')}`);
+  }
+
+  const bench = /bench: utime=([\d.]+)s stime=([\d.]+)s rtime=([\d.]+)s/.exec(result.stderr);
+  const rss = /bench: maxrss=(\d+)(?:KiB|kB)/.exec(result.stderr);
+  return {
+    wallMs,
+    cpuMs: bench ? (Number(bench[1]) + Number(bench[2])) * 1000 : NaN,
+    maxRssKb: rss ? Number(rss[1]) : NaN
+  };
+}
+
+function sumRuns(runs) {
+  return runs.reduce((total, run) => ({
+    wallMs: total.wallMs + run.wallMs,
+    cpuMs: total.cpuMs + run.cpuMs,
+    maxRssKb: Math.max(total.maxRssKb, run.maxRssKb)
+  }), { wallMs: 0, cpuMs: 0, maxRssKb: 0 });
+}
+
+// 기존 구현과 동일한 명령 (1차: 팔레트 그래프 전체 실행, 2차: 다시 디코딩해 팔레트 적용)
+function legacyTwoPass(input, workDir, { start, duration, fps }) {
+  const palettePath = path.join(workDir, 'palette.png');
+  const outputPath = path.join(workDir, 'legacy.gif');
+  const scale = "scale='min(iw\\,1024)':min'(ih\\,1024)':force_original_aspect_ratio=decrease";
+
+  const first = runFfmpeg([
+    '-ss', String(start), '-i', input, '-t', String(duration), '-r', String(fps),
+    '-vf', `${scale},split[s0][s1];[s0]palettegen=max_colors=128[p];[s1][p]paletteuse=dither=floyd_steinberg`,
+    '-update', '1', palettePath
+  ]);
+  const second = runFfmpeg([
+    '-ss', String(start), '-i', input, '-i', palettePath, '-t', String(duration), '-r', String(fps),
+    '-filter_complex', `[0:v]${scale}[v];[v][1:v]paletteuse=dither=floyd_steinberg`,
+    '-loop', '0', outputPath
+  ]);
+
+  return { ...sumRuns([first, second]), bytes: fs.statSync(outputPath).size };
+}
+
+function singlePass(input, workDir, { start, duration, fps }) {
+  const outputPath = path.join(workDir, 'single.gif');
+  const probe = spawnSync(ffmpegPath, ['-hide_banner', '-i', input], { encoding: 'utf8' }).stderr;
+  const size = /, (\d{2,5})x(\d{2,5})[, ]/.exec(probe);
+  const source = { width: size ? Number(size[1]) : 1920, height: size ? Number(size[2]) : 1080, duration: null };
+  const plan = planGif(source, { startTime: start, duration, fps });
+
+  const run = runFfmpeg([
+    '-ss', String(plan.startTime), '-t', String(plan.duration), '-i', input, '-an',
+    '-filter_complex', buildGifFilter(plan, { colors: 128, dither: 'floyd_steinberg' }),
+    '-loop', '0', outputPath
+  ]);
+
+  return { ...run, bytes: fs.statSync(outputPath).size };
+}
+
+function format(label, result) {
+  return [
+    label.padEnd(12),
+    `${result.wallMs.toFixed(0).padStart(8)}ms`,
+    `${result.cpuMs.toFixed(0).padStart(8)}ms`,
+    `${(result.maxRssKb / 1024).toFixed(1).padStart(8)}MB`,
+    `${(result.bytes / 1024).toFixed(0).padStart(8)}KB`
+  ].join(' ');
+}
+
+function main() {
+  const args = parseArgs(process.argv.slice(2));
+  const workDir = fs.mkdtempSync(path.join(os.tmpdir(), 'gif-bench-'));
+
+  try {
+    let input = args.input;
+    if (!input) {
+      input = path.join(workDir, 'testsrc.mp4');
+      console.log('🎥 테스트 영상 생성 중 (1080p, 30초)...');
+      runFfmpeg(['-f', 'lavfi', '-i', 'testsrc2=size=1920x1080:rate=30:duration=30',
+        '-c:v', 'libx264', '-preset', 'veryfast', '-pix_fmt', 'yuv420p', input]);
+    }
+
+    const results = { legacy: [], single: [] };
+    for (let i = 0; i < args.runs; i++) {
+      results.legacy.push(legacyTwoPass(input, workDir, args));
+      results.single.push(singlePass(input, workDir, args));
+    }
+
+    const average = (runs) => ({
+      wallMs: runs.reduce((t, r) => t + r.wallMs, 0) / runs.length,
+      cpuMs: runs.reduce((t, r) => t + r.cpuMs, 0) / runs.length,
+      maxRssKb: Math.max(...runs.map((r) => r.maxRssKb)),
+      bytes: runs[runs.length - 1].bytes
+    });
+
+    const legacy = average(results.legacy);
+    const single = average(results.single);
+
+    console.log(`\n📊 ${args.runs}회 평균 (start=${args.start}s, duration=${args.duration}s, fps=${args.fps})`);
+    console.log(`${''.padEnd(12)} ${'wall'.padStart(10)} ${'cpu'.padStart(10)} ${'maxrss'.padStart(10)} ${'size'.padStart(10)}`);
+    console.log(format('2-pass', legacy));
+    console.log(format('single-pass', single));
+    console.log(`\n⚡ wall ${(legacy.wallMs / single.wallMs).toFixed(2)}x, cpu ${(legacy.cpuMs / single.cpuMs).toFixed(2)}x`);
+  } finally {
+    fs.rmSync(workDir, { recursive: true, force: true });
+  }
+}
+
+main();
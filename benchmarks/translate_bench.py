@@ -0,0 +1,95 @@
+"""
+================================
+⏱️ 번역 치환 엔진 벤치마크
+================================
+translate_to_english.py의 기존 방식(항목별 str.replace 반복)과
+단일 스캔 트라이 정규식(compile_translations)을 public/*.html 전체로 비교
+- 파일은 수정하지 않음 (메모리에서만 치환)
+- 두 방식의 결과가 다른 파일 수도 출력 (접두사가 겹치는 항목의 순서 의존 결과)
+
+사용법:
+    python3 benchmarks/translate_bench.py [--runs 5] [--scale 1]
+    --scale N: 사전을 N배로 늘려(가짜 항목 추가) 사전 크기에 따른 비용 비교
+"""
+
+import argparse
+import importlib.util
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+PUBLIC_DIR = ROOT_DIR / "public"
+
+
+def load_translator():
+    spec = importlib.util.spec_from_file_location("translate_to_english", ROOT_DIR / "translate_to_english.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def sequential_replace(translations, text):
+    """기존 방식: 사전 순서대로 문서 전체를 항목마다 치환"""
+    for korean, english in translations.items():
+        text = text.replace(korean, english)
+    return text
+
+
+def measure(fn, documents, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        for document in documents:
+            fn(document)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="번역 치환 엔진 벤치마크")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scale", type=int, default=1, help="사전 크기 배수 (가짜 항목 추가)")
+    args = parser.parse_args()
+
+    module = load_translator()
+    translations = dict(module.TRANSLATIONS)
+    # 실제 문서에는 없는 항목을 추가해 사전 크기만 키움 (매칭 결과는 동일)
+    for copy in range(1, args.scale):
+        for korean, english in module.TRANSLATIONS.items():
+            translations[f"{korean}#{copy}"] = english
+
+    documents = [path.read_text(encoding="utf-8") for path in sorted(PUBLIC_DIR.glob("*.html"))]
+    if not documents:
+        print(f"❌ HTML 파일이 없습니다: {PUBLIC_DIR}", file=sys.stderr)
+        return 1
+    total_kb = sum(len(doc.encode("utf-8")) for doc in documents) / 1024
+
+    started = time.perf_counter()
+    translate = module.compile_translations(translations)
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    print(f"📄 문서 {len(documents)}개 ({total_kb:,.0f}KB), 사전 {len(translations)}개 항목, {args.runs}회 반복\n")
+    seq_median, seq_best = measure(lambda doc: sequential_replace(translations, doc), documents, args.runs)
+    one_median, one_best = measure(translate, documents, args.runs)
+
+    print(f"{'방식':<28}{'중앙값(ms)':>12}{'최소(ms)':>12}")
+    print(f"{'항목별 str.replace':<28}{seq_median:>12.1f}{seq_best:>12.1f}")
+    print(f"{'단일 스캔 (트라이 정규식)':<28}{one_median:>12.1f}{one_best:>12.1f}")
+    print(f"\n⚙️  정규식 컴파일: {compile_ms:.1f}ms (프로세스당 1회)")
+    print(f"🚀 속도 비: {seq_median / one_median:.2f}x")
+
+    differing = [
+        path.name
+        for path, doc in zip(sorted(PUBLIC_DIR.glob("*.html")), documents)
+        if sequential_replace(translations, doc) != translate(doc)
+    ]
+    print(f"🔍 결과가 다른 파일: {len(differing)}개 (짧은 항목이 긴 항목을 먼저 깨뜨린 경우)")
+    for name in differing:
+        print(f"   - {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
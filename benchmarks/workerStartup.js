@@ -0,0 +1,129 @@
+/**
+ * ================================
+ * ⏱️ 변환 워커 스레드 시작 비용 벤치마크
+ * ================================
+ * converter.task.js를 읽는 워커 스레드의 생성 시간과 스레드당 메모리 비교
+ * - eager: 모든 변환 모듈을 시작 시 require (지연 로딩 이전 동작)
+ * - lazy: converter.task.js만 require (변환 모듈은 첫 사용 시 로드)
+ * - lazy+jpg-to-png: lazy 후 이미지 변환 모듈 하나만 로드한 상태
+ *
+ * 스레드당 RSS는 스레드 N개를 띄운 상태의 프로세스 RSS 증가분 / N
+ *
+ * 사용법:
+ *   node benchmarks/workerStartup.js [--threads 8] [--runs 3]
+ */
+
+const path = require('path');
+const { Worker } = require('worker_threads');
+
+const CONVERTERS_DIR = path.resolve(__dirname, '../utils/converters');
+
+// 지연 로딩 이전 converter.task.js가 최상위에서 읽던 모듈
+const EAGER_MODULES = [
+  'convertPdfToWord', 'convertPdfToExcel', 'convertPdfToPpt', 'convertPdfToImage', 'convertOfficeToPdf',
+  'mergePdf', 'splitPdf', 'compressPdf', 'convertImage', 'convertHeic', 'resizeImage', 'imageBatch',
+  'convertAudio', 'convertVideo', 'convertVideoToGif', 'pipeline'
+];
+
+const MODES = {
+  eager: [...EAGER_MODULES, 'converter.task'],
+  lazy: ['converter.task'],
+  'lazy+jpg-to-png': ['converter.task', 'convertImage']
+};
+
+// 워커: 모듈을 읽고 준비 완료를 알린 뒤 종료 신호까지 대기
+const WORKER_SOURCE = `
+  const { parentPort, workerData } = require('worker_threads');
+  const path = require('path');
+  const startedAt = process.hrtime.bigint();
+  for (const name of workerData.modules) {
+    require(path.join(workerData.dir, name));
+  }
+  const loadMs = Number(process.hrtime.bigint() - startedAt) / 1e6;
+  parentPort.postMessage({ loadMs, heapUsed: process.memoryUsage().heapUsed });
+  parentPort.once('message', () => process.exit(0));
+`;
+
+function parseArgs(argv) {
+  const args = { threads: 8, runs: 3 };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i].startsWith('--')) {
+      args[argv[i].slice(2)] = Number(argv[++i]);
+    }
+  }
+  return args;
+}
+
+/**
+ * 워커 1개 생성 → 준비 완료까지 시간 측정
+ * @returns {Promise<{worker: Worker, readyMs: number, loadMs: number, heapUsed: number}>}
+ */
+function spawnWorker(modules) {
+  const startedAt = process.hrtime.bigint();
+  const worker = new Worker(WORKER_SOURCE, {
+    eval: true,
+    // piscina의 workerData.supervisorRegistry 없이도 converter.task.js가 동작
+    workerData: { dir: CONVERTERS_DIR, modules }
+  });
+
+  return new Promise((resolve, reject) => {
+    worker.once('error', reject);
+    worker.once('message', ({ loadMs, heapUsed }) => {
+      resolve({ worker, readyMs: Number(process.hrtime.bigint() - startedAt) / 1e6, loadMs, heapUsed });
+    });
+  });
+}
+
+async function measure(modules, threads) {
+  global.gc?.();
+  const rssBefore = process.memoryUsage().rss;
+
+  // 순차 생성 (스레드 재생성 상황과 같이 하나씩 시작 시간 측정)
+  const spawned = [];
+  for (let i = 0; i < threads; i++) {
+    spawned.push(await spawnWorker(modules));
+  }
+  const rssPerThread = (process.memoryUsage().rss - rssBefore) / threads;
+
+  await Promise.all(spawned.map(({ worker }) => {
+    const exited = new Promise((resolve) => worker.once('exit', resolve));
+    worker.postMessage('exit');
+    return exited;
+  }));
+
+  const average = (key) => spawned.reduce((total, item) => total + item[key], 0) / threads;
+  return { readyMs: average('readyMs'), loadMs: average('loadMs'), heapUsed: average('heapUsed'), rssPerThread };
+}
+
+function format(label, result) {
+  return [
+    label.padEnd(18),
+    `${result.readyMs.toFixed(1).padStart(8)}ms`,
+    `${result.loadMs.toFixed(1).padStart(8)}ms`,
+    `${(result.heapUsed / 1024 / 1024).toFixed(1).padStart(8)}MB`,
+    `${(result.rssPerThread / 1024 / 1024).toFixed(1).padStart(8)}MB`
+  ].join(' ');
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+
+  console.log(`🧵 스레드 ${args.threads}개 × ${args.runs}회 (모드별 마지막 실행 결과)`);
+  console.log(`${''.padEnd(18)} ${'ready'.padStart(10)} ${'require'.padStart(10)} ${'heap'.padStart(10)} ${'rss/thread'.padStart(10)}`);
+
+  const results = {};
+  for (const [mode, modules] of Object.entries(MODES)) {
+    for (let run = 0; run < args.runs; run++) {
+      results[mode] = await measure(modules, args.threads);
+    }
+    console.log(format(mode, results[mode]));
+  }
+
+  const { eager, lazy } = results;
+  console.log(`\n⚡ ready ${(eager.readyMs / lazy.readyMs).toFixed(2)}x, rss/thread ${((eager.rssPerThread - lazy.rssPerThread) / 1024 / 1024).toFixed(1)}MB 절약`);
+}
+
+main().catch((error) => {
+  console.error('❌ 벤치마크 실패:', error);
+  process.exit(1);
+});
@@ -0,0 +1,110 @@
+"""
+================================
+⏱️ PDF → Excel 표 추출 엔진 벤치마크
+================================
+pdf_to_xlsx.py 엔진(text, camelot, auto)의 속도와 추출 품질을 비교
+- 입력은 loadtest/corpus.py의 표 PDF 생성기로 만들어 정답 셀을 알고 있음
+- 품질: 정답 행이 추출 결과에 그대로 있는 비율(재현율) / 추출된 행 중 정답 행 비율(정밀도)
+- 설치되지 않은 엔진은 건너뜀 (camelot은 선택 의존성)
+
+사용법:
+    python3 benchmarks/xlsx_engines_bench.py [--runs 3]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "loadtest"))
+sys.path.insert(0, str(ROOT_DIR / "utils" / "converters" / "scripts"))
+
+import corpus  # noqa: E402
+import pdf_to_xlsx  # noqa: E402
+
+# 이름 → (PDF 바이트, 정답 표 목록)
+CASES = {
+    "text-aligned 5p": lambda rng: corpus.make_table_pdf_with_rows(rng, pages=5, rows=20, cols=5),
+    "ruled 5p": lambda rng: corpus.make_table_pdf_with_rows(rng, pages=5, rows=20, cols=5, ruled=True),
+    "text-aligned 40p": lambda rng: corpus.make_table_pdf_with_rows(rng, pages=40, rows=30, cols=6),
+    "prose only 10p": lambda rng: (corpus.make_pdf(rng, pages=10), []),
+}
+
+
+def normalize_rows(table):
+    """빈 셀을 뺀 행 튜플 목록 (열 위치 차이는 무시)"""
+    rows = []
+    for row in table:
+        cells = tuple(str(cell).strip() for cell in row if str(cell).strip())
+        if cells:
+            rows.append(cells)
+    return rows
+
+
+def score(expected_tables, extracted_tables):
+    """
+    @returns (재현율, 정밀도) - 정답 행 / 추출 행 기준
+    """
+    expected = [row for table in expected_tables for row in normalize_rows(table)]
+    extracted = [row for table in extracted_tables for row in normalize_rows(table)]
+    expected_set, extracted_set = set(expected), set(extracted)
+
+    recall = sum(row in extracted_set for row in expected) / len(expected) if expected else 1.0
+    precision = sum(row in expected_set for row in extracted) / len(extracted) if extracted else 1.0
+    return recall, precision
+
+
+def available_engines():
+    engines = ["text", "auto"]
+    if pdf_to_xlsx.module_available("camelot"):
+        engines.insert(1, "camelot")
+    return engines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF → Excel 표 추출 엔진 벤치마크")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        pdf_to_xlsx.load_fitz()
+    except pdf_to_xlsx.MissingDependency as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+
+    engines = available_engines()
+    if "camelot" not in engines:
+        print("⚠️  camelot이 설치되어 있지 않아 text/auto만 비교합니다")
+    # camelot은 표가 없는 영역마다 경고를 출력
+    warnings.filterwarnings("ignore")
+
+    print(f"{'입력':<20}{'엔진':<10}{'중앙값(ms)':>12}{'표':>6}{'재현율':>9}{'정밀도':>9}  선택")
+    with tempfile.TemporaryDirectory(prefix="xlsx-bench-") as tmp_dir:
+        for case, generate in CASES.items():
+            pdf_bytes, expected = generate(random.Random(case))
+            pdf_path = Path(tmp_dir) / "input.pdf"
+            pdf_path.write_bytes(pdf_bytes)
+
+            for engine in engines:
+                timings = []
+                for _ in range(args.runs):
+                    started = time.perf_counter()
+                    tables, summary = pdf_to_xlsx.extract_tables(pdf_path, engine)
+                    timings.append((time.perf_counter() - started) * 1000)
+
+                recall, precision = score(expected, tables)
+                chosen = f"{summary['engine']} ({summary['reason']})" if engine == "auto" else ""
+                print(
+                    f"{case:<20}{engine:<10}{statistics.median(timings):>12.1f}"
+                    f"{len(tables):>6}{recall:>9.0%}{precision:>9.0%}  {chosen}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+================================
+🏗️ 정적 페이지 빌드
+================================
+public/*.html 에 페이지 변환(SEO head, 영어 locale/번역, 광고 스크립트 등)을 한 번에 적용
+- 페이지마다 한 번 읽고, 선언된 순서대로 변환을 메모리에서 이어 적용한 뒤 바뀐 경우에만 한 번 기록
+- 페이지 단위로 프로세스 풀에서 병렬 처리
+- .build-cache/manifest.json 에 페이지별 결과 해시를 저장해 변경 없는 페이지는 건너뜀
+  (변환 목록이나 변환 스크립트 소스가 바뀌면 전체 재빌드)
+- fingerprint 변환은 styles.css 등의 참조를 내용 해시 파일명으로 바꿈 (fingerprint_assets.py)
+  해시 파일 자체는 커밋하지 않고 배포 빌드(npm run build)에서 생성 - 로컬 빌드는 편의상 함께 생성
+- 모든 변환은 멱등: 빌드 결과에 다시 빌드해도 바뀌지 않음 → CI에서 --check 로 검증
+
+사용법:
+    python3 build_static.py                 # 변경된 페이지만 빌드
+    python3 build_static.py --force         # 캐시 무시하고 전체 빌드
+    python3 build_static.py --check         # 기록하지 않고, 빌드하면 바뀌는 페이지가 있으면 종료 코드 1 (CI)
+    python3 build_static.py --transforms seo,ads
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import add_ad_fix
+import add_ads
+import add_gatekeeper_scripts
+import add_seo
+import fingerprint_assets
+import remove_ad_fix
+import translate_to_english
+import update_locale
+
+ROOT_DIR = Path(__file__).resolve().parent
+PUBLIC_DIR = ROOT_DIR / "public"
+MANIFEST_PATH = ROOT_DIR / ".build-cache" / "manifest.json"
+
+# Google 사이트 소유권 확인 파일은 내용이 바뀌면 안 됨
+SKIP_PREFIXES = ("google",)
+
+
+# fingerprint 변환이 사용할 자산 → 해시 파일명 (워커 프로세스마다 _init_worker로 설정)
+_rewrite_assets = None
+
+
+def _init_worker(asset_map):
+    global _rewrite_assets
+    _rewrite_assets = fingerprint_assets.compile_rewriter(asset_map)
+
+
+def _fingerprint(content, filename):
+    return _rewrite_assets(content)
+
+
+def _gatekeeper(content, filename):
+    # <head>가 없는 페이지는 그대로 둠
+    return add_gatekeeper_scripts.apply_gatekeeper_scripts(content) or content
+
+
+# 변환 이름 → (content, filename) -> content
+TRANSFORMS = {
+    "seo": add_seo.apply_seo,
+    "locale": lambda content, filename: update_locale.apply_english_locale(content),
+    "translate": lambda content, filename: translate_to_english.translate_text(content),
+    "gatekeeper": _gatekeeper,
+    "add-ad-fix": lambda content, filename: add_ad_fix.add_ad_fix_link(content),
+    "remove-ad-fix": lambda content, filename: remove_ad_fix.remove_ad_fix_link(content),
+    "ads": lambda content, filename: add_ads.add_ad_script_tags(content),
+    "fingerprint": _fingerprint,
+}
+
+# 기본 적용 순서
+# - seo가 <head>를 통째로 교체하므로 head에 삽입하는 변환(gatekeeper, ad-fix)보다 먼저
+# - translate는 seo head의 한국어가 아닌 본문만 바꾸지만 locale과 함께 head 교체 이후에 적용
+# - fingerprint는 다른 변환이 넣은 자산 참조까지 바꾸도록 마지막
+DEFAULT_PIPELINE = ["seo", "locale", "translate", "gatekeeper", "remove-ad-fix", "ads", "fingerprint"]
+
+# 빌드 결과에 영향을 주는 소스 (바뀌면 캐시 무효화)
+SOURCE_FILES = [
+    Path(__file__),
+    Path(add_seo.__file__),
+    Path(update_locale.__file__),
+    Path(translate_to_english.__file__),
+    Path(add_gatekeeper_scripts.__file__),
+    Path(add_ad_fix.__file__),
+    Path(remove_ad_fix.__file__),
+    Path(add_ads.__file__),
+    Path(fingerprint_assets.__file__),
+]
+
+
+def sha256_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def pipeline_fingerprint(pipeline, public_dir, asset_map):
+    digest = hashlib.sha256(f"{public_dir.resolve()}|{','.join(pipeline)}".encode("utf-8"))
+    # 자산 내용이 바뀌면 해시 파일명이 바뀌므로 모든 페이지 재빌드
+    digest.update(json.dumps(asset_map, sort_keys=True).encode("utf-8"))
+    for source in SOURCE_FILES:
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def load_manifest(fingerprint):
+    try:
+        manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    # 변환 구성이 바뀌었으면 이전 기록은 쓸 수 없음
+    if manifest.get("fingerprint") != fingerprint:
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(fingerprint, files):
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    payload = json.dumps({"fingerprint": fingerprint, "files": files}, indent=2, sort_keys=True)
+    write_atomic(MANIFEST_PATH, payload)
+
+
+def write_atomic(path, text):
+    """같은 디렉토리의 임시 파일에 쓴 뒤 교체 (중단돼도 반쯤 쓰인 페이지가 남지 않음)"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def file_state(path, content):
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256_text(content)}
+
+
+def is_unchanged(path, record):
+    """manifest 기록과 같으면 True (크기/mtime이 같으면 읽지 않음, 다르면 내용 해시로 확인)"""
+    if not record:
+        return False
+    stat = path.stat()
+    if stat.st_size == record["size"] and stat.st_mtime_ns == record["mtime_ns"]:
+        return True
+    return sha256_text(path.read_text(encoding="utf-8")) == record["sha256"]
+
+
+def build_page(path_str, pipeline, write):
+    """
+    페이지 하나 빌드 (프로세스 풀 워커)
+    @returns {name, changed, state?, error?}
+    """
+    path = Path(path_str)
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            original = f.read()
+
+        content = original
+        for name in pipeline:
+            content = TRANSFORMS[name](content, path.name)
+
+        changed = content != original
+        if changed and write:
+            write_atomic(path, content)
+        return {"name": path.name, "changed": changed, "state": file_state(path, content if write else original)}
+    except Exception as e:  # noqa: BLE001 - 페이지별 실패는 모아서 보고
+        return {"name": path.name, "changed": False, "error": f"{type(e).__name__}: {e}"}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="public/*.html 정적 페이지 빌드")
+    parser.add_argument("--public-dir", type=Path, default=PUBLIC_DIR)
+    parser.add_argument("--transforms", help=f"쉼표로 구분한 변환 순서 (기본: {','.join(DEFAULT_PIPELINE)})")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="병렬 프로세스 수")
+    parser.add_argument("--force", action="store_true", help="캐시를 무시하고 전체 빌드")
+    parser.add_argument("--check", action="store_true", help="기록하지 않고 바뀔 페이지가 있으면 종료 코드 1")
+    parser.add_argument("--list", action="store_true", help="사용 가능한 변환 목록 출력")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.list:
+        for name in TRANSFORMS:
+            print(f"{name}{' (기본)' if name in DEFAULT_PIPELINE else ''}")
+        return 0
+
+    pipeline = args.transforms.split(",") if args.transforms else DEFAULT_PIPELINE
+    unknown = [name for name in pipeline if name not in TRANSFORMS]
+    if unknown:
+        print(f"❌ 알 수 없는 변환: {', '.join(unknown)} (사용 가능: {', '.join(TRANSFORMS)})", file=sys.stderr)
+        return 2
+    if "add-ad-fix" in pipeline and "remove-ad-fix" in pipeline:
+        print("❌ add-ad-fix와 remove-ad-fix는 함께 사용할 수 없습니다", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    asset_map = fingerprint_assets.compute_asset_map(args.public_dir) if "fingerprint" in pipeline else {}
+    # 해시 파일은 커밋 대상이 아니므로 --check 에서는 검사하지 않음 (페이지 참조만 검사)
+    created, removed = [], []
+    if not args.check:
+        created, removed = fingerprint_assets.sync_fingerprinted_files(args.public_dir, asset_map)
+    for path in created:
+        print(f"🔖 생성: {path.relative_to(args.public_dir).as_posix()}")
+    for path in removed:
+        print(f"🗑️  삭제: {path.relative_to(args.public_dir).as_posix()}")
+
+    _init_worker(asset_map)
+    fingerprint = pipeline_fingerprint(pipeline, args.public_dir, asset_map)
+    records = {} if args.force else load_manifest(fingerprint)
+
+    pages = sorted(p for p in args.public_dir.glob("*.html") if not p.name.startswith(SKIP_PREFIXES))
+    pending = [p for p in pages if not is_unchanged(p, records.get(p.name))]
+    print(f"🏗️  페이지 {len(pages)}개 중 {len(pending)}개 빌드 ({' → '.join(pipeline)})")
+
+    results = []
+    if pending:
+        with ProcessPoolExecutor(
+            max_workers=max(1, min(args.jobs, len(pending))),
+            initializer=_init_worker,
+            initargs=(asset_map,),
+        ) as pool:
+            results = list(pool.map(
+                build_page,
+                [str(p) for p in pending],
+                [pipeline] * len(pending),
+                [not args.check] * len(pending),
+                chunksize=max(1, len(pending) // (args.jobs * 4) or 1),
+            ))
+
+    changed = [r["name"] for r in results if r["changed"]]
+    errors = [r for r in results if "error" in r]
+    for result in results:
+        if "error" in result:
+            print(f"❌ {result['name']}: {result['error']}")
+        elif result["changed"]:
+            print(f"{'📝 변경 필요' if args.check else '✅ 빌드'}: {result['name']}")
+
+    if not args.check:
+        # 현재 페이지 목록 기준으로 기록 (삭제된 페이지는 제외, 실패한 페이지는 다음에 다시 빌드)
+        names = {p.name for p in pages}
+        files = {name: record for name, record in records.items() if name in names}
+        for result in results:
+            if "error" in result:
+                files.pop(result["name"], None)
+            else:
+                files[result["name"]] = result["state"]
+        save_manifest(fingerprint, files)
+
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"\n📊 Summary ({elapsed:.0f}ms):")
+    print(f"   {'📝 Would change' if args.check else '✅ Updated'}: {len(changed)} files")
+    if created or removed:
+        print(f"   🔖 Fingerprinted assets: +{len(created)} / -{len(removed)}")
+    print(f"   ⏭️  Unchanged: {len(pages) - len(changed) - len(errors)} files (cached: {len(pages) - len(pending)})")
+    if errors:
+        print(f"   ❌ Errors: {len(errors)} files")
+
+    if errors:
+        return 1
+    if args.check and changed:
+        print("\n❌ 빌드 결과와 다른 페이지가 있습니다. python3 build_static.py 를 실행해 커밋하세요.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+/**
+ * ================================
+ * 🧩 클러스터 모드 진입점
+ * ================================
+ * 하나의 포트 뒤에서 HTTP 워커 프로세스 N개 실행 (node cluster.js)
+ * - 워커: server.js 그대로 실행 (포트는 primary가 공유, 연결은 워커에 분배)
+ * - primary: 스키마 준비, 만료 파일 정리 스케줄러 실행 (정확히 한 프로세스),
+ *   죽은 워커 재시작, 종료 신호 전달
+ * - SQLite(WAL)는 모든 프로세스가 같은 파일을 열고, rate limit 카운터도 DB에 공유
+ * - 변환 큐(admission)와 동일 입력 합치기(coalescing)는 프로세스별로 동작
+ *
+ * 환경변수:
+ *   CLUSTER_WORKERS       - 워커 수 (기본: CPU 코어 수)
+ *   CONVERTER_MAX_THREADS - 미지정 시 코어 수 / 워커 수로 나눠 프로세스마다 Piscina 스레드 과다 생성 방지
+ */
+
+const cluster = require('cluster');
+const os = require('os');
+
+if (cluster.isWorker) {
+  require('./server');
+} else {
+  const { validateEnvironment } = require('./config/env');
+  const { withTime } = require('./utils/logger');
+
+  validateEnvironment();
+
+  const cpuCount = os.availableParallelism?.() || os.cpus().length;
+  const workerCount = parseInt(process.env.CLUSTER_WORKERS) || cpuCount;
+
+  // 워커마다 Piscina 풀을 띄우므로 변환 스레드를 코어 수에 맞게 나눔 (fork 시 환경변수 상속)
+  if (!process.env.CONVERTER_MAX_THREADS) {
+    const maxThreads = Math.max(1, Math.floor(cpuCount / workerCount));
+    process.env.CONVERTER_MAX_THREADS = String(maxThreads);
+    process.env.CONVERTER_MIN_THREADS = process.env.CONVERTER_MIN_THREADS || String(Math.min(2, maxThreads));
+  }
+
+  // 워커가 동시에 CREATE TABLE을 실행하지 않도록 primary에서 먼저 스키마 준비
+  require('./config/db');
+
+  // 만료 파일 / rate limit 정리는 primary에서만 실행
+  const { startScheduler } = require('./utils/scheduler');
+  console.log(withTime('⏰ 파일 정리 스케줄러 시작 (primary)...'));
+  startScheduler();
+
+  // 짧은 시간 안에 계속 죽으면 재시작 중단 (설정 오류 등으로 인한 무한 재시작 방지)
+  const RESTART_WINDOW_MS = 60 * 1000;
+  const MAX_RESTARTS_PER_WINDOW = workerCount * 3;
+  let restartTimes = [];
+  let isShuttingDown = false;
+
+  const forkWorker = () => {
+    const worker = cluster.fork();
+    console.log(withTime(`👷 워커 시작: pid=${worker.process.pid}`));
+    return worker;
+  };
+
+  cluster.on('exit', (worker, code, signal) => {
+    if (isShuttingDown) {
+      if (Object.keys(cluster.workers).length === 0) {
+        console.log(withTime('✅ 모든 워커 종료 완료'));
+        process.exit(0);
+      }
+      return;
+    }
+
+    console.error(withTime(`⚠️  워커 종료: pid=${worker.process.pid}, code=${code}, signal=${signal || '-'}`));
+
+    const now = Date.now();
+    restartTimes = restartTimes.filter((time) => now - time < RESTART_WINDOW_MS);
+    if (restartTimes.length >= MAX_RESTARTS_PER_WINDOW) {
+      console.error(withTime(`❌ ${RESTART_WINDOW_MS / 1000}초 내 재시작 ${restartTimes.length}회 - 클러스터 종료`));
+      process.exit(1);
+    }
+    restartTimes.push(now);
+    forkWorker();
+  });
+
+  // 워커에 종료 신호 전달 → 각 워커의 graceful shutdown 완료 대기 (최대 35초)
+  const shutdown = (signal) => {
+    if (isShuttingDown) return;
+    isShuttingDown = true;
+
+    console.log(withTime(`\n🛑 ${signal} 수신 - 워커 ${Object.keys(cluster.workers).length}개 종료 중...`));
+
+    setTimeout(() => {
+      console.error(withTime('⚠️  35초 타임아웃 - 강제 종료'));
+      process.exit(1);
+    }, 35000).unref();
+
+    for (const worker of Object.values(cluster.workers)) {
+      worker.process.kill(signal);
+    }
+    if (Object.keys(cluster.workers).length === 0) {
+      process.exit(0);
+    }
+  };
+
+  process.on('SIGTERM', () => shutdown('SIGTERM'));
+  process.on('SIGINT', () => shutdown('SIGINT'));
+
+  console.log(withTime(`🧩 클러스터 모드: 워커 ${workerCount}개, 워커당 변환 스레드 ${process.env.CONVERTER_MAX_THREADS || cpuCount}개`));
+  for (let i = 0; i < workerCount; i++) {
+    forkWorker();
+  }
+}
@@ -0,0 +1,229 @@
+"""
+================================
+🗜️ 정적 자산 사전 압축
+================================
+public/ 아래 텍스트 자산(html, css, js, svg, xml, txt, json)마다
+최대 압축률의 .br / .gz 형제 파일을 생성
+- 서버(utils/precompressed.js)가 Accept-Encoding에 맞는 형제 파일을 그대로 전송
+  → 요청마다 이벤트 루프에서 gzip 하지 않음
+- .build-cache/compress.json 에 원본 해시를 기록해 바뀐 자산만 다시 압축
+- 원본보다 작아지지 않는 파일은 형제 파일을 만들지 않음 (있으면 삭제)
+- 원본이 사라진 형제 파일은 삭제
+
+build_static.py 이후에 실행 (HTML 변환 결과를 압축해야 함):
+    python3 build_static.py && python3 compress_static.py
+
+사용법:
+    python3 compress_static.py [--force] [--jobs N]
+
+Brotli는 선택 의존성 (pip install brotli) - 없으면 .gz만 생성
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT_DIR = Path(__file__).resolve().parent
+PUBLIC_DIR = ROOT_DIR / "public"
+MANIFEST_PATH = ROOT_DIR / ".build-cache" / "compress.json"
+
+# utils/precompressed.js 의 COMPRESSIBLE_EXTENSIONS 와 같아야 함
+COMPRESSIBLE_EXTENSIONS = {".html", ".css", ".js", ".svg", ".xml", ".txt", ".json"}
+
+# 이보다 작은 파일은 압축 이득보다 헤더 비용이 큼
+MIN_SIZE = 256
+
+
+def encoders():
+    """인코딩 이름 → (확장자, 압축 함수)"""
+    result = {"gzip": (".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        result["br"] = (".br", lambda data: brotli.compress(data, quality=11, mode=brotli.MODE_TEXT))
+    return result
+
+
+def sibling(path, ext):
+    return path.with_name(path.name + ext)
+
+
+def write_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def compress_asset(path_str):
+    """
+    자산 하나 압축 (프로세스 풀 워커)
+    @returns {path, sha256, written: [인코딩], skipped: [인코딩]}
+    """
+    path = Path(path_str)
+    data = path.read_bytes()
+    written, skipped = [], []
+
+    for name, (ext, compress) in encoders().items():
+        target = sibling(path, ext)
+        compressed = compress(data) if len(data) >= MIN_SIZE else None
+        if compressed is None or len(compressed) >= len(data):
+            # 압축 이득이 없으면 원본만 전송되도록 형제 파일 제거
+            target.unlink(missing_ok=True)
+            skipped.append(name)
+            continue
+        write_atomic(target, compressed)
+        written.append(name)
+
+    if brotli is None:
+        # 이전 빌드의 .br은 원본과 맞지 않으므로 제거
+        sibling(path, ".br").unlink(missing_ok=True)
+
+    return {
+        "path": path_str,
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "written": written,
+        "skipped": skipped,
+    }
+
+
+def file_record(path, sha256, encodings):
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256, "encodings": encodings}
+
+
+def is_fresh(path, record, encoding_names):
+    """
+    기록 이후 원본이 바뀌지 않았고 형제 파일이 남아 있으면 True
+    - 크기/mtime이 같으면 읽지 않음
+    - 내용만 같고 mtime이 바뀐 경우(git checkout 등) 형제 파일 mtime을 갱신
+      (서버는 원본보다 오래된 형제 파일을 쓰지 않음)
+    """
+    if not record or record.get("encodings") is None:
+        return False
+    # 이전 실행에 brotli가 없었으면 .br 생성을 위해 다시 압축
+    if set(encoding_names) - set(record["encodings"]) - set(record.get("skipped", [])):
+        return False
+
+    siblings = [sibling(path, encoders()[name][0]) for name in record["encodings"] if name in encoders()]
+    if not all(s.exists() for s in siblings):
+        return False
+
+    stat = path.stat()
+    if stat.st_size == record["size"] and stat.st_mtime_ns == record["mtime_ns"]:
+        return True
+    if hashlib.sha256(path.read_bytes()).hexdigest() != record["sha256"]:
+        return False
+
+    for s in siblings:
+        os.utime(s)
+    record["size"], record["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+    return True
+
+
+def load_manifest():
+    """public 디렉토리 절대 경로 → 자산별 기록"""
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    payload = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+    write_atomic(MANIFEST_PATH, payload)
+
+
+def remove_orphans(public_dir):
+    """원본이 없는 .br / .gz 삭제"""
+    removed = []
+    for ext in (".br", ".gz"):
+        for compressed in public_dir.rglob(f"*{ext}"):
+            source = compressed.with_name(compressed.name[: -len(ext)])
+            if source.suffix in COMPRESSIBLE_EXTENSIONS and not source.exists():
+                compressed.unlink()
+                removed.append(compressed)
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="public/ 정적 자산 .br/.gz 사전 압축")
+    parser.add_argument("--public-dir", type=Path, default=PUBLIC_DIR)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="병렬 프로세스 수")
+    parser.add_argument("--force", action="store_true", help="캐시를 무시하고 전체 압축")
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("⚠️  brotli 모듈이 없어 .gz만 생성합니다 (pip install brotli)")
+
+    started = time.perf_counter()
+    public_dir = args.public_dir.resolve()
+    manifest = load_manifest()
+    records = {} if args.force else manifest.get(str(public_dir), {})
+    encoding_names = list(encoders())
+
+    assets = sorted(
+        p for p in public_dir.rglob("*")
+        if p.is_file() and p.suffix in COMPRESSIBLE_EXTENSIONS
+    )
+    keys = {p: p.relative_to(public_dir).as_posix() for p in assets}
+    pending = [p for p in assets if not is_fresh(p, records.get(keys[p]), encoding_names)]
+    print(f"🗜️  자산 {len(assets)}개 중 {len(pending)}개 압축 ({', '.join(encoding_names)})")
+
+    results = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(pending)))) as pool:
+            results = list(pool.map(compress_asset, [str(p) for p in pending]))
+
+    files = {keys[p]: records[keys[p]] for p in assets if keys[p] in records}
+    original_bytes = compressed_bytes = 0
+    for result in results:
+        path = Path(result["path"])
+        record = file_record(path, result["sha256"], result["written"])
+        record["skipped"] = result["skipped"]
+        files[keys[path]] = record
+
+        size = path.stat().st_size
+        best = min(
+            [sibling(path, encoders()[name][0]).stat().st_size for name in result["written"]],
+            default=size,
+        )
+        original_bytes += size
+        compressed_bytes += best
+        print(f"✅ {keys[path]}: {size:,} → {best:,} bytes ({', '.join(result['written']) or '압축 안 함'})")
+
+    removed = remove_orphans(public_dir)
+    for path in removed:
+        print(f"🗑️  삭제: {path.relative_to(public_dir).as_posix()}")
+    manifest[str(public_dir)] = files
+    save_manifest(manifest)
+
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"\n📊 Summary ({elapsed:.0f}ms):")
+    print(f"   ✅ Compressed: {len(results)} files")
+    if original_bytes:
+        print(f"   📉 {original_bytes:,} → {compressed_bytes:,} bytes ({compressed_bytes / original_bytes:.0%})")
+    print(f"   ⏭️  Unchanged: {len(assets) - len(results)} files")
+    if removed:
+        print(f"   🗑️  Removed: {len(removed)} orphaned files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
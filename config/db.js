@@ -1,8 +1,12 @@
 const path = require('path');
 const Database = require('better-sqlite3');
 
-const dbPath = path.resolve(__dirname, '../db/database.db');
-const db = new Database(dbPath);
+// DB_PATH로 경로 지정 가능 (테스트에서는 ':memory:')
+const dbPath = process.env.DB_PATH || path.resolve(__dirname, '../db/database.db');
+// 클러스터 모드에서는 여러 프로세스가 같은 파일을 연다 (WAL: 읽기는 동시, 쓰기는 1개씩)
+// 다른 프로세스가 쓰기 잠금을 잡고 있으면 SQLITE_BUSY 대신 최대 DB_BUSY_TIMEOUT_MS 대기
+const busyTimeout = parseInt(process.env.DB_BUSY_TIMEOUT_MS) || 5000;
+const db = new Database(dbPath, { timeout: busyTimeout });
 
 // DB 설정
 db.exec(`
@@ -27,9 +31,187 @@ db.exec(`
     status TEXT DEFAULT 'active'               -- 'active', 'deleted', 'failed'
   );
 
-  CREATE INDEX IF NOT EXISTS idx_file_id ON files(file_id);
-  CREATE INDEX IF NOT EXISTS idx_expires_at ON files(expires_at);
-  CREATE INDEX IF NOT EXISTS idx_status ON files(status);
+  -- 만료 스캔 (status='active' AND expires_at <= now ORDER BY expires_at) 전용 부분 인덱스
+  -- active 행만 담고 file_id, r2_path, status까지 포함해 테이블을 읽지 않음 (커버링)
+  -- status는 부분 인덱스 조건에 이미 고정돼 있지만, 쿼리가 참조하는 컬럼이 인덱스에 없으면
+  -- 플래너가 커버링으로 인정하지 않아 행마다 테이블을 다시 읽음
+  CREATE INDEX IF NOT EXISTS idx_files_active_expires_covering
+    ON files(expires_at, file_id, r2_path, status) WHERE status = 'active';
+
+  -- 관리자 삭제 목록 (status='deleted' ORDER BY deleted_at DESC)
+  CREATE INDEX IF NOT EXISTS idx_files_deleted_at
+    ON files(deleted_at) WHERE status = 'deleted';
+
+  -- 위 부분 인덱스로 대체된 인덱스 제거
+  -- - idx_files_active_expires: status가 빠져 커버링이 아니던 이전 버전
+  -- - idx_file_id: file_id UNIQUE 제약이 같은 인덱스를 이미 만듦
+  -- - idx_status: 값 종류가 3개뿐이라 선택도가 낮고, 플래너가 부분 인덱스 대신 고르는 원인
+  -- - idx_expires_at: 만료 스캔은 항상 status='active' 조건과 함께 실행
+  -- INSERT/상태 변경마다 갱신할 B-tree가 4개 → 3개로 줄어듦
+  DROP INDEX IF EXISTS idx_files_active_expires;
+  DROP INDEX IF EXISTS idx_file_id;
+  DROP INDEX IF EXISTS idx_status;
+  DROP INDEX IF EXISTS idx_expires_at;
+`);
+
+// 변환 작업 지표 테이블 생성 (작업당 1행, utils/metrics.js에서 배치 기록)
+db.exec(`
+  CREATE TABLE IF NOT EXISTS conversion_metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    format TEXT NOT NULL,                      -- 변환 형식 (word, merge, mp4 등)
+    outcome TEXT NOT NULL,                     -- 'success', 'failed', 'timeout', 'aborted'
+    input_bytes INTEGER,                       -- 입력 크기
+    output_bytes INTEGER,                      -- 출력 크기 (실패 시 NULL)
+    queue_wait_ms INTEGER,                     -- 워커 풀 대기 시간
+    run_ms INTEGER,                            -- 워커 실행 시간
+    total_ms INTEGER NOT NULL,                 -- 대기 + 실행 전체 시간
+    peak_rss_bytes INTEGER,                    -- 외부 프로세스 최대 RSS (없으면 NULL)
+    error_code TEXT,                           -- 실패 코드
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+  );
+
+  CREATE INDEX IF NOT EXISTS idx_metrics_created_at ON conversion_metrics(created_at);
+  CREATE INDEX IF NOT EXISTS idx_metrics_format_created_at ON conversion_metrics(format, created_at);
+`);
+
+// rate limit 카운터 테이블 (utils/rateLimitStore.js, 클러스터 프로세스 간 공유)
+db.exec(`
+  CREATE TABLE IF NOT EXISTS rate_limits (
+    prefix TEXT NOT NULL,                      -- 리미터 이름 (general, upload, admin, login, job-poll)
+    key TEXT NOT NULL,                         -- 클라이언트 키 (IP)
+    hits INTEGER NOT NULL,                     -- 현재 창의 요청 수
+    reset_at INTEGER NOT NULL,                 -- 창 종료 시각 (epoch ms)
+    PRIMARY KEY (prefix, key)
+  ) WITHOUT ROWID;
+
+  CREATE INDEX IF NOT EXISTS idx_rate_limits_reset_at ON rate_limits(reset_at);
+`);
+
+// 변환 작업 큐 테이블 (utils/jobQueue.js, 워커 프로세스가 lease로 작업 점유)
+// 시각 컬럼은 모두 epoch ms (Node/Python 워커가 같은 기준으로 비교)
+db.exec(`
+  CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,                       -- 작업 ID
+    format TEXT NOT NULL,                      -- 변환 형식 (word, excel, jpg-to-png 등)
+    payload TEXT NOT NULL,                     -- 입력 JSON (r2Path, originalName, quality 등)
+    status TEXT NOT NULL DEFAULT 'queued',     -- 'queued', 'running', 'succeeded', 'failed'
+    priority INTEGER NOT NULL DEFAULT 0,       -- 클수록 먼저 처리
+    attempts INTEGER NOT NULL DEFAULT 0,       -- 점유(실행 시작) 횟수
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_at INTEGER NOT NULL,                   -- 이 시각 이후 점유 가능 (재시도 backoff)
+    lease_owner TEXT,                          -- 점유 중인 워커 ID
+    lease_expires_at INTEGER,                  -- heartbeat가 끊기면 이 시각 이후 재점유
+    result TEXT,                               -- 성공 결과 JSON (fileId, r2Path, fileName 등)
+    error TEXT,                                -- 마지막 실패 사유
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL
+  );
+
+  -- 점유 스캔 (status='queued' AND run_at <= now ORDER BY priority DESC, run_at)
+  CREATE INDEX IF NOT EXISTS idx_jobs_queued
+    ON jobs(priority DESC, run_at) WHERE status = 'queued';
+
+  -- 만료 lease 회수 (status='running' AND lease_expires_at <= now)
+  CREATE INDEX IF NOT EXISTS idx_jobs_running_lease
+    ON jobs(lease_expires_at) WHERE status = 'running';
+
+  -- 완료 작업 정리 (status IN ('succeeded', 'failed') AND updated_at <= cutoff)
+  CREATE INDEX IF NOT EXISTS idx_jobs_finished_updated
+    ON jobs(updated_at) WHERE status IN ('succeeded', 'failed');
 `);
 
+// ============ 대시보드 집계 테이블 (시간/일 단위 롤업) ============
+// files 테이블에 INSERT/UPDATE/DELETE가 발생할 때 트리거로 카운터를 증감시켜
+// 대시보드가 files 전체를 COUNT 스캔하지 않도록 함
+
+// r2_path 확장자 → 대시보드 형식 라벨
+const FORMAT_LABEL_SQL = (column) => `
+  CASE
+    WHEN ${column} LIKE '%.docx' THEN 'Word (.docx)'
+    WHEN ${column} LIKE '%.xlsx' THEN 'Excel (.xlsx)'
+    WHEN ${column} LIKE '%.pptx' THEN 'PowerPoint (.pptx)'
+    WHEN ${column} LIKE '%.zip' THEN 'Image (.zip)'
+    WHEN ${column} LIKE '%.pdf' THEN 'PDF'
+    WHEN ${column} LIKE '%.mp3' THEN 'MP3'
+    WHEN ${column} LIKE '%.wav' THEN 'WAV'
+    WHEN ${column} LIKE '%.ogg' THEN 'OGG'
+    WHEN ${column} LIKE '%.m4a' THEN 'M4A'
+    WHEN ${column} LIKE '%.aac' THEN 'AAC'
+    WHEN ${column} LIKE '%.mp4' THEN 'MP4'
+    WHEN ${column} LIKE '%.mov' THEN 'MOV'
+    WHEN ${column} LIKE '%.webm' THEN 'WebM'
+    WHEN ${column} LIKE '%.mkv' THEN 'MKV'
+    ELSE 'Other'
+  END`;
+
+const ROLLUPS = [
+  { table: 'files_rollup_hourly', bucket: (row) => `STRFTIME('%Y-%m-%d %H:00:00', ${row}.created_at)` },
+  { table: 'files_rollup_daily', bucket: (row) => `DATE(${row}.created_at)` }
+];
+
+// 롤업 카운터 증감 (UPSERT)
+const rollupUpsert = (row, delta) => ROLLUPS.map(({ table, bucket }) => `
+    INSERT INTO ${table} (file_type, status, bucket, format, count)
+    VALUES (${row}.file_type, COALESCE(${row}.status, 'unknown'), ${bucket(row)}, ${FORMAT_LABEL_SQL(`${row}.r2_path`)}, ${delta})
+    ON CONFLICT (file_type, status, bucket, format) DO UPDATE SET count = count + ${delta};`).join('\n');
+
+const setupRollups = db.transaction(() => {
+  const alreadyCreated = db.prepare(
+    `SELECT 1 FROM sqlite_master WHERE type='table' AND name='files_rollup_daily'`
+  ).get();
+
+  for (const { table } of ROLLUPS) {
+    db.exec(`
+      CREATE TABLE IF NOT EXISTS ${table} (
+        file_type TEXT NOT NULL,
+        status TEXT NOT NULL,
+        bucket TEXT NOT NULL,                    -- 'YYYY-MM-DD HH:00:00' (시간) 또는 'YYYY-MM-DD' (일)
+        format TEXT NOT NULL,                    -- 형식 라벨 (Word (.docx) 등)
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (file_type, status, bucket, format)
+      ) WITHOUT ROWID;
+    `);
+  }
+
+  db.exec(`
+    CREATE TRIGGER IF NOT EXISTS trg_files_rollup_insert
+    AFTER INSERT ON files
+    BEGIN
+      ${rollupUpsert('NEW', 1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_files_rollup_update
+    AFTER UPDATE OF status, file_type, r2_path, created_at ON files
+    WHEN OLD.status IS NOT NEW.status
+      OR OLD.file_type IS NOT NEW.file_type
+      OR OLD.r2_path IS NOT NEW.r2_path
+      OR OLD.created_at IS NOT NEW.created_at
+    BEGIN
+      ${rollupUpsert('OLD', -1)}
+      ${rollupUpsert('NEW', 1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_files_rollup_delete
+    AFTER DELETE ON files
+    BEGIN
+      ${rollupUpsert('OLD', -1)}
+    END;
+  `);
+
+  // 최초 생성 시 1회 백필 (트리거 생성과 같은 트랜잭션이라 누락/중복 없음)
+  if (!alreadyCreated) {
+    for (const { table, bucket } of ROLLUPS) {
+      db.exec(`
+        INSERT INTO ${table} (file_type, status, bucket, format, count)
+        SELECT file_type, COALESCE(status, 'unknown'), ${bucket('files')}, ${FORMAT_LABEL_SQL('files.r2_path')}, COUNT(*)
+        FROM files
+        GROUP BY 1, 2, 3, 4;
+      `);
+    }
+    console.log('📊 대시보드 롤업 테이블 백필 완료');
+  }
+});
+
+setupRollups.immediate();
+
 module.exports = db;
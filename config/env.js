@@ -0,0 +1,28 @@
+const { withTime } = require('../utils/logger');
+
+// ============ 필수 환경변수 검증 ============
+// server.js와 cluster.js(primary)에서 호출 - 클러스터 모드에서는 워커를 띄우기 전에 한 번 검증
+function validateEnvironment() {
+  const requiredEnvVars = [
+    'JWT_SECRET',
+    'ADMIN_PASSWORD',
+    'R2_ENDPOINT',
+    'R2_BUCKET',
+    'R2_ACCESS_KEY_ID',
+    'R2_SECRET_ACCESS_KEY'
+  ];
+
+  const missing = requiredEnvVars.filter(varName => !process.env[varName]);
+
+  if (missing.length > 0) {
+    console.error(withTime(`❌ 필수 환경변수 없음: ${missing.join(', ')}`));
+    console.error(withTime('Railway 환경변수를 설정해주세요.'));
+    process.exit(1);
+  }
+
+  console.log(withTime('✅ 모든 필수 환경변수 검증됨'));
+}
+
+module.exports = {
+  validateEnvironment
+};
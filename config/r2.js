@@ -6,7 +6,11 @@
  * R2는 S3 호환 API를 제공하므로 S3 클라이언트로 사용 가능
  */
 
-const { S3Client, PutObjectCommand, GetObjectCommand, DeleteObjectCommand } = require('@aws-sdk/client-s3');
+const fs = require('fs');
+const crypto = require('crypto');
+const { Transform } = require('stream');
+const { pipeline } = require('stream/promises');
+const { S3Client, PutObjectCommand, GetObjectCommand, DeleteObjectCommand, DeleteObjectsCommand } = require('@aws-sdk/client-s3');
 const { withTime } = require('../utils/logger');
 
 const requiredR2EnvKeys = ['R2_ENDPOINT', 'R2_BUCKET', 'R2_ACCESS_KEY_ID', 'R2_SECRET_ACCESS_KEY'];
@@ -37,22 +41,30 @@ const r2Client = new S3Client({
     secretAccessKey: process.env.R2_SECRET_ACCESS_KEY,
   },
   endpoint: process.env.R2_ENDPOINT,
+  // 로컬 S3 호환 서버(MinIO 등)로 테스트할 때 path-style 주소 사용
+  forcePathStyle: process.env.R2_FORCE_PATH_STYLE === 'true',
 });
 
+// DeleteObjects 한 번에 보낼 수 있는 최대 키 수 (S3/R2 제한)
+const DELETE_BATCH_SIZE = 1000;
+const DELETE_CONCURRENCY = parseInt(process.env.R2_DELETE_CONCURRENCY) || 4;
+
 /**
  * R2에 파일 업로드
  * @param {string} key - R2에 저장될 파일 경로 (예: uploads/file-1234567890.pdf)
  * @param {Buffer|Stream} body - 파일 데이터
  * @param {string} contentType - MIME 타입 (예: application/pdf)
+ * @param {number} [contentLength] - Stream 업로드 시 필요한 바이트 길이
  * @returns {Promise} R2 업로드 응답
  */
-const uploadToR2 = async (key, body, contentType = 'application/octet-stream') => {
+const uploadToR2 = async (key, body, contentType = 'application/octet-stream', contentLength) => {
   try {
     const command = new PutObjectCommand({
       Bucket: process.env.R2_BUCKET,
       Key: key,
       Body: body,
       ContentType: contentType,
+      ...(contentLength !== undefined && { ContentLength: contentLength }),
     });
 
     const result = await r2Client.send(command);
@@ -97,6 +109,180 @@ const downloadFromR2 = async (key) => {
   }
 };
 
+/**
+ * R2 객체를 스트림으로 조회 (Buffer로 모으지 않음)
+ * @param {string} key - R2 파일 경로
+ * @param {string} [range] - HTTP Range 헤더 값 (예: bytes=0-1023)
+ * @returns {Promise<{body: Readable, contentLength: number, contentRange?: string, eTag?: string, lastModified?: Date}>}
+ */
+const getR2ObjectStream = async (key, range) => {
+  const command = new GetObjectCommand({
+    Bucket: process.env.R2_BUCKET,
+    Key: key,
+    ...(range && { Range: range }),
+  });
+
+  const response = await r2Client.send(command);
+  return {
+    body: response.Body,
+    contentLength: response.ContentLength,
+    contentRange: response.ContentRange,
+    eTag: response.ETag,
+    lastModified: response.LastModified,
+  };
+};
+
+// RFC 3986 인코딩 (SigV4 정규화 규칙)
+const encodeRfc3986 = (value) =>
+  encodeURIComponent(value).replace(/[!'()*]/g, (c) => `%${c.charCodeAt(0).toString(16).toUpperCase()}`);
+
+const hmac = (key, value) => crypto.createHmac('sha256', key).update(value, 'utf8').digest();
+
+/**
+ * SigV4 쿼리 서명 URL 생성 (S3 presigned GET)
+ * @param {string} objectUrl - 서명할 객체 URL (쿼리 없음, 경로는 인코딩된 상태)
+ * @param {Object} options
+ * @param {string} options.accessKeyId
+ * @param {string} options.secretAccessKey
+ * @param {string} [options.region] - 기본 'auto' (R2)
+ * @param {number} [options.expiresIn] - 유효 시간 (초)
+ * @param {Date} [options.date] - 서명 시각 (테스트용)
+ * @param {Object} [options.query] - 추가 쿼리 파라미터 (response-content-disposition 등)
+ * @returns {string} 서명된 URL
+ */
+const presignUrl = (objectUrl, { accessKeyId, secretAccessKey, region = 'auto', expiresIn = 300, date = new Date(), query = {} }) => {
+  const url = new URL(objectUrl);
+  const amzDate = date.toISOString().replace(/[:-]|\.\d{3}/g, '');
+  const shortDate = amzDate.slice(0, 8);
+  const scope = `${shortDate}/${region}/s3/aws4_request`;
+
+  const params = {
+    ...query,
+    'X-Amz-Algorithm': 'AWS4-HMAC-SHA256',
+    'X-Amz-Credential': `${accessKeyId}/${scope}`,
+    'X-Amz-Date': amzDate,
+    'X-Amz-Expires': String(expiresIn),
+    'X-Amz-SignedHeaders': 'host',
+  };
+  const canonicalQuery = Object.keys(params)
+    .sort()
+    .map((name) => `${encodeRfc3986(name)}=${encodeRfc3986(params[name])}`)
+    .join('&');
+
+  const canonicalRequest = [
+    'GET',
+    url.pathname,
+    canonicalQuery,
+    `host:${url.host}\n`,
+    'host',
+    'UNSIGNED-PAYLOAD',
+  ].join('\n');
+
+  const stringToSign = [
+    'AWS4-HMAC-SHA256',
+    amzDate,
+    scope,
+    crypto.createHash('sha256').update(canonicalRequest, 'utf8').digest('hex'),
+  ].join('\n');
+
+  const signingKey = hmac(hmac(hmac(hmac(`AWS4${secretAccessKey}`, shortDate), region), 's3'), 'aws4_request');
+  const signature = crypto.createHmac('sha256', signingKey).update(stringToSign, 'utf8').digest('hex');
+
+  return `${url.origin}${url.pathname}?${canonicalQuery}&X-Amz-Signature=${signature}`;
+};
+
+/**
+ * R2 객체 다운로드용 presigned URL 생성 (클라이언트가 R2에서 직접 다운로드)
+ * @param {string} key - R2 파일 경로
+ * @param {Object} options
+ * @param {number} [options.expiresIn] - 유효 시간 (초, 기본 R2_PRESIGN_EXPIRES 또는 300)
+ * @param {string} [options.fileName] - 다운로드 파일명 (Content-Disposition)
+ * @returns {string} presigned URL
+ */
+const getPresignedDownloadUrl = (key, { expiresIn = parseInt(process.env.R2_PRESIGN_EXPIRES) || 300, fileName } = {}) => {
+  const endpoint = process.env.R2_ENDPOINT.replace(/\/+$/, '');
+  // path-style 주소 (R2/S3 호환 서버 모두 지원)
+  const objectPath = [process.env.R2_BUCKET, ...key.split('/')].map(encodeRfc3986).join('/');
+
+  return presignUrl(`${endpoint}/${objectPath}`, {
+    accessKeyId: process.env.R2_ACCESS_KEY_ID,
+    secretAccessKey: process.env.R2_SECRET_ACCESS_KEY,
+    expiresIn,
+    query: fileName ? { 'response-content-disposition': `attachment; filename="${fileName}"` } : {},
+  });
+};
+
+/**
+ * 로컬 파일을 스트림으로 R2에 업로드 (파일 전체를 메모리에 올리지 않음)
+ * @param {string} key - R2 파일 경로
+ * @param {string} filePath - 업로드할 로컬 파일 경로
+ * @param {string} contentType - MIME 타입
+ * @returns {Promise} R2 업로드 응답
+ */
+const uploadFileToR2 = async (key, filePath, contentType = 'application/octet-stream') => {
+  const { size } = await fs.promises.stat(filePath);
+  return uploadToR2(key, fs.createReadStream(filePath), contentType, size);
+};
+
+/**
+ * R2 객체를 로컬 파일로 스트리밍 다운로드 (Buffer로 모으지 않음)
+ * @param {string} key - R2 파일 경로
+ * @param {string} filePath - 저장할 로컬 파일 경로
+ * @returns {Promise<number>} 저장된 바이트 수
+ */
+const downloadFromR2ToFile = async (key, filePath) => {
+  try {
+    const command = new GetObjectCommand({
+      Bucket: process.env.R2_BUCKET,
+      Key: key,
+    });
+
+    const response = await r2Client.send(command);
+    await pipeline(response.Body, fs.createWriteStream(filePath));
+
+    const { size } = await fs.promises.stat(filePath);
+    console.log(withTime(`✅ R2 다운로드 성공 (파일): ${key}`));
+    return size;
+  } catch (error) {
+    console.error(withTime(`❌ R2 다운로드 실패: ${key}`), error);
+    throw error;
+  }
+};
+
+/**
+ * R2 객체를 로컬 파일로 스트리밍 다운로드하면서 sha256 계산 (파일을 다시 읽지 않음)
+ * - 해시는 변환 합치기(SingleFlight) 키로 사용 → 워커 풀에서 입력을 다시 해시하지 않음
+ * @param {string} key - R2 파일 경로
+ * @param {string} filePath - 저장할 로컬 파일 경로
+ * @returns {Promise<{size: number, sha256: string}>} 저장된 바이트 수와 내용 해시
+ */
+const downloadFromR2ToFileWithHash = async (key, filePath) => {
+  try {
+    const command = new GetObjectCommand({
+      Bucket: process.env.R2_BUCKET,
+      Key: key,
+    });
+
+    const response = await r2Client.send(command);
+    const hash = crypto.createHash('sha256');
+    let size = 0;
+    const hasher = new Transform({
+      transform(chunk, encoding, done) {
+        hash.update(chunk);
+        size += chunk.length;
+        done(null, chunk);
+      },
+    });
+    await pipeline(response.Body, hasher, fs.createWriteStream(filePath));
+
+    console.log(withTime(`✅ R2 다운로드 성공 (파일): ${key}`));
+    return { size, sha256: hash.digest('hex') };
+  } catch (error) {
+    console.error(withTime(`❌ R2 다운로드 실패: ${key}`), error);
+    throw error;
+  }
+};
+
 /**
  * R2에서 파일 삭제
  * @param {string} key - R2 파일 경로
@@ -121,6 +307,71 @@ const deleteFromR2 = async (key) => {
   }
 };
 
+/**
+ * R2에서 여러 파일 일괄 삭제 (DeleteObjects, 요청당 최대 1000개)
+ * - 배치 요청은 최대 concurrency개까지 동시에 실행
+ * - 키별 실패는 응답의 Errors로 구분
+ * - 요청 자체가 실패하면(네트워크, 5xx, 인증 등) 키 상태를 알 수 없으므로 배치 전체를 retry로 반환
+ * @param {Array<string>} keys - 삭제할 R2 파일 경로 목록
+ * @param {Object} options
+ * @param {number} [options.concurrency] - 동시 배치 요청 수 (기본 R2_DELETE_CONCURRENCY 또는 4)
+ * @param {Function} [options.onBatch] - 배치 완료마다 호출 ({ deleted, errors, retry })
+ * @returns {Promise<{deleted: Array<string>, errors: Array<{key, code, message}>, retry: Array<string>}>}
+ */
+const deleteManyFromR2 = async (keys, { concurrency = DELETE_CONCURRENCY, onBatch } = {}) => {
+  const batches = [];
+  for (let i = 0; i < keys.length; i += DELETE_BATCH_SIZE) {
+    batches.push(keys.slice(i, i + DELETE_BATCH_SIZE));
+  }
+
+  const deleted = [];
+  const errors = [];
+  const retry = [];
+  let nextBatch = 0;
+
+  const deleteBatch = async (batch) => {
+    try {
+      const command = new DeleteObjectsCommand({
+        Bucket: process.env.R2_BUCKET,
+        Delete: {
+          Objects: batch.map((key) => ({ Key: key })),
+          Quiet: true, // 성공한 키는 응답에서 생략 (실패만 반환)
+        },
+      });
+
+      const response = await r2Client.send(command);
+      const batchErrors = (response.Errors || []).map((err) => ({
+        key: err.Key,
+        code: err.Code,
+        message: err.Message,
+      }));
+      const failedKeys = new Set(batchErrors.map((err) => err.key));
+      return { deleted: batch.filter((key) => !failedKeys.has(key)), errors: batchErrors, retry: [] };
+    } catch (error) {
+      console.error(withTime(`❌ R2 일괄 삭제 요청 실패 (${batch.length}개, 다음 주기에 재시도): ${error.message}`));
+      return { deleted: [], errors: [], retry: batch };
+    }
+  };
+
+  const runWorker = async () => {
+    while (nextBatch < batches.length) {
+      const batch = batches[nextBatch++];
+      const result = await deleteBatch(batch);
+      deleted.push(...result.deleted);
+      errors.push(...result.errors);
+      retry.push(...result.retry);
+      if (onBatch) await onBatch(result);
+    }
+  };
+
+  await Promise.all(
+    Array.from({ length: Math.min(concurrency, batches.length) }, runWorker)
+  );
+
+  console.log(withTime(`✅ R2 일괄 삭제 완료 (성공: ${deleted.length}, 실패: ${errors.length}, 재시도: ${retry.length})`));
+  return { deleted, errors, retry };
+};
+
 /**
  * 파일 경로 생성 (타임스탐프로 충돌 방지)
  * @param {string} originalName - 원본 파일명
@@ -137,8 +388,15 @@ const generateR2Path = (originalName, folder = 'uploads') => {
 module.exports = {
   r2Client,
   uploadToR2,
+  uploadFileToR2,
   downloadFromR2,
+  downloadFromR2ToFile,
+  downloadFromR2ToFileWithHash,
+  getR2ObjectStream,
+  getPresignedDownloadUrl,
+  presignUrl,
   deleteFromR2,
+  deleteManyFromR2,
   generateR2Path,
   isR2Configured,
   logR2Status,
@@ -1,4 +1,35 @@
+const cluster = require('cluster');
 const rateLimit = require('express-rate-limit');
+const { SqliteRateLimitStore } = require('../utils/rateLimitStore');
+
+// 루프백 주소 (IPv4 / IPv6 / IPv4-mapped IPv6)
+const LOOPBACK_IPS = ['127.0.0.1', '::1', '::ffff:127.0.0.1'];
+
+/**
+ * 개발 환경의 로컬 요청이면 rate limit 제외
+ * - 서버가 듀얼 스택(::)으로 listen하면 127.0.0.1 요청도 ::ffff:127.0.0.1로 들어옴
+ */
+const isLocalDevRequest = (req) => {
+  return LOOPBACK_IPS.includes(req.ip) && process.env.NODE_ENV === 'development';
+};
+
+/**
+ * 작업 상태 폴링(GET /api/jobs/:jobId) 여부
+ * - 2초 간격 폴링이 일반 API 한도를 소진하지 않도록 jobPollLimiter로 따로 제한
+ */
+const isJobStatusPoll = (req) => {
+  return req.method === 'GET' && req.originalUrl.startsWith('/api/jobs/');
+};
+
+/**
+ * 리미터 저장소 선택
+ * - 클러스터 워커: 모든 HTTP 프로세스가 공유하는 SQLite 카운터
+ * - 단일 프로세스: express-rate-limit 기본 MemoryStore (DB 왕복 없음)
+ * @param {string} prefix - 리미터 이름
+ */
+const storeOptions = (prefix) => {
+  return cluster.isWorker ? { store: new SqliteRateLimitStore({ prefix }) } : {};
+};
 
 /**
  * 로그인 API용 Rate Limiter
@@ -10,10 +41,9 @@ const loginLimiter = rateLimit({
   message: '로그인 시도가 너무 많습니다. 15분 후 다시 시도하세요.',
   standardHeaders: true, // RateLimit 헤더 반환
   legacyHeaders: false, // X-RateLimit 헤더 비활성화
-  skip: (req, res) => {
-    // 옵션: 특정 IP는 제한 제외 (예: localhost 개발 환경)
-    return req.ip === '127.0.0.1' && process.env.NODE_ENV === 'development';
-  }
+  ...storeOptions('login'),
+  // 옵션: 특정 IP는 제한 제외 (예: localhost 개발 환경)
+  skip: isLocalDevRequest
 });
 
 /**
@@ -26,9 +56,8 @@ const generalLimiter = rateLimit({
   message: '요청이 너무 많습니다. 잠시 후 다시 시도하세요.',
   standardHeaders: true,
   legacyHeaders: false,
-  skip: (req, res) => {
-    return req.ip === '127.0.0.1' && process.env.NODE_ENV === 'development';
-  }
+  ...storeOptions('general'),
+  skip: (req) => isLocalDevRequest(req) || isJobStatusPoll(req)
 });
 
 /**
@@ -41,9 +70,8 @@ const uploadLimiter = rateLimit({
   message: '업로드가 너무 많습니다. 15분 후 다시 시도하세요.',
   standardHeaders: true,
   legacyHeaders: false,
-  skip: (req, res) => {
-    return req.ip === '127.0.0.1' && process.env.NODE_ENV === 'development';
-  }
+  ...storeOptions('upload'),
+  skip: isLocalDevRequest
 });
 
 /**
@@ -56,14 +84,28 @@ const adminLimiter = rateLimit({
   message: '요청이 너무 많습니다. 15분 후 다시 시도하세요.',
   standardHeaders: true,
   legacyHeaders: false,
-  skip: (req, res) => {
-    return req.ip === '127.0.0.1' && process.env.NODE_ENV === 'development';
-  }
+  ...storeOptions('admin'),
+  skip: isLocalDevRequest
+});
+
+/**
+ * 작업 상태 폴링용 Rate Limiter
+ * 15분 내 1000회 이상 요청하면 차단 (2초 간격 폴링 기준 여유 있게)
+ */
+const jobPollLimiter = rateLimit({
+  windowMs: 15 * 60 * 1000, // 15분
+  max: 1000, // 최대 1000회 요청
+  message: '요청이 너무 많습니다. 잠시 후 다시 시도하세요.',
+  standardHeaders: true,
+  legacyHeaders: false,
+  ...storeOptions('job-poll'),
+  skip: isLocalDevRequest
 });
 
 module.exports = {
   loginLimiter,
   generalLimiter,
   uploadLimiter,
-  adminLimiter
+  adminLimiter,
+  jobPollLimiter
 };
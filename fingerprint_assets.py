@@ -0,0 +1,134 @@
+"""
+================================
+🔖 정적 자산 파일명 해시
+================================
+자주 요청되는 자산을 내용 해시가 들어간 파일명으로 복사하고 HTML 참조를 바꿈
+    styles.css → styles.1a2b3c4d.css
+- 해시 파일은 내용이 바뀌면 이름도 바뀌므로 서버가 immutable + 1년 캐시로 전송
+  (utils/assetCache.js)
+- 원본 파일은 그대로 유지 (해시 파일을 참조하지 않는 곳에서도 동작)
+- 참조 재작성은 이미 해시된 이름도 현재 해시로 바꾸므로 멱등
+- HTML 참조 재작성은 build_static.py 의 fingerprint 변환으로 실행 (결과 페이지는 커밋)
+- 해시 파일은 커밋하지 않고 배포 빌드에서 생성 (npm run build, .gitignore)
+
+사용법:
+    python3 fingerprint_assets.py           # 해시 파일 생성 + 이전 해시 파일 삭제
+"""
+
+import hashlib
+import re
+import sys
+from pathlib import Path
+
+PUBLIC_DIR = Path(__file__).resolve().parent / "public"
+
+# 해시할 자산 (public 기준 경로)
+FINGERPRINT_ASSETS = [
+    "styles.css",
+    "script.js",
+    "admin/styles.css",
+    "admin/script.js",
+    "og-image.png",
+]
+
+# utils/assetCache.js 의 FINGERPRINT_PATTERN 과 같은 길이
+HASH_LENGTH = 8
+
+
+def fingerprint_name(rel_path, data):
+    """styles.css + 내용 → styles.<해시>.css"""
+    path = Path(rel_path)
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+
+def hashed_pattern(rel_path):
+    """원본 이름 또는 임의 해시가 붙은 이름과 일치하는 파일명 정규식"""
+    path = Path(rel_path)
+    return rf"{re.escape(path.stem)}(?:\.[0-9a-f]{{{HASH_LENGTH}}})?{re.escape(path.suffix)}"
+
+
+def compute_asset_map(public_dir):
+    """
+    @returns {'styles.css': 'styles.1a2b3c4d.css', ...} (없는 자산은 제외)
+    """
+    asset_map = {}
+    for rel_path in FINGERPRINT_ASSETS:
+        source = Path(public_dir) / rel_path
+        if source.exists():
+            asset_map[rel_path] = fingerprint_name(rel_path, source.read_bytes())
+    return asset_map
+
+
+def sync_fingerprinted_files(public_dir, asset_map, write=True):
+    """
+    해시 파일 생성 + 이전 해시 파일 삭제
+    @returns (생성할/생성한 경로 목록, 삭제할/삭제한 경로 목록)
+    """
+    public_dir = Path(public_dir)
+    created, removed = [], []
+
+    for rel_path, hashed in asset_map.items():
+        source = public_dir / rel_path
+        target = public_dir / hashed
+        if not target.exists():
+            created.append(target)
+            if write:
+                target.write_bytes(source.read_bytes())
+
+        stale = re.compile(rf"{re.escape(source.stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(source.suffix)}")
+        for candidate in source.parent.iterdir():
+            if candidate.name != target.name and stale.fullmatch(candidate.name):
+                removed.append(candidate)
+                if write:
+                    candidate.unlink()
+
+    return created, removed
+
+
+def compile_rewriter(asset_map):
+    """
+    HTML 속성 값 안의 자산 참조를 해시 이름으로 바꾸는 함수 생성
+    - "styles.css", "/styles.css", "https://도메인/styles.css" 형태 모두 처리
+    - 쿼리/프래그먼트(?v=1, #x)는 유지
+    """
+    if not asset_map:
+        return lambda content: content
+
+    alternatives = []
+    replacements = {}
+    for index, (rel_path, hashed) in enumerate(asset_map.items()):
+        parent = Path(rel_path).parent.as_posix()
+        directory = "" if parent == "." else re.escape(parent) + "/"
+        alternatives.append(f"(?P<a{index}>{directory}{hashed_pattern(rel_path)})")
+        replacements[f"a{index}"] = hashed
+
+    pattern = re.compile(
+        r"""(?P<prefix>["'](?:(?:https?:)?//[^"'/\s]+)?/?)(?:"""
+        + "|".join(alternatives)
+        + r""")(?=["'?#])"""
+    )
+
+    def replace(match):
+        return match.group("prefix") + replacements[match.lastgroup]
+
+    return lambda content: pattern.sub(replace, content)
+
+
+def rewrite_asset_references(content, asset_map):
+    return compile_rewriter(asset_map)(content)
+
+
+def main():
+    asset_map = compute_asset_map(PUBLIC_DIR)
+    created, removed = sync_fingerprinted_files(PUBLIC_DIR, asset_map)
+    for path in created:
+        print(f"🔖 생성: {path.relative_to(PUBLIC_DIR).as_posix()}")
+    for path in removed:
+        print(f"🗑️  삭제: {path.relative_to(PUBLIC_DIR).as_posix()}")
+    print(f"🔖 해시 자산 {len(asset_map)}개 (+{len(created)} / -{len(removed)})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
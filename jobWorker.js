@@ -0,0 +1,189 @@
+/**
+ * ================================
+ * 🛠️ 변환 작업 워커 프로세스
+ * ================================
+ * jobs 테이블에서 작업을 점유해 실행하는 독립 프로세스 (node jobWorker.js)
+ * - 웹 서버와 별개로 원하는 수만큼 실행 → 웹 계층과 무관하게 변환 용량 확장
+ * - 작업마다 lease를 heartbeat로 연장, lease를 잃으면 변환 취소 후 결과 기록 안 함
+ * - 실패 시 jobQueue의 backoff 재시도, 종료 신호를 받으면 새 작업 점유 중단 후 진행 중 작업 완료 대기
+ * - 입력/결과는 R2(또는 R2_ENDPOINT의 S3 호환 서버)로 주고받음, DB는 웹 서버와 같은 SQLite 파일(DB_PATH)
+ *
+ * 환경변수:
+ *   JOB_WORKER_CONCURRENCY - 동시에 실행할 작업 수 (기본: CONVERTER_MAX_THREADS 또는 CPU 코어 수)
+ *   JOB_WORKER_FORMATS     - 처리할 형식 (쉼표 구분, 기본: 전체)
+ *   JOB_POLL_MS            - 작업이 없을 때 다음 점유 시도까지 대기 (기본 1초)
+ *   JOB_LEASE_MS           - lease 길이 (기본 60초, heartbeat는 1/3 간격)
+ */
+
+const os = require('os');
+const db = require('./config/db');
+const { withTime } = require('./utils/logger');
+const { deleteFromR2, isR2Configured, logR2Status } = require('./config/r2');
+const { destroy: destroyPool } = require('./utils/converterPool');
+const {
+  JOB_LEASE_MS,
+  claimJob,
+  heartbeatJob,
+  completeJob,
+  failJob,
+  releaseJob,
+  recoverExpiredJobs
+} = require('./utils/jobQueue');
+const { JOB_FORMATS, isPermanentFailure, runConversionJob } = require('./utils/jobRunner');
+
+const WORKER_ID = `${os.hostname()}:${process.pid}`;
+const CONCURRENCY = parseInt(process.env.JOB_WORKER_CONCURRENCY)
+  || parseInt(process.env.CONVERTER_MAX_THREADS)
+  || os.cpus().length;
+const FORMATS = process.env.JOB_WORKER_FORMATS
+  ? process.env.JOB_WORKER_FORMATS.split(',').map((format) => format.trim()).filter((format) => JOB_FORMATS.includes(format))
+  : JOB_FORMATS;
+const POLL_MS = parseInt(process.env.JOB_POLL_MS) || 1000;
+const HEARTBEAT_MS = Math.max(1000, Math.floor(JOB_LEASE_MS / 3));
+const DRAIN_TIMEOUT_MS = 30000;
+
+let isShuttingDown = false;
+// 실행 중인 작업 ID → AbortController (종료 타임아웃 시 취소 후 반납)
+const running = new Map();
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * 점유한 작업 1건 실행 → 결과/실패 기록
+ * @param {Object} job - claimJob 결과
+ */
+async function processJob(job) {
+  const controller = new AbortController();
+  running.set(job.id, controller);
+  let leaseLost = false;
+
+  // lease 연장 (실패하면 다른 워커가 재점유했으므로 변환 취소)
+  const heartbeat = setInterval(() => {
+    try {
+      if (!heartbeatJob(db, job.id, WORKER_ID)) {
+        leaseLost = true;
+        console.warn(withTime(`⚠️  lease 상실 - 작업 취소: ${job.id}`));
+        controller.abort();
+      }
+    } catch (error) {
+      console.error(withTime(`❌ heartbeat 실패: ${job.id} (${error.message})`));
+    }
+  }, HEARTBEAT_MS);
+
+  try {
+    const result = await runConversionJob(job, { signal: controller.signal });
+
+    if (!completeJob(db, job.id, WORKER_ID, result)) {
+      console.warn(withTime(`⚠️  lease 상실 - 결과 기록 안 함: ${job.id}`));
+      return;
+    }
+    console.log(withTime(`✅ 큐 작업 완료: ${job.id} → ${result.fileName}`));
+
+    // 완료 기록 후 원본 삭제 (최선의 노력)
+    try {
+      await deleteFromR2(job.payload.r2Path);
+    } catch (deleteError) {
+      console.warn(withTime(`⚠️  원본 파일 삭제 실패 (무시하고 계속): ${job.payload.r2Path}`), deleteError.message);
+    }
+  } catch (error) {
+    if (leaseLost) return;
+
+    // 종료 중 취소 / 이 프로세스의 수용 한도 초과 → 시도 횟수 차감 없이 반납
+    if (controller.signal.aborted || error.code === 'ADMISSION_REJECTED') {
+      releaseJob(db, job.id, WORKER_ID);
+      console.warn(withTime(`↩️  큐 작업 반납: ${job.id} (${error.message})`));
+      return;
+    }
+
+    const outcome = failJob(db, job.id, WORKER_ID, error.message, { retry: !isPermanentFailure(error) });
+    if (outcome?.status === 'queued') {
+      console.warn(withTime(`🔁 큐 작업 재시도 예약: ${job.id} (${outcome.attempts}회 실패, ${new Date(outcome.run_at).toISOString()} 이후) - ${error.message}`));
+    } else {
+      console.error(withTime(`❌ 큐 작업 실패: ${job.id} - ${error.message}`));
+    }
+  } finally {
+    clearInterval(heartbeat);
+    running.delete(job.id);
+  }
+}
+
+/**
+ * 작업 슬롯 1개: 점유 → 실행을 반복 (작업이 없으면 POLL_MS 대기)
+ */
+async function runSlot() {
+  while (!isShuttingDown) {
+    let job = null;
+    try {
+      job = claimJob(db, { workerId: WORKER_ID, formats: FORMATS });
+    } catch (error) {
+      // SQLITE_BUSY 등 일시적 오류는 다음 주기에 재시도
+      console.error(withTime(`❌ 작업 점유 실패: ${error.message}`));
+    }
+
+    if (job) {
+      await processJob(job);
+    } else {
+      await sleep(POLL_MS);
+    }
+  }
+}
+
+/**
+ * lease가 끊긴 작업 회수 (다른 워커가 죽은 경우)
+ */
+function recoverJobs() {
+  try {
+    for (const { id, status } of recoverExpiredJobs(db)) {
+      console.warn(withTime(`♻️  lease 만료 작업 회수: ${id} → ${status}`));
+    }
+  } catch (error) {
+    console.error(withTime(`❌ lease 만료 작업 회수 실패: ${error.message}`));
+  }
+}
+
+async function shutdown(signal) {
+  if (isShuttingDown) return;
+  isShuttingDown = true;
+
+  console.log(withTime(`\n🛑 ${signal} 수신 - 새 작업 점유 중단, 진행 중 ${running.size}개 완료 대기...`));
+
+  const deadline = Date.now() + DRAIN_TIMEOUT_MS;
+  while (running.size > 0 && Date.now() < deadline) {
+    await sleep(200);
+  }
+
+  // 타임아웃: 남은 작업 취소 → processJob이 반납 처리
+  if (running.size > 0) {
+    console.warn(withTime(`⚠️  ${DRAIN_TIMEOUT_MS / 1000}초 타임아웃 - 작업 ${running.size}개 취소 후 반납`));
+    for (const controller of running.values()) controller.abort();
+    while (running.size > 0) {
+      await sleep(100);
+    }
+  }
+
+  await destroyPool();
+  console.log(withTime('✅ 워커 종료 완료'));
+  process.exit(0);
+}
+
+if (!isR2Configured) {
+  logR2Status();
+  process.exit(1);
+}
+
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
+
+process.on('unhandledRejection', (reason) => {
+  console.error(withTime('❌ Unhandled Rejection:'), reason);
+});
+
+console.log(withTime(`🛠️  변환 작업 워커 시작: ${WORKER_ID} (동시 ${CONCURRENCY}개, 형식 ${FORMATS.length}개)`));
+logR2Status();
+
+setInterval(recoverJobs, HEARTBEAT_MS).unref();
+recoverJobs();
+
+for (let i = 0; i < CONCURRENCY; i++) {
+  runSlot();
+}
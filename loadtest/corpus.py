@@ -0,0 +1,273 @@
+"""
+================================
+🧪 부하 테스트용 입력 파일 생성
+================================
+mix 설정의 corpus 항목으로 실제와 비슷한 크기의 PDF(텍스트/표)/DOCX/PNG/WAV 파일을 만듦
+- 표준 라이브러리만 사용 (zlib/zipfile/wave)
+- 항목마다 variants 개의 서로 다른 파일 생성 → 동일 입력 합치기(single-flight)에
+  모든 요청이 묶여 처리량이 부풀려지지 않도록
+- spec이 같으면 기존 파일 재사용 (manifest.json)
+"""
+
+import hashlib
+import io
+import json
+import math
+import random
+import struct
+import wave
+import zipfile
+import zlib
+from pathlib import Path
+
+# corpus kind → (확장자, MIME)
+KINDS = {
+    "pdf": (".pdf", "application/pdf"),
+    "pdf-table": (".pdf", "application/pdf"),
+    "docx": (".docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "png": (".png", "image/png"),
+    "wav": (".wav", "audio/wav"),
+}
+
+LOREM = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua ut enim ad minim veniam quis nostrud"
+).split()
+
+
+def _sentence(rng, words=12):
+    return " ".join(rng.choice(LOREM) for _ in range(words)).capitalize() + "."
+
+
+# ---------- PDF ----------
+def _write_pdf(page_contents):
+    """페이지별 콘텐츠 스트림(str) → xref 포함 유효한 PDF 바이트"""
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    page_tree = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for text in page_contents:
+        content = zlib.compress(text.encode("latin-1"))
+        stream = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content) + content + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (page_tree, font, stream)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % page_tree
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[page_tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    return out.getvalue()
+
+
+def make_pdf(rng, pages=2, lines_per_page=40):
+    """텍스트 페이지로 이루어진 PDF"""
+    page_contents = []
+    for page in range(pages):
+        lines = [f"BT /F1 11 Tf 50 {780 - i * 18} Td ({_sentence(rng)}) Tj ET" for i in range(lines_per_page)]
+        lines.insert(0, f"BT /F1 16 Tf 50 810 Td (Page {page + 1}) Tj ET")
+        page_contents.append("\n".join(lines))
+    return _write_pdf(page_contents)
+
+
+def _table_cell(rng, col):
+    if col == 0:
+        return rng.choice(LOREM).capitalize() + f"-{rng.randint(1, 999)}"
+    if col % 2:
+        return f"{rng.uniform(0, 100000):,.2f}"
+    return rng.choice(LOREM)
+
+
+def make_table_pdf_with_rows(rng, pages=1, rows=15, cols=5, ruled=False):
+    """
+    페이지마다 설명 문단 + 표 1개인 PDF
+    @returns (PDF 바이트, 페이지별 표 셀 [[[str]]]) - 표 추출 품질 비교용 정답 포함
+    ruled=True면 셀 경계선을 그림 (괘선 표), False면 텍스트 정렬만 있는 표
+    """
+    col_width = 495 / cols
+    row_height = 20
+    page_contents, tables = [], []
+
+    for page in range(pages):
+        header = [f"Column {c + 1}" for c in range(cols)]
+        body = [[_table_cell(rng, c) for c in range(cols)] for _ in range(rows)]
+        table = [header] + body
+
+        ops = [f"BT /F1 14 Tf 50 800 Td (Report page {page + 1}) Tj ET"]
+        for i in range(3):
+            ops.append(f"BT /F1 10 Tf 50 {775 - i * 14} Td ({_sentence(rng, 14)}) Tj ET")
+
+        top = 720
+        for r, row in enumerate(table):
+            y = top - r * row_height
+            for c, text in enumerate(row):
+                ops.append(f"BT /F1 10 Tf {54 + c * col_width:.1f} {y - 14} Td ({text}) Tj ET")
+
+        if ruled:
+            bottom = top - len(table) * row_height
+            for r in range(len(table) + 1):
+                y = top - r * row_height
+                ops.append(f"50 {y} m 545 {y} l S")
+            for c in range(cols + 1):
+                x = 50 + c * col_width
+                ops.append(f"{x:.1f} {top} m {x:.1f} {bottom} l S")
+
+        y = top - len(table) * row_height - 30
+        for i in range(2):
+            ops.append(f"BT /F1 10 Tf 50 {y - i * 14} Td ({_sentence(rng, 14)}) Tj ET")
+
+        page_contents.append("\n".join(ops))
+        tables.append(table)
+
+    return _write_pdf(page_contents), tables
+
+
+def make_table_pdf(rng, pages=1, rows=15, cols=5, ruled=False):
+    return make_table_pdf_with_rows(rng, pages, rows, cols, ruled)[0]
+
+
+# ---------- DOCX ----------
+def make_docx(rng, paragraphs=100):
+    """최소 구성의 Word 문서 (LibreOffice가 열 수 있는 OOXML)"""
+    body = "".join(f"<w:p><w:r><w:t>{_sentence(rng, 20)}</w:t></w:r></w:p>" for _ in range(paragraphs))
+    parts = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            "</Types>"
+        ),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="word/document.xml"/></Relationships>'
+        ),
+        "word/document.xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f"<w:body>{body}</w:body></w:document>"
+        ),
+    }
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, xml in parts.items():
+            archive.writestr(name, xml)
+    return out.getvalue()
+
+
+# ---------- PNG ----------
+def make_png(rng, width=1600, height=1200, noise=0.3):
+    """그라디언트 + 노이즈 RGB 이미지 (noise가 클수록 사진처럼 압축률이 낮아짐)"""
+    phase = rng.random() * math.tau
+    rows = []
+    for y in range(height):
+        row = bytearray(b"\x00")  # filter: none
+        for x in range(width):
+            base = 128 + 100 * math.sin(phase + x / 90 + y / 140)
+            jitter = (rng.random() - 0.5) * 255 * noise
+            value = max(0, min(255, int(base + jitter)))
+            row += bytes((value, (value + x) & 0xFF, (value + y) & 0xFF))
+        rows.append(bytes(row))
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(b"".join(rows), 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+# ---------- WAV ----------
+def make_wav(rng, seconds=30, sample_rate=44100, channels=2):
+    """톤 + 노이즈 16bit PCM"""
+    frequency = rng.uniform(220, 880)
+    frames = bytearray()
+    for i in range(int(seconds * sample_rate)):
+        sample = int(12000 * math.sin(math.tau * frequency * i / sample_rate) + rng.uniform(-800, 800))
+        frames += struct.pack("<h", sample) * channels
+
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(bytes(frames))
+    return out.getvalue()
+
+
+GENERATORS = {
+    "pdf": lambda rng, spec: make_pdf(rng, spec.get("pages", 2), spec.get("lines_per_page", 40)),
+    "pdf-table": lambda rng, spec: make_table_pdf(
+        rng, spec.get("pages", 1), spec.get("rows", 15), spec.get("cols", 5), spec.get("ruled", False)
+    ),
+    "docx": lambda rng, spec: make_docx(rng, spec.get("paragraphs", 100)),
+    "png": lambda rng, spec: make_png(rng, spec.get("width", 1600), spec.get("height", 1200), spec.get("noise", 0.3)),
+    "wav": lambda rng, spec: make_wav(rng, spec.get("seconds", 30)),
+}
+
+
+def _spec_hash(name, spec, seed):
+    payload = json.dumps({"name": name, "spec": spec, "seed": seed}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def build_corpus(corpus_spec, out_dir, seed=1):
+    """
+    corpus 설정 → {이름: [{path, mime, size}, ...]}
+
+    corpus_spec 예: {"pdf-small": {"kind": "pdf", "pages": 2, "variants": 4}}
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    corpus = {}
+    for name, spec in corpus_spec.items():
+        kind = spec["kind"]
+        if kind not in GENERATORS:
+            raise ValueError(f"지원하지 않는 corpus kind: {kind} ({', '.join(GENERATORS)})")
+        ext, mime = KINDS[kind]
+        digest = _spec_hash(name, spec, seed)
+
+        files = []
+        for variant in range(spec.get("variants", 4)):
+            path = out_dir / f"{name}-{variant}{ext}"
+            if manifest.get(path.name) != digest or not path.exists():
+                rng = random.Random(f"{seed}:{name}:{variant}")
+                path.write_bytes(GENERATORS[kind](rng, spec))
+                manifest[path.name] = digest
+                print(f"🧪 생성: {path.name} ({path.stat().st_size / 1024:.0f}KB)")
+            files.append({"path": str(path), "mime": mime, "size": path.stat().st_size})
+        corpus[name] = files
+
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    return corpus
@@ -0,0 +1,652 @@
+"""
+================================
+🏋️ 엔드투엔드 부하 테스트
+================================
+로컬 S3 호환 서버(R2 대역)와 server.js를 띄우고
+/api/upload → /api/convert* → /api/download 전체 경로를 mix 설정대로 반복 실행
+
+리포트:
+- 전체/형식별 처리량, p50/p95/p99 지연 (단계별 upload/convert/download 포함)
+- 오류율 (503 수용 거절은 rejected로 별도 집계)
+- 서버 프로세스 트리(LibreOffice/Python 자식 포함) RSS/CPU 시계열
+- --baseline 지정 시 저장된 기준 결과와 비교, 회귀가 있으면 종료 코드 1
+
+사용법:
+    python3 loadtest/run.py --duration 60 --concurrency 8
+    python3 loadtest/run.py --save-baseline loadtest/baseline.json
+    python3 loadtest/run.py --baseline loadtest/baseline.json --tolerance 0.15
+    python3 loadtest/run.py --target http://localhost:3002   # 이미 떠 있는 서버 (R2 설정은 서버 몫)
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from corpus import build_corpus
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+LOADTEST_DIR = Path(__file__).resolve().parent
+ROOT_DIR = LOADTEST_DIR.parent
+DEFAULT_MIX = LOADTEST_DIR / "mix.json"
+REQUEST_TIMEOUT = 600
+PHASES = ("upload", "convert", "download")
+
+
+# ============ 유틸 ============
+def percentile(values, q):
+    """선형 보간 백분위수 (q: 0~100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_summary(values):
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    return {
+        "p50": round(percentile(values, 50), 1),
+        "p95": round(percentile(values, 95), 1),
+        "p99": round(percentile(values, 99), 1),
+        "mean": round(sum(values) / len(values), 1),
+        "max": round(max(values), 1),
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class HttpError(Exception):
+    def __init__(self, phase, status, body=""):
+        super().__init__(f"{phase}: HTTP {status} {body[:200]}")
+        self.phase = phase
+        self.status = status
+
+
+def _request(url, data=None, headers=None, method=None):
+    request = urllib.request.Request(url, data=data, headers=headers or {}, method=method)
+    return urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT)
+
+
+def _json_call(phase, url, data, headers):
+    try:
+        with _request(url, data, headers, "POST") as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        raise HttpError(phase, error.code, error.read().decode("utf-8", "replace")) from None
+
+
+def multipart_body(field, file_name, mime, content):
+    boundary = f"----loadtest{uuid.uuid4().hex}"
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{file_name}"\r\n'
+        f"Content-Type: {mime}\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return head + content + tail, f"multipart/form-data; boundary={boundary}"
+
+
+# ============ 작업 실행 ============
+def run_job(base_url, job, source):
+    """업로드 → 변환 → 다운로드 한 사이클, 단계별 소요 시간(ms) 반환"""
+    timings = {}
+    file_name = f"loadtest-{uuid.uuid4().hex[:8]}{Path(source['path']).suffix}"
+
+    started = time.perf_counter()
+    body, content_type = multipart_body("file", file_name, source["mime"], source["content"])
+    uploaded = _json_call("upload", f"{base_url}/api/upload", body, {"Content-Type": content_type})
+    timings["upload"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    payload = {"r2Path": uploaded["r2Path"], "originalName": file_name, **job.get("body", {})}
+    if job.get("format"):
+        payload["format"] = job["format"]
+    converted = _json_call(
+        "convert",
+        f"{base_url}{job['endpoint']}",
+        json.dumps(payload).encode("utf-8"),
+        {"Content-Type": "application/json"},
+    )
+    timings["convert"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    downloaded = 0
+    try:
+        with _request(f"{base_url}/api/download/{converted['fileId']}") as response:
+            while True:
+                chunk = response.read(256 * 1024)
+                if not chunk:
+                    break
+                downloaded += len(chunk)
+    except urllib.error.HTTPError as error:
+        raise HttpError("download", error.code, error.read().decode("utf-8", "replace")) from None
+    timings["download"] = (time.perf_counter() - started) * 1000
+
+    return timings, downloaded
+
+
+def classify_error(error):
+    if isinstance(error, HttpError):
+        kind = "rejected" if error.status == 503 else "error"
+        return kind, f"{error.phase}_http_{error.status}"
+    if isinstance(error, (TimeoutError, urllib.error.URLError)) and "timed out" in str(error):
+        return "error", "timeout"
+    if isinstance(error, (ConnectionError, urllib.error.URLError)):
+        return "error", "connection"
+    return "error", type(error).__name__
+
+
+class LoadRunner:
+    def __init__(self, base_url, jobs, corpus, concurrency, duration, warmup, seed):
+        self.base_url = base_url
+        self.jobs = jobs
+        self.weights = [job.get("weight", 1) for job in jobs]
+        self.concurrency = concurrency
+        self.duration = duration
+        self.warmup = warmup
+        self.seed = seed
+        self.results = []
+        self.lock = threading.Lock()
+
+        # 업로드마다 디스크를 읽지 않도록 미리 로드
+        self.corpus = {
+            name: [{**entry, "content": Path(entry["path"]).read_bytes()} for entry in entries]
+            for name, entries in corpus.items()
+        }
+
+    def _worker(self, index, measure_from, deadline):
+        rng = random.Random(self.seed * 1000 + index)
+        while time.monotonic() < deadline:
+            job = rng.choices(self.jobs, weights=self.weights)[0]
+            source = rng.choice(self.corpus[job["corpus"]])
+            started = time.monotonic()
+            record = {"job": job["name"], "input_bytes": len(source["content"]), "started": started}
+            try:
+                timings, output_bytes = run_job(self.base_url, job, source)
+                record.update(outcome="ok", phases=timings, output_bytes=output_bytes)
+            except Exception as error:  # noqa: BLE001 - 모든 실패를 결과로 기록
+                outcome, kind = classify_error(error)
+                record.update(outcome=outcome, error=kind, message=str(error)[:300])
+            record["finished"] = time.monotonic()
+            record["total_ms"] = (record["finished"] - started) * 1000
+            if started >= measure_from:
+                with self.lock:
+                    self.results.append(record)
+            if record["outcome"] == "rejected":
+                # 503 직후 바로 재요청해 거절을 부풀리지 않도록 잠시 대기
+                time.sleep(min(1.0, max(0.0, deadline - time.monotonic())))
+
+    def run(self):
+        start = time.monotonic()
+        measure_from = start + self.warmup
+        deadline = measure_from + self.duration
+        threads = [
+            threading.Thread(target=self._worker, args=(i, measure_from, deadline), daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return measure_from, time.monotonic()
+
+
+# ============ 리소스 샘플링 ============
+def _proc_tree_usage(root_pid):
+    """/proc 기반 프로세스 트리 RSS(bytes) / 누적 CPU(초) (psutil 없을 때)"""
+    ticks = os.sysconf("SC_CLK_TCK")
+    page = os.sysconf("SC_PAGE_SIZE")
+    parents = {}
+    stats = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{entry}/statm") as f:
+                rss_pages = int(f.read().split()[1])
+        except (OSError, IndexError):
+            continue
+        pid = int(entry)
+        parents[pid] = int(fields[1])
+        # utime, stime, cutime, cstime (stat 필드 14~17)
+        stats[pid] = ([int(v) for v in fields[11:15]], rss_pages * page)
+
+    if root_pid not in stats:
+        return None
+
+    tree = {root_pid}
+    changed = True
+    while changed:
+        changed = False
+        for pid, ppid in parents.items():
+            if ppid in tree and pid not in tree:
+                tree.add(pid)
+                changed = True
+
+    rss = sum(stats[pid][1] for pid in tree)
+    cpu_ticks = sum(stats[pid][0][0] + stats[pid][0][1] for pid in tree)
+    # 이미 종료·회수된 자식의 CPU 시간은 부모의 cutime/cstime에 누적됨
+    cpu_ticks += stats[root_pid][0][2] + stats[root_pid][0][3]
+    return rss, cpu_ticks / ticks
+
+
+def _psutil_tree_usage(root_pid):
+    try:
+        root = psutil.Process(root_pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+    rss = 0
+    cpu = 0.0
+    for process in processes:
+        try:
+            times = process.cpu_times()
+            rss += process.memory_info().rss
+            cpu += times.user + times.system
+        except psutil.Error:
+            continue
+    times = root.cpu_times()
+    cpu += getattr(times, "children_user", 0) + getattr(times, "children_system", 0)
+    return rss, cpu
+
+
+class ResourceSampler(threading.Thread):
+    def __init__(self, pid, interval=1.0):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self.stopped = threading.Event()
+        if psutil is not None:
+            self.usage = _psutil_tree_usage
+        elif os.path.isdir("/proc"):
+            self.usage = _proc_tree_usage
+        else:
+            self.usage = None
+
+    def run(self):
+        if self.usage is None:
+            print("⚠️  psutil이 없고 /proc도 없어 서버 RSS/CPU를 수집하지 않습니다.", file=sys.stderr)
+            return
+        previous = None
+        while not self.stopped.is_set():
+            now = time.monotonic()
+            usage = self.usage(self.pid)
+            if usage is None:
+                return
+            rss, cpu_seconds = usage
+            cpu_pct = None
+            if previous is not None:
+                elapsed = now - previous[0]
+                cpu_pct = max(0.0, (cpu_seconds - previous[1]) / elapsed * 100) if elapsed > 0 else 0.0
+            previous = (now, cpu_seconds)
+            self.samples.append({"at": now, "rss_mb": round(rss / 1024 / 1024, 1), "cpu_pct": cpu_pct})
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+        self.join(timeout=5)
+
+    def summary(self, start, end):
+        window = [s for s in self.samples if start <= s["at"] <= end]
+        cpu = [s["cpu_pct"] for s in window if s["cpu_pct"] is not None]
+        return {
+            "peak_rss_mb": max((s["rss_mb"] for s in window), default=None),
+            "mean_cpu_pct": round(sum(cpu) / len(cpu), 1) if cpu else None,
+            "peak_cpu_pct": round(max(cpu), 1) if cpu else None,
+            "timeline": [
+                {
+                    "t": round(s["at"] - start, 1),
+                    "rss_mb": s["rss_mb"],
+                    "cpu_pct": None if s["cpu_pct"] is None else round(s["cpu_pct"], 1),
+                }
+                for s in window
+            ],
+        }
+
+
+# ============ 로컬 환경 기동 ============
+class LocalStack:
+    """S3 대역 + server.js 프로세스를 띄우고 종료 시 정리"""
+
+    def __init__(self, workdir, server_env):
+        self.workdir = Path(workdir)
+        self.server_env = server_env
+        self.log = None
+        self.processes = []
+        self.server = None
+        self.standin_port = None
+        self.server_port = free_port()
+
+    def start(self):
+        standin = subprocess.Popen(
+            [sys.executable, str(LOADTEST_DIR / "s3_standin.py"), "--root", str(self.workdir / "s3")],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.processes.append(standin)
+        line = standin.stdout.readline()
+        if not line.startswith("LISTENING"):
+            raise RuntimeError(f"S3 대역 서버 시작 실패: {line!r}")
+        self.standin_port = int(line.split()[1])
+        print(f"🪣 S3 대역 서버: http://127.0.0.1:{self.standin_port}")
+
+        env = {
+            **os.environ,
+            "PORT": str(self.server_port),
+            # 로컬 요청은 rate limit 제외 (config/rateLimiter.js)
+            "NODE_ENV": "development",
+            "DB_PATH": str(self.workdir / "loadtest.db"),
+            "CONVERTER_SCRATCH_DIR": str(self.workdir / "scratch"),
+            "R2_ENDPOINT": f"http://127.0.0.1:{self.standin_port}",
+            "R2_BUCKET": "loadtest",
+            "R2_ACCESS_KEY_ID": "loadtest",
+            "R2_SECRET_ACCESS_KEY": "loadtest-secret",
+            "R2_FORCE_PATH_STYLE": "true",
+            **self.server_env,
+        }
+        self.log = open(self.workdir / "server.log", "w")
+        self.server = subprocess.Popen(
+            ["node", "server.js"], cwd=ROOT_DIR, env=env, stdout=self.log, stderr=subprocess.STDOUT
+        )
+        self.processes.append(self.server)
+        self._wait_healthy()
+        print(f"🚀 서버: {self.base_url} (pid {self.server.pid}, 로그 {self.workdir / 'server.log'})")
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def _wait_healthy(self, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.server.poll() is not None:
+                raise RuntimeError(f"서버가 종료되었습니다 (코드 {self.server.returncode}), 로그: {self.workdir / 'server.log'}")
+            try:
+                with _request(f"{self.base_url}/health"):
+                    return
+            except urllib.error.HTTPError:
+                # 503(overloaded)이어도 떠 있는 것
+                return
+            except OSError:
+                time.sleep(0.3)
+        raise RuntimeError("서버 /health 응답 대기 시간 초과")
+
+    def standin_stats(self):
+        try:
+            with _request(f"http://127.0.0.1:{self.standin_port}/_standin/stats") as response:
+                return json.loads(response.read())
+        except OSError:
+            return None
+
+    def stop(self):
+        for process in reversed(self.processes):
+            if process.poll() is None:
+                process.send_signal(signal.SIGTERM)
+        for process in reversed(self.processes):
+            try:
+                process.wait(timeout=35)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if self.log:
+            self.log.close()
+
+
+# ============ 리포트 ============
+def build_report(results, measure_from, measure_end, args, mix, resources, standin):
+    elapsed = max(measure_end - measure_from, 1e-9)
+    by_job = defaultdict(list)
+    for record in results:
+        by_job[record["job"]].append(record)
+
+    formats = {}
+    for job in mix["jobs"]:
+        records = by_job.get(job["name"], [])
+        ok = [r for r in records if r["outcome"] == "ok"]
+        errors = [r for r in records if r["outcome"] == "error"]
+        rejected = [r for r in records if r["outcome"] == "rejected"]
+        error_kinds = defaultdict(int)
+        for record in errors + rejected:
+            error_kinds[record["error"]] += 1
+        formats[job["name"]] = {
+            "count": len(records),
+            "ok": len(ok),
+            "errors": len(errors),
+            "rejected": len(rejected),
+            "error_rate": round(len(errors) / len(records), 4) if records else 0.0,
+            "throughput_per_min": round(len(ok) / elapsed * 60, 2),
+            "latency_ms": latency_summary([r["total_ms"] for r in ok]),
+            "phases": {phase: latency_summary([r["phases"][phase] for r in ok]) for phase in PHASES},
+            "error_kinds": dict(error_kinds),
+        }
+
+    ok_total = sum(f["ok"] for f in formats.values())
+    count_total = sum(f["count"] for f in formats.values())
+    errors_total = sum(f["errors"] for f in formats.values())
+    return {
+        "meta": {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "duration_s": round(elapsed, 1),
+            "warmup_s": args.warmup,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "mix": str(args.mix),
+            "git_commit": _git_commit(),
+        },
+        "summary": {
+            "jobs": count_total,
+            "ok": ok_total,
+            "errors": errors_total,
+            "rejected": sum(f["rejected"] for f in formats.values()),
+            "error_rate": round(errors_total / count_total, 4) if count_total else 0.0,
+            "throughput_per_min": round(ok_total / elapsed * 60, 2),
+            "latency_ms": latency_summary([r["total_ms"] for r in results if r["outcome"] == "ok"]),
+        },
+        "formats": formats,
+        "resources": resources,
+        "standin": standin,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _fmt(value, suffix=""):
+    return "-" if value is None else f"{value:,.0f}{suffix}"
+
+
+def print_report(report):
+    summary = report["summary"]
+    print("\n========== 부하 테스트 결과 ==========")
+    print(
+        f"⏱️  {report['meta']['duration_s']}s, 동시 {report['meta']['concurrency']} | "
+        f"작업 {summary['jobs']} (성공 {summary['ok']}, 오류 {summary['errors']}, 거절 {summary['rejected']}) | "
+        f"처리량 {summary['throughput_per_min']}/분"
+    )
+    header = f"{'job':<22}{'n':>6}{'ok':>6}{'err%':>7}{'rej':>5}{'/min':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in report["formats"].items():
+        latency = stats["latency_ms"]
+        print(
+            f"{name:<22}{stats['count']:>6}{stats['ok']:>6}{stats['error_rate'] * 100:>6.1f}%{stats['rejected']:>5}"
+            f"{stats['throughput_per_min']:>8}{_fmt(latency['p50']):>9}{_fmt(latency['p95']):>9}{_fmt(latency['p99']):>9}"
+        )
+        for kind, count in stats["error_kinds"].items():
+            print(f"    ⚠️  {kind}: {count}")
+
+    resources = report["resources"]
+    if resources and resources.get("peak_rss_mb") is not None:
+        print(
+            f"🧠 서버 RSS 최대 {resources['peak_rss_mb']}MB | "
+            f"CPU 평균 {_fmt(resources['mean_cpu_pct'], '%')} / 최대 {_fmt(resources['peak_cpu_pct'], '%')}"
+        )
+
+
+def compare_with_baseline(report, baseline, tolerance, error_tolerance):
+    """기준 결과 대비 회귀 목록 (p50/p95 지연·처리량·오류율·최대 RSS)"""
+    regressions = []
+
+    def slower(label, current, base):
+        if current is not None and base and current > base * (1 + tolerance):
+            regressions.append(f"{label}: {base:,.0f} → {current:,.0f} (+{(current / base - 1) * 100:.0f}%)")
+
+    base_summary = baseline.get("summary", {})
+    base_throughput = base_summary.get("throughput_per_min")
+    current_throughput = report["summary"]["throughput_per_min"]
+    if base_throughput and current_throughput < base_throughput * (1 - tolerance):
+        regressions.append(
+            f"처리량: {base_throughput}/분 → {current_throughput}/분 "
+            f"({(current_throughput / base_throughput - 1) * 100:.0f}%)"
+        )
+
+    for name, stats in report["formats"].items():
+        base = baseline.get("formats", {}).get(name)
+        if not base:
+            continue
+        for q in ("p50", "p95"):
+            slower(f"{name} {q}(ms)", stats["latency_ms"][q], base["latency_ms"].get(q))
+        if stats["error_rate"] > base.get("error_rate", 0) + error_tolerance:
+            regressions.append(
+                f"{name} 오류율: {base.get('error_rate', 0) * 100:.1f}% → {stats['error_rate'] * 100:.1f}%"
+            )
+
+    base_rss = (baseline.get("resources") or {}).get("peak_rss_mb")
+    current_rss = (report.get("resources") or {}).get("peak_rss_mb")
+    slower("서버 최대 RSS(MB)", current_rss, base_rss)
+
+    return regressions
+
+
+# ============ main ============
+def parse_args():
+    parser = argparse.ArgumentParser(description="convert-for-you 엔드투엔드 부하 테스트")
+    parser.add_argument("--mix", type=Path, default=DEFAULT_MIX, help="작업 mix/corpus 설정 JSON")
+    parser.add_argument("--duration", type=float, default=60, help="측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=10, help="측정 전 워밍업 (초, 결과에서 제외)")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 가상 사용자 수")
+    parser.add_argument("--seed", type=int, default=1, help="작업 선택/corpus 생성 시드")
+    parser.add_argument("--corpus-dir", type=Path, default=LOADTEST_DIR / ".corpus")
+    parser.add_argument("--out", type=Path, help="결과 JSON 경로 (기본 loadtest/results/<시각>.json)")
+    parser.add_argument("--target", help="이미 실행 중인 서버 URL (지정 시 로컬 서버/S3 대역을 띄우지 않음)")
+    parser.add_argument("--server-pid", type=int, help="--target 사용 시 RSS/CPU를 수집할 서버 PID")
+    parser.add_argument(
+        "--server-env", action="append", default=[], metavar="KEY=VALUE",
+        help="로컬 서버에 추가로 넘길 환경 변수 (예: CONVERTER_MAX_THREADS=4)",
+    )
+    parser.add_argument("--baseline", type=Path, help="비교할 기준 결과 JSON")
+    parser.add_argument("--save-baseline", type=Path, help="이번 결과를 기준 결과로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="지연/처리량/RSS 허용 변화율 (기본 15%%)")
+    parser.add_argument("--error-tolerance", type=float, default=0.01, help="오류율 허용 증가폭 (기본 1%%p)")
+    parser.add_argument("--keep-workdir", action="store_true", help="서버 로그/DB/S3 객체 디렉터리 보존")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    mix = json.loads(args.mix.read_text(encoding="utf-8"))
+
+    unknown = {job["corpus"] for job in mix["jobs"]} - set(mix["corpus"])
+    if unknown:
+        print(f"❌ mix에 정의되지 않은 corpus: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    print("🧪 corpus 준비...")
+    corpus = build_corpus(mix["corpus"], args.corpus_dir, args.seed)
+
+    stack = None
+    workdir = Path(tempfile.mkdtemp(prefix="convert-loadtest-"))
+    try:
+        if args.target:
+            base_url = args.target.rstrip("/")
+            server_pid = args.server_pid
+        else:
+            server_env = dict(item.split("=", 1) for item in args.server_env)
+            stack = LocalStack(workdir, server_env)
+            stack.start()
+            base_url = stack.base_url
+            server_pid = stack.server.pid
+
+        sampler = ResourceSampler(server_pid) if server_pid else None
+        if sampler:
+            sampler.start()
+
+        print(f"🏋️  부하 시작: 동시 {args.concurrency}, 워밍업 {args.warmup}s + 측정 {args.duration}s")
+        runner = LoadRunner(base_url, mix["jobs"], corpus, args.concurrency, args.duration, args.warmup, args.seed)
+        measure_from, measure_end = runner.run()
+
+        resources = None
+        if sampler:
+            sampler.stop()
+            resources = sampler.summary(measure_from, measure_end)
+        standin = stack.standin_stats() if stack else None
+    finally:
+        if stack:
+            stack.stop()
+        if args.keep_workdir:
+            print(f"📁 작업 디렉터리 보존: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = build_report(runner.results, measure_from, measure_end, args, mix, resources, standin)
+    print_report(report)
+
+    out = args.out or LOADTEST_DIR / "results" / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"💾 결과 저장: {out}")
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"📌 기준 결과 저장: {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_with_baseline(report, baseline, args.tolerance, args.error_tolerance)
+        if regressions:
+            print(f"\n❌ 기준 대비 회귀 {len(regressions)}건 ({args.baseline}):")
+            for line in regressions:
+                print(f"   - {line}")
+            return 1
+        print(f"\n✅ 기준 대비 회귀 없음 ({args.baseline}, 허용 {args.tolerance * 100:.0f}%)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
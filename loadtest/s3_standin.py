@@ -0,0 +1,312 @@
+"""
+================================
+🪣 로컬 S3 호환 서버 (R2 대역)
+================================
+부하 테스트에서 R2 대신 사용하는 최소 S3 호환 서버 (표준 라이브러리만 사용)
+- path-style 주소만 지원: /<bucket>/<key>
+- PutObject / GetObject(Range) / HeadObject / DeleteObject / DeleteObjects
+- 서명(SigV4)은 검증하지 않음 (로컬 전용)
+- aws-chunked 업로드(@aws-sdk 체크섬 trailer) 디코딩
+- GET /_standin/stats 로 요청 수/바이트 통계 조회
+
+사용법:
+    python3 loadtest/s3_standin.py --port 9000 --root /tmp/s3-standin
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import quote, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+DELETE_KEY_PATTERN = re.compile(r"<Key>(.*?)</Key>", re.S)
+COPY_CHUNK = 1024 * 1024
+
+
+class ObjectStore:
+    """키 → 디스크 파일 (메모리에 객체를 쌓지 않음)"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.stats = {"put": 0, "get": 0, "head": 0, "delete": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def path_for(self, bucket, key):
+        return self.root / quote(bucket, safe="") / quote(key, safe="")
+
+    def count(self, op, nbytes=0, direction=None):
+        with self.lock:
+            self.stats[op] += 1
+            if direction:
+                self.stats[direction] += nbytes
+
+    def snapshot(self):
+        with self.lock:
+            objects = sum(1 for p in self.root.glob("*/*") if not p.name.endswith(".part"))
+            return {**self.stats, "objects": objects}
+
+
+def xml_error(code, message, resource=""):
+    body = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f"<Error><Code>{code}</Code><Message>{escape(message)}</Message>"
+        f"<Resource>{escape(resource)}</Resource></Error>"
+    )
+    return body.encode("utf-8")
+
+
+def parse_range(header, size):
+    """단일 바이트 범위 → (start, end) 포함 구간, 만족 불가면 None"""
+    match = RANGE_PATTERN.match(header or "")
+    if not match or (not match.group(1) and not match.group(2)):
+        return "ignore"
+    first, last = match.group(1), match.group(2)
+    if not first:
+        length = int(last)
+        if length == 0:
+            return None
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "S3Standin/1.0"
+    protocol_version = "HTTP/1.1"
+
+    # 요청마다 로그를 찍으면 부하 테스트 출력이 묻힘
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    @property
+    def store(self):
+        return self.server.store
+
+    def _target(self):
+        parts = urlsplit(self.path)
+        segments = parts.path.lstrip("/").split("/", 1)
+        bucket = unquote(segments[0]) if segments[0] else ""
+        key = unquote(segments[1]) if len(segments) > 1 else ""
+        return bucket, key, parts.query
+
+    def _send(self, status, body=b"", headers=None, content_type="application/xml"):
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _read_http_body(self):
+        """Content-Length 또는 Transfer-Encoding: chunked 본문을 청크 단위로 반환"""
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # trailer 헤더 소진
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+                yield self.rfile.read(size)
+                self.rfile.readline()
+        else:
+            remaining = int(self.headers.get("Content-Length") or 0)
+            while remaining > 0:
+                chunk = self.rfile.read(min(COPY_CHUNK, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+
+    def _is_aws_chunked(self):
+        encoding = self.headers.get("Content-Encoding", "").lower()
+        sha_header = self.headers.get("x-amz-content-sha256", "")
+        return "aws-chunked" in encoding or sha_header.startswith("STREAMING-")
+
+    def _read_object_body(self):
+        """업로드 본문 (aws-chunked 포맷이면 청크 헤더/trailer를 벗겨냄)"""
+        raw = self._read_http_body()
+        if not self._is_aws_chunked():
+            yield from raw
+            return
+
+        buffer = b""
+        for chunk in raw:
+            buffer += chunk
+            while True:
+                line_end = buffer.find(b"\r\n")
+                if line_end < 0:
+                    break
+                size = int(buffer[:line_end].split(b";")[0] or b"0", 16)
+                if size == 0:
+                    # 마지막 청크 뒤 trailer(x-amz-checksum-*)는 버림
+                    for _ in raw:
+                        pass
+                    return
+                if len(buffer) < line_end + 2 + size + 2:
+                    break
+                start = line_end + 2
+                yield buffer[start:start + size]
+                buffer = buffer[start + size + 2:]
+
+    # ---------- PUT ----------
+    def do_PUT(self):
+        bucket, key, _ = self._target()
+        if not key:
+            # CreateBucket
+            self.store.path_for(bucket, "x").parent.mkdir(parents=True, exist_ok=True)
+            for _ in self._read_http_body():
+                pass
+            return self._send(200)
+
+        target = self.store.path_for(bucket, key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + f".{threading.get_ident()}.part")
+        digest = hashlib.md5()
+        size = 0
+        with open(partial, "wb") as f:
+            for chunk in self._read_object_body():
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+        os.replace(partial, target)
+
+        self.store.count("put", size, "bytes_in")
+        self._send(200, headers={"ETag": f'"{digest.hexdigest()}"'})
+
+    # ---------- GET / HEAD ----------
+    def do_GET(self):
+        if self.path.startswith("/_standin/stats"):
+            body = json.dumps(self.store.snapshot()).encode("utf-8")
+            return self._send(200, body, content_type="application/json")
+        self._get_object(head=False)
+
+    def do_HEAD(self):
+        self._get_object(head=True)
+
+    def _get_object(self, head):
+        bucket, key, _ = self._target()
+        target = self.store.path_for(bucket, key)
+        if not key or not target.is_file():
+            return self._send(404, xml_error("NoSuchKey", "The specified key does not exist.", key))
+
+        size = target.stat().st_size
+        byte_range = parse_range(self.headers.get("Range"), size)
+        if byte_range is None:
+            return self._send(
+                416,
+                xml_error("InvalidRange", "The requested range is not satisfiable", key),
+                headers={"Content-Range": f"bytes */{size}"},
+            )
+
+        status = 200
+        start, end = 0, size - 1
+        headers = {"Accept-Ranges": "bytes", "ETag": f'"{size:x}-{int(target.stat().st_mtime_ns):x}"'}
+        if byte_range != "ignore":
+            status = 206
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        length = max(0, end - start + 1)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        if head:
+            self.store.count("head")
+            return
+
+        with open(target, "rb") as f:
+            f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = f.read(min(COPY_CHUNK, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+        self.store.count("get", length, "bytes_out")
+
+    # ---------- DELETE ----------
+    def do_DELETE(self):
+        bucket, key, _ = self._target()
+        try:
+            self.store.path_for(bucket, key).unlink()
+        except FileNotFoundError:
+            pass
+        self.store.count("delete")
+        self._send(204)
+
+    # ---------- POST ?delete (DeleteObjects) ----------
+    def do_POST(self):
+        bucket, _, query = self._target()
+        body = b"".join(self._read_http_body()).decode("utf-8", "replace")
+        if "delete" not in query:
+            return self._send(501, xml_error("NotImplemented", "Only DeleteObjects is supported."))
+
+        deleted = []
+        for raw_key in DELETE_KEY_PATTERN.findall(body):
+            key = raw_key.replace("&lt;", "<").replace("&gt;", ">").replace("&quot;", '"').replace("&amp;", "&")
+            try:
+                self.store.path_for(bucket, key).unlink()
+            except FileNotFoundError:
+                pass
+            self.store.count("delete")
+            deleted.append(f"<Deleted><Key>{escape(key)}</Key></Deleted>")
+
+        result = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<DeleteResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"{''.join(deleted)}</DeleteResult>"
+        )
+        self._send(200, result.encode("utf-8"))
+
+
+def create_server(root, host="127.0.0.1", port=0, verbose=False):
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.store = ObjectStore(root)
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 S3 호환 서버 (부하 테스트용 R2 대역)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0이면 빈 포트 자동 선택")
+    parser.add_argument("--root", required=True, help="객체 저장 디렉터리")
+    parser.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    args = parser.parse_args()
+
+    server = create_server(args.root, args.host, args.port, args.verbose)
+    # 부모 프로세스(run.py)가 이 줄에서 포트를 읽음
+    print(f"LISTENING {server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+/**
+ * ================================
+ * 💾 Multer 스크래치 디스크 저장소
+ * ================================
+ * 업로드 스트림을 메모리에 모으지 않고 작업별 스크래치 디렉토리에 바로 기록
+ * - 기록하면서 sha256 해시와 크기를 함께 계산 (파일을 다시 읽지 않음)
+ * - 앞부분 바이트로 Magic Number 검증 → 불일치 시 즉시 중단하고 파일 삭제
+ * - req.file: { path, scratchDir, size, sha256, detectedType, ... }
+ */
+
+const fs = require('fs');
+const path = require('path');
+const crypto = require('crypto');
+const { Transform } = require('stream');
+const { pipeline } = require('stream/promises');
+const { createScratchDir, removeScratchDir, safeExtension } = require('../utils/scratch');
+
+// Magic Number 검증에 사용하는 앞부분 바이트 수
+const SNIFF_BYTES = 64;
+
+/**
+ * 해시/크기 계산 + 앞부분 바이트 검증을 하는 통과 스트림
+ * @param {Object} file - multer 파일 정보
+ * @param {Function} validate - (head, file) => { valid, error, type }
+ */
+function createInspector(file, validate) {
+  const hash = crypto.createHash('sha256');
+  const chunks = [];
+  let headLength = 0;
+  let checked = false;
+
+  const inspector = new Transform({
+    transform(chunk, encoding, done) {
+      inspector.size += chunk.length;
+      hash.update(chunk);
+
+      if (!checked) {
+        chunks.push(chunk);
+        headLength += chunk.length;
+        if (headLength >= SNIFF_BYTES) {
+          const error = check();
+          if (error) return done(error);
+        }
+      }
+      done(null, chunk);
+    },
+    flush(done) {
+      // 파일이 SNIFF_BYTES보다 작은 경우
+      const error = checked ? null : check();
+      if (error) return done(error);
+      inspector.sha256 = hash.digest('hex');
+      done();
+    }
+  });
+
+  function check() {
+    checked = true;
+    const head = Buffer.concat(chunks).subarray(0, SNIFF_BYTES);
+    chunks.length = 0;
+    const result = validate(head, file);
+    if (!result.valid) {
+      const error = new Error(result.error);
+      error.code = 'INVALID_FILE_TYPE';
+      return error;
+    }
+    inspector.detectedType = result.type || null;
+    return null;
+  }
+
+  inspector.size = 0;
+  inspector.sha256 = null;
+  inspector.detectedType = null;
+  return inspector;
+}
+
+class ScratchStorage {
+  /**
+   * @param {Object} [options]
+   * @param {Function} [options.validate] - (head, file) => { valid, error, type }
+   * @param {string} [options.prefix] - 스크래치 디렉토리 접두사
+   */
+  constructor(options = {}) {
+    this.validate = options.validate || (() => ({ valid: true }));
+    this.prefix = options.prefix || 'upload';
+  }
+
+  _handleFile(req, file, cb) {
+    let scratchDir;
+
+    (async () => {
+      scratchDir = await createScratchDir(this.prefix);
+      const filePath = path.join(scratchDir, `source${safeExtension(file.originalname)}`);
+      const inspector = createInspector(file, this.validate);
+
+      await pipeline(file.stream, inspector, fs.createWriteStream(filePath));
+
+      return {
+        path: filePath,
+        scratchDir,
+        size: inspector.size,
+        sha256: inspector.sha256,
+        detectedType: inspector.detectedType
+      };
+    })().then(
+      (info) => cb(null, info),
+      async (error) => {
+        // 검증 실패/스트림 오류 시 부분 기록된 파일까지 정리
+        await removeScratchDir(scratchDir);
+        cb(error);
+      }
+    );
+  }
+
+  _removeFile(req, file, cb) {
+    // 크기 제한 초과 등으로 multer가 업로드를 취소한 경우
+    removeScratchDir(file.scratchDir).then(() => cb(null), cb);
+  }
+}
+
+/**
+ * 스크래치 디스크 저장소 생성
+ * @param {Object} [options] - ScratchStorage 옵션
+ * @returns {ScratchStorage}
+ */
+function scratchStorage(options) {
+  return new ScratchStorage(options);
+}
+
+module.exports = scratchStorage;
+module.exports.SNIFF_BYTES = SNIFF_BYTES;
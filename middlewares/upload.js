@@ -1,158 +1,169 @@
 const multer = require('multer');
-const FileType = require('file-type');
+const scratchStorage = require('./scratchStorage');
+const { MAX_FILE_SIZE } = require('../utils/constants');
+
+const ascii = (head, start, end) => head.toString('latin1', start, end);
+const bytesAt = (head, offset, bytes) => bytes.every((byte, i) => head[offset + i] === byte);
+
+// ISO-BMFF(ftyp) 브랜드 → 세부 타입
+const HEIF_BRANDS = ['heic', 'heix', 'hevc', 'hevx', 'heim', 'heis', 'mif1', 'msf1'];
 
 /**
- * 파일 타입 검증 (Magic Number 확인)
- * MIME type 스푸핑 방지
+ * Magic Number 시그니처 목록 (앞부분 바이트만으로 판별)
+ * - file-type 패키지(v18+)는 ESM 전용이라 CommonJS에서 require할 수 없어 직접 판별
  */
-const validateFileType = async (buffer, mimeType) => {
-  const allowedMimes = {
-    // PDF
-    'application/pdf': ['pdf'],
-    // Office
-    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': ['docx'],
-    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': ['xlsx'],
-    'application/vnd.openxmlformats-officedocument.presentationml.presentation': ['pptx'],
-    'application/msword': ['doc'],
-    'application/vnd.ms-excel': ['xls'],
-    'application/vnd.ms-powerpoint': ['ppt'],
-    // Images
-    'image/jpeg': ['jpg', 'jpeg'],
-    'image/png': ['png'],
-    'image/webp': ['webp'],
-    'image/heic': ['heic'],
-    'image/heif': ['heif'],
-    // Audio
-    'audio/mpeg': ['mp3'],
-    'audio/wav': ['wav'],
-    'audio/ogg': ['ogg'],
-    'audio/x-m4a': ['m4a'],
-    'audio/aac': ['aac'],
-    'audio/x-flac': ['flac'],
-    'audio/x-ms-wma': ['wma'],
-    // Video
-    'video/mp4': ['mp4'],
-    'video/quicktime': ['mov'],
-    'video/x-msvideo': ['avi'],
-    'video/x-matroska': ['mkv'],
-    'video/webm': ['webm'],
-    'video/x-flv': ['flv'],
-    'video/x-ms-wmv': ['wmv']
-  };
+const MAGIC_SIGNATURES = [
+  { type: 'pdf', test: (h) => ascii(h, 0, 5) === '%PDF-' },
+  { type: 'zip', test: (h) => bytesAt(h, 0, [0x50, 0x4B, 0x03, 0x04]) },  // docx/xlsx/pptx
+  { type: 'ole', test: (h) => bytesAt(h, 0, [0xD0, 0xCF, 0x11, 0xE0, 0xA1, 0xB1, 0x1A, 0xE1]) },  // doc/xls/ppt
+  { type: 'jpeg', test: (h) => bytesAt(h, 0, [0xFF, 0xD8, 0xFF]) },
+  { type: 'png', test: (h) => bytesAt(h, 0, [0x89, 0x50, 0x4E, 0x47, 0x0D, 0x0A, 0x1A, 0x0A]) },
+  { type: 'webp', test: (h) => ascii(h, 0, 4) === 'RIFF' && ascii(h, 8, 12) === 'WEBP' },
+  { type: 'wav', test: (h) => ascii(h, 0, 4) === 'RIFF' && ascii(h, 8, 12) === 'WAVE' },
+  { type: 'avi', test: (h) => ascii(h, 0, 4) === 'RIFF' && ascii(h, 8, 12) === 'AVI ' },
+  {
+    type: 'ftyp',
+    test: (h) => ascii(h, 4, 8) === 'ftyp',
+    refine: (h) => {
+      const brand = ascii(h, 8, 12).toLowerCase();
+      if (HEIF_BRANDS.includes(brand)) return 'heif';
+      if (brand === 'qt  ') return 'mov';
+      if (brand === 'm4a ' || brand === 'm4b ') return 'm4a';
+      return 'mp4';
+    }
+  },
+  // ftyp 없이 시작하는 구형 QuickTime
+  { type: 'mov', test: (h) => ['moov', 'mdat', 'wide', 'free', 'skip'].includes(ascii(h, 4, 8)) },
+  { type: 'ogg', test: (h) => ascii(h, 0, 4) === 'OggS' },
+  { type: 'flac', test: (h) => ascii(h, 0, 4) === 'fLaC' },
+  // ID3 태그 또는 MPEG 오디오 프레임 동기 (Layer III)
+  { type: 'mp3', test: (h) => ascii(h, 0, 3) === 'ID3' || (h[0] === 0xFF && (h[1] & 0xE6) === 0xE2) },
+  // ADTS 프레임 동기 (Layer 00)
+  { type: 'aac', test: (h) => h[0] === 0xFF && (h[1] & 0xF6) === 0xF0 },
+  { type: 'ebml', test: (h) => bytesAt(h, 0, [0x1A, 0x45, 0xDF, 0xA3]) },  // mkv/webm
+  { type: 'flv', test: (h) => ascii(h, 0, 3) === 'FLV' },
+  { type: 'asf', test: (h) => bytesAt(h, 0, [0x30, 0x26, 0xB2, 0x75, 0x8E, 0x66, 0xCF, 0x11]) }  // wma/wmv
+];
 
-  try {
-    // 실제 파일 타입 확인 (magic number)
-    const fileType = await FileType.fromBuffer(buffer);
+/**
+ * 허용 MIME type → 실제 파일에서 허용하는 시그니처 타입
+ */
+const ALLOWED_SIGNATURES = {
+  // PDF
+  'application/pdf': ['pdf'],
+  // Office
+  'application/vnd.openxmlformats-officedocument.wordprocessingml.document': ['zip'],    // .docx
+  'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': ['zip'],          // .xlsx
+  'application/vnd.openxmlformats-officedocument.presentationml.presentation': ['zip'],  // .pptx
+  'application/msword': ['ole'],           // .doc
+  'application/vnd.ms-excel': ['ole'],     // .xls
+  'application/vnd.ms-powerpoint': ['ole'], // .ppt
+  // Images
+  'image/jpeg': ['jpeg'],                  // .jpg, .jpeg
+  'image/png': ['png'],                    // .png
+  'image/webp': ['webp'],                  // .webp
+  'image/heic': ['heif'],                  // .heic
+  'image/heif': ['heif'],                  // .heif
+  // Audio
+  'audio/mpeg': ['mp3'],                   // .mp3
+  'audio/wav': ['wav'],                    // .wav
+  'audio/ogg': ['ogg'],                    // .ogg
+  'audio/x-m4a': ['m4a', 'mp4'],           // .m4a
+  'audio/aac': ['aac', 'm4a', 'mp4'],      // .aac
+  'audio/x-flac': ['flac'],                // .flac
+  'audio/x-ms-wma': ['asf'],               // .wma
+  // Video
+  'video/mp4': ['mp4', 'm4a'],             // .mp4
+  'video/quicktime': ['mov', 'mp4'],       // .mov
+  'video/x-msvideo': ['avi'],              // .avi
+  'video/x-matroska': ['ebml'],            // .mkv
+  'video/webm': ['ebml'],                  // .webm
+  'video/x-flv': ['flv'],                  // .flv
+  'video/x-ms-wmv': ['asf']                // .wmv
+};
 
-    if (!fileType) {
-      return { valid: false, error: '파일 타입을 확인할 수 없습니다' };
+/**
+ * 앞부분 바이트로 실제 파일 타입 판별
+ * @param {Buffer} head - 파일 앞부분 (최소 12바이트 권장)
+ * @returns {string|null} 시그니처 타입 (예: 'pdf', 'zip', 'mp4') 또는 null
+ */
+const detectFileType = (head) => {
+  for (const signature of MAGIC_SIGNATURES) {
+    if (signature.test(head)) {
+      return signature.refine ? signature.refine(head) : signature.type;
     }
+  }
+  return null;
+};
 
-    // 선언된 MIME type과 실제 MIME type 비교
-    if (fileType.mime !== mimeType) {
-      return {
-        valid: false,
-        error: `파일 타입이 일치하지 않습니다. 선언: ${mimeType}, 실제: ${fileType.mime}`
-      };
-    }
+/**
+ * 파일 타입 검증 (Magic Number 확인)
+ * MIME type 스푸핑 방지
+ * @param {Buffer} head - 업로드 스트림 앞부분
+ * @param {string} mimeType - 클라이언트가 선언한 MIME type
+ * @returns {{ valid: boolean, error?: string, type?: string }}
+ */
+const validateFileType = (head, mimeType) => {
+  const type = detectFileType(head);
 
-    // 추가 검증: 확장자 확인
-    const expectedExts = allowedMimes[mimeType];
-    if (expectedExts && !expectedExts.includes(fileType.ext)) {
-      return {
-        valid: false,
-        error: `파일 확장자가 일치하지 않습니다`
-      };
-    }
+  if (!type) {
+    return { valid: false, error: '파일 타입을 확인할 수 없습니다' };
+  }
 
-    return { valid: true };
-  } catch (error) {
-    return { valid: false, error: '파일 타입 검증 실패: ' + error.message };
+  // 선언된 MIME type과 실제 파일 타입 비교
+  const expectedTypes = ALLOWED_SIGNATURES[mimeType];
+  if (!expectedTypes || !expectedTypes.includes(type)) {
+    return {
+      valid: false,
+      error: `파일 타입이 일치하지 않습니다. 선언: ${mimeType}, 실제: ${type}`
+    };
   }
+
+  return { valid: true, type };
 };
 
 /**
- * Multer 메모리 저장소 설정
- * - 파일을 메모리에 저장 (R2에 업로드하기 전까지)
- * - req.file.buffer에 접근 가능 (단일 파일)
- * - req.files에 접근 가능 (다중 파일)
+ * Multer 스크래치 디스크 저장소 설정
+ * - 업로드를 메모리 대신 작업별 스크래치 디렉토리에 스트리밍 기록
+ * - req.file.path / req.file.scratchDir / req.file.sha256 에 접근 가능
+ * - 요청 처리 후 req.file.scratchDir 정리 필요
  */
 const upload = multer({
-  storage: multer.memoryStorage(),
-  fileFilter: async (req, file, cb) => {
+  storage: scratchStorage({
+    prefix: 'upload',
+    // Magic number로 파일 타입 검증 (스트림 앞부분에서 바로 확인)
+    validate: (head, file) => validateFileType(head, file.mimetype)
+  }),
+  fileFilter: (req, file, cb) => {
     // PDF, Office, 이미지, 음성, 비디오 파일 허용
-    const allowedMimeTypes = [
-      // PDF
-      'application/pdf',
-      // Office
-      'application/vnd.openxmlformats-officedocument.wordprocessingml.document',  // .docx
-      'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',        // .xlsx
-      'application/vnd.openxmlformats-officedocument.presentationml.presentation', // .pptx
-      'application/msword',           // .doc
-      'application/vnd.ms-excel',     // .xls
-      'application/vnd.ms-powerpoint', // .ppt
-      // Images
-      'image/jpeg',                   // .jpg, .jpeg
-      'image/png',                    // .png
-      'image/webp',                   // .webp
-      'image/heic',                   // .heic
-      'image/heif',                   // .heif
-      // Audio
-      'audio/mpeg',                   // .mp3
-      'audio/wav',                    // .wav
-      'audio/ogg',                    // .ogg
-      'audio/x-m4a',                  // .m4a
-      'audio/aac',                    // .aac
-      'audio/x-flac',                 // .flac
-      'audio/x-ms-wma',               // .wma
-      // Video
-      'video/mp4',                    // .mp4
-      'video/quicktime',              // .mov
-      'video/x-msvideo',              // .avi
-      'video/x-matroska',             // .mkv
-      'video/webm',                   // .webm
-      'video/x-flv',                  // .flv
-      'video/x-ms-wmv'                // .wmv
-    ];
-
-    if (!allowedMimeTypes.includes(file.mimetype)) {
+    if (!ALLOWED_SIGNATURES[file.mimetype]) {
       return cb(new Error('지원하지 않는 파일 형식입니다'));
     }
 
-    // Magic number로 파일 타입 검증
-    if (req.file && req.file.buffer) {
-      const validation = await validateFileType(req.file.buffer, file.mimetype);
-      if (!validation.valid) {
-        return cb(new Error(validation.error));
-      }
-    }
-
     cb(null, true);
   },
-  limits: { fileSize: 50 * 1024 * 1024 } // 50MB 제한
+  limits: { fileSize: MAX_FILE_SIZE }
 });
 
 // PDF 병합용 다중 파일 업로드 (최대 10개)
 const uploadMultiple = multer({
-  storage: multer.memoryStorage(),
-  fileFilter: async (req, file, cb) => {
+  storage: scratchStorage({
+    prefix: 'upload',
+    // PDF magic number 검증
+    validate: (head) => validateFileType(head, 'application/pdf')
+  }),
+  fileFilter: (req, file, cb) => {
     // PDF 파일만 허용
     if (file.mimetype !== 'application/pdf') {
       return cb(new Error('PDF 파일만 업로드 가능합니다'));
     }
 
-    // PDF magic number 검증
-    if (req.file && req.file.buffer) {
-      const validation = await validateFileType(req.file.buffer, 'application/pdf');
-      if (!validation.valid) {
-        return cb(new Error(validation.error));
-      }
-    }
-
     cb(null, true);
   },
-  limits: { fileSize: 50 * 1024 * 1024 } // 50MB 제한
+  limits: { fileSize: MAX_FILE_SIZE, files: 10 }
 });
 
 module.exports = upload;
 module.exports.uploadMultiple = uploadMultiple;
+module.exports.detectFileType = detectFileType;
+module.exports.validateFileType = validateFileType;
@@ -2,7 +2,11 @@ import os
 from pathlib import Path
 
 # 프로젝트 루트 경로
-BASE_DIR = Path(r"C:\Users\yj437\OneDrive\Desktop\coding_windows\convert-for-you\public")
+BASE_DIR = Path(__file__).resolve().parent / "public"
+
+def remove_ad_fix_link(content):
+    """ad-fix.css 링크 제거"""
+    return content.replace('  <link rel="stylesheet" href="ad-fix.css">\n', '')
 
 def remove_ad_fix_css(filepath):
     """HTML 파일에서 ad-fix.css 링크 제거"""
@@ -18,7 +22,7 @@ def remove_ad_fix_css(filepath):
             return False
         
         # ad-fix.css 링크 제거
-        updated_content = content.replace('  <link rel="stylesheet" href="ad-fix.css">\n', '')
+        updated_content = remove_ad_fix_link(content)
         
         # 파일 저장
         with open(filepath, 'w', encoding='utf-8') as f:
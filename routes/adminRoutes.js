@@ -10,7 +10,9 @@ const {
   getFilesList,
   getFileById,
   getSystemStatus,
-  getDeletedFiles
+  getDeletedFiles,
+  getLatencyStats,
+  getThroughputStats
 } = require('../utils/dashboard');
 const { deleteFromR2 } = require('../config/r2');
 const db = require('../config/db');
@@ -78,6 +80,62 @@ router.get('/stats', verifyToken, (req, res) => {
   }
 });
 
+/**
+ * 조회 구간 문자열을 분 단위로 변환 (예: 30m, 24h, 7d)
+ * @param {string} value - 구간 문자열
+ * @param {number} defaultMinutes - 기본값 (분)
+ * @returns {number|null} 분 (형식 오류 시 null)
+ */
+const parseWindowMinutes = (value, defaultMinutes) => {
+  if (!value) return defaultMinutes;
+  const match = /^(\d+)([mhd])$/.exec(String(value));
+  if (!match) return null;
+  const minutes = parseInt(match[1]) * { m: 1, h: 60, d: 60 * 24 }[match[2]];
+  // 최대 90일
+  return minutes > 0 && minutes <= 60 * 24 * 90 ? minutes : null;
+};
+
+/**
+ * GET /api/admin/metrics/latency
+ * 형식별 변환 지연 시간 백분위 (p50/p95/p99)
+ * 쿼리: window (기본 24h), format (선택)
+ */
+router.get('/metrics/latency', verifyToken, (req, res) => {
+  try {
+    const windowMinutes = parseWindowMinutes(req.query.window, 60 * 24);
+    if (windowMinutes === null) {
+      return res.status(400).json({ success: false, error: '잘못된 조회 구간입니다. (예: 30m, 24h, 7d)' });
+    }
+
+    const formats = getLatencyStats(windowMinutes, req.query.format || null);
+    res.json({ success: true, windowMinutes, formats, timestamp: new Date().toISOString() });
+  } catch (error) {
+    console.error(withTime(`❌ 지연 시간 지표 조회 오류: ${error.message}`));
+    res.status(500).json({ success: false, error: '지연 시간 지표 조회 실패' });
+  }
+});
+
+/**
+ * GET /api/admin/metrics/throughput
+ * 시간 구간별 형식별 처리량
+ * 쿼리: window (기본 24h), bucket (기본 1h), format (선택)
+ */
+router.get('/metrics/throughput', verifyToken, (req, res) => {
+  try {
+    const windowMinutes = parseWindowMinutes(req.query.window, 60 * 24);
+    const bucketMinutes = parseWindowMinutes(req.query.bucket, 60);
+    if (windowMinutes === null || bucketMinutes === null || bucketMinutes > windowMinutes) {
+      return res.status(400).json({ success: false, error: '잘못된 조회 구간입니다. (예: window=24h&bucket=1h)' });
+    }
+
+    const buckets = getThroughputStats(windowMinutes, bucketMinutes, req.query.format || null);
+    res.json({ success: true, windowMinutes, bucketMinutes, buckets, timestamp: new Date().toISOString() });
+  } catch (error) {
+    console.error(withTime(`❌ 처리량 지표 조회 오류: ${error.message}`));
+    res.status(500).json({ success: false, error: '처리량 지표 조회 실패' });
+  }
+});
+
 /**
  * GET /api/admin/files
  * 파일 목록 조회 (페이지네이션)
@@ -1,22 +1,56 @@
 const express = require('express');
-const { EXTENSION_MAP, MAX_MERGE_SIZE, FILE_EXPIRY_MINUTES } = require('../utils/constants');
-const { downloadFromR2, uploadToR2, deleteFromR2, generateR2Path } = require('../config/r2');
+const path = require('path');
+const { EXTENSION_MAP, PIPELINE_STEPS, MAX_MERGE_SIZE, MAX_BATCH_IMAGES, FILE_EXPIRY_MINUTES } = require('../utils/constants');
+const { downloadFromR2ToFile, downloadFromR2ToFileWithHash, uploadToR2, uploadFileToR2, deleteFromR2, generateR2Path } = require('../config/r2');
 const { convert: convertWithPiscina } = require('../utils/converterPool');
 const db = require('../config/db');
 const { withTime } = require('../utils/logger');
 const { sanitizeFilename } = require('../utils/sanitizer');
 const { safeConversionWithTransaction, safeCleanupWithTransaction } = require('../utils/dbTransaction');
+const { createScratchDir, removeScratchDir, safeExtension } = require('../utils/scratch');
+const { rejectWhenBusy, respondIfRejected } = require('../utils/admission');
 
 const router = express.Router();
 
+/**
+ * 클라이언트 연결이 응답 전에 끊기면 abort되는 신호
+ * - 동일 변환을 기다리는 요청이 모두 끊기면 워커 작업도 취소됨
+ * @param {import('express').Response} res
+ * @returns {AbortSignal}
+ */
+function abortOnDisconnect(res) {
+  const controller = new AbortController();
+  res.on('close', () => {
+    if (!res.writableEnded) controller.abort();
+  });
+  return controller.signal;
+}
+
+/**
+ * R2 원본을 스크래치 디렉토리로 스트리밍 다운로드 (메모리에 Buffer로 올리지 않음)
+ * - 워커에는 파일 경로만 전달
+ * - 다운로드 중 계산한 sha256을 변환 합치기 키로 넘겨 입력을 다시 읽지 않음
+ * @param {string} scratchDir - 작업별 스크래치 디렉토리
+ * @param {string} r2Path - 원본 R2 경로
+ * @param {string} [originalName] - 원본 파일명 (확장자 결정용)
+ * @returns {Promise<{ inputPath: string, size: number, sha256: string }>}
+ */
+async function downloadSource(scratchDir, r2Path, originalName) {
+  const ext = safeExtension(originalName) || safeExtension(r2Path);
+  const inputPath = path.join(scratchDir, `source${ext}`);
+  const { size, sha256 } = await downloadFromR2ToFileWithHash(r2Path, inputPath);
+  return { inputPath, size, sha256 };
+}
+
 /**
  * POST /api/convert - 파일 변환 (워커 풀 활용)
  *
  * 요청 본문:
  * {
  *   r2Path: "uploads/...",      // 원본 파일 R2 경로
- *   format: "word",             // 변환 형식 (word, excel, ppt, jpg, png)
- *   originalName: "file.pdf"    // 원본 파일명
+ *   format: "word",             // 변환 형식 (word, excel, ppt, jpg, png, word2jpg 등 다단계 형식)
+ *   originalName: "file.pdf",   // 원본 파일명
+ *   quality: "medium"           // (선택) 다단계 압축 형식의 압축 품질
  * }
  *
  * 응답:
@@ -24,19 +58,23 @@ const router = express.Router();
  *   success: true,
  *   fileId: "1234567890",       // 변환된 파일 ID
  *   r2Path: "converted/...",    // 변환된 파일 R2 경로
- *   fileName: "file_converted.docx"
+ *   fileName: "file_converted.docx",
+ *   partial: true,              // (마감 시간으로 일부 페이지만 변환된 경우만)
+ *   pagesDone: 550,
+ *   pagesTotal: 600
  * }
  *
  * 동작:
- * 1. R2에서 원본 PDF 파일 다운로드
- * 2. Piscina 스레드 풀에서 병렬 변환
+ * 1. R2에서 원본 파일을 스크래치 디스크로 다운로드
+ * 2. Piscina 스레드 풀에서 병렬 변환 (파일 경로 전달)
  * 3. 변환된 파일을 R2에 업로드
  * 4. DB에 파일 메타데이터 저장
  * 5. 원본 파일을 R2에서 즉시 삭제
  */
-router.post('/', async (req, res) => {
+router.post('/', rejectWhenBusy((req) => req.body?.format), async (req, res) => {
+  let scratchDir;
   try {
-    const { r2Path, format, originalName } = req.body;
+    const { r2Path, format, originalName, quality } = req.body;
 
     // 요청 검증
     if (!r2Path || !format) {
@@ -55,7 +93,8 @@ router.post('/', async (req, res) => {
       'resize', 'compress-image',
       'mp3', 'wav', 'ogg', 'm4a', 'aac',
       'mp4', 'mov', 'webm', 'mkv',
-      'compress-video', 'gif'
+      'compress-video', 'gif',
+      ...Object.keys(PIPELINE_STEPS)
     ];
     if (!validFormats.includes(format)) {
       return res.status(400).json({
@@ -64,8 +103,10 @@ router.post('/', async (req, res) => {
       });
     }
 
-    // Office → PDF 변환 여부 확인
-    const isOfficeToPdf = format.endsWith('2pdf');
+    // 다단계 변환 여부 (Office → PDF → 이미지/압축을 한 워커에서 처리, 최종 결과만 업로드)
+    const isPipeline = Object.hasOwn(PIPELINE_STEPS, format);
+    // Office 입력 여부 확인
+    const isOfficeToPdf = format.endsWith('2pdf') || isPipeline;
 
     console.log(withTime(`\n========== 파일 변환 시작 ==========`));
     console.log(withTime(`📝 형식: ${format}`));
@@ -75,12 +116,14 @@ router.post('/', async (req, res) => {
     // 1️⃣ R2에서 원본 파일 다운로드
     const fileTypeLabel = isOfficeToPdf ? 'Office 파일' : 'PDF 파일';
     console.log(withTime(`\n[1/5] 📥 R2에서 ${fileTypeLabel} 다운로드`));
-    const fileBuffer = await downloadFromR2(r2Path);
-    console.log(withTime(`✅ 다운로드 완료 (${(fileBuffer.length / 1024 / 1024).toFixed(2)}MB)`));
+    scratchDir = await createScratchDir('convert');
+    const { inputPath, size: inputSize, sha256 } = await downloadSource(scratchDir, r2Path, originalName);
+    console.log(withTime(`✅ 다운로드 완료 (${(inputSize / 1024 / 1024).toFixed(2)}MB)`));
 
     // 2️⃣ Piscina 스레드 풀에서 변환
     console.log(withTime(`\n[2/5] 🔄 Piscina에서 변환 작업 실행`));
-    const result = await convertWithPiscina(fileBuffer, format);
+    const additionalData = isPipeline ? { quality } : [];
+    const result = await convertWithPiscina(inputPath, format, additionalData, { signal: abortOnDisconnect(res), inputHash: sha256 });
 
     if (!result.success) {
       const workerError = new Error(result.error || '워커 변환 작업이 실패했습니다.');
@@ -92,6 +135,9 @@ router.post('/', async (req, res) => {
 
     const convertedBuffer = result.buffer;
     console.log(withTime(`✅ 변환 완료 (${(convertedBuffer.length / 1024 / 1024).toFixed(2)}MB)`));
+    if (result.partial) {
+      console.warn(withTime(`⏳ 마감 시간 도달로 일부만 변환: ${result.partial.pagesDone}/${result.partial.pagesTotal}페이지`));
+    }
 
     // 3️⃣ 변환된 파일명 생성
     console.log(withTime(`\n[3/5] 📝 파일명 생성`));
@@ -151,13 +197,30 @@ router.post('/', async (req, res) => {
       fileId: fileId,
       r2Path: convertedR2Path,
       fileName: convertedFileName,
-      message: `변환 완료: ${convertedFileName}`
+      message: result.partial
+        ? `일부 변환 완료 (${result.partial.pagesDone}/${result.partial.pagesTotal}페이지): ${convertedFileName}`
+        : `변환 완료: ${convertedFileName}`,
+      ...(result.partial && {
+        partial: true,
+        pagesDone: result.partial.pagesDone,
+        pagesTotal: result.partial.pagesTotal
+      })
     });
   } catch (error) {
+    if (respondIfRejected(res, error)) return;
+
     // 서버 로그에만 상세 정보 기록
     console.error(withTime('\n❌ 파일 변환 실패:'), error.message);
     console.error(withTime('스택 추적:'), error.stack);
 
+    // 변환 옵션 검증 실패 (예: GIF 시작 시간이 영상 길이를 넘음) - 메시지는 사용자용
+    if (error.code === 'INVALID_CONVERSION_OPTIONS') {
+      return res.status(400).json({
+        success: false,
+        error: error.message
+      });
+    }
+
     // 클라이언트에는 제네릭 에러 메시지만 반환 (정보 유출 방지)
     if (error.code === 'LIBREOFFICE_NO_XLSX_FILTER') {
       return res.status(503).json({
@@ -170,6 +233,8 @@ router.post('/', async (req, res) => {
       success: false,
       error: '파일 변환에 실패했습니다. 잠시 후 다시 시도하세요.'
     });
+  } finally {
+    await removeScratchDir(scratchDir);
   }
 });
 
@@ -197,7 +262,8 @@ router.post('/', async (req, res) => {
  * 4. DB에 파일 메타데이터 저장
  * 5. 원본 파일들을 R2에서 삭제
  */
-router.post('/merge', async (req, res) => {
+router.post('/merge', rejectWhenBusy(() => 'merge'), async (req, res) => {
+  let scratchDir;
   try {
     const { r2Paths, fileNames } = req.body;
 
@@ -219,9 +285,10 @@ router.post('/merge', async (req, res) => {
     console.log(withTime(`\n========== PDF 병합 시작 ==========`));
     console.log(withTime(`📄 파일 수: ${r2Paths.length}개`));
 
-    // 1️⃣ R2에서 모든 PDF 파일 다운로드
+    // 1️⃣ R2에서 모든 PDF 파일을 스크래치 디스크로 다운로드
     console.log(withTime(`\n[1/5] 📥 R2에서 PDF 파일 다운로드`));
-    const pdfBuffers = [];
+    scratchDir = await createScratchDir('merge');
+    const pdfPaths = [];
     let totalSize = 0;
 
     for (let i = 0; i < r2Paths.length; i++) {
@@ -229,10 +296,11 @@ router.post('/merge', async (req, res) => {
       const fileName = fileNames?.[i] || `파일${i + 1}.pdf`;
 
       try {
-        const fileBuffer = await downloadFromR2(r2Path);
-        totalSize += fileBuffer.length;
+        const inputPath = path.join(scratchDir, `input-${String(i + 1).padStart(3, '0')}.pdf`);
+        const fileSize = await downloadFromR2ToFile(r2Path, inputPath);
+        totalSize += fileSize;
 
-        // 누적 크기 검증 (메모리 초과 방지)
+        // 누적 크기 검증 (스크래치 디스크 사용량 제한)
         if (totalSize > MAX_MERGE_SIZE) {
           return res.status(413).json({
             success: false,
@@ -240,8 +308,8 @@ router.post('/merge', async (req, res) => {
           });
         }
 
-        pdfBuffers.push(fileBuffer);
-        console.log(withTime(`  ✓ ${fileName} (${(fileBuffer.length / 1024 / 1024).toFixed(2)}MB)`));
+        pdfPaths.push(inputPath);
+        console.log(withTime(`  ✓ ${fileName} (${(fileSize / 1024 / 1024).toFixed(2)}MB)`));
       } catch (error) {
         console.error(withTime(`  ✗ ${fileName} 다운로드 실패`));
         throw new Error(`"${fileName}" 다운로드 실패: ${error.message}`);
@@ -252,7 +320,8 @@ router.post('/merge', async (req, res) => {
 
     // 2️⃣ Piscina 스레드 풀에서 병합
     console.log(withTime(`\n[2/5] 🔄 Piscina에서 PDF 병합 실행`));
-    const result = await convertWithPiscina(pdfBuffers, 'merge', fileNames);
+    const mergedPath = path.join(scratchDir, 'merged.pdf');
+    const result = await convertWithPiscina(pdfPaths, 'merge', fileNames, { outputPath: mergedPath });
 
     if (!result.success) {
       const workerError = new Error(result.error || '워커 병합 작업이 실패했습니다.');
@@ -262,8 +331,7 @@ router.post('/merge', async (req, res) => {
       throw workerError;
     }
 
-    const mergedBuffer = result.buffer;
-    console.log(withTime(`✅ 병합 완료 (${(mergedBuffer.length / 1024 / 1024).toFixed(2)}MB)`));
+    console.log(withTime(`✅ 병합 완료: ${result.outputPath}`));
 
     // 3️⃣ 병합된 파일명 생성
     console.log(withTime(`\n[3/5] 📝 파일명 생성`));
@@ -283,7 +351,7 @@ router.post('/merge', async (req, res) => {
     const mergeUploadAndCleanupOperation = async () => {
       try {
         // R2에 병합된 파일 업로드
-        await uploadToR2(mergedR2Path, mergedBuffer, 'application/pdf');
+        await uploadFileToR2(mergedR2Path, result.outputPath, 'application/pdf');
         console.log(withTime(`✅ R2 업로드 완료: ${mergedR2Path}`));
 
         // 업로드 성공 후 원본 파일들 삭제 (최선의 노력)
@@ -327,6 +395,8 @@ router.post('/merge', async (req, res) => {
       message: `병합 완료: ${mergedFileName}`
     });
   } catch (error) {
+    if (respondIfRejected(res, error)) return;
+
     console.error(withTime('\n❌ PDF 병합 실패:'), error.message);
     console.error(withTime('스택 추적:'), error.stack);
 
@@ -335,6 +405,8 @@ router.post('/merge', async (req, res) => {
       success: false,
       error: 'PDF 병합에 실패했습니다. 잠시 후 다시 시도하세요.'
     });
+  } finally {
+    await removeScratchDir(scratchDir);
   }
 });
 
@@ -363,7 +435,8 @@ router.post('/merge', async (req, res) => {
  * 5. DB에 파일 메타데이터 저장
  * 6. 원본 파일을 R2에서 삭제
  */
-router.post('/split', async (req, res) => {
+router.post('/split', rejectWhenBusy(() => 'split'), async (req, res) => {
+  let scratchDir;
   try {
     const { r2Path, ranges } = req.body;
 
@@ -392,12 +465,13 @@ router.post('/split', async (req, res) => {
     console.log(withTime(`\n========== PDF 분할 시작 ==========`));
     console.log(withTime(`📄 분할 범위: ${ranges.length}개`));
 
-    // 1️⃣ R2에서 PDF 파일 다운로드
+    // 1️⃣ R2에서 PDF 파일을 스크래치 디스크로 다운로드
     console.log(withTime(`\n[1/5] 📥 R2에서 PDF 파일 다운로드`));
-    let fileBuffer;
+    scratchDir = await createScratchDir('split');
+    const inputPath = path.join(scratchDir, 'source.pdf');
     try {
-      fileBuffer = await downloadFromR2(r2Path);
-      console.log(withTime(`✅ 다운로드 완료 (${(fileBuffer.length / 1024 / 1024).toFixed(2)}MB)`));
+      const fileSize = await downloadFromR2ToFile(r2Path, inputPath);
+      console.log(withTime(`✅ 다운로드 완료 (${(fileSize / 1024 / 1024).toFixed(2)}MB)`));
     } catch (error) {
       console.error(withTime(`  ✗ PDF 다운로드 실패`));
       throw new Error(`PDF 다운로드 실패: ${error.message}`);
@@ -405,7 +479,8 @@ router.post('/split', async (req, res) => {
 
     // 2️⃣ Piscina 스레드 풀에서 분할
     console.log(withTime(`\n[2/5] 🔄 Piscina에서 PDF 분할 실행`));
-    const result = await convertWithPiscina(fileBuffer, 'split', ranges);
+    const zipPath = path.join(scratchDir, 'split.zip');
+    const result = await convertWithPiscina(inputPath, 'split', ranges, { outputPath: zipPath });
 
     if (!result.success) {
       const workerError = new Error(result.error || '워커 분할 작업이 실패했습니다.');
@@ -415,8 +490,7 @@ router.post('/split', async (req, res) => {
       throw workerError;
     }
 
-    const splitZipBuffer = result.buffer;
-    console.log(withTime(`✅ 분할 완료 (${(splitZipBuffer.length / 1024 / 1024).toFixed(2)}MB)ZIP`));
+    console.log(withTime(`✅ 분할 완료: ${result.outputPath}`));
 
     // 3️⃣ 분할된 파일명 생성
     console.log(withTime(`\n[3/5] 📝 파일명 생성`));
@@ -436,7 +510,7 @@ router.post('/split', async (req, res) => {
     const splitUploadAndCleanupOperation = async () => {
       try {
         // R2에 분할 ZIP 파일 업로드
-        await uploadToR2(splitR2Path, splitZipBuffer, 'application/zip');
+        await uploadFileToR2(splitR2Path, result.outputPath, 'application/zip');
         console.log(withTime(`✅ R2 업로드 완료: ${splitR2Path}`));
 
         // 업로드 성공 후 원본 파일 삭제
@@ -473,6 +547,8 @@ router.post('/split', async (req, res) => {
       message: `분할 완료: ${splitFileName}`
     });
   } catch (error) {
+    if (respondIfRejected(res, error)) return;
+
     console.error(withTime('\n❌ PDF 분할 실패:'), error.message);
     console.error(withTime('스택 추적:'), error.stack);
 
@@ -481,13 +557,16 @@ router.post('/split', async (req, res) => {
       error: 'PDF 분할에 실패했습니다.',
       details: error.message
     });
+  } finally {
+    await removeScratchDir(scratchDir);
   }
 });
 
 /**
  * POST /api/compress - PDF 압축
  */
-router.post('/compress', async (req, res) => {
+router.post('/compress', rejectWhenBusy(() => 'compress'), async (req, res) => {
+  let scratchDir;
   try {
     const { r2Path, quality } = req.body;
 
@@ -503,19 +582,19 @@ router.post('/compress', async (req, res) => {
 
     // R2에서 PDF 다운로드
     console.log(withTime(`\n[1/4] 📥 R2에서 PDF 파일 다운로드`));
-    const fileBuffer = await downloadFromR2(r2Path);
-    console.log(withTime(`✅ 다운로드 완료 (${(fileBuffer.length / 1024 / 1024).toFixed(2)}MB)`));
+    scratchDir = await createScratchDir('compress');
+    const { inputPath, size: originalSize, sha256 } = await downloadSource(scratchDir, r2Path, 'source.pdf');
+    console.log(withTime(`✅ 다운로드 완료 (${(originalSize / 1024 / 1024).toFixed(2)}MB)`));
 
     // 압축 실행
     console.log(withTime(`\n[2/4] 🔄 Piscina에서 PDF 압축 실행`));
-    const result = await convertWithPiscina(fileBuffer, 'compress', quality || 'medium');
+    const result = await convertWithPiscina(inputPath, 'compress', quality || 'medium', { signal: abortOnDisconnect(res), inputHash: sha256 });
 
     if (!result.success) {
       throw new Error(result.error || '압축 실패');
     }
 
     const compressedBuffer = result.buffer;
-    const originalSize = fileBuffer.length;
     const ratio = ((1 - compressedBuffer.length / originalSize) * 100).toFixed(1);
     console.log(withTime(`✅ 압축 완료 (${(compressedBuffer.length / 1024 / 1024).toFixed(2)}MB) - ${ratio}% 감소`));
 
@@ -571,19 +650,24 @@ router.post('/compress', async (req, res) => {
       message: `압축 완료: ${compressedFileName}`
     });
   } catch (error) {
+    if (respondIfRejected(res, error)) return;
+
     console.error(withTime('\n❌ PDF 압축 실패:'), error.message);
     res.status(500).json({
       success: false,
       error: 'PDF 압축에 실패했습니다.',
       details: error.message
     });
+  } finally {
+    await removeScratchDir(scratchDir);
   }
 });
 
 /**
  * POST /api/image - 이미지 변환/리사이즈
  */
-router.post('/image', async (req, res) => {
+router.post('/image', rejectWhenBusy((req) => req.body?.format), async (req, res) => {
+  let scratchDir;
   try {
     const { r2Path, format, quality, backgroundColor, options } = req.body;
 
@@ -605,21 +689,23 @@ router.post('/image', async (req, res) => {
     console.log(withTime(`\n========== 이미지 변환 시작 ==========`));
     console.log(withTime(`📸 형식: ${format}`));
 
-    // R2에서 이미지 다운로드
-    const imageBuffer = await downloadFromR2(r2Path);
-    console.log(withTime(`✅ 다운로드 완료 (${(imageBuffer.length / 1024 / 1024).toFixed(2)}MB)`));
+    // R2에서 이미지를 스크래치 디스크로 다운로드
+    scratchDir = await createScratchDir('image');
+    const { inputPath: imagePath, size: imageSize, sha256 } = await downloadSource(scratchDir, r2Path);
+    console.log(withTime(`✅ 다운로드 완료 (${(imageSize / 1024 / 1024).toFixed(2)}MB)`));
 
     // 변환 실행
     console.log(withTime(`🔄 Piscina에서 이미지 변환 실행`));
+    const jobOptions = { signal: abortOnDisconnect(res), inputHash: sha256 };
     let convertResult;
     if (format === 'png-to-jpg') {
-      convertResult = await convertWithPiscina(imageBuffer, format, backgroundColor || '#ffffff');
+      convertResult = await convertWithPiscina(imagePath, format, backgroundColor || '#ffffff', jobOptions);
     } else if (['jpg-to-webp', 'png-to-webp', 'heic-to-jpg', 'heic-to-webp'].includes(format)) {
-      convertResult = await convertWithPiscina(imageBuffer, format, quality || 80);
+      convertResult = await convertWithPiscina(imagePath, format, quality || 80, jobOptions);
     } else if (['resize', 'compress-image'].includes(format)) {
-      convertResult = await convertWithPiscina(imageBuffer, format, options);
+      convertResult = await convertWithPiscina(imagePath, format, options, jobOptions);
     } else {
-      convertResult = await convertWithPiscina(imageBuffer, format);
+      convertResult = await convertWithPiscina(imagePath, format, [], jobOptions);
     }
 
     if (!convertResult.success) {
@@ -628,7 +714,7 @@ router.post('/image', async (req, res) => {
 
     const convertedBuffer = convertResult.buffer;
     const ext = EXTENSION_MAP[format] || '.jpg';
-    const originalSize = imageBuffer.length / 1024 / 1024;
+    const originalSize = imageSize / 1024 / 1024;
     const convertedSize = convertedBuffer.length / 1024 / 1024;
     console.log(withTime(`✅ 변환 완료 (${originalSize.toFixed(2)}MB → ${convertedSize.toFixed(2)}MB)`));
 
@@ -680,12 +766,191 @@ router.post('/image', async (req, res) => {
       message: `변환 완료: ${convertedFileName}`
     });
   } catch (error) {
+    if (respondIfRejected(res, error)) return;
+
     console.error(withTime('\n❌ 이미지 변환 실패:'), error.message);
     res.status(500).json({
       success: false,
       error: '이미지 변환에 실패했습니다.',
       details: error.message
     });
+  } finally {
+    await removeScratchDir(scratchDir);
+  }
+});
+
+/**
+ * POST /api/convert/image-batch - 이미지 일괄 변환 (ZIP 하나로 반환)
+ *
+ * 요청 본문:
+ * {
+ *   r2Paths: ["uploads/...", ...],       // 원본 이미지 R2 경로 배열
+ *   fileNames: ["IMG_0001.HEIC", ...],  // 원본 파일명 배열 (ZIP 엔트리 이름)
+ *   format: "heic-to-jpg",              // 모든 이미지에 적용할 변환 형식
+ *   quality, backgroundColor, options    // /api/convert/image와 동일한 옵션
+ * }
+ *
+ * 응답:
+ * {
+ *   success: true,
+ *   fileId, r2Path, fileName: "images.zip",
+ *   succeeded: 39, failed: 1,
+ *   results: [{ fileName, success, error? }, ...]
+ * }
+ *
+ * 동작:
+ * 1. R2에서 모든 이미지를 스크래치 디스크로 다운로드
+ * 2. 워커 하나에서 동시 변환 수를 제한해 변환, 무압축 ZIP으로 스트리밍 기록
+ * 3. ZIP 하나만 R2 업로드 + DB 저장 (이미지별 R2 객체/DB 행 없음)
+ * 4. 원본 이미지들을 R2에서 삭제
+ */
+router.post('/image-batch', rejectWhenBusy(() => 'image-batch'), async (req, res) => {
+  let scratchDir;
+  try {
+    const { r2Paths, fileNames, format, quality, backgroundColor, options } = req.body;
+
+    // 요청 검증
+    if (!r2Paths || !Array.isArray(r2Paths) || r2Paths.length === 0 || !format) {
+      return res.status(400).json({
+        success: false,
+        error: '이미지 R2 경로 배열과 형식이 필요합니다.'
+      });
+    }
+
+    if (r2Paths.length > MAX_BATCH_IMAGES) {
+      return res.status(400).json({
+        success: false,
+        error: `최대 ${MAX_BATCH_IMAGES}개까지만 일괄 변환 가능합니다.`
+      });
+    }
+
+    const validFormats = ['jpg-to-png', 'png-to-jpg', 'jpg-to-webp', 'png-to-webp', 'webp-to-jpg', 'webp-to-png', 'heic-to-jpg', 'heic-to-png', 'heic-to-webp', 'resize', 'compress-image'];
+    if (!validFormats.includes(format)) {
+      return res.status(400).json({
+        success: false,
+        error: `지원하지 않는 형식입니다: ${format}`
+      });
+    }
+
+    console.log(withTime(`\n========== 이미지 일괄 변환 시작 ==========`));
+    console.log(withTime(`📸 형식: ${format}, 파일 수: ${r2Paths.length}개`));
+
+    // 1️⃣ R2에서 모든 이미지를 스크래치 디스크로 다운로드
+    console.log(withTime(`\n[1/4] 📥 R2에서 이미지 다운로드`));
+    scratchDir = await createScratchDir('image-batch');
+    const imagePaths = [];
+    const names = [];
+    let totalSize = 0;
+
+    for (let i = 0; i < r2Paths.length; i++) {
+      const fileName = fileNames?.[i] || `image-${i + 1}`;
+      const inputPath = path.join(scratchDir, `input-${String(i + 1).padStart(3, '0')}${safeExtension(fileName) || safeExtension(r2Paths[i])}`);
+      totalSize += await downloadFromR2ToFile(r2Paths[i], inputPath);
+
+      // 누적 크기 검증 (스크래치 디스크 사용량 제한)
+      if (totalSize > MAX_MERGE_SIZE) {
+        return res.status(413).json({
+          success: false,
+          error: `일괄 변환 파일의 총 크기가 ${MAX_MERGE_SIZE / 1024 / 1024}MB를 초과했습니다.`
+        });
+      }
+
+      imagePaths.push(inputPath);
+      names.push(fileName);
+    }
+    console.log(withTime(`✅ 다운로드 완료 (총 ${(totalSize / 1024 / 1024).toFixed(2)}MB)`));
+
+    // 2️⃣ 워커 하나에서 일괄 변환 → ZIP
+    console.log(withTime(`\n[2/4] 🔄 Piscina에서 이미지 일괄 변환 실행`));
+    const zipPath = path.join(scratchDir, 'images.zip');
+    const result = await convertWithPiscina(imagePaths, 'image-batch', {
+      format,
+      fileNames: names,
+      quality,
+      backgroundColor,
+      options
+    }, { outputPath: zipPath });
+
+    if (!result.success) {
+      const workerError = new Error(result.error || '워커 일괄 변환 작업이 실패했습니다.');
+      if (result.code) {
+        workerError.code = result.code;
+      }
+      throw workerError;
+    }
+
+    const results = result.items.map(({ fileName, success, error }) => (success ? { fileName, success } : { fileName, success, error }));
+    const succeeded = results.filter((item) => item.success).length;
+    console.log(withTime(`✅ 일괄 변환 완료: 성공 ${succeeded}개 / 실패 ${results.length - succeeded}개`));
+
+    // 3️⃣ ZIP을 R2에 업로드 + DB 저장 (트랜잭션)
+    console.log(withTime(`\n[3/4] 📤 R2에 ZIP 파일 업로드`));
+    const zipFileName = 'images.zip';
+    const zipR2Path = generateR2Path(zipFileName, 'converted');
+    const fileId = `${Date.now()}-${Math.random().toString(36).substring(2, 8)}`;
+    const expiryDate = new Date(Date.now() + 10 * 60 * 1000);
+    const tenMinutesLater = expiryDate.toISOString().replace('T', ' ').substring(0, 19);
+
+    const batchUploadAndCleanupOperation = async () => {
+      try {
+        await uploadFileToR2(zipR2Path, result.outputPath, 'application/zip');
+        console.log(withTime(`✅ R2 업로드 완료: ${zipR2Path}`));
+
+        // 업로드 성공 후 원본 이미지 삭제 (최선의 노력)
+        for (const r2Path of r2Paths) {
+          try {
+            await deleteFromR2(r2Path);
+          } catch (deleteError) {
+            console.warn(withTime(`⚠️  원본 파일 삭제 실패 (무시하고 계속): ${r2Path}`), deleteError.message);
+          }
+        }
+
+        return { success: true, r2Path: zipR2Path };
+      } catch (uploadError) {
+        throw new Error(`R2 일괄 변환 작업 실패: ${uploadError.message}`);
+      }
+    };
+
+    console.log(withTime(`\n[4/4] 💾 R2 업로드 + DB 저장 (트랜잭션)`));
+    await safeConversionWithTransaction(db, batchUploadAndCleanupOperation, {
+      fileId: fileId,
+      r2Path: zipR2Path,
+      fileType: 'converted',
+      expiresAt: tenMinutesLater
+    });
+
+    console.log(withTime(`✅ DB 저장 완료: ${fileId}`));
+    console.log(withTime(`\n========== 이미지 일괄 변환 완료 ==========\n`));
+
+    res.json({
+      success: true,
+      fileId: fileId,
+      r2Path: zipR2Path,
+      fileName: zipFileName,
+      succeeded,
+      failed: results.length - succeeded,
+      results,
+      message: `일괄 변환 완료: ${succeeded}/${results.length}개`
+    });
+  } catch (error) {
+    if (respondIfRejected(res, error)) return;
+
+    console.error(withTime('\n❌ 이미지 일괄 변환 실패:'), error.message);
+
+    if (error.code === 'IMAGE_BATCH_ALL_FAILED') {
+      return res.status(422).json({
+        success: false,
+        error: '모든 이미지 변환에 실패했습니다. 파일 형식을 확인하세요.'
+      });
+    }
+
+    res.status(500).json({
+      success: false,
+      error: '이미지 일괄 변환에 실패했습니다.',
+      details: error.message
+    });
+  } finally {
+    await removeScratchDir(scratchDir);
   }
 });
 
@@ -1,20 +1,27 @@
 const express = require('express');
-const { downloadFromR2 } = require('../config/r2');
+const { pipeline } = require('stream/promises');
+const { getR2ObjectStream, getPresignedDownloadUrl, isR2Configured } = require('../config/r2');
 const db = require('../config/db');
 
 const router = express.Router();
 
+// 'stream' (기본): Node가 R2 응답을 그대로 전달 / 'presign': R2 presigned URL로 리다이렉트
+const DOWNLOAD_MODE = process.env.DOWNLOAD_MODE || 'stream';
+
+// 단일 바이트 범위만 R2로 전달 (다중 범위는 무시하고 전체 응답)
+const SINGLE_RANGE_PATTERN = /^bytes=(\d*)-(\d*)$/;
+
 /**
  * GET /api/download/:fileId - 파일 다운로드 (R2에서)
  *
  * 요청: GET /api/download/1234567890-abc123
- * 응답: 파일 바이너리 데이터
+ * 응답: 파일 바이너리 데이터 (Range 요청 시 206 Partial Content)
+ *       DOWNLOAD_MODE=presign이면 R2 presigned URL로 302 리다이렉트
  *
  * 동작:
  * 1. DB에서 파일 ID로 R2 경로 조회
- * 2. R2에서 파일 다운로드
+ * 2. R2 객체를 스트림으로 받아 메모리에 모으지 않고 바로 응답으로 전달
  * 3. 클라이언트에게 다운로드 제공
- * 4. 파일 상태를 'deleted'로 변경 (스케줄러가 10분 후에 R2에서 실제 삭제)
  */
 router.get('/:fileId', async (req, res) => {
   try {
@@ -31,21 +38,57 @@ router.get('/:fileId', async (req, res) => {
       });
     }
 
-    // R2에서 파일 다운로드
-    console.log(`📥 R2에서 파일 다운로드: ${fileRecord.r2_path}`);
-    const fileBuffer = await downloadFromR2(fileRecord.r2_path);
-
     // 파일명 추출 (R2 경로에서)
     const fileName = fileRecord.r2_path.substring(fileRecord.r2_path.lastIndexOf('/') + 1);
 
+    // presigned URL 모드: 파일이 Node 프로세스를 거치지 않음
+    if (DOWNLOAD_MODE === 'presign' && isR2Configured) {
+      const url = getPresignedDownloadUrl(fileRecord.r2_path, { fileName });
+      console.log(`🔗 presigned URL로 리다이렉트: ${fileRecord.r2_path}`);
+      res.setHeader('Cache-Control', 'no-store');
+      return res.redirect(302, url);
+    }
+
+    const rangeHeader = req.headers.range;
+    const range = rangeHeader && SINGLE_RANGE_PATTERN.test(rangeHeader) ? rangeHeader : undefined;
+
+    // R2에서 파일 스트림 조회
+    console.log(`📥 R2에서 파일 스트리밍: ${fileRecord.r2_path}${range ? ` (${range})` : ''}`);
+    let object;
+    try {
+      object = await getR2ObjectStream(fileRecord.r2_path, range);
+    } catch (error) {
+      if (error.name === 'InvalidRange' || error.$metadata?.httpStatusCode === 416) {
+        return res.status(416).json({
+          success: false,
+          error: '요청한 범위가 올바르지 않습니다.'
+        });
+      }
+      throw error;
+    }
+
     // 클라이언트에게 파일 전송
+    res.status(object.contentRange ? 206 : 200);
     res.setHeader('Content-Disposition', `attachment; filename="${fileName}"`);
     res.setHeader('Content-Type', 'application/octet-stream');
-    res.send(fileBuffer);
+    res.setHeader('Accept-Ranges', 'bytes');
+    if (object.contentLength !== undefined) res.setHeader('Content-Length', object.contentLength);
+    if (object.contentRange) res.setHeader('Content-Range', object.contentRange);
+    if (object.eTag) res.setHeader('ETag', object.eTag);
+    if (object.lastModified) res.setHeader('Last-Modified', new Date(object.lastModified).toUTCString());
 
-    console.log(`✅ 파일 다운로드 완료: ${fileName}`);
+    try {
+      // 클라이언트 연결이 끊기면 pipeline이 R2 스트림도 함께 정리
+      await pipeline(object.body, res);
+      console.log(`✅ 파일 다운로드 완료: ${fileName}`);
+    } catch (error) {
+      console.warn(`⚠️  파일 전송 중단: ${fileName} (${error.message})`);
+    }
   } catch (error) {
     console.error('❌ 파일 다운로드 실패:', error);
+    if (res.headersSent) {
+      return res.destroy(error);
+    }
     res.status(500).json({
       success: false,
       error: '파일 다운로드에 실패했습니다.'
@@ -0,0 +1,129 @@
+const express = require('express');
+const db = require('../config/db');
+const { withTime } = require('../utils/logger');
+const { uploadLimiter, jobPollLimiter } = require('../config/rateLimiter');
+const { enqueueJob, getJob, countQueuedJobs } = require('../utils/jobQueue');
+const { JOB_FORMATS } = require('../utils/jobRunner');
+
+const router = express.Router();
+
+// 대기 작업이 이보다 많으면 등록 거절 (워커 용량보다 요청이 계속 많은 경우)
+const JOB_MAX_QUEUED = parseInt(process.env.JOB_MAX_QUEUED) || 1000;
+const JOB_RETRY_AFTER_SEC = 30;
+
+/**
+ * POST /api/jobs - 변환 작업 등록 (워커 프로세스가 비동기로 처리)
+ *
+ * 요청 본문:
+ * {
+ *   r2Path: "uploads/...",      // 원본 파일 R2 경로
+ *   format: "word",             // 변환 형식 (merge/split/image-batch 제외)
+ *   originalName: "file.pdf",   // 원본 파일명
+ *   quality, backgroundColor, options,  // (선택) /api/convert, /api/convert/image 와 같은 옵션
+ *   priority: 0                 // (선택) 클수록 먼저 처리
+ * }
+ *
+ * 응답 (202):
+ * {
+ *   success: true,
+ *   jobId: "...",
+ *   status: "queued",
+ *   statusUrl: "/api/jobs/..."
+ * }
+ */
+router.post('/', uploadLimiter, (req, res) => {
+  try {
+    const { r2Path, format, originalName, quality, backgroundColor, options, priority } = req.body;
+
+    if (!r2Path || !format) {
+      return res.status(400).json({
+        success: false,
+        error: 'R2 경로와 형식이 필요합니다.'
+      });
+    }
+
+    if (!JOB_FORMATS.includes(format)) {
+      return res.status(400).json({
+        success: false,
+        error: `지원하지 않는 형식입니다. 지원 형식: ${JOB_FORMATS.join(', ')}`
+      });
+    }
+
+    if (countQueuedJobs(db) >= JOB_MAX_QUEUED) {
+      res.set('Retry-After', String(JOB_RETRY_AFTER_SEC));
+      return res.status(503).json({
+        success: false,
+        error: '대기 중인 변환 작업이 너무 많습니다. 잠시 후 다시 시도하세요.',
+        retryAfter: JOB_RETRY_AFTER_SEC
+      });
+    }
+
+    const job = enqueueJob(db, {
+      format,
+      payload: { r2Path, originalName, quality, backgroundColor, options },
+      priority: Number.isInteger(priority) ? Math.max(-10, Math.min(10, priority)) : 0
+    });
+    console.log(withTime(`📬 변환 작업 등록: ${job.id} (${format}, ${originalName || r2Path})`));
+
+    res.status(202).json({
+      success: true,
+      jobId: job.id,
+      status: job.status,
+      statusUrl: `/api/jobs/${job.id}`
+    });
+  } catch (error) {
+    console.error(withTime('❌ 변환 작업 등록 실패:'), error.message);
+    res.status(500).json({
+      success: false,
+      error: '변환 작업 등록에 실패했습니다. 잠시 후 다시 시도하세요.'
+    });
+  }
+});
+
+/**
+ * GET /api/jobs/:jobId - 변환 작업 상태 조회 (폴링)
+ *
+ * 응답:
+ * {
+ *   success: true,
+ *   jobId, status,              // queued / running / succeeded / failed
+ *   attempts,
+ *   fileId, r2Path, fileName,   // succeeded일 때만 (partial, pagesDone, pagesTotal 포함 가능)
+ *   error                       // failed일 때만 (제네릭 메시지)
+ * }
+ */
+router.get('/:jobId', jobPollLimiter, (req, res) => {
+  try {
+    const job = getJob(db, req.params.jobId);
+
+    if (!job) {
+      return res.status(404).json({
+        success: false,
+        error: '작업을 찾을 수 없습니다.'
+      });
+    }
+
+    // 아직 끝나지 않은 작업은 폴링 간격 안내
+    if (job.status === 'queued' || job.status === 'running') {
+      res.set('Retry-After', '2');
+    }
+
+    res.json({
+      success: true,
+      jobId: job.id,
+      status: job.status,
+      attempts: job.attempts,
+      ...(job.status === 'succeeded' && job.result),
+      // 상세 실패 사유는 서버 로그/DB에만 (정보 유출 방지)
+      ...(job.status === 'failed' && { error: '파일 변환에 실패했습니다. 다시 시도하세요.' })
+    });
+  } catch (error) {
+    console.error(withTime('❌ 변환 작업 조회 실패:'), error.message);
+    res.status(500).json({
+      success: false,
+      error: '변환 작업 조회에 실패했습니다.'
+    });
+  }
+});
+
+module.exports = router;
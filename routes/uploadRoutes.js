@@ -1,17 +1,38 @@
 const express = require('express');
 const upload = require('../middlewares/upload');
-const { uploadToR2, generateR2Path } = require('../config/r2');
+const { uploadFileToR2, generateR2Path } = require('../config/r2');
 const { withTime } = require('../utils/logger');
+const { removeScratchDir } = require('../utils/scratch');
 
 const router = express.Router();
 
+/**
+ * 업로드 미들웨어 오류를 JSON 응답으로 변환
+ * - 크기 초과: 413 / 타입 불일치·미지원 형식: 400
+ */
+const receiveFile = (req, res, next) => {
+  upload.single('file')(req, res, (error) => {
+    if (!error) return next();
+
+    console.warn(withTime(`⚠️  업로드 거부: ${error.message}`));
+    const tooLarge = error.code === 'LIMIT_FILE_SIZE';
+    res.status(tooLarge ? 413 : 400).json({
+      success: false,
+      error: tooLarge ? '파일 크기가 제한을 초과했습니다.' : error.message
+    });
+  });
+};
+
 /**
  * POST /api/upload - 파일 업로드 (R2로 저장)
  *
  * 요청: multipart/form-data with 'file' field
- * 응답: { success: true, fileName: "...", r2Path: "...", size: ... }
+ * 응답: { success: true, fileName: "...", r2Path: "...", size: ..., sha256: "..." }
+ *
+ * 업로드 파일은 스크래치 디스크에 스트리밍 기록된 뒤 R2로 스트리밍 업로드
+ * (요청 처리 중 파일 전체를 메모리에 올리지 않음)
  */
-router.post('/', upload.single('file'), async (req, res) => {
+router.post('/', receiveFile, async (req, res) => {
   try {
     if (!req.file) {
       return res.status(400).json({
@@ -23,14 +44,15 @@ router.post('/', upload.single('file'), async (req, res) => {
     // R2 저장 경로 생성
     const r2Path = generateR2Path(req.file.originalname, 'uploads');
 
-    // R2에 파일 업로드
-    const uploadResult = await uploadToR2(r2Path, req.file.buffer, 'application/pdf');
+    // 스크래치 파일을 R2에 스트리밍 업로드
+    const uploadResult = await uploadFileToR2(r2Path, req.file.path, req.file.mimetype);
 
     res.json({
       success: true,
       fileName: req.file.originalname,
       r2Path: r2Path,
       size: req.file.size,
+      sha256: req.file.sha256,
       url: uploadResult.url
     });
   } catch (error) {
@@ -39,6 +61,8 @@ router.post('/', upload.single('file'), async (req, res) => {
       success: false,
       error: '파일 업로드에 실패했습니다.'
     });
+  } finally {
+    await removeScratchDir(req.file?.scratchDir);
   }
 });
 
@@ -1,5 +1,6 @@
 const express = require('express');
 const path = require('path');
+const cluster = require('cluster');
 const helmet = require('helmet');
 const cors = require('cors');
 const morgan = require('morgan');
@@ -7,37 +8,21 @@ const compression = require('compression');
 
 // 설정 및 라우트 import
 const db = require('./config/db');
+const { validateEnvironment } = require('./config/env');
 const { PORT } = require('./utils/constants');
 const uploadRoutes = require('./routes/uploadRoutes');
 const convertRoutes = require('./routes/convertRoutes');
 const downloadRoutes = require('./routes/downloadRoutes');
 const adminRoutes = require('./routes/adminRoutes');
+const jobRoutes = require('./routes/jobRoutes');
 const { startScheduler } = require('./utils/scheduler');
 const { logR2Status } = require('./config/r2');
 const { withTime } = require('./utils/logger');
 const { generalLimiter, uploadLimiter, adminLimiter } = require('./config/rateLimiter');
-
-// ============ 필수 환경변수 검증 ============
-function validateEnvironment() {
-  const requiredEnvVars = [
-    'JWT_SECRET',
-    'ADMIN_PASSWORD',
-    'R2_ENDPOINT',
-    'R2_BUCKET',
-    'R2_ACCESS_KEY_ID',
-    'R2_SECRET_ACCESS_KEY'
-  ];
-
-  const missing = requiredEnvVars.filter(varName => !process.env[varName]);
-
-  if (missing.length > 0) {
-    console.error(withTime(`❌ 필수 환경변수 없음: ${missing.join(', ')}`));
-    console.error(withTime('Railway 환경변수를 설정해주세요.'));
-    process.exit(1);
-  }
-
-  console.log(withTime('✅ 모든 필수 환경변수 검증됨'));
-}
+const { admission } = require('./utils/admission');
+const { getStats: getPoolStats } = require('./utils/converterPool');
+const { servePrecompressed } = require('./utils/precompressed');
+const { setCacheHeaders } = require('./utils/assetCache');
 
 // 서버 시작 전 환경변수 검증
 validateEnvironment();
@@ -103,6 +88,7 @@ app.use(helmet({
 app.use(morgan('dev'));
 app.use(express.json());
 app.use(express.urlencoded({ extended: true }));
+// 사전 압축(.br/.gz) 자산은 Content-Encoding이 설정되어 있어 compression()이 건너뜀
 app.use(compression());
 
 // ============ HTTPS 강제 (프로덕션) ============
@@ -117,7 +103,10 @@ if (process.env.NODE_ENV === 'production') {
   });
 }
 
-app.use(express.static(path.join(__dirname, 'public')));
+// compress_static.py로 만든 .br/.gz가 있으면 우선 전송, 없으면 express.static
+// 해시 파일명 자산은 immutable 장기 캐시, HTML은 no-cache (utils/assetCache.js)
+app.use(servePrecompressed(path.join(__dirname, 'public'), { setHeaders: setCacheHeaders }));
+app.use(express.static(path.join(__dirname, 'public'), { setHeaders: setCacheHeaders }));
 
 // Favicon redirect (ico -> png)
 app.get('/favicon.ico', (req, res) => {
@@ -141,18 +130,39 @@ app.use('/api/', generalLimiter);
 // ============ API Routes ============
 app.use('/api/upload', uploadLimiter, uploadRoutes);
 app.use('/api/convert', uploadLimiter, convertRoutes);
+// 큐 작업 등록/폴링 (변환은 jobWorker.js 프로세스가 처리)
+app.use('/api/jobs', jobRoutes);
 app.use('/api/download', downloadRoutes);
 app.use('/api/admin', adminLimiter, adminRoutes);
 
 // ============ Health Check Endpoint ============
+// 큐 상태 포함: lane별 포화 여부는 본문으로만 알리고 200 유지 (다른 lane의 변환은 계속 받을 수 있음)
+// 모든 lane이 포화된 경우에만 503 + Retry-After (로드밸런서가 미리 트래픽을 줄이도록)
 app.get('/health', (req, res) => {
   try {
     db.prepare('SELECT 1').get();
-    res.status(200).json({
-      status: 'healthy',
+
+    const { saturated, overloaded, lanes } = admission.getStatus();
+    const pool = getPoolStats();
+    const body = {
+      status: overloaded ? 'overloaded' : saturated ? 'degraded' : 'healthy',
       uptime: process.uptime(),
-      timestamp: new Date().toISOString()
-    });
+      timestamp: new Date().toISOString(),
+      queue: {
+        poolQueueSize: pool.queueSize,
+        threads: pool.threads,
+        inFlightBytes: Object.values(lanes).reduce((sum, lane) => sum + lane.inFlightBytes, 0),
+        lanes
+      }
+    };
+
+    if (overloaded) {
+      const retryAfter = Math.min(...Object.values(lanes).map((lane) => lane.retryAfterSec));
+      res.set('Retry-After', String(retryAfter));
+      return res.status(503).json(body);
+    }
+
+    res.status(200).json(body);
   } catch (error) {
     res.status(503).json({
       status: 'unhealthy',
@@ -226,8 +236,11 @@ server = app.listen(PORT, () => {
   console.log(withTime(`🚀 Server is running on http://localhost:${PORT}`));
 
   // 파일 자동 삭제 스케줄러 시작
-  console.log(withTime(`⏰ 파일 정리 스케줄러 시작...`));
-  startScheduler();
+  // 클러스터 모드(cluster.js)에서는 primary 프로세스 하나만 실행 → 워커는 건너뜀
+  if (!cluster.isWorker) {
+    console.log(withTime(`⏰ 파일 정리 스케줄러 시작...`));
+    startScheduler();
+  }
 
   // R2 연결 상태 로그
   logR2Status();
@@ -3,7 +3,7 @@ import re
 from pathlib import Path
 
 # 프로젝트 루트 경로
-BASE_DIR = Path(r"C:\Users\yj437\OneDrive\Desktop\coding_windows\convert-for-you\public")
+BASE_DIR = Path(__file__).resolve().parent / "public"
 
 # 한국어 -> 영어 매핑
 TRANSLATIONS = {
@@ -165,6 +165,50 @@ TRANSLATIONS = {
     "MKV 변환": "MKV Converter",
 }
 
+def _trie_pattern(keys):
+    """문자열 목록 → 공통 접두사를 묶은 정규식 (같은 위치에서는 가장 긴 항목이 매칭)"""
+    trie = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        is_end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # 더 긴 항목을 먼저 시도하고, 실패하면 여기서 끝나는 짧은 항목으로 되돌아감
+        if is_end:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+def compile_translations(translations):
+    """
+    번역 사전 → 문서를 한 번만 훑는 치환 함수
+
+    항목마다 문서 전체를 str.replace 하면 비용이 (사전 크기 × 문서 크기)이고,
+    "PDF 변환"이 "무료 PDF 변환"보다 먼저 바뀌는 것처럼 결과가 사전 순서에 좌우됨
+    → 모든 키를 접두사 트라이 정규식 하나로 합쳐 왼쪽부터 한 번 스캔하며
+      각 위치에서 가장 긴 키로 치환 (치환 결과는 다시 검사하지 않음)
+    """
+    keys = [key for key in translations if key]
+    if not keys:
+        return lambda text: text
+
+    pattern = re.compile(_trie_pattern(keys))
+    lookup = translations.get
+    return lambda text: pattern.sub(lambda match: lookup(match.group(0)), text)
+
+
+translate_text = compile_translations(TRANSLATIONS)
+
+
 def translate_html_file(filepath):
     """HTML 파일의 한국어 텍스트를 영어로 변환"""
     filename = os.path.basename(filepath)
@@ -180,9 +224,8 @@ def translate_html_file(filepath):
         
         original_content = content
         
-        # 각 번역 적용
-        for korean, english in TRANSLATIONS.items():
-            content = content.replace(korean, english)
+        # 모든 번역을 한 번의 스캔으로 적용 (가장 긴 문구 우선)
+        content = translate_text(content)
         
         # 변경사항이 없으면 건너뛰기
         if content == original_content:
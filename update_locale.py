@@ -2,7 +2,14 @@ import os
 from pathlib import Path
 
 # 프로젝트 루트 경로
-BASE_DIR = Path(r"C:\Users\yj437\OneDrive\Desktop\coding_windows\convert-for-you\public")
+BASE_DIR = Path(__file__).resolve().parent / "public"
+
+def apply_english_locale(content):
+    """HTML lang 속성과 OG locale을 영어로 변경"""
+    # HTML lang 속성 변경: ko -> en
+    content = content.replace('<html lang="ko">', '<html lang="en">')
+    # OG locale 변경: ko_KR -> en_US
+    return content.replace('content="ko_KR"', 'content="en_US"')
 
 def update_locale_to_english(filepath):
     """HTML 파일의 locale을 영어로 변경"""
@@ -19,11 +26,7 @@ def update_locale_to_english(filepath):
         
         original_content = content
         
-        # HTML lang 속성 변경: ko -> en
-        content = content.replace('<html lang="ko">', '<html lang="en">')
-        
-        # OG locale 변경: ko_KR -> en_US
-        content = content.replace('content="ko_KR"', 'content="en_US"')
+        content = apply_english_locale(content)
         
         # 변경사항이 없으면 건너뛰기
         if content == original_content:
@@ -0,0 +1,277 @@
+/**
+ * ================================
+ * 🚦 변환 작업 수용 제어 (Admission Control)
+ * ================================
+ * 작업 종류(lane)별로 대기+실행 중 작업 수와 입력 바이트에 상한을 두고,
+ * 초과 시 큐에 쌓지 않고 바로 503 + Retry-After로 거절
+ * - Retry-After / 예상 대기 시간은 최근 처리량(완료 속도)으로 계산
+ * - /health에서 lane별 큐 상태를 노출해 로드밸런서가 미리 트래픽을 줄일 수 있게 함
+ */
+
+const os = require('os');
+
+const MAX_THREADS = parseInt(process.env.CONVERTER_MAX_THREADS) || os.cpus().length;
+
+// 처리량 계산 구간 및 기본 작업 시간 (완료 기록이 없을 때)
+const THROUGHPUT_WINDOW_MS = 60 * 1000;
+const DEFAULT_JOB_MS = 10 * 1000;
+const MIN_RETRY_AFTER_SEC = 1;
+const MAX_RETRY_AFTER_SEC = 300;
+
+const MB = 1024 * 1024;
+
+/**
+ * lane별 기본 상한 (환경 변수 ADMISSION_<LANE>_MAX_QUEUE / ADMISSION_<LANE>_MAX_MB 로 변경)
+ * - document: PDF/Office (LibreOffice, Python 스크립트)
+ * - image: sharp 기반 이미지 변환
+ * - media: FFmpeg 기반 음성/비디오 변환 (작업당 시간/용량이 큼)
+ */
+const LANE_DEFAULTS = {
+  document: { maxQueue: MAX_THREADS * 4, maxBytes: 1024 * MB },
+  image: { maxQueue: MAX_THREADS * 8, maxBytes: 512 * MB },
+  media: { maxQueue: MAX_THREADS * 2, maxBytes: 2048 * MB }
+};
+
+const MEDIA_FORMATS = ['mp3', 'wav', 'ogg', 'm4a', 'aac', 'mp4', 'mov', 'webm', 'mkv', 'compress-video', 'gif'];
+
+/**
+ * 변환 형식 → lane
+ * @param {string} format
+ * @returns {'document'|'image'|'media'}
+ */
+function laneFor(format) {
+  if (MEDIA_FORMATS.includes(format)) return 'media';
+  if (format.includes('-to-') || format === 'resize' || format === 'compress-image' || format === 'image-batch') return 'image';
+  return 'document';
+}
+
+/**
+ * 수용 거절 에러 (code: ADMISSION_REJECTED, retryAfterSec 포함)
+ */
+class AdmissionError extends Error {
+  constructor(lane, reason, retryAfterSec) {
+    super(`변환 대기열이 가득 찼습니다 (${lane}: ${reason})`);
+    this.name = 'AdmissionError';
+    this.code = 'ADMISSION_REJECTED';
+    this.lane = lane;
+    this.reason = reason;
+    this.retryAfterSec = retryAfterSec;
+  }
+}
+
+class AdmissionController {
+  /**
+   * @param {Object} [options]
+   * @param {Object} [options.lanes] - lane별 { maxQueue, maxBytes }
+   * @param {number} [options.concurrency] - 동시에 실행되는 작업 수 (워커 스레드 수)
+   * @param {() => number} [options.now] - 시계 (테스트용)
+   */
+  constructor(options = {}) {
+    this.concurrency = options.concurrency || MAX_THREADS;
+    this.now = options.now || Date.now;
+    this.lanes = {};
+
+    const limits = options.lanes || {};
+    for (const [name, defaults] of Object.entries(LANE_DEFAULTS)) {
+      const envPrefix = `ADMISSION_${name.toUpperCase()}`;
+      this.lanes[name] = {
+        maxQueue: limits[name]?.maxQueue ?? (parseInt(process.env[`${envPrefix}_MAX_QUEUE`]) || defaults.maxQueue),
+        maxBytes: limits[name]?.maxBytes ?? ((parseInt(process.env[`${envPrefix}_MAX_MB`]) * MB) || defaults.maxBytes),
+        depth: 0,
+        bytes: 0,
+        admitted: 0,
+        rejected: 0,
+        completions: [],   // 최근 완료 시각 (처리량 계산)
+        avgJobMs: null     // 작업 시간 지수 이동 평균
+      };
+    }
+  }
+
+  _lane(name) {
+    const lane = this.lanes[name];
+    if (!lane) throw new Error(`알 수 없는 lane: ${name}`);
+    return lane;
+  }
+
+  /**
+   * 최근 처리량 (완료 작업/초)
+   */
+  _throughput(lane) {
+    const cutoff = this.now() - THROUGHPUT_WINDOW_MS;
+    while (lane.completions.length > 0 && lane.completions[0] < cutoff) {
+      lane.completions.shift();
+    }
+    if (lane.completions.length >= 3) {
+      return lane.completions.length / (THROUGHPUT_WINDOW_MS / 1000);
+    }
+    // 완료 기록이 적으면 평균 작업 시간 × 동시 실행 수로 추정
+    return this.concurrency / ((lane.avgJobMs || DEFAULT_JOB_MS) / 1000);
+  }
+
+  /**
+   * 현재 대기열을 모두 처리하는 데 걸리는 예상 시간 (초)
+   */
+  _estimatedWaitSec(lane) {
+    return lane.depth / this._throughput(lane);
+  }
+
+  /**
+   * 자리가 하나 날 때까지의 예상 시간 (초) → Retry-After
+   */
+  _retryAfterSec(lane) {
+    const excess = Math.max(1, lane.depth - lane.maxQueue + 1);
+    const seconds = Math.ceil(excess / this._throughput(lane));
+    return Math.min(MAX_RETRY_AFTER_SEC, Math.max(MIN_RETRY_AFTER_SEC, seconds));
+  }
+
+  /**
+   * 추가 작업을 받을 수 있는지 확인 (예약하지 않음, 라우트 초입의 빠른 거절용)
+   * @param {string} laneName
+   * @param {number} [bytes=0] - 예상 입력 크기
+   * @returns {AdmissionError|null}
+   */
+  check(laneName, bytes = 0) {
+    const lane = this._lane(laneName);
+
+    if (lane.depth >= lane.maxQueue) {
+      return new AdmissionError(laneName, `queue ${lane.depth}/${lane.maxQueue}`, this._retryAfterSec(lane));
+    }
+    // 작업 하나는 크기와 관계없이 허용 (단일 대용량 파일이 영원히 거절되지 않도록)
+    if (lane.depth > 0 && lane.bytes + bytes > lane.maxBytes) {
+      return new AdmissionError(laneName, `bytes ${lane.bytes + bytes}/${lane.maxBytes}`, this._retryAfterSec(lane));
+    }
+    return null;
+  }
+
+  /**
+   * check()와 같지만 거절이면 lane의 거절 횟수(rejected)도 증가
+   * @param {string} laneName
+   * @param {number} [bytes=0] - 예상 입력 크기
+   * @returns {AdmissionError|null}
+   */
+  checkAndRecord(laneName, bytes = 0) {
+    const rejection = this.check(laneName, bytes);
+    if (rejection) {
+      this._lane(laneName).rejected++;
+    }
+    return rejection;
+  }
+
+  /**
+   * 작업 수용 (상한 초과 시 AdmissionError throw)
+   * @param {string} laneName
+   * @param {number} [bytes=0] - 입력 크기
+   * @returns {{lane: string, bytes: number, admittedAt: number}} release()에 전달할 티켓
+   */
+  acquire(laneName, bytes = 0) {
+    const lane = this._lane(laneName);
+    const rejection = this.checkAndRecord(laneName, bytes);
+    if (rejection) {
+      throw rejection;
+    }
+
+    lane.depth++;
+    lane.bytes += bytes;
+    lane.admitted++;
+    return { lane: laneName, bytes, admittedAt: this.now() };
+  }
+
+  /**
+   * 작업 종료 (성공/실패 모두 호출)
+   * @param {Object} ticket - acquire() 반환값
+   * @param {Object} [result]
+   * @param {number} [result.runMs] - 실제 실행 시간 (없으면 수용~종료 시간)
+   */
+  release(ticket, result = {}) {
+    if (!ticket || ticket.released) return;
+    ticket.released = true;
+
+    const lane = this._lane(ticket.lane);
+    const finishedAt = this.now();
+    lane.depth = Math.max(0, lane.depth - 1);
+    lane.bytes = Math.max(0, lane.bytes - ticket.bytes);
+    lane.completions.push(finishedAt);
+
+    const jobMs = result.runMs ?? (finishedAt - ticket.admittedAt);
+    lane.avgJobMs = lane.avgJobMs === null ? jobMs : lane.avgJobMs * 0.8 + jobMs * 0.2;
+  }
+
+  /**
+   * lane별 상태 (/health 노출용)
+   * - saturated: lane 중 하나라도 포화
+   * - overloaded: 모든 lane이 포화 (어떤 변환도 받을 수 없음)
+   */
+  getStatus() {
+    const lanes = {};
+    let saturated = false;
+    let overloaded = true;
+
+    for (const [name, lane] of Object.entries(this.lanes)) {
+      const full = lane.depth >= lane.maxQueue || (lane.depth > 0 && lane.bytes >= lane.maxBytes);
+      saturated = saturated || full;
+      overloaded = overloaded && full;
+      lanes[name] = {
+        depth: lane.depth,
+        maxQueue: lane.maxQueue,
+        inFlightBytes: lane.bytes,
+        maxBytes: lane.maxBytes,
+        throughputPerMin: Math.round(this._throughput(lane) * 60 * 10) / 10,
+        estimatedWaitSec: Math.ceil(this._estimatedWaitSec(lane)),
+        admitted: lane.admitted,
+        rejected: lane.rejected,
+        saturated: full,
+        retryAfterSec: full ? this._retryAfterSec(lane) : 0
+      };
+    }
+
+    return { saturated, overloaded, lanes };
+  }
+}
+
+// 프로세스 전역 컨트롤러 (워커 풀과 라우트가 공유)
+const admission = new AdmissionController();
+
+/**
+ * 수용 거절 에러면 503 + Retry-After 응답 후 true 반환
+ * @param {import('express').Response} res
+ * @param {Error} error
+ * @returns {boolean}
+ */
+function respondIfRejected(res, error) {
+  if (error?.code !== 'ADMISSION_REJECTED') return false;
+  if (res.headersSent) return true;
+
+  res.set('Retry-After', String(error.retryAfterSec));
+  res.status(503).json({
+    success: false,
+    error: '요청이 많아 잠시 후 다시 시도해주세요.',
+    retryAfter: error.retryAfterSec
+  });
+  return true;
+}
+
+/**
+ * 라우트 초입에서 대기열이 가득 찼으면 R2 다운로드 전에 바로 거절하는 미들웨어
+ * @param {(req) => string|null} resolveFormat - 요청에서 변환 형식 추출 (null이면 통과)
+ */
+function rejectWhenBusy(resolveFormat) {
+  return (req, res, next) => {
+    const format = resolveFormat(req);
+    if (!format) return next();
+
+    const rejection = admission.checkAndRecord(laneFor(format));
+    if (rejection) {
+      return respondIfRejected(res, rejection);
+    }
+    next();
+  };
+}
+
+module.exports = {
+  AdmissionController,
+  AdmissionError,
+  admission,
+  laneFor,
+  respondIfRejected,
+  rejectWhenBusy
+};
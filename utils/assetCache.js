@@ -0,0 +1,43 @@
+/**
+ * ================================
+ * 🔖 정적 자산 캐시 헤더
+ * ================================
+ * - 파일명에 내용 해시가 있는 자산(fingerprint_assets.py, 예: styles.1a2b3c4d.css)
+ *   → 내용이 바뀌면 URL이 바뀌므로 1년 + immutable (재검증 요청 없음)
+ * - HTML → no-cache (매번 ETag로 재검증해 새 해시 참조를 바로 받음)
+ * - 그 외 → express.static 기본값 (max-age=0)
+ */
+
+const path = require('path');
+
+// fingerprint_assets.py 의 HASH_LENGTH 와 같은 길이
+const FINGERPRINT_PATTERN = /\.[0-9a-f]{8}\.[a-z0-9]+$/;
+const IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60; // 1년 (초)
+
+/**
+ * 해시 파일명인지 확인
+ * @param {string} filePath
+ * @returns {boolean}
+ */
+function isFingerprinted(filePath) {
+  return FINGERPRINT_PATTERN.test(path.basename(filePath));
+}
+
+/**
+ * express.static / servePrecompressed 의 setHeaders
+ * @param {Object} res - Express response
+ * @param {string} filePath - 원본 파일 경로 (.br/.gz 형제가 아닌)
+ */
+function setCacheHeaders(res, filePath) {
+  if (isFingerprinted(filePath)) {
+    res.setHeader('Cache-Control', `public, max-age=${IMMUTABLE_MAX_AGE}, immutable`);
+  } else if (path.extname(filePath) === '.html') {
+    res.setHeader('Cache-Control', 'no-cache');
+  }
+}
+
+module.exports = {
+  IMMUTABLE_MAX_AGE,
+  isFingerprinted,
+  setCacheHeaders
+};
@@ -13,8 +13,12 @@ const UPLOAD_DIR = path.join(__dirname, '../' + (process.env.UPLOAD_DIR || 'uplo
 // 파일 크기 제한 (기본값: 50MB)
 const MAX_FILE_SIZE = parseInt(process.env.MAX_FILE_SIZE) || 50 * 1024 * 1024;
 
-// 병합 작업 최대 크기 (100MB - 메모리 제한)
-const MAX_MERGE_SIZE = 100 * 1024 * 1024;
+// 병합 작업 최대 크기 (기본값: 1GB)
+// 병합/분할은 디스크 파일 기반으로 처리되므로 메모리가 아닌 스크래치 디스크 용량 기준
+const MAX_MERGE_SIZE = parseInt(process.env.MAX_MERGE_SIZE) || 1024 * 1024 * 1024;
+
+// 이미지 일괄 변환 최대 파일 수 (기본값: 50개)
+const MAX_BATCH_IMAGES = parseInt(process.env.MAX_BATCH_IMAGES) || 50;
 
 // 파일 만료 시간 (분)
 const FILE_EXPIRY_MINUTES = 10;
@@ -50,6 +54,7 @@ const EXTENSION_MAP = {
   'heic-to-webp': '.webp',
   'resize': '.resized',  // 원본 포맷 유지
   'compress-image': '.compressed',  // 원본 포맷 유지
+  'image-batch': '.zip',  // 일괄 변환 결과 (무압축 ZIP)
   // 음성 변환
   'mp3': '.mp3',
   'wav': '.wav',
@@ -62,7 +67,30 @@ const EXTENSION_MAP = {
   'webm': '.webm',
   'mkv': '.mkv',
   'compress-video': '.mp4',
-  'gif': '.gif'
+  'gif': '.gif',
+  // 다단계 변환 (Office → PDF → 이미지 ZIP / 압축 PDF)
+  'word2jpg': '.zip',
+  'word2png': '.zip',
+  'excel2jpg': '.zip',
+  'excel2png': '.zip',
+  'ppt2jpg': '.zip',
+  'ppt2png': '.zip',
+  'word2pdf-compress': '.pdf',
+  'excel2pdf-compress': '.pdf',
+  'ppt2pdf-compress': '.pdf'
+};
+
+// 다단계 변환 형식 → 단계 형식 목록 (한 워커 안에서 순서대로 실행, utils/converters/pipeline.js)
+const PIPELINE_STEPS = {
+  'word2jpg': ['word2pdf', 'jpg'],
+  'word2png': ['word2pdf', 'png'],
+  'excel2jpg': ['excel2pdf', 'jpg'],
+  'excel2png': ['excel2pdf', 'png'],
+  'ppt2jpg': ['ppt2pdf', 'jpg'],
+  'ppt2png': ['ppt2pdf', 'png'],
+  'word2pdf-compress': ['word2pdf', 'compress'],
+  'excel2pdf-compress': ['excel2pdf', 'compress'],
+  'ppt2pdf-compress': ['ppt2pdf', 'compress']
 };
 
 // 변환 시뮬레이션 시간 (ms)
@@ -80,9 +108,11 @@ module.exports = {
   UPLOAD_DIR,
   MAX_FILE_SIZE,
   MAX_MERGE_SIZE,
+  MAX_BATCH_IMAGES,
   FILE_EXPIRY_MINUTES,
   SCHEDULER_INTERVAL_MINUTES,
   EXTENSION_MAP,
+  PIPELINE_STEPS,
   CONVERSION_DELAY,
   ADSENSE_PUBLISHER_ID,
   DB_PATH
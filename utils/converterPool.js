@@ -8,11 +8,29 @@
 const Piscina = require('piscina');
 const path = require('path');
 const os = require('os');
+const fs = require('fs');
+const supervisor = require('./processSupervisor');
+const { recordConversion } = require('./metrics');
+const { SingleFlight, hashInput, stableStringify } = require('./singleFlight');
+const { createScratchDir, removeScratchDir } = require('./scratch');
+const { admission, laneFor } = require('./admission');
+const { PIPELINE_STEPS } = require('./constants');
 
 // 환경 변수 기본값
 const MAX_THREADS = parseInt(process.env.CONVERTER_MAX_THREADS) || os.cpus().length;
 const MIN_THREADS = parseInt(process.env.CONVERTER_MIN_THREADS) || 2;
 const TIMEOUT = parseInt(process.env.CONVERTER_TIMEOUT) || 300000; // 5분
+const COALESCE_ENABLED = process.env.CONVERTER_COALESCE !== '0'; // 동일 입력 동시 변환 합치기
+
+// 워커 스레드들이 생성한 외부 프로세스 그룹을 공유하는 레지스트리
+const supervisorRegistry = supervisor.createRegistryBuffer();
+supervisor.attachRegistry(supervisorRegistry);
+
+// 작업 ID (프로세스 그룹 정리 시 작업 단위 식별용)
+let nextTaskId = 1;
+
+// 진행 중인 동일 변환 (입력 해시 + 형식 + 옵션 기준)
+const inflight = new SingleFlight();
 
 /**
  * Piscina 워커 풀 생성
@@ -27,17 +45,122 @@ const pool = new Piscina({
   maxThreads: MAX_THREADS,
   idleTimeout: 30000,  // 30초 유휴 후 스레드 정리
   taskTimeout: TIMEOUT,
-  concurrentTasksPerWorker: 1  // 워커당 1개 작업만 처리 (변환은 CPU 집약적)
+  concurrentTasksPerWorker: 1,  // 워커당 1개 작업만 처리 (변환은 CPU 집약적)
+  workerData: { supervisorRegistry }
+});
+
+// 메인 프로세스 종료 시 남아있는 외부 프로세스 그룹 정리
+process.on('exit', () => {
+  supervisor.reapAll();
 });
 
 /**
- * 변환 작업 실행
- * @param {Buffer|Array<Buffer>} fileBuffer - 파일 버퍼
+ * 입력/출력 크기 계산 (Buffer 또는 디스크 경로)
+ * @param {Buffer|string|Array<string>} input
+ * @returns {number|null}
+ */
+function byteSize(input) {
+  if (Buffer.isBuffer(input)) return input.length;
+  if (Array.isArray(input)) {
+    const sizes = input.map(byteSize);
+    return sizes.includes(null) ? null : sizes.reduce((sum, size) => sum + size, 0);
+  }
+  if (typeof input === 'string') {
+    try {
+      return fs.statSync(input).size;
+    } catch (error) {
+      return null;
+    }
+  }
+  return null;
+}
+
+/**
+ * 실패 원인 분류 (Piscina 타임아웃/취소 구분)
+ */
+function classifyFailure(error) {
+  if (error?.name === 'AbortError') return 'aborted';
+  if (/timed out/i.test(error?.message || '')) return 'timeout';
+  return 'failed';
+}
+
+/**
+ * 변환 작업 실행 (동일한 입력/형식/옵션의 작업이 진행 중이면 결과 공유)
+ * - 결과를 호출자별 경로(outputPath)에 기록하는 형식(merge, split, image-batch)은 합치지 않음
+ * - 호출자의 signal은 자신의 대기만 취소, 모든 대기자가 취소하면 워커 작업도 취소
+ * @param {Buffer|string|Array<string>} fileInput - 입력 파일 경로 또는 버퍼 (merge: 입력 PDF 경로 배열, split: 입력 PDF 경로)
+ *        경로를 전달하면 워커 스레드로 파일 내용이 복사되지 않음
  * @param {string} format - 변환 형식
- * @param {any} additionalData - 추가 데이터 (merge: fileNames, split: ranges, compress: quality, image: options/quality/backgroundColor)
- * @returns {Promise<{success, buffer, format}>}
+ * @param {any} additionalData - 추가 데이터 (merge: fileNames, split: ranges, compress: quality, image: options/quality/backgroundColor,
+ *        image-batch: { format, fileNames, quality, backgroundColor, options })
+ * @param {Object} options - 작업 옵션
+ * @param {string} [options.outputPath] - 결과를 디스크에 기록하는 형식(merge, split, image-batch)의 출력 경로
+ * @param {AbortSignal} [options.signal] - 작업 취소 신호 (워커의 외부 프로세스 그룹까지 종료)
+ * @param {string} [options.inputHash] - 입력 내용의 sha256 (다운로드 중 계산한 값, 없으면 여기서 파일을 읽어 계산)
+ * @returns {Promise<{success, buffer?, outputPath?, partial?, format}>}
+ *          partial: 마감 시간으로 일부 페이지만 변환된 경우 { pagesDone, pagesTotal }
+ */
+async function convert(fileInput, format, additionalData = [], options = {}) {
+  if (!COALESCE_ENABLED || options.outputPath) {
+    return runConversion(fileInput, format, additionalData, options);
+  }
+
+  let key;
+  try {
+    const inputHash = options.inputHash || await hashInput(fileInput);
+    key = `${format}:${inputHash}:${stableStringify(additionalData)}`;
+  } catch (error) {
+    console.warn(`⚠️  입력 해시 계산 실패 (합치지 않고 실행): ${error.message}`);
+    return runConversion(fileInput, format, additionalData, options);
+  }
+
+  return inflight.do(key, async (signal) => {
+    // 첫 요청자가 먼저 끝나 스크래치 파일을 지워도 공유 작업은 계속 읽을 수 있도록 고정
+    const pinned = await pinInput(fileInput);
+    try {
+      return await runConversion(pinned.input, format, additionalData, { ...options, signal });
+    } finally {
+      await removeScratchDir(pinned.dir);
+    }
+  }, { signal: options.signal });
+}
+
+/**
+ * 경로 입력을 작업 전용 스크래치 디렉토리에 하드 링크 (다른 파일시스템이면 복사)
+ * @param {Buffer|string} fileInput
+ * @returns {Promise<{input: Buffer|string, dir: string|null}>}
  */
-async function convert(fileBuffer, format, additionalData = []) {
+async function pinInput(fileInput) {
+  if (typeof fileInput !== 'string') {
+    return { input: fileInput, dir: null };
+  }
+
+  const dir = await createScratchDir('flight');
+  const pinnedPath = path.join(dir, `input${path.extname(fileInput)}`);
+  try {
+    await fs.promises.link(fileInput, pinnedPath);
+  } catch (error) {
+    await fs.promises.copyFile(fileInput, pinnedPath);
+  }
+  return { input: pinnedPath, dir };
+}
+
+/**
+ * 워커 풀에서 변환 작업 1건 실행
+ * @param {Buffer|string|Array<string>} fileInput - convert()와 동일
+ * @param {string} format
+ * @param {any} additionalData
+ * @param {Object} options - { outputPath, signal }
+ */
+async function runConversion(fileInput, format, additionalData = [], options = {}) {
+  // 대기열 상한 초과 시 Piscina 큐에 넣지 않고 바로 거절 (ADMISSION_REJECTED)
+  const ticket = admission.acquire(laneFor(format), byteSize(fileInput) || 0);
+
+  const taskId = nextTaskId++;
+  if (nextTaskId > 0x7fffffff) nextTaskId = 1;
+  const enqueuedAt = Date.now();
+  let result;
+
   try {
     console.log(`⏳ 워커 풀에 변환 작업 추가: ${format}`);
 
@@ -45,19 +168,33 @@ async function convert(fileBuffer, format, additionalData = []) {
 
     // PDF 병합
     if (format === 'merge') {
-      workerData = { pdfBuffers: fileBuffer, fileNames: additionalData, format };
+      workerData = { pdfPaths: fileInput, fileNames: additionalData, outputPath: options.outputPath, format };
     }
     // PDF 분할
     else if (format === 'split') {
-      workerData = { pdfBuffer: fileBuffer, ranges: additionalData, format };
+      workerData = { pdfPath: fileInput, ranges: additionalData, outputPath: options.outputPath, format };
+    }
+    // 이미지 일괄 변환 (additionalData: { format, fileNames, quality, backgroundColor, options })
+    else if (format === 'image-batch') {
+      workerData = {
+        imagePaths: fileInput,
+        fileNames: additionalData.fileNames || [],
+        batchOptions: additionalData,
+        outputPath: options.outputPath,
+        format
+      };
+    }
+    // 다단계 변환 파이프라인 (additionalData: { quality } 등 단계 공통 옵션)
+    else if (Object.hasOwn(PIPELINE_STEPS, format)) {
+      workerData = { pipelineInput: fileInput, pipelineOptions: additionalData, format };
     }
     // PDF 압축
     else if (format === 'compress') {
-      workerData = { pdfBuffer: fileBuffer, quality: additionalData, format };
+      workerData = { pdfInput: fileInput, quality: additionalData, format };
     }
     // Office → PDF
     else if (format.endsWith('2pdf')) {
-      workerData = { officeBuffer: fileBuffer, format };
+      workerData = { officeInput: fileInput, format };
     }
     // 이미지 변환 (JPG/PNG/WEBP)
     else if (format.includes('to-')) {
@@ -66,49 +203,92 @@ async function convert(fileBuffer, format, additionalData = []) {
       const isBackgroundFormat = format === 'png-to-jpg';
 
       if (isQualityFormat) {
-        workerData = { imageBuffer: fileBuffer, quality: additionalData, format };
+        workerData = { imageInput: fileInput, quality: additionalData, format };
       } else if (isBackgroundFormat) {
-        workerData = { imageBuffer: fileBuffer, backgroundColor: additionalData, format };
+        workerData = { imageInput: fileInput, backgroundColor: additionalData, format };
       } else {
-        workerData = { imageBuffer: fileBuffer, format };
+        workerData = { imageInput: fileInput, format };
       }
     }
     // 이미지 리사이즈/압축
     else if (format === 'resize' || format === 'compress-image') {
-      workerData = { imageBuffer: fileBuffer, options: additionalData, format };
+      workerData = { imageInput: fileInput, options: additionalData, format };
     }
     // 음성 변환 (MP3, WAV, OGG, M4A, AAC)
     else if (['mp3', 'wav', 'ogg', 'm4a', 'aac'].includes(format)) {
-      workerData = { audioBuffer: fileBuffer, bitrate: additionalData, format };
+      workerData = { audioInput: fileInput, bitrate: additionalData, format };
     }
     // 비디오 변환 (MP4, MOV, WebM, MKV)
     else if (['mp4', 'mov', 'webm', 'mkv'].includes(format)) {
-      workerData = { videoBuffer: fileBuffer, videoOptions: additionalData, format };
+      workerData = { videoInput: fileInput, videoOptions: additionalData, format };
     }
     // 비디오 압축
     else if (format === 'compress-video') {
-      workerData = { videoBuffer: fileBuffer, quality: additionalData, format };
+      workerData = { videoInput: fileInput, quality: additionalData, format };
     }
     // 비디오 → GIF
     else if (format === 'gif') {
-      workerData = { videoBuffer: fileBuffer, gifOptions: additionalData, format };
+      workerData = { videoInput: fileInput, gifOptions: additionalData, format };
     }
     // PDF → 다른 형식 변환
     else {
-      workerData = { pdfBuffer: fileBuffer, format };
+      workerData = { pdfInput: fileInput, format };
     }
 
-    const result = await pool.run(workerData);
+    workerData.taskId = taskId;
+    // taskTimeout 전에 페이지 단위 변환기가 부분 결과를 만들 수 있도록 마감 시각 전달
+    workerData.deadlineAt = enqueuedAt + TIMEOUT;
+    result = await pool.run(workerData, options.signal ? { signal: options.signal } : undefined);
 
     if (!result.success) {
-      throw new Error(result.error);
+      const error = new Error(result.error);
+      error.code = result.code;
+      throw error;
     }
 
-    console.log(`✅ 변환 완료: ${format}`);
+    if (result.partial) {
+      console.warn(`⏳ 부분 결과: ${format} (${result.partial.pagesDone}/${result.partial.pagesTotal}페이지)`);
+    } else {
+      console.log(`✅ 변환 완료: ${format}`);
+    }
+    recordJobMetrics(format, fileInput, enqueuedAt, result, 'success');
     return result;
   } catch (error) {
     console.error(`❌ 변환 실패: ${format}`, error.message);
+    recordJobMetrics(format, fileInput, enqueuedAt, result, classifyFailure(error), error.code);
     throw error;
+  } finally {
+    // 타임아웃/취소로 워커 스레드가 종료된 경우에도 손자 프로세스(soffice, gs 등) 정리
+    supervisor.reapTask(taskId);
+    admission.release(ticket, { runMs: result?.metrics?.runMs });
+  }
+}
+
+/**
+ * 작업 지표 기록 (지표 기록 실패는 변환 결과에 영향 없음)
+ */
+function recordJobMetrics(format, input, enqueuedAt, result, outcome, errorCode) {
+  try {
+    const finishedAt = Date.now();
+    const metrics = result?.metrics;
+    let output = null;
+    if (outcome === 'success') {
+      output = result.buffer || result.outputPath;
+    }
+
+    recordConversion({
+      format,
+      outcome,
+      inputBytes: byteSize(input),
+      outputBytes: output ? byteSize(output) : null,
+      queueWaitMs: metrics ? Math.max(0, metrics.startedAt - enqueuedAt) : null,
+      runMs: metrics ? metrics.runMs : null,
+      totalMs: finishedAt - enqueuedAt,
+      peakRssBytes: metrics ? metrics.peakRssBytes : null,
+      errorCode
+    });
+  } catch (error) {
+    console.warn(`⚠️  변환 지표 기록 실패: ${error.message}`);
   }
 }
 
@@ -120,7 +300,12 @@ function getStats() {
     minThreads: MIN_THREADS,
     maxThreads: MAX_THREADS,
     taskTimeout: TIMEOUT,
-    cpuCores: os.cpus().length
+    cpuCores: os.cpus().length,
+    queueSize: pool.queueSize,
+    threads: pool.threads.length,
+    childProcesses: supervisor.getSupervisorStats(),
+    coalescing: { enabled: COALESCE_ENABLED, ...inflight.getStats() },
+    admission: admission.getStatus()
   };
 }
 
@@ -130,6 +315,7 @@ function getStats() {
 async function destroy() {
   console.log('🛑 워커 풀 종료...');
   await pool.destroy();
+  supervisor.reapAll();
   console.log('✅ 워커 풀 종료 완료');
 }
 
@@ -5,18 +5,19 @@
  * Ghostscript를 사용하여 PDF 압축
  */
 
-const { spawn } = require('child_process');
+const { spawnSupervised } = require('../processSupervisor');
 const fs = require('fs');
 const path = require('path');
 const os = require('os');
+const { materializeInput, inputSize } = require('../scratch');
 
 /**
  * PDF 압축
- * @param {Buffer} pdfBuffer - PDF 버퍼
+ * @param {string|Buffer} pdfInput - PDF 파일 경로 또는 버퍼
  * @param {string} quality - 압축 품질 ('high', 'medium', 'low')
  * @returns {Promise<Buffer>} 압축된 PDF 버퍼
  */
-async function compressPdf(pdfBuffer, quality = 'medium') {
+async function compressPdf(pdfInput, quality = 'medium') {
   const tempDir = os.tmpdir();
   const timestamp = Date.now();
   const randomStr = Math.random().toString(36).substring(2, 8);
@@ -42,9 +43,9 @@ async function compressPdf(pdfBuffer, quality = 'medium') {
         gsQuality = 'screen';
     }
 
-    // 1️⃣ 임시 파일에 PDF 저장
-    console.log(`  📝 임시 파일 저장`);
-    fs.writeFileSync(inputPath, pdfBuffer);
+    // 1️⃣ 임시 경로에 PDF 준비 (경로 입력은 복사 없이 링크)
+    console.log(`  📝 임시 파일 준비`);
+    await materializeInput(pdfInput, inputPath);
     console.log(`  ✓ 입력: ${inputPath}`);
 
     // 2️⃣ Ghostscript로 압축
@@ -55,9 +56,10 @@ async function compressPdf(pdfBuffer, quality = 'medium') {
     // 3️⃣ 압축된 파일 읽기
     console.log(`  📂 압축된 파일 읽기`);
     const compressedBuffer = fs.readFileSync(outputPath);
-    const originalSize = pdfBuffer.length / 1024 / 1024;
+    const originalBytes = await inputSize(pdfInput);
+    const originalSize = originalBytes / 1024 / 1024;
     const compressedSize = compressedBuffer.length / 1024 / 1024;
-    const ratio = ((1 - compressedBuffer.length / pdfBuffer.length) * 100).toFixed(1);
+    const ratio = ((1 - compressedBuffer.length / originalBytes) * 100).toFixed(1);
 
     console.log(`✅ PDF 압축 완료`);
     console.log(`  원본: ${originalSize.toFixed(2)}MB`);
@@ -104,7 +106,8 @@ function runGhostscript(inputPath, outputPath, quality) {
       inputPath
     ];
 
-    const gs = spawn('gs', args);
+    // 타임아웃 60초: 감독자가 프로세스 종료 시 타이머를 해제하므로 성공 후에는 발동하지 않음
+    const gs = spawnSupervised('gs', args, { timeoutMs: 60000, label: 'ghostscript' });
     let stderr = '';
 
     gs.stderr.on('data', (data) => {
@@ -114,6 +117,8 @@ function runGhostscript(inputPath, outputPath, quality) {
     gs.on('close', (code) => {
       if (code === 0) {
         resolve();
+      } else if (gs.killReason === 'timeout') {
+        reject(new Error('Ghostscript 타임아웃 (60초)'));
       } else {
         reject(new Error(`Ghostscript 실패 (코드: ${code}): ${stderr}`));
       }
@@ -122,12 +127,6 @@ function runGhostscript(inputPath, outputPath, quality) {
     gs.on('error', (err) => {
       reject(new Error(`Ghostscript 프로세스 오류: ${err.message}`));
     });
-
-    // 타임아웃 설정 (60초)
-    setTimeout(() => {
-      gs.kill();
-      reject(new Error('Ghostscript 타임아웃 (60초)'));
-    }, 60000);
   });
 }
 
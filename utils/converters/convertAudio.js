@@ -3,6 +3,7 @@
  * 🎵 Audio Format Conversion
  * ================================
  * Converts between audio formats: MP3, WAV, OGG, M4A, AAC
+ * Compatible sources are remuxed with stream copy (see mediaPlanner)
  * Uses FFmpeg via fluent-ffmpeg
  */
 
@@ -11,6 +12,9 @@ const path = require('path');
 const fs = require('fs');
 const os = require('os');
 const { promisify } = require('util');
+const { superviseFfmpeg } = require('../processSupervisor');
+const { materializeInput } = require('../scratch');
+const { probeMedia, planAudioConversion, fullEncodePlan } = require('./mediaPlanner');
 
 // Set FFmpeg path
 const ffmpegPath = require('@ffmpeg-installer/ffmpeg').path;
@@ -18,88 +22,100 @@ const ffprobePath = require('@ffmpeg-installer/ffmpeg').path.replace('ffmpeg', '
 ffmpeg.setFfmpegPath(ffmpegPath);
 ffmpeg.setFfprobePath(ffprobePath);
 
-const writeFile = promisify(fs.writeFile);
 const readFile = promisify(fs.readFile);
 const unlink = promisify(fs.unlink);
 
+// Encoder per target format (used when the source cannot be copied)
+const AUDIO_ENCODERS = {
+  mp3: 'libmp3lame',
+  wav: 'pcm_s16le',
+  ogg: 'libvorbis',
+  m4a: 'aac',
+  aac: 'aac'
+};
+
+/**
+ * Run FFmpeg for one plan
+ * @param {string} inputPath
+ * @param {string} outputPath
+ * @param {string} format
+ * @param {Object} plan - planAudioConversion() result
+ * @param {number} bitrate - Bitrate in kbps
+ */
+function runAudioPlan(inputPath, outputPath, format, plan, bitrate) {
+  return new Promise((resolve, reject) => {
+    const encoder = AUDIO_ENCODERS[format];
+    if (!encoder) {
+      return reject(new Error(`지원하지 않는 음성 형식: ${format}`));
+    }
+
+    const command = ffmpeg(inputPath);
+
+    if (plan.audio === 'copy') {
+      // Container change only: copy the audio stream, drop cover art/video
+      command
+        .noVideo()
+        .audioCodec('copy');
+    } else {
+      command.audioCodec(encoder);
+      if (format !== 'wav') {
+        command.audioBitrate(`${Math.min(bitrate, 320)}k`);
+      }
+      command
+        .audioChannels(2)
+        .audioFrequency(44100);
+    }
+
+    superviseFfmpeg(command, { label: 'ffmpeg-audio' })
+      .output(outputPath)
+      .on('end', () => {
+        console.log(`✅ 음성 변환 완료: ${format} (audio=${plan.audio})`);
+        resolve();
+      })
+      .on('error', (err) => {
+        console.error(`❌ 음성 변환 오류:`, err.message);
+        reject(err);
+      })
+      .run();
+  });
+}
+
 /**
  * Audio format converter
- * @param {Buffer} audioBuffer - Input audio buffer
+ * - Sources already in a compatible codec within the bitrate cap are
+ *   stream-copied into the new container instead of transcoded
+ * @param {string|Buffer} audioInput - Input audio file path or buffer
  * @param {string} format - Target format: mp3, wav, ogg, m4a, aac
  * @param {number} bitrate - Bitrate in kbps (default 192)
  * @returns {Promise<Buffer>} Converted audio buffer
  */
-async function convertAudio(audioBuffer, format, bitrate = 192) {
+async function convertAudio(audioInput, format, bitrate = 192) {
   const timestamp = Date.now();
   const inputPath = path.join(os.tmpdir(), `audio-input-${timestamp}.tmp`);
   const outputPath = path.join(os.tmpdir(), `audio-output-${timestamp}.${format}`);
 
   try {
-    // Write input buffer to temp file
-    await writeFile(inputPath, audioBuffer);
+    // Prepare input at temp path (paths are symlinked, buffers written)
+    await materializeInput(audioInput, inputPath);
     console.log(`📝 임시 음성 파일 생성: ${inputPath}`);
 
-    // Convert audio using FFmpeg
-    await new Promise((resolve, reject) => {
-      let command = ffmpeg(inputPath);
-
-      // Format-specific settings
-      switch (format) {
-        case 'mp3':
-          command
-            .audioCodec('libmp3lame')
-            .audioBitrate(`${Math.min(bitrate, 320)}k`)
-            .audioChannels(2)
-            .audioFrequency(44100);
-          break;
-
-        case 'wav':
-          command
-            .audioCodec('pcm_s16le')
-            .audioChannels(2)
-            .audioFrequency(44100);
-          break;
-
-        case 'ogg':
-          command
-            .audioCodec('libvorbis')
-            .audioBitrate(`${Math.min(bitrate, 320)}k`)
-            .audioChannels(2)
-            .audioFrequency(44100);
-          break;
-
-        case 'm4a':
-          command
-            .audioCodec('aac')
-            .audioBitrate(`${Math.min(bitrate, 320)}k`)
-            .audioChannels(2)
-            .audioFrequency(44100);
-          break;
-
-        case 'aac':
-          command
-            .audioCodec('aac')
-            .audioBitrate(`${Math.min(bitrate, 320)}k`)
-            .audioChannels(2)
-            .audioFrequency(44100);
-          break;
-
-        default:
-          throw new Error(`지원하지 않는 음성 형식: ${format}`);
-      }
+    // Decide whether the audio stream can be copied
+    let plan;
+    try {
+      plan = planAudioConversion(await probeMedia(inputPath), format, bitrate);
+    } catch (err) {
+      console.warn(`⚠️ ffprobe 실패 - 재인코딩: ${err.message}`);
+      plan = fullEncodePlan('probe failed');
+    }
+    console.log(`🧭 변환 계획: audio=${plan.audio}${plan.reasons.length ? ` (${plan.reasons.join('; ')})` : ''}`);
 
-      command
-        .output(outputPath)
-        .on('end', () => {
-          console.log(`✅ 음성 변환 완료: ${format}`);
-          resolve();
-        })
-        .on('error', (err) => {
-          console.error(`❌ 음성 변환 오류:`, err.message);
-          reject(err);
-        })
-        .run();
-    });
+    try {
+      await runAudioPlan(inputPath, outputPath, format, plan, bitrate);
+    } catch (err) {
+      if (plan.audio !== 'copy') throw err;
+      console.warn(`⚠️ 스트림 복사 실패 - 재인코딩으로 재시도: ${err.message}`);
+      await runAudioPlan(inputPath, outputPath, format, fullEncodePlan('remux failed'), bitrate);
+    }
 
     // Read converted file
     const result = await readFile(outputPath);
@@ -123,15 +139,15 @@ async function convertAudio(audioBuffer, format, bitrate = 192) {
 
 /**
  * Get audio metadata (duration, codec, bitrate, channels)
- * @param {Buffer} audioBuffer - Audio buffer
+ * @param {string|Buffer} audioInput - Input audio file path or buffer
  * @returns {Promise<Object>} Metadata object
  */
-async function getAudioMetadata(audioBuffer) {
+async function getAudioMetadata(audioInput) {
   const timestamp = Date.now();
   const inputPath = path.join(os.tmpdir(), `audio-metadata-${timestamp}.tmp`);
 
   try {
-    await writeFile(inputPath, audioBuffer);
+    await materializeInput(audioInput, inputPath);
 
     return new Promise((resolve, reject) => {
       ffmpeg.ffprobe(inputPath, (err, metadata) => {
@@ -8,20 +8,21 @@
 
 const convert = require('heic-convert');
 const sharp = require('sharp');
+const { readInput } = require('../scratch');
 
 /**
  * HEIC → JPG 변환
- * @param {Buffer} heicBuffer - HEIC 이미지 버퍼
+ * @param {string|Buffer} heicInput - HEIC 이미지 파일 경로 또는 버퍼
  * @param {number} quality - JPG 품질 (1-100, 기본값 90)
  * @returns {Promise<Buffer>} JPG 이미지 버퍼
  */
-async function heicToJpg(heicBuffer, quality = 90) {
+async function heicToJpg(heicInput, quality = 90) {
   try {
     console.log(`🎨 HEIC → JPG 변환 중... (품질: ${quality})`);
 
     // HEIC → JPEG 바이너리 변환
     const jpegBuffer = await convert({
-      blob: heicBuffer,
+      blob: await readInput(heicInput),
       toType: 'image/jpeg',
       quality: Math.min(Math.max(quality, 1), 100) / 100  // 0-1 범위로 변환
     });
@@ -36,16 +37,16 @@ async function heicToJpg(heicBuffer, quality = 90) {
 
 /**
  * HEIC → PNG 변환
- * @param {Buffer} heicBuffer - HEIC 이미지 버퍼
+ * @param {string|Buffer} heicInput - HEIC 이미지 파일 경로 또는 버퍼
  * @returns {Promise<Buffer>} PNG 이미지 버퍼
  */
-async function heicToPng(heicBuffer) {
+async function heicToPng(heicInput) {
   try {
     console.log(`🎨 HEIC → PNG 변환 중...`);
 
     // HEIC → JPEG 먼저 변환 (heic-convert는 PNG를 직접 지원하지 않음)
     const jpegBuffer = await convert({
-      blob: heicBuffer,
+      blob: await readInput(heicInput),
       toType: 'image/jpeg',
       quality: 0.95
     });
@@ -65,17 +66,17 @@ async function heicToPng(heicBuffer) {
 
 /**
  * HEIC → WEBP 변환
- * @param {Buffer} heicBuffer - HEIC 이미지 버퍼
+ * @param {string|Buffer} heicInput - HEIC 이미지 파일 경로 또는 버퍼
  * @param {number} quality - WEBP 품질 (1-100, 기본값 80)
  * @returns {Promise<Buffer>} WEBP 이미지 버퍼
  */
-async function heicToWebp(heicBuffer, quality = 80) {
+async function heicToWebp(heicInput, quality = 80) {
   try {
     console.log(`🎨 HEIC → WEBP 변환 중... (품질: ${quality})`);
 
     // HEIC → JPEG 먼저 변환
     const jpegBuffer = await convert({
-      blob: heicBuffer,
+      blob: await readInput(heicInput),
       toType: 'image/jpeg',
       quality: 0.95
     });
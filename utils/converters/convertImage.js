@@ -9,14 +9,14 @@ const sharp = require('sharp');
 
 /**
  * JPG → PNG 변환
- * @param {Buffer} imageBuffer - JPG 이미지 버퍼
+ * @param {string|Buffer} imageInput - JPG 이미지 파일 경로 또는 버퍼
  * @returns {Promise<Buffer>} PNG 이미지 버퍼
  */
-async function jpgToPng(imageBuffer) {
+async function jpgToPng(imageInput) {
   try {
     console.log(`🎨 JPG → PNG 변환 중...`);
 
-    const pngBuffer = await sharp(imageBuffer)
+    const pngBuffer = await sharp(imageInput)
       .png({ compressionLevel: 9 })  // 최대 압축
       .toBuffer();
 
@@ -30,16 +30,16 @@ async function jpgToPng(imageBuffer) {
 
 /**
  * PNG → JPG 변환
- * @param {Buffer} imageBuffer - PNG 이미지 버퍼
+ * @param {string|Buffer} imageInput - PNG 이미지 파일 경로 또는 버퍼
  * @param {string} backgroundColor - 배경색 (hex: #ffffff)
  * @returns {Promise<Buffer>} JPG 이미지 버퍼
  */
-async function pngToJpg(imageBuffer, backgroundColor = '#ffffff') {
+async function pngToJpg(imageInput, backgroundColor = '#ffffff') {
   try {
     console.log(`🎨 PNG → JPG 변환 중... (배경: ${backgroundColor})`);
 
     // 투명 배경을 지정된 색으로 변환
-    const jpgBuffer = await sharp(imageBuffer)
+    const jpgBuffer = await sharp(imageInput)
       .flatten({ background: backgroundColor })  // 투명 배경 처리
       .jpeg({ quality: 90, progressive: true })
       .toBuffer();
@@ -54,15 +54,15 @@ async function pngToJpg(imageBuffer, backgroundColor = '#ffffff') {
 
 /**
  * JPG → WEBP 변환
- * @param {Buffer} imageBuffer - JPG 이미지 버퍼
+ * @param {string|Buffer} imageInput - JPG 이미지 파일 경로 또는 버퍼
  * @param {number} quality - 품질 (1-100, 기본값 80)
  * @returns {Promise<Buffer>} WEBP 이미지 버퍼
  */
-async function jpgToWebp(imageBuffer, quality = 80) {
+async function jpgToWebp(imageInput, quality = 80) {
   try {
     console.log(`🎨 JPG → WEBP 변환 중... (품질: ${quality})`);
 
-    const webpBuffer = await sharp(imageBuffer)
+    const webpBuffer = await sharp(imageInput)
       .webp({ quality: Math.min(Math.max(quality, 1), 100) })
       .toBuffer();
 
@@ -76,15 +76,15 @@ async function jpgToWebp(imageBuffer, quality = 80) {
 
 /**
  * PNG → WEBP 변환
- * @param {Buffer} imageBuffer - PNG 이미지 버퍼
+ * @param {string|Buffer} imageInput - PNG 이미지 파일 경로 또는 버퍼
  * @param {number} quality - 품질 (1-100, 기본값 80)
  * @returns {Promise<Buffer>} WEBP 이미지 버퍼
  */
-async function pngToWebp(imageBuffer, quality = 80) {
+async function pngToWebp(imageInput, quality = 80) {
   try {
     console.log(`🎨 PNG → WEBP 변환 중... (품질: ${quality})`);
 
-    const webpBuffer = await sharp(imageBuffer)
+    const webpBuffer = await sharp(imageInput)
       .webp({ quality: Math.min(Math.max(quality, 1), 100) })
       .toBuffer();
 
@@ -98,14 +98,14 @@ async function pngToWebp(imageBuffer, quality = 80) {
 
 /**
  * WEBP → JPG 변환
- * @param {Buffer} imageBuffer - WEBP 이미지 버퍼
+ * @param {string|Buffer} imageInput - WEBP 이미지 파일 경로 또는 버퍼
  * @returns {Promise<Buffer>} JPG 이미지 버퍼
  */
-async function webpToJpg(imageBuffer) {
+async function webpToJpg(imageInput) {
   try {
     console.log(`🎨 WEBP → JPG 변환 중...`);
 
-    const jpgBuffer = await sharp(imageBuffer)
+    const jpgBuffer = await sharp(imageInput)
       .jpeg({ quality: 90, progressive: true })
       .toBuffer();
 
@@ -119,14 +119,14 @@ async function webpToJpg(imageBuffer) {
 
 /**
  * WEBP → PNG 변환
- * @param {Buffer} imageBuffer - WEBP 이미지 버퍼
+ * @param {string|Buffer} imageInput - WEBP 이미지 파일 경로 또는 버퍼
  * @returns {Promise<Buffer>} PNG 이미지 버퍼
  */
-async function webpToPng(imageBuffer) {
+async function webpToPng(imageInput) {
   try {
     console.log(`🎨 WEBP → PNG 변환 중...`);
 
-    const pngBuffer = await sharp(imageBuffer)
+    const pngBuffer = await sharp(imageInput)
       .png({ compressionLevel: 9 })
       .toBuffer();
 
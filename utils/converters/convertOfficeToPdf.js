@@ -8,7 +8,9 @@
 const fs = require('fs/promises');
 const os = require('os');
 const path = require('path');
-const { spawn } = require('child_process');
+const { materializeInput } = require('../scratch');
+const { spawnSupervised } = require('../processSupervisor');
+const { profileEnv } = require('../profiler');
 const { randomBytes } = require('crypto');
 
 const PYTHON_SCRIPT = path.join(__dirname, 'scripts', 'office_to_pdf.py');
@@ -16,8 +18,10 @@ const PYTHON_BIN = process.env.PYTHON_BIN || 'python3';
 
 async function runPythonScript(inputPath, outputPath) {
   return new Promise((resolve, reject) => {
-    const child = spawn(PYTHON_BIN, [PYTHON_SCRIPT, inputPath, outputPath], {
-      stdio: ['ignore', 'pipe', 'pipe']
+    const child = spawnSupervised(PYTHON_BIN, [PYTHON_SCRIPT, inputPath, outputPath], {
+      stdio: ['ignore', 'pipe', 'pipe'],
+      env: profileEnv('office_to_pdf'),
+      label: 'office_to_pdf'
     });
 
     let stderr = '';
@@ -34,7 +38,7 @@ async function runPythonScript(inputPath, outputPath) {
         resolve();
       } else {
         const err = new Error(
-          `Office → PDF 변환 실패 (exit=${code}).${stderr ? `\n${stderr.trim()}` : ''}`
+          `Office → PDF 변환 실패 (exit=${code}${child.killReason ? `, ${child.killReason}` : ''}).${stderr ? `\n${stderr.trim()}` : ''}`
         );
         err.code = 'OFFICE_TO_PDF_CONVERSION_FAILED';
         reject(err);
@@ -56,15 +60,17 @@ async function withTemporaryPaths(callback) {
 
 /**
  * Office 문서를 PDF로 변환
- * @param {Buffer} officeBuffer - Office 파일 버퍼 (docx/xlsx/pptx)
+ * @param {string|Buffer} officeInput - Office 파일 경로 또는 버퍼 (docx/xlsx/pptx)
  * @param {string} format - 입력 파일 형식 ('word', 'excel', 'ppt')
- * @returns {Promise<Buffer>} 변환된 PDF 파일 버퍼
+ * @param {Object} [options]
+ * @param {string} [options.outputPath] - 지정 시 PDF를 이 경로에 기록하고 경로 반환 (파이프라인 중간 결과용)
+ * @returns {Promise<Buffer|string>} 변환된 PDF 파일 버퍼 (outputPath 지정 시 경로)
  */
-async function convertOfficeToPdf(officeBuffer, format) {
+async function convertOfficeToPdf(officeInput, format, options = {}) {
   try {
     console.log(`📄 Office (${format.toUpperCase()}) → PDF 변환 시작`);
 
-    const pdfBuffer = await withTemporaryPaths(async (tmpDir) => {
+    const pdfResult = await withTemporaryPaths(async (tmpDir) => {
       // 입력 파일 확장자 결정
       const extMap = {
         'word': '.docx',
@@ -78,10 +84,10 @@ async function convertOfficeToPdf(officeBuffer, format) {
       }
 
       const inputPath = path.join(tmpDir, `input${ext}`);
-      const outputPath = path.join(tmpDir, 'output.pdf');
+      const outputPath = options.outputPath || path.join(tmpDir, 'output.pdf');
 
       // 1. Office 파일 저장
-      await fs.writeFile(inputPath, officeBuffer);
+      await materializeInput(officeInput, inputPath);
       console.log(`✅ ${format.toUpperCase()} 파일 저장 완료`);
 
       // 2. Python 스크립트로 LibreOffice 호출하여 PDF 변환
@@ -89,6 +95,10 @@ async function convertOfficeToPdf(officeBuffer, format) {
       await runPythonScript(inputPath, outputPath);
       console.log('✅ PDF 변환 성공');
 
+      if (options.outputPath) {
+        return outputPath;
+      }
+
       // 3. 변환된 PDF 읽기
       const buffer = await fs.readFile(outputPath);
       console.log(`✅ PDF 파일 읽기 완료 (${(buffer.length / 1024).toFixed(2)} KB)`);
@@ -97,7 +107,7 @@ async function convertOfficeToPdf(officeBuffer, format) {
     });
 
     console.log(`✅ Office → PDF 변환 완료`);
-    return pdfBuffer;
+    return pdfResult;
   } catch (error) {
     console.error(`❌ Office → PDF 변환 실패:`, error.message);
     const wrapped = new Error(`Office → PDF 변환 실패: ${error.message}`);
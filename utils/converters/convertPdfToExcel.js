@@ -2,24 +2,45 @@
  * ================================
  * 📊 PDF → Excel (.xlsx) 변환
  * ================================
- * Camelot + pandas를 사용하여 PDF에서 표를 추출해 XLSX로 저장
+ * pdf_to_xlsx.py로 PDF에서 표를 추출해 XLSX로 저장
+ * - 추출 엔진: camelot(정확하지만 무거움) / text(PyMuPDF 단어 박스 기반 경량 엔진)
+ * - auto(기본): 문서 구조를 preflight 해서 문서마다 엔진 선택
+ * - PDF2XLSX_ENGINE 환경변수 또는 options.engine 으로 고정 가능
+ * - 마감 시간이 지나면 남은 페이지를 건너뛰고 찾은 표만 저장 (utils/deadline.js)
  */
 
 const fs = require('fs/promises');
 const os = require('os');
 const path = require('path');
-const { spawn } = require('child_process');
+const { materializeInput } = require('../scratch');
+const { spawnSupervised } = require('../processSupervisor');
+const { profileEnv } = require('../profiler');
+const { deadlineArgs, parseScriptSummary, reportScriptSummary } = require('../deadline');
 const { randomBytes } = require('crypto');
 
 const PYTHON_BIN = process.env.PDF2XLSX_PYTHON_BIN || process.env.PDF2DOCX_PYTHON_BIN || 'python3';
 const SCRIPT_PATH = path.resolve(__dirname, 'scripts/pdf_to_xlsx.py');
+const DEFAULT_ENGINE = process.env.PDF2XLSX_ENGINE || 'auto';
+const ENGINES = ['auto', 'camelot', 'text'];
 
-async function runPdfToXlsx(inputPath, outputPath) {
+/**
+ * pdf_to_xlsx.py 실행
+ * @returns {Promise<Object>} 스크립트 요약 ({ engine, reason, tables, timings, partial, pages_done, pages_total })
+ */
+async function runPdfToXlsx(inputPath, outputPath, engine, deadlineAt) {
   return new Promise((resolve, reject) => {
-    const args = [SCRIPT_PATH, inputPath, outputPath];
-    const child = spawn(PYTHON_BIN, args, { stdio: ['ignore', 'pipe', 'pipe'] });
+    const args = [SCRIPT_PATH, inputPath, outputPath, '--engine', engine, ...deadlineArgs(deadlineAt)];
+    const child = spawnSupervised(PYTHON_BIN, args, {
+      stdio: ['ignore', 'pipe', 'pipe'],
+      env: profileEnv('pdf_to_xlsx'),
+      label: 'pdf_to_xlsx'
+    });
 
+    let stdout = '';
     let stderr = '';
+    child.stdout?.on('data', (chunk) => {
+      stdout += chunk.toString();
+    });
     child.stderr?.on('data', (chunk) => {
       stderr += chunk.toString();
     });
@@ -27,10 +48,10 @@ async function runPdfToXlsx(inputPath, outputPath) {
     child.on('error', (error) => reject(error));
     child.on('close', (code) => {
       if (code === 0) {
-        resolve();
+        resolve(parseScriptSummary(stdout));
       } else {
         const err = new Error(
-          `PDF → Excel 변환 프로세스가 실패했습니다 (exit=${code}).${stderr ? `\n${stderr.trim()}` : ''}`
+          `PDF → Excel 변환 프로세스가 실패했습니다 (exit=${code}${child.killReason ? `, ${child.killReason}` : ''}).${stderr ? `\n${stderr.trim()}` : ''}`
         );
         err.code = 'PDF2XLSX_CONVERSION_FAILED';
         reject(err);
@@ -54,19 +75,31 @@ async function withTemporaryPaths(callback) {
 
 /**
  * PDF를 Excel로 변환
- * @param {Buffer} pdfBuffer - PDF 파일 버퍼
+ * @param {string|Buffer} pdfInput - PDF 파일 경로 또는 버퍼
+ * @param {Object} [options]
+ * @param {string} [options.engine] - 'auto' | 'camelot' | 'text' (기본: PDF2XLSX_ENGINE 또는 auto)
+ * @param {number} [options.deadlineAt] - 작업 마감 시각 (epoch ms)
  * @returns {Promise<Buffer>} 변환된 Excel 파일 버퍼
  */
-async function convertPdfToExcel(pdfBuffer) {
+async function convertPdfToExcel(pdfInput, options = {}) {
   try {
-    console.log(`📊 PDF → Excel 변환 시작`);
+    const engine = options.engine || DEFAULT_ENGINE;
+    if (!ENGINES.includes(engine)) {
+      throw new Error(`지원하지 않는 표 추출 엔진: ${engine}`);
+    }
+    console.log(`📊 PDF → Excel 변환 시작 (엔진: ${engine})`);
 
     const convertedBuffer = await withTemporaryPaths(async ({ inputPath, outputPath }) => {
-      await fs.writeFile(inputPath, pdfBuffer);
+      await materializeInput(pdfInput, inputPath);
 
       console.log(`🔄 python pdf_to_xlsx 변환 중...`);
-      await runPdfToXlsx(inputPath, outputPath);
-      console.log('✅ python pdf_to_xlsx 변환 성공');
+      const summary = await runPdfToXlsx(inputPath, outputPath, engine, options.deadlineAt);
+      reportScriptSummary(summary);
+      const timings = Object.entries(summary.timings || {}).map(([key, ms]) => `${key}=${ms}`).join(', ');
+      console.log(
+        `✅ python pdf_to_xlsx 변환 성공 (엔진: ${summary.engine ?? engine}${summary.reason ? ` - ${summary.reason}` : ''}, ` +
+        `표 ${summary.tables ?? '?'}개${timings ? `, ${timings}` : ''})`
+      );
 
       return fs.readFile(outputPath);
     });
@@ -3,24 +3,35 @@
  * 🖼️ PDF → Image (JPG/PNG) 변환
  * ================================
  * pdftoppm (Poppler) + Sharp를 사용하여 모든 페이지를 이미지로 변환하고 ZIP으로 압축
+ * - 마감 시간이 지나면 남은 페이지를 건너뛰고 완료한 페이지만 압축 (utils/deadline.js)
  */
 
 const fs = require('fs/promises');
 const os = require('os');
 const path = require('path');
-const { spawn } = require('child_process');
+const { materializeInput } = require('../scratch');
+const { spawnSupervised } = require('../processSupervisor');
+const { stopAt, reportPartial } = require('../deadline');
 const { randomBytes } = require('crypto');
 const sharp = require('sharp');
 const archiver = require('archiver');
 const { createWriteStream } = require('fs');
 
 const PDFTOPPM_BIN = process.env.PDFTOPPM_BIN || 'pdftoppm';
+const PDFINFO_BIN = process.env.PDFINFO_BIN || 'pdfinfo';
+// pdftoppm 1회 실행으로 렌더링할 페이지 수 (마감 확인 단위)
+const PAGES_PER_RENDER = 4;
 
-async function runPdftoppm(inputPath, outputBase) {
+/**
+ * pdftoppm 실행
+ * @param {{first: number, last: number}|null} range - 렌더링할 페이지 범위 (null이면 전체)
+ */
+async function runPdftoppm(inputPath, outputBase, range) {
   return new Promise((resolve, reject) => {
     // -singlefile 제거하여 모든 페이지 변환
-    const args = ['-png', '-r', '300', inputPath, outputBase];
-    const child = spawn(PDFTOPPM_BIN, args, { stdio: ['ignore', 'pipe', 'pipe'] });
+    const pageArgs = range ? ['-f', String(range.first), '-l', String(range.last)] : [];
+    const args = ['-png', '-r', '300', ...pageArgs, inputPath, outputBase];
+    const child = spawnSupervised(PDFTOPPM_BIN, args, { stdio: ['ignore', 'pipe', 'pipe'], label: 'pdftoppm' });
 
     let stderr = '';
     child.stderr?.on('data', (chunk) => {
@@ -33,7 +44,7 @@ async function runPdftoppm(inputPath, outputBase) {
         resolve();
       } else {
         const err = new Error(
-          `pdftoppm 변환이 실패했습니다 (exit=${code}).${stderr ? `\n${stderr.trim()}` : ''}`
+          `pdftoppm 변환이 실패했습니다 (exit=${code}${child.killReason ? `, ${child.killReason}` : ''}).${stderr ? `\n${stderr.trim()}` : ''}`
         );
         err.code = 'PDFTOPPM_CONVERSION_FAILED';
         reject(err);
@@ -42,6 +53,42 @@ async function runPdftoppm(inputPath, outputBase) {
   });
 }
 
+/**
+ * pdfinfo로 페이지 수 조회 (실패하면 null → 전체를 한 번에 렌더링)
+ * @returns {Promise<number|null>}
+ */
+async function getPageCount(inputPath) {
+  return new Promise((resolve) => {
+    const child = spawnSupervised(PDFINFO_BIN, [inputPath], { stdio: ['ignore', 'pipe', 'ignore'], label: 'pdfinfo' });
+
+    let stdout = '';
+    child.stdout?.on('data', (chunk) => {
+      stdout += chunk.toString();
+    });
+
+    child.on('error', () => resolve(null));
+    child.on('close', (code) => {
+      const match = /^Pages:\s+(\d+)/m.exec(stdout);
+      resolve(code === 0 && match ? Number(match[1]) : null);
+    });
+  });
+}
+
+/**
+ * 렌더링 범위 목록 (PAGES_PER_RENDER 페이지씩)
+ * @param {number|null} pagesTotal
+ * @returns {Array<{first: number, last: number}|null>}
+ */
+function renderRanges(pagesTotal) {
+  if (!pagesTotal) return [null];
+
+  const ranges = [];
+  for (let first = 1; first <= pagesTotal; first += PAGES_PER_RENDER) {
+    ranges.push({ first, last: Math.min(first + PAGES_PER_RENDER - 1, pagesTotal) });
+  }
+  return ranges;
+}
+
 async function withTemporaryPaths(callback) {
   const tmpDir = path.join(os.tmpdir(), `pdf2img-${randomBytes(8).toString('hex')}`);
   await fs.mkdir(tmpDir, { recursive: true });
@@ -88,71 +135,82 @@ async function optimizeImage(imageBuffer, format) {
   return imageBuffer;
 }
 
-async function createZipFromImages(pngFiles, format, zipPath) {
-  return new Promise(async (resolve, reject) => {
-    const output = createWriteStream(zipPath);
-    const archive = archiver('zip', { zlib: { level: 9 } });
-
+/**
+ * 페이지를 순서대로 렌더링 → 최적화 → ZIP에 추가
+ * - PAGES_PER_RENDER 페이지씩 렌더링하고 덩어리 사이에 마감 확인 (첫 덩어리는 항상 처리)
+ * - 마감이 지나면 남은 페이지를 건너뛰고 지금까지의 페이지로 ZIP 완성
+ * @returns {Promise<{pagesDone: number, pagesTotal: number}>}
+ */
+async function renderPagesToZip(inputPath, outputBase, format, zipPath, deadlineAt) {
+  const output = createWriteStream(zipPath);
+  const archive = archiver('zip', { zlib: { level: 9 } });
+  const closed = new Promise((resolve, reject) => {
     output.on('close', () => resolve());
     output.on('error', reject);
     archive.on('error', reject);
+  });
+  archive.pipe(output);
+
+  const stop = stopAt(deadlineAt);
+  const pagesTotal = await getPageCount(inputPath);
+  let pagesDone = 0;
 
-    archive.pipe(output);
+  try {
+    for (const range of renderRanges(pagesTotal)) {
+      if (pagesDone > 0 && Date.now() >= stop) break;
 
-    try {
-      for (let i = 0; i < pngFiles.length; i++) {
-        const pngPath = pngFiles[i];
-        let imageBuffer = await fs.readFile(pngPath);
+      await runPdftoppm(inputPath, outputBase, range);
 
+      for (const pngPath of await getAllPngFiles(outputBase)) {
         // 이미지 최적화
-        imageBuffer = await optimizeImage(imageBuffer, format);
+        const imageBuffer = await optimizeImage(await fs.readFile(pngPath), format);
+        await fs.rm(pngPath);
 
         // ZIP에 추가 (파일명: page-001.jpg, page-002.jpg, ...)
-        const fileName = `page-${String(i + 1).padStart(3, '0')}.${format}`;
-        archive.append(imageBuffer, { name: fileName });
+        pagesDone++;
+        archive.append(imageBuffer, { name: `page-${String(pagesDone).padStart(3, '0')}.${format}` });
       }
+    }
 
-      await archive.finalize();
-    } catch (error) {
-      reject(error);
+    if (pagesDone === 0) {
+      throw new Error('PDF 변환 결과 이미지 파일이 생성되지 않았습니다');
     }
-  });
+  } catch (error) {
+    closed.catch(() => {});
+    archive.abort();
+    output.destroy();
+    throw error;
+  }
+
+  await archive.finalize();
+  await closed;
+  return { pagesDone, pagesTotal: pagesTotal || pagesDone };
 }
 
 /**
  * PDF를 모든 페이지의 이미지로 변환하여 ZIP 파일로 반환
- * @param {Buffer} pdfBuffer - PDF 파일 버퍼
+ * @param {string|Buffer} pdfInput - PDF 파일 경로 또는 버퍼
  * @param {string} format - 변환 형식 ('jpg' 또는 'png')
+ * @param {Object} [options]
+ * @param {number} [options.deadlineAt] - 작업 마감 시각 (epoch ms)
  * @returns {Promise<Buffer>} 변환된 이미지 ZIP 파일 버퍼
  */
-async function convertPdfToImage(pdfBuffer, format) {
+async function convertPdfToImage(pdfInput, format, options = {}) {
   try {
     console.log(`🖼️ PDF → ${format.toUpperCase()} (ZIP) 변환 시작`);
 
     const zipBuffer = await withTemporaryPaths(async ({ inputPath, outputBase, zipPath }) => {
       // 1. PDF를 파일로 저장
-      await fs.writeFile(inputPath, pdfBuffer);
+      await materializeInput(pdfInput, inputPath);
       console.log('✅ PDF 파일 저장 완료');
 
-      // 2. pdftoppm으로 모든 페이지를 PNG로 변환
-      console.log('🔄 pdftoppm으로 모든 페이지 PNG 변환 중...');
-      await runPdftoppm(inputPath, outputBase);
-      console.log('✅ pdftoppm 변환 성공');
-
-      // 3. 생성된 PNG 파일들 조회
-      const pngFiles = await getAllPngFiles(outputBase);
-      console.log(`📊 총 ${pngFiles.length}개 페이지 변환됨`);
-
-      if (pngFiles.length === 0) {
-        throw new Error('PDF 변환 결과 이미지 파일이 생성되지 않았습니다');
-      }
-
-      // 4. ZIP 파일 생성
-      console.log(`📦 ZIP 파일 생성 중... (${format.toUpperCase()} 최적화)`);
-      await createZipFromImages(pngFiles, format, zipPath);
-      console.log('✅ ZIP 파일 생성 완료');
+      // 2. pdftoppm으로 페이지를 PNG로 렌더링하며 ZIP 생성
+      console.log(`🔄 pdftoppm 렌더링 + ZIP 생성 중... (${format.toUpperCase()} 최적화)`);
+      const { pagesDone, pagesTotal } = await renderPagesToZip(inputPath, outputBase, format, zipPath, options.deadlineAt);
+      reportPartial(pagesDone, pagesTotal);
+      console.log(`📊 총 ${pagesDone}/${pagesTotal}개 페이지 변환됨`);
 
-      // 5. ZIP 파일을 버퍼로 읽기
+      // 3. ZIP 파일을 버퍼로 읽기
       const buffer = await fs.readFile(zipPath);
       return buffer;
     });
@@ -3,23 +3,39 @@
  * 🎬 PDF → PowerPoint (.pptx) 변환
  * ================================
  * pdf2image + python-pptx를 사용하여 PDF 페이지를 이미지 슬라이드로 변환
+ * - 마감 시간이 지나면 남은 페이지를 건너뛰고 완료한 슬라이드만 저장 (utils/deadline.js)
  */
 
 const fs = require('fs/promises');
 const os = require('os');
 const path = require('path');
-const { spawn } = require('child_process');
+const { materializeInput } = require('../scratch');
+const { spawnSupervised } = require('../processSupervisor');
+const { profileEnv } = require('../profiler');
+const { deadlineArgs, parseScriptSummary, reportScriptSummary } = require('../deadline');
 const { randomBytes } = require('crypto');
 
 const PYTHON_BIN = process.env.PDF2PPTX_PYTHON_BIN || process.env.PDF2DOCX_PYTHON_BIN || 'python3';
 const SCRIPT_PATH = path.resolve(__dirname, 'scripts/pdf_to_pptx.py');
 
-async function runPdfToPptx(inputPath, outputPath) {
+/**
+ * pdf_to_pptx.py 실행
+ * @returns {Promise<Object>} 스크립트 요약 ({ partial, pages_done, pages_total })
+ */
+async function runPdfToPptx(inputPath, outputPath, deadlineAt) {
   return new Promise((resolve, reject) => {
-    const args = [SCRIPT_PATH, inputPath, outputPath];
-    const child = spawn(PYTHON_BIN, args, { stdio: ['ignore', 'pipe', 'pipe'] });
+    const args = [SCRIPT_PATH, inputPath, outputPath, ...deadlineArgs(deadlineAt)];
+    const child = spawnSupervised(PYTHON_BIN, args, {
+      stdio: ['ignore', 'pipe', 'pipe'],
+      env: profileEnv('pdf_to_pptx'),
+      label: 'pdf_to_pptx'
+    });
 
+    let stdout = '';
     let stderr = '';
+    child.stdout?.on('data', (chunk) => {
+      stdout += chunk.toString();
+    });
     child.stderr?.on('data', (chunk) => {
       stderr += chunk.toString();
     });
@@ -27,10 +43,10 @@ async function runPdfToPptx(inputPath, outputPath) {
     child.on('error', (error) => reject(error));
     child.on('close', (code) => {
       if (code === 0) {
-        resolve();
+        resolve(parseScriptSummary(stdout));
       } else {
         const err = new Error(
-          `PDF → PowerPoint 변환 프로세스가 실패했습니다 (exit=${code}).${stderr ? `\n${stderr.trim()}` : ''}`
+          `PDF → PowerPoint 변환 프로세스가 실패했습니다 (exit=${code}${child.killReason ? `, ${child.killReason}` : ''}).${stderr ? `\n${stderr.trim()}` : ''}`
         );
         err.code = 'PDF2PPTX_CONVERSION_FAILED';
         reject(err);
@@ -54,19 +70,22 @@ async function withTemporaryPaths(callback) {
 
 /**
  * PDF를 PowerPoint로 변환
- * @param {Buffer} pdfBuffer - PDF 파일 버퍼
+ * @param {string|Buffer} pdfInput - PDF 파일 경로 또는 버퍼
+ * @param {Object} [options]
+ * @param {number} [options.deadlineAt] - 작업 마감 시각 (epoch ms)
  * @returns {Promise<Buffer>} 변환된 PowerPoint 파일 버퍼
  */
-async function convertPdfToPpt(pdfBuffer) {
+async function convertPdfToPpt(pdfInput, options = {}) {
 
   try {
     console.log(`🎬 PDF → PowerPoint 변환 시작`);
 
     const convertedBuffer = await withTemporaryPaths(async ({ inputPath, outputPath }) => {
-      await fs.writeFile(inputPath, pdfBuffer);
+      await materializeInput(pdfInput, inputPath);
 
       console.log(`🔄 python pdf_to_pptx 변환 중...`);
-      await runPdfToPptx(inputPath, outputPath);
+      const summary = await runPdfToPptx(inputPath, outputPath, options.deadlineAt);
+      reportScriptSummary(summary);
       console.log('✅ python pdf_to_pptx 변환 성공');
 
       return fs.readFile(outputPath);
@@ -3,25 +3,39 @@
  * 📄 PDF → Word (.docx) 변환
  * ================================
  * pdf2docx(Python)를 호출하여 PDF를 Word로 변환
+ * - 마감 시간이 지나면 남은 페이지를 건너뛰고 완료한 페이지만으로 문서 생성 (utils/deadline.js)
  */
 
 const fs = require('fs/promises');
 const os = require('os');
 const path = require('path');
-const { spawn } = require('child_process');
+const { materializeInput } = require('../scratch');
+const { spawnSupervised } = require('../processSupervisor');
+const { profileEnv } = require('../profiler');
+const { deadlineArgs, parseScriptSummary, reportScriptSummary } = require('../deadline');
 const { randomBytes } = require('crypto');
 
 const PYTHON_BIN = process.env.PDF2DOCX_PYTHON_BIN || 'python3';
 const SCRIPT_PATH = path.resolve(__dirname, 'scripts/pdf_to_docx.py');
 
-async function runPdf2Docx(inputPath, outputPath) {
+/**
+ * pdf_to_docx.py 실행
+ * @returns {Promise<Object>} 스크립트 요약 ({ partial, pages_done, pages_total })
+ */
+async function runPdf2Docx(inputPath, outputPath, deadlineAt) {
   return new Promise((resolve, reject) => {
-    const args = [SCRIPT_PATH, inputPath, outputPath];
-    const child = spawn(PYTHON_BIN, args, { stdio: ['ignore', 'pipe', 'pipe'] });
+    const args = [SCRIPT_PATH, inputPath, outputPath, ...deadlineArgs(deadlineAt)];
+    const child = spawnSupervised(PYTHON_BIN, args, {
+      stdio: ['ignore', 'pipe', 'pipe'],
+      env: profileEnv('pdf_to_docx'),
+      label: 'pdf_to_docx'
+    });
 
+    let stdout = '';
     let stderr = '';
     child.stdout?.on('data', (chunk) => {
-      // pdf2docx는 진행 상황을 stdout에 출력하기도 하지만 굳이 로그로 노출하지 않음
+      // 마지막 줄의 요약만 사용 (pdf2docx 진행 상황은 로그로 노출하지 않음)
+      stdout += chunk.toString();
     });
     child.stderr?.on('data', (chunk) => {
       stderr += chunk.toString();
@@ -30,10 +44,10 @@ async function runPdf2Docx(inputPath, outputPath) {
     child.on('error', (error) => reject(error));
     child.on('close', (code) => {
       if (code === 0) {
-        resolve();
+        resolve(parseScriptSummary(stdout));
       } else {
         const err = new Error(
-          `pdf2docx 변환 프로세스가 실패했습니다 (exit=${code}).${stderr ? `\n${stderr.trim()}` : ''}`
+          `pdf2docx 변환 프로세스가 실패했습니다 (exit=${code}${child.killReason ? `, ${child.killReason}` : ''}).${stderr ? `\n${stderr.trim()}` : ''}`
         );
         err.code = 'PDF2DOCX_CONVERSION_FAILED';
         reject(err);
@@ -56,19 +70,22 @@ async function withTemporaryPaths(callback) {
 }
 /**
  * PDF를 Word로 변환
- * @param {Buffer} pdfBuffer - PDF 파일 버퍼
+ * @param {string|Buffer} pdfInput - PDF 파일 경로 또는 버퍼
+ * @param {Object} [options]
+ * @param {number} [options.deadlineAt] - 작업 마감 시각 (epoch ms)
  * @returns {Promise<Buffer>} 변환된 Word 파일 버퍼
  */
-async function convertPdfToWord(pdfBuffer) {
+async function convertPdfToWord(pdfInput, options = {}) {
 
   try {
     console.log(`📝 PDF → Word 변환 시작`);
 
     const convertedBuffer = await withTemporaryPaths(async ({ inputPath, outputPath }) => {
-      await fs.writeFile(inputPath, pdfBuffer);
+      await materializeInput(pdfInput, inputPath);
 
       console.log(`🔄 pdf2docx 변환 중...`);
-      await runPdf2Docx(inputPath, outputPath);
+      const summary = await runPdf2Docx(inputPath, outputPath, options.deadlineAt);
+      reportScriptSummary(summary);
       console.log('✅ pdf2docx 변환 성공');
 
       return fs.readFile(outputPath);
@@ -4,6 +4,7 @@
  * ================================
  * Converts between video formats: MP4, MOV, AVI, MKV, WebM
  * Supports codec and resolution configuration
+ * Container-only changes are remuxed with stream copy (see mediaPlanner)
  * Uses FFmpeg via fluent-ffmpeg
  */
 
@@ -12,6 +13,9 @@ const path = require('path');
 const fs = require('fs');
 const os = require('os');
 const { promisify } = require('util');
+const { superviseFfmpeg } = require('../processSupervisor');
+const { materializeInput } = require('../scratch');
+const { probeMedia, planVideoConversion, fullEncodePlan } = require('./mediaPlanner');
 
 // Set FFmpeg path
 const ffmpegPath = require('@ffmpeg-installer/ffmpeg').path;
@@ -19,18 +23,97 @@ const ffprobePath = require('@ffmpeg-installer/ffmpeg').path.replace('ffmpeg', '
 ffmpeg.setFfmpegPath(ffmpegPath);
 ffmpeg.setFfprobePath(ffprobePath);
 
-const writeFile = promisify(fs.writeFile);
 const readFile = promisify(fs.readFile);
 const unlink = promisify(fs.unlink);
 
+// Encoder settings per container (used for streams that cannot be copied)
+const VIDEO_ENCODERS = {
+  mp4: { video: (codec) => (codec === 'h265' ? 'libx265' : 'libx264'), audio: 'aac' },
+  mov: { video: (codec) => (codec === 'h265' ? 'libx265' : 'libx264'), audio: 'aac' },
+  avi: { video: () => 'mpeg4', audio: 'libmp3lame' },
+  mkv: { video: (codec) => (codec === 'vp9' ? 'libvpx-vp9' : 'libx264'), audio: 'aac' },
+  webm: { video: (codec) => (codec === 'vp9' ? 'libvpx-vp9' : 'libvpx'), audio: 'libopus' }
+};
+
+/**
+ * Probe the input and plan which streams can be copied
+ * @returns {Promise<{plan: Object, metadata: Object|null}>}
+ */
+async function planConversion(inputPath, format, options) {
+  try {
+    const metadata = await probeMedia(inputPath);
+    return { plan: planVideoConversion(metadata, format, options), metadata };
+  } catch (err) {
+    console.warn(`⚠️ ffprobe 실패 - 전체 재인코딩: ${err.message}`);
+    return { plan: fullEncodePlan('probe failed'), metadata: null };
+  }
+}
+
+/**
+ * Run FFmpeg for one plan
+ * @param {string} inputPath
+ * @param {string} outputPath
+ * @param {string} format
+ * @param {Object} plan - planVideoConversion() result
+ * @param {Object} settings - {codec, bitrate, width, height, sourceCodec}
+ */
+function runVideoPlan(inputPath, outputPath, format, plan, settings) {
+  return new Promise((resolve, reject) => {
+    const encoder = VIDEO_ENCODERS[format];
+    if (!encoder) {
+      return reject(new Error(`지원하지 않는 비디오 형식: ${format}`));
+    }
+
+    const command = ffmpeg(inputPath);
+
+    if (plan.video === 'copy') {
+      command.videoCodec('copy');
+      // Apple players expect the hvc1 tag for HEVC in MP4/MOV
+      if (settings.sourceCodec === 'hevc' && (format === 'mp4' || format === 'mov')) {
+        command.outputOptions('-tag:v', 'hvc1');
+      }
+    } else {
+      command
+        .videoCodec(encoder.video(settings.codec))
+        .videoBitrate(settings.bitrate)
+        .size(`${settings.width}x${settings.height}`)
+        .autopad();
+    }
+
+    if (plan.audio === 'copy') {
+      command.audioCodec('copy');
+    } else if (plan.audio === 'none') {
+      command.noAudio();
+    } else {
+      command
+        .audioCodec(encoder.audio)
+        .audioBitrate(128);
+    }
+
+    superviseFfmpeg(command, { label: 'ffmpeg-video' })
+      .output(outputPath)
+      .on('end', () => {
+        console.log(`✅ 비디오 변환 완료: ${format} (video=${plan.video}, audio=${plan.audio})`);
+        resolve();
+      })
+      .on('error', (err) => {
+        console.error(`❌ 비디오 변환 오류:`, err.message);
+        reject(err);
+      })
+      .run();
+  });
+}
+
 /**
  * Video format converter
- * @param {Buffer} videoBuffer - Input video buffer
+ * - Streams already compatible with the target container and requested limits
+ *   are stream-copied (remux); only the remaining streams are re-encoded
+ * @param {string|Buffer} videoInput - Input video file path or buffer
  * @param {string} format - Target format: mp4, mov, avi, mkv, webm
  * @param {Object} options - {codec: 'h264'|'h265'|'vp8'|'vp9', bitrate: 5000, resolution: '1920x1080'|'1280x720'|'854x480'}
  * @returns {Promise<Buffer>} Converted video buffer
  */
-async function convertVideo(videoBuffer, format, options = {}) {
+async function convertVideo(videoInput, format, options = {}) {
   const {
     codec = 'h264',
     bitrate = 5000,
@@ -42,85 +125,28 @@ async function convertVideo(videoBuffer, format, options = {}) {
   const outputPath = path.join(os.tmpdir(), `video-output-${timestamp}.${format}`);
 
   try {
-    // Write input buffer to temp file
-    await writeFile(inputPath, videoBuffer);
+    // Prepare input at temp path (paths are symlinked, buffers written)
+    await materializeInput(videoInput, inputPath);
     console.log(`📝 임시 비디오 파일 생성: ${inputPath}`);
 
-    // Convert video using FFmpeg
-    await new Promise((resolve, reject) => {
-      let command = ffmpeg(inputPath);
-
-      // Parse resolution
-      const [width, height] = resolution.split('x').map(Number);
-
-      // Video codec and bitrate settings
-      switch (format) {
-        case 'mp4':
-          command
-            .videoCodec(codec === 'h265' ? 'libx265' : 'libx264')
-            .videoBitrate(bitrate)
-            .audioCodec('aac')
-            .audioBitrate(128)
-            .size(`${width}x${height}`)
-            .autopad();
-          break;
-
-        case 'mov':
-          command
-            .videoCodec(codec === 'h265' ? 'libx265' : 'libx264')
-            .videoBitrate(bitrate)
-            .audioCodec('aac')
-            .audioBitrate(128)
-            .size(`${width}x${height}`)
-            .autopad();
-          break;
-
-        case 'avi':
-          command
-            .videoCodec('mpeg4')
-            .videoBitrate(bitrate)
-            .audioCodec('libmp3lame')
-            .audioBitrate(128)
-            .size(`${width}x${height}`)
-            .autopad();
-          break;
-
-        case 'mkv':
-          command
-            .videoCodec(codec === 'vp9' ? 'libvpx-vp9' : 'libx264')
-            .videoBitrate(bitrate)
-            .audioCodec('aac')
-            .audioBitrate(128)
-            .size(`${width}x${height}`)
-            .autopad();
-          break;
-
-        case 'webm':
-          command
-            .videoCodec(codec === 'vp9' ? 'libvpx-vp9' : 'libvpx')
-            .videoBitrate(bitrate)
-            .audioCodec('libopus')
-            .audioBitrate(128)
-            .size(`${width}x${height}`)
-            .autopad();
-          break;
-
-        default:
-          throw new Error(`지원하지 않는 비디오 형식: ${format}`);
-      }
+    // Parse resolution
+    const [width, height] = resolution.split('x').map(Number);
 
-      command
-        .output(outputPath)
-        .on('end', () => {
-          console.log(`✅ 비디오 변환 완료: ${format}`);
-          resolve();
-        })
-        .on('error', (err) => {
-          console.error(`❌ 비디오 변환 오류:`, err.message);
-          reject(err);
-        })
-        .run();
-    });
+    // Decide which streams can be copied (only explicit options count as limits)
+    const { plan, metadata } = await planConversion(inputPath, format, options);
+    const sourceCodec = metadata?.streams?.find(s => s.codec_type === 'video' && !s.disposition?.attached_pic)?.codec_name;
+    console.log(`🧭 변환 계획: video=${plan.video}, audio=${plan.audio}${plan.reasons.length ? ` (${plan.reasons.join('; ')})` : ''}`);
+
+    const settings = { codec, bitrate, width, height, sourceCodec };
+
+    try {
+      await runVideoPlan(inputPath, outputPath, format, plan, settings);
+    } catch (err) {
+      if (plan.video !== 'copy' && plan.audio !== 'copy') throw err;
+      // Remux can fail on edge cases (e.g. timestamps) → fall back to full re-encode
+      console.warn(`⚠️ 스트림 복사 실패 - 전체 재인코딩으로 재시도: ${err.message}`);
+      await runVideoPlan(inputPath, outputPath, format, fullEncodePlan('remux failed'), settings);
+    }
 
     // Read converted file
     const result = await readFile(outputPath);
@@ -144,12 +170,12 @@ async function convertVideo(videoBuffer, format, options = {}) {
 
 /**
  * Compress video with quality control
- * @param {Buffer} videoBuffer - Input video buffer
+ * @param {string|Buffer} videoInput - Input video file path or buffer
  * @param {string} quality - 'high' (8000kbps), 'medium' (5000kbps), 'low' (2500kbps)
  * @param {string} format - Output format (default: mp4)
  * @returns {Promise<Buffer>} Compressed video buffer
  */
-async function compressVideo(videoBuffer, quality = 'medium', format = 'mp4') {
+async function compressVideo(videoInput, quality = 'medium', format = 'mp4') {
   const bitrateMap = {
     'high': 8000,
     'medium': 5000,
@@ -158,7 +184,7 @@ async function compressVideo(videoBuffer, quality = 'medium', format = 'mp4') {
 
   const bitrate = bitrateMap[quality] || 5000;
 
-  return convertVideo(videoBuffer, format, {
+  return convertVideo(videoInput, format, {
     codec: 'h264',
     bitrate: bitrate,
     resolution: quality === 'low' ? '854x480' : quality === 'medium' ? '1280x720' : '1920x1080'
@@ -167,15 +193,15 @@ async function compressVideo(videoBuffer, quality = 'medium', format = 'mp4') {
 
 /**
  * Get video metadata (duration, codec, bitrate, resolution, fps)
- * @param {Buffer} videoBuffer - Video buffer
+ * @param {string|Buffer} videoInput - Input video file path or buffer
  * @returns {Promise<Object>} Metadata object
  */
-async function getVideoMetadata(videoBuffer) {
+async function getVideoMetadata(videoInput) {
   const timestamp = Date.now();
   const inputPath = path.join(os.tmpdir(), `video-metadata-${timestamp}.tmp`);
 
   try {
-    await writeFile(inputPath, videoBuffer);
+    await materializeInput(videoInput, inputPath);
 
     return new Promise((resolve, reject) => {
       ffmpeg.ffprobe(inputPath, (err, metadata) => {
@@ -4,6 +4,7 @@
  * ================================
  * Converts video files to animated GIFs
  * Supports frame rate, duration, and quality control
+ * Single decode pass with a frame/pixel budget
  * Uses FFmpeg via fluent-ffmpeg
  */
 
@@ -12,6 +13,9 @@ const path = require('path');
 const fs = require('fs');
 const os = require('os');
 const { promisify } = require('util');
+const { superviseFfmpeg } = require('../processSupervisor');
+const { materializeInput } = require('../scratch');
+const { probeMedia } = require('./mediaPlanner');
 
 // Set FFmpeg path
 const ffmpegPath = require('@ffmpeg-installer/ffmpeg').path;
@@ -19,84 +23,180 @@ const ffprobePath = require('@ffmpeg-installer/ffmpeg').path.replace('ffmpeg', '
 ffmpeg.setFfmpegPath(ffmpegPath);
 ffmpeg.setFfprobePath(ffprobePath);
 
-const writeFile = promisify(fs.writeFile);
 const readFile = promisify(fs.readFile);
 const unlink = promisify(fs.unlink);
 
+// Output budget: total GIF pixels (frames × width × height) and frame count
+// The single-pass graph buffers every frame until the palette is ready,
+// so this also bounds FFmpeg memory use
+const GIF_PIXEL_BUDGET = parseInt(process.env.GIF_PIXEL_BUDGET) || 60 * 1000 * 1000;
+const GIF_MAX_FRAMES = parseInt(process.env.GIF_MAX_FRAMES) || 300;
+const GIF_MAX_DIMENSION = 1024;
+const GIF_MIN_DIMENSION = 64;
+
+// Assumed source size when ffprobe fails
+const FALLBACK_SOURCE = { width: 1920, height: 1080, duration: null };
+
+// Quality settings (colors and dithering)
+const QUALITY_SETTINGS = {
+  'high': { colors: 256, dither: 'floyd_steinberg' },
+  'medium': { colors: 128, dither: 'floyd_steinberg' },
+  'low': { colors: 64, dither: 'bayer' }
+};
+
+/**
+ * Fit the requested clip into the frame/pixel budget
+ * - Rejects a startTime at or past the end of the source (INVALID_CONVERSION_OPTIONS → 400)
+ * - Clamps duration to what is left of the source after startTime
+ * - Lowers fps when the frame count exceeds GIF_MAX_FRAMES
+ * - Scales down so frames × width × height stays within the pixel budget
+ * - Keeps the aspect ratio: small frames are scaled up towards GIF_MIN_DIMENSION only
+ *   as far as the 1024px cap and the budget allow (very wide/tall videos stay thin)
+ * @param {{width: number, height: number, duration: number|null}} source - Probed source info
+ * @param {Object} options - {startTime, duration, fps}
+ * @param {Object} [budget] - {pixels, maxFrames}
+ * @returns {{startTime: number, duration: number, fps: number, width: number, height: number, frames: number, totalPixels: number}}
+ */
+function planGif(source, options = {}, budget = {}) {
+  const pixelBudget = budget.pixels || GIF_PIXEL_BUDGET;
+  const maxFrames = budget.maxFrames || GIF_MAX_FRAMES;
+
+  const startTime = Math.max(0, Number(options.startTime) || 0);
+  let duration = Math.max(0.1, Number(options.duration) || 10);
+  let fps = Math.max(1, Number(options.fps) || 10);
+
+  if (source.duration && startTime >= source.duration) {
+    const error = new Error(`시작 시간(${startTime}초)이 영상 길이(${source.duration}초)를 벗어났습니다.`);
+    error.code = 'INVALID_CONVERSION_OPTIONS';
+    throw error;
+  }
+  if (source.duration) {
+    duration = Math.min(duration, source.duration - startTime);
+  }
+
+  let frames = Math.ceil(duration * fps);
+  if (frames > maxFrames) {
+    fps = Math.max(1, Math.floor(maxFrames / duration));
+    frames = Math.ceil(duration * fps);
+    if (frames > maxFrames) {
+      // Even 1fps is too many frames → shorten the clip
+      duration = maxFrames / fps;
+      frames = maxFrames;
+    }
+  }
+
+  // Largest size that keeps the aspect ratio, the 1024px cap and the per-frame pixel share
+  const aspect = source.width / source.height;
+  const perFramePixels = pixelBudget / frames;
+  let width = Math.min(source.width, GIF_MAX_DIMENSION, Math.sqrt(perFramePixels * aspect));
+  let height = width / aspect;
+  if (height > GIF_MAX_DIMENSION) {
+    height = GIF_MAX_DIMENSION;
+    width = height * aspect;
+  }
+  // Scale both sides together so a tiny short side does not distort the ratio
+  const shortSide = Math.min(width, height);
+  if (shortSide < GIF_MIN_DIMENSION) {
+    const scale = Math.min(
+      GIF_MIN_DIMENSION / shortSide,
+      GIF_MAX_DIMENSION / Math.max(width, height),
+      Math.sqrt(perFramePixels / (width * height))
+    );
+    if (scale > 1) {
+      width *= scale;
+      height *= scale;
+    }
+  }
+  // Even sizes for the encoder (2px floor for extreme ratios)
+  width = Math.max(2, Math.floor(width / 2) * 2);
+  height = Math.max(2, Math.floor(height / 2) * 2);
+
+  // Re-check the budget after rounding: drop frames rather than exceed it
+  if (frames * width * height > pixelBudget) {
+    frames = Math.max(1, Math.floor(pixelBudget / (width * height)));
+    duration = frames / fps;
+  }
+
+  return {
+    startTime,
+    duration,
+    fps,
+    width,
+    height,
+    frames,
+    totalPixels: frames * width * height
+  };
+}
+
+/**
+ * Single-pass filter graph: one decode feeds both palettegen and paletteuse
+ * @param {Object} plan - planGif() result
+ * @param {Object} settings - QUALITY_SETTINGS entry
+ * @returns {string}
+ */
+function buildGifFilter(plan, settings) {
+  return [
+    `fps=${plan.fps},scale=${plan.width}:${plan.height}:flags=lanczos,split[s0][s1]`,
+    `[s0]palettegen=max_colors=${settings.colors}:stats_mode=diff[p]`,
+    `[s1][p]paletteuse=dither=${settings.dither}`
+  ].join(';');
+}
+
+async function probeSource(inputPath) {
+  try {
+    const metadata = await probeMedia(inputPath);
+    const stream = metadata.streams.find(s => s.codec_type === 'video' && !s.disposition?.attached_pic);
+    if (!stream?.width || !stream?.height) return FALLBACK_SOURCE;
+
+    // Rotated phone videos report the unrotated size
+    const rotation = Math.abs(Number(stream.tags?.rotate) || 0);
+    const rotated = rotation === 90 || rotation === 270;
+    return {
+      width: rotated ? stream.height : stream.width,
+      height: rotated ? stream.width : stream.height,
+      duration: Number(metadata.format?.duration) || null
+    };
+  } catch (err) {
+    console.warn(`⚠️ ffprobe 실패 - 기본 크기로 계산: ${err.message}`);
+    return FALLBACK_SOURCE;
+  }
+}
+
 /**
  * Convert video to GIF
- * @param {Buffer} videoBuffer - Input video buffer
+ * - Seeks on the input side and decodes only the requested window, once
+ * - Palette generation and dithering run in the same filter graph
+ * - Output size is bounded by GIF_PIXEL_BUDGET / GIF_MAX_FRAMES
+ * @param {string|Buffer} videoInput - Input video file path or buffer
  * @param {Object} options - {startTime: 0, duration: 10, fps: 10, quality: 'high'|'medium'|'low'}
  * @returns {Promise<Buffer>} GIF buffer
  */
-async function videoToGif(videoBuffer, options = {}) {
-  const {
-    startTime = 0,
-    duration = 10,
-    fps = 10,
-    quality = 'medium'
-  } = options;
+async function videoToGif(videoInput, options = {}) {
+  const { quality = 'medium' } = options;
 
   const timestamp = Date.now();
   const inputPath = path.join(os.tmpdir(), `video-gif-input-${timestamp}.tmp`);
-  const paletteDir = path.join(os.tmpdir(), `gif-palette-${timestamp}`);
-  const palettePath = path.join(paletteDir, 'palette.png');
   const outputPath = path.join(os.tmpdir(), `video-gif-output-${timestamp}.gif`);
 
   try {
-    // Write input buffer to temp file
-    await writeFile(inputPath, videoBuffer);
+    // Prepare input at temp path (paths are symlinked, buffers written)
+    await materializeInput(videoInput, inputPath);
     console.log(`📝 임시 비디오 파일 생성: ${inputPath}`);
 
-    // Create palette directory
-    if (!fs.existsSync(paletteDir)) {
-      fs.mkdirSync(paletteDir, { recursive: true });
-    }
-
-    // Quality settings (colors and dithering)
-    const qualitySettings = {
-      'high': { colors: 256, dither: 'floyd_steinberg' },
-      'medium': { colors: 128, dither: 'floyd_steinberg' },
-      'low': { colors: 64, dither: 'bayer' }
-    };
-
-    const settings = qualitySettings[quality] || qualitySettings['medium'];
-
-    // Step 1: Generate palette for better quality
-    console.log('🎨 GIF 팔레트 생성 중...');
-    await new Promise((resolve, reject) => {
-      ffmpeg(inputPath)
-        .seekInput(startTime)
-        .duration(duration)
-        .fps(fps)
-        .output(palettePath)
-        .outputOptions([
-          '-vf',
-          `scale='min(iw\,1024)':min'(ih\,1024)':force_original_aspect_ratio=decrease,split[s0][s1];[s0]palettegen=max_colors=${settings.colors}[p];[s1][p]paletteuse=dither=${settings.dither}`
-        ])
-        .on('end', () => {
-          console.log('✅ 팔레트 생성 완료');
-          resolve();
-        })
-        .on('error', (err) => {
-          console.error('❌ 팔레트 생성 오류:', err.message);
-          reject(err);
-        })
-        .run();
-    });
+    const settings = QUALITY_SETTINGS[quality] || QUALITY_SETTINGS['medium'];
+    const plan = planGif(await probeSource(inputPath), options);
+    console.log(`🧭 GIF 계획: ${plan.width}x${plan.height}, ${plan.fps}fps, ${plan.duration.toFixed(1)}초 (${plan.frames}프레임, ${(plan.totalPixels / 1e6).toFixed(1)}MP)`);
 
-    // Step 2: Create GIF using palette
-    console.log('🎬 GIF 생성 중...');
+    console.log('🎬 GIF 생성 중 (단일 패스)...');
     await new Promise((resolve, reject) => {
-      ffmpeg(inputPath)
-        .seekInput(startTime)
-        .duration(duration)
-        .fps(fps)
+      superviseFfmpeg(ffmpeg(inputPath), { label: 'ffmpeg-gif' })
+        // -ss/-t before -i: demuxer seeks and stops reading after the window
+        .seekInput(plan.startTime)
+        .inputOptions(['-t', String(plan.duration)])
+        .noAudio()
         .output(outputPath)
         .outputOptions([
-          '-i', palettePath,
-          '-filter_complex',
-          `[0:v]scale='min(iw\,1024)':min'(ih\,1024)':force_original_aspect_ratio=decrease[v];[v][1:v]paletteuse=dither=${settings.dither}`,
+          '-filter_complex', buildGifFilter(plan, settings),
           '-loop', '0'
         ])
         .on('end', () => {
@@ -123,10 +223,6 @@ async function videoToGif(videoBuffer, options = {}) {
     try {
       if (fs.existsSync(inputPath)) await unlink(inputPath);
       if (fs.existsSync(outputPath)) await unlink(outputPath);
-      if (fs.existsSync(palettePath)) await unlink(palettePath);
-      if (fs.existsSync(paletteDir)) {
-        fs.rmdirSync(paletteDir, { recursive: true });
-      }
       console.log('🧹 임시 GIF 파일 정리 완료');
     } catch (err) {
       console.warn('⚠️ 임시 파일 정리 중 오류:', err.message);
@@ -135,5 +231,7 @@ async function videoToGif(videoBuffer, options = {}) {
 }
 
 module.exports = {
-  videoToGif
+  videoToGif,
+  planGif,
+  buildGifFilter
 };
@@ -4,172 +4,211 @@
  * ================================
  * 별도 스레드에서 실행되는 PDF 변환 작업
  * Piscina가 호출할 핸들러 함수 내보내기
+ * - 변환 모듈(sharp, fluent-ffmpeg, archiver 등)은 형식별로 처음 사용할 때 require
+ *   → 스레드 생성 시 모든 변환기를 읽지 않아 idleTimeout 후 재생성되는 스레드의 시작 시간/힙 절약
  */
 
-const convertToWord = require('./convertPdfToWord');
-const convertToExcel = require('./convertPdfToExcel');
-const convertToPpt = require('./convertPdfToPpt');
-const convertToImage = require('./convertPdfToImage');
-const convertOfficeToPdf = require('./convertOfficeToPdf');
-const { mergePdf } = require('./mergePdf');
-const { splitPdf } = require('./splitPdf');
-const { compressPdf } = require('./compressPdf');
-const { jpgToPng, pngToJpg, jpgToWebp, pngToWebp, webpToJpg, webpToPng } = require('./convertImage');
-const { heicToJpg, heicToPng, heicToWebp } = require('./convertHeic');
-const { resizeImage, compressImageOnly } = require('./resizeImage');
-const { convertAudio } = require('./convertAudio');
-const { convertVideo, compressVideo } = require('./convertVideo');
-const { videoToGif } = require('./convertVideoToGif');
+const { workerData } = require('piscina');
+const { attachRegistry, setCurrentTask, getTaskUsage } = require('../processSupervisor');
+const { startProfile, stopProfile } = require('../profiler');
+const { inputSize } = require('../scratch');
+const { takePartial, takePageCount } = require('../deadline');
+const { PIPELINE_STEPS } = require('../constants');
+
+/**
+ * 모듈 지연 로더 (처음 호출할 때 require, 이후 스레드 안에서 재사용)
+ * @param {string} modulePath
+ * @returns {Function} 모듈을 반환하는 함수
+ */
+function lazy(modulePath) {
+  let loaded;
+  return () => {
+    if (!loaded) {
+      loaded = require(modulePath);
+    }
+    return loaded;
+  };
+}
+
+const modules = {
+  word: lazy('./convertPdfToWord'),
+  excel: lazy('./convertPdfToExcel'),
+  ppt: lazy('./convertPdfToPpt'),
+  image: lazy('./convertPdfToImage'),
+  officeToPdf: lazy('./convertOfficeToPdf'),
+  merge: lazy('./mergePdf'),
+  split: lazy('./splitPdf'),
+  compress: lazy('./compressPdf'),
+  convertImage: lazy('./convertImage'),
+  heic: lazy('./convertHeic'),
+  resize: lazy('./resizeImage'),
+  imageBatch: lazy('./imageBatch'),
+  audio: lazy('./convertAudio'),
+  video: lazy('./convertVideo'),
+  gif: lazy('./convertVideoToGif'),
+  pipeline: lazy('./pipeline')
+};
+
+const audioHandler = (data) => modules.audio().convertAudio(data.audioInput, data.format, data.bitrate || 192);
+const videoHandler = (data) => modules.video().convertVideo(data.videoInput, data.format, data.videoOptions || {});
+
+/**
+ * 형식 → 변환 핸들러 (data: 워커 입력, pageOptions: 페이지 단위 변환기 옵션)
+ * 핸들러를 호출할 때 해당 형식의 모듈만 로드됨
+ */
+const HANDLERS = {
+  // PDF → Office/Image 변환
+  word: (data, pageOptions) => modules.word()(data.pdfInput, pageOptions),
+  excel: (data, pageOptions) => modules.excel()(data.pdfInput, pageOptions),
+  ppt: (data, pageOptions) => modules.ppt()(data.pdfInput, pageOptions),
+  jpg: (data, pageOptions) => modules.image()(data.pdfInput, 'jpg', pageOptions),
+  png: (data, pageOptions) => modules.image()(data.pdfInput, 'png', pageOptions),
+
+  // Office → PDF 변환
+  word2pdf: (data) => modules.officeToPdf()(data.officeInput, 'word'),
+  excel2pdf: (data) => modules.officeToPdf()(data.officeInput, 'excel'),
+  ppt2pdf: (data) => modules.officeToPdf()(data.officeInput, 'ppt'),
+
+  // PDF 병합/분할/압축
+  merge: (data) => modules.merge().mergePdf(data.pdfPaths, data.fileNames, data.outputPath),
+  split: (data) => modules.split().splitPdf(data.pdfPath, data.ranges, data.outputPath),
+  compress: (data) => modules.compress().compressPdf(data.pdfInput, data.quality || 'medium'),
+
+  // 이미지 변환 (JPG/PNG/WEBP)
+  'jpg-to-png': (data) => modules.convertImage().jpgToPng(data.imageInput),
+  'png-to-jpg': (data) => modules.convertImage().pngToJpg(data.imageInput, data.backgroundColor || '#ffffff'),
+  'jpg-to-webp': (data) => modules.convertImage().jpgToWebp(data.imageInput, data.quality || 80),
+  'png-to-webp': (data) => modules.convertImage().pngToWebp(data.imageInput, data.quality || 80),
+  'webp-to-jpg': (data) => modules.convertImage().webpToJpg(data.imageInput),
+  'webp-to-png': (data) => modules.convertImage().webpToPng(data.imageInput),
+
+  // HEIC 변환
+  'heic-to-jpg': (data) => modules.heic().heicToJpg(data.imageInput, data.quality || 90),
+  'heic-to-png': (data) => modules.heic().heicToPng(data.imageInput),
+  'heic-to-webp': (data) => modules.heic().heicToWebp(data.imageInput, data.quality || 80),
+
+  // 이미지 리사이즈/압축
+  resize: (data) => modules.resize().resizeImage(data.imageInput, data.options),
+  'compress-image': (data) => modules.resize().compressImageOnly(data.imageInput, data.options),
+
+  // 이미지 일괄 변환 (무압축 ZIP)
+  'image-batch': (data) => modules.imageBatch().convertImageBatch(
+    data.imagePaths, data.fileNames, data.batchOptions.format, data.batchOptions, data.outputPath
+  ),
+
+  // 음성 변환 (MP3, WAV, OGG, M4A, AAC)
+  mp3: audioHandler,
+  wav: audioHandler,
+  ogg: audioHandler,
+  m4a: audioHandler,
+  aac: audioHandler,
+
+  // 비디오 변환 (MP4, MOV, WebM, MKV) / 압축 / GIF
+  mp4: videoHandler,
+  mov: videoHandler,
+  webm: videoHandler,
+  mkv: videoHandler,
+  'compress-video': (data) => modules.video().compressVideo(data.videoInput, data.quality || 'medium', 'mp4'),
+  gif: (data) => modules.gif().videoToGif(data.videoInput, data.gifOptions || {})
+};
+
+// 메인 스레드와 외부 프로세스 그룹 레지스트리 공유
+attachRegistry(workerData?.supervisorRegistry);
+
+/**
+ * 작업 실행 지표 (메인 스레드에서 대기 시간 계산 및 지표 저장에 사용)
+ * @param {number} startedAt - 워커에서 작업을 시작한 시각 (epoch ms)
+ */
+function collectMetrics(startedAt) {
+  const usage = getTaskUsage();
+  return {
+    startedAt,
+    runMs: Date.now() - startedAt,
+    peakRssBytes: usage.processes > 0 ? usage.peakRssBytes : null,
+    childCpuMs: usage.cpuMs
+  };
+}
 
 /**
  * Piscina 핸들러 함수
- * @param {Object} data - { pdfBuffer: Buffer, format: string } 또는 { officeBuffer: Buffer, format: string } 또는 { pdfBuffers: Array<Buffer>, fileNames: Array<string>, format: string } 또는 { pdfBuffer: Buffer, ranges: Array, format: 'split' }
- * @returns {Promise<{success: boolean, buffer: Buffer, format: string}>}
+ * 입력(*Input)은 디스크 경로(권장, 워커로 복사되지 않음) 또는 Buffer
+ * @param {Object} data - { pdfInput: string|Buffer, format: string } 또는 { officeInput: string|Buffer, format: string } 또는 { pdfPaths: Array<string>, fileNames: Array<string>, outputPath: string, format: 'merge' } 또는 { pdfPath: string, ranges: Array, outputPath: string, format: 'split' }
+ *        또는 { imagePaths: Array<string>, fileNames: Array<string>, batchOptions: Object, outputPath: string, format: 'image-batch' }
+ *        또는 { pipelineInput: string|Buffer, pipelineOptions: Object, format: 'word2jpg' 등 파이프라인 형식 }
+ *        공통: deadlineAt (epoch ms, 페이지 단위 변환기의 마감 시각)
+ * @returns {Promise<{success: boolean, buffer?: Buffer, outputPath?: string, items?: Array, steps?: Array, partial?: Object, format: string, metrics: Object}>}
+ *          결과가 디스크에 기록되는 형식(merge, split, image-batch)은 buffer 대신 outputPath 반환
  */
 module.exports = async (data) => {
+  const startedAt = Date.now();
+  // 옵트인 샘플링 프로파일링 (대상 작업이 아니면 null)
+  const profile = await startProfile(data?.format);
+  let succeeded = false;
+
   try {
-    const { pdfBuffer, officeBuffer, pdfBuffers, fileNames, ranges, quality, format, imageBuffer, options, backgroundColor, audioBuffer, videoBuffer, bitrate, videoOptions, gifOptions } = data;
+    const { format } = data;
 
     console.log(`🔄 [워커 스레드] 변환 시작: ${format}`);
+    setCurrentTask(data.taskId);
+    // 이전 작업이 실패하며 남긴 부분 결과/페이지 수 정보 초기화
+    takePartial();
+    takePageCount();
+    // 페이지 단위 변환기는 마감 전에 멈추고 완료한 페이지만으로 결과 생성 (utils/deadline.js)
+    const pageOptions = { deadlineAt: data.deadlineAt };
 
     let result;
+    let steps;
 
     // 형식별 변환 함수 호출
-    switch (format) {
-      // PDF → Office/Image 변환
-      case 'word':
-        result = await convertToWord(pdfBuffer);
-        break;
-
-      case 'excel':
-        result = await convertToExcel(pdfBuffer);
-        break;
-
-      case 'ppt':
-        result = await convertToPpt(pdfBuffer);
-        break;
-
-      case 'jpg':
-        result = await convertToImage(pdfBuffer, 'jpg');
-        break;
-
-      case 'png':
-        result = await convertToImage(pdfBuffer, 'png');
-        break;
-
-      // Office → PDF 변환
-      case 'word2pdf':
-        result = await convertOfficeToPdf(officeBuffer, 'word');
-        break;
-
-      case 'excel2pdf':
-        result = await convertOfficeToPdf(officeBuffer, 'excel');
-        break;
-
-      case 'ppt2pdf':
-        result = await convertOfficeToPdf(officeBuffer, 'ppt');
-        break;
-
-      // PDF 병합
-      case 'merge':
-        result = await mergePdf(pdfBuffers, fileNames);
-        break;
-
-      // PDF 분할
-      case 'split':
-        result = await splitPdf(pdfBuffer, ranges);
-        break;
-
-      // PDF 압축
-      case 'compress':
-        result = await compressPdf(pdfBuffer, quality || 'medium');
-        break;
-
-      // 이미지 변환 (JPG/PNG/WEBP)
-      case 'jpg-to-png':
-        result = await jpgToPng(imageBuffer);
-        break;
-
-      case 'png-to-jpg':
-        result = await pngToJpg(imageBuffer, backgroundColor || '#ffffff');
-        break;
-
-      case 'jpg-to-webp':
-        result = await jpgToWebp(imageBuffer, quality || 80);
-        break;
-
-      case 'png-to-webp':
-        result = await pngToWebp(imageBuffer, quality || 80);
-        break;
-
-      case 'webp-to-jpg':
-        result = await webpToJpg(imageBuffer);
-        break;
-
-      case 'webp-to-png':
-        result = await webpToPng(imageBuffer);
-        break;
-
-      // HEIC 변환
-      case 'heic-to-jpg':
-        result = await heicToJpg(imageBuffer, quality || 90);
-        break;
-
-      case 'heic-to-png':
-        result = await heicToPng(imageBuffer);
-        break;
-
-      case 'heic-to-webp':
-        result = await heicToWebp(imageBuffer, quality || 80);
-        break;
-
-      // 이미지 리사이즈
-      case 'resize':
-        result = await resizeImage(imageBuffer, options);
-        break;
-
-      // 이미지 압축
-      case 'compress-image':
-        result = await compressImageOnly(imageBuffer, options);
-        break;
-
-      // 음성 변환 (MP3, WAV, OGG, M4A, AAC)
-      case 'mp3':
-      case 'wav':
-      case 'ogg':
-      case 'm4a':
-      case 'aac':
-        result = await convertAudio(audioBuffer, format, bitrate || 192);
-        break;
-
-      // 비디오 변환 (MP4, MOV, WebM, MKV)
-      case 'mp4':
-      case 'mov':
-      case 'webm':
-      case 'mkv':
-        result = await convertVideo(videoBuffer, format, videoOptions || {});
-        break;
-
-      // 비디오 압축
-      case 'compress-video':
-        result = await compressVideo(videoBuffer, quality || 'medium', 'mp4');
-        break;
-
-      // 비디오 → GIF
-      case 'gif':
-        result = await videoToGif(videoBuffer, gifOptions || {});
-        break;
-
-      default:
-        throw new Error(`지원하지 않는 형식: ${format}`);
+    if (Object.hasOwn(HANDLERS, format)) {
+      result = await HANDLERS[format](data, pageOptions);
+    } else if (Object.hasOwn(PIPELINE_STEPS, format)) {
+      // 다단계 변환 (예: word2jpg = word2pdf → jpg), 중간 결과는 워커 스크래치에만 존재
+      // 마감 시각은 작업 전체 기준이므로 앞 단계 소요 시간은 이미지 단계의 남은 시간에서 빠짐
+      ({ result, steps } = await modules.pipeline().runPipeline(format, data.pipelineInput, {
+        ...data.pipelineOptions,
+        ...pageOptions
+      }));
+    } else {
+      throw new Error(`지원하지 않는 형식: ${format}`);
     }
 
     // 변환 성공 반환
     console.log(`✅ [워커 스레드] 변환 완료: ${format}`);
+    succeeded = true;
+    // 마감 시간으로 일부 페이지만 변환된 경우 { pagesDone, pagesTotal }
+    const partial = takePartial();
+
+    // 일괄 변환: ZIP 경로 + 이미지별 결과
+    if (format === 'image-batch') {
+      return {
+        success: true,
+        outputPath: result.outputPath,
+        items: result.items,
+        format: format,
+        metrics: collectMetrics(startedAt)
+      };
+    }
+
+    // 파일 경로 결과는 Buffer로 다시 읽지 않고 그대로 메인 스레드에 전달
+    if (typeof result === 'string') {
+      return {
+        success: true,
+        outputPath: result,
+        format: format,
+        ...(steps && { steps }),
+        ...(partial && { partial }),
+        metrics: collectMetrics(startedAt)
+      };
+    }
+
     return {
       success: true,
       buffer: result,
-      format: format
+      format: format,
+      ...(steps && { steps }),
+      ...(partial && { partial }),
+      metrics: collectMetrics(startedAt)
     };
   } catch (error) {
     // 변환 실패 반환
@@ -179,7 +218,24 @@ module.exports = async (data) => {
       error: error.message,
       code: error.code,
       stack: error.stack,
-      format: data?.format
+      format: data?.format,
+      metrics: collectMetrics(startedAt)
     };
+  } finally {
+    // 페이지 수는 변환기가 이미 확인한 값 사용 (pdfinfo/스크립트 요약, 페이지 단위 변환기가 아니면 null)
+    const pages = takePageCount();
+    if (profile) {
+      // 프로파일 메타데이터 수집 실패가 변환 결과에 영향을 주지 않도록
+      try {
+        const input = data.pdfInput || data.officeInput || data.imageInput || data.audioInput || data.videoInput || data.pipelineInput;
+        await stopProfile(profile, {
+          success: succeeded,
+          pages,
+          inputBytes: input ? await inputSize(input).catch(() => null) : null
+        });
+      } catch (error) {
+        console.warn(`⚠️  [프로파일러] 메타데이터 수집 실패: ${error.message}`);
+      }
+    }
   }
 };
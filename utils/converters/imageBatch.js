@@ -0,0 +1,188 @@
+/**
+ * ================================
+ * 이미지 일괄 변환 (Batch)
+ * ================================
+ * 여러 이미지를 같은 옵션으로 한 워커에서 변환하고
+ * 결과를 무압축(store) ZIP 하나로 스트리밍 기록
+ * - 이미지(JPG/PNG/WEBP)는 이미 압축된 포맷이므로 deflate 생략
+ * - 동시 변환 수 제한 (sharp/libvips 자체도 멀티스레드)
+ * - 이미지별 성공/실패를 보고서로 반환 (일부 실패해도 나머지는 포함)
+ */
+
+const fs = require('fs');
+const path = require('path');
+const archiver = require('archiver');
+const { jpgToPng, pngToJpg, jpgToWebp, pngToWebp, webpToJpg, webpToPng } = require('./convertImage');
+const { heicToJpg, heicToPng, heicToWebp } = require('./convertHeic');
+const { resizeImage, compressImageOnly } = require('./resizeImage');
+
+// 워커 하나에서 동시에 변환할 이미지 수
+const IMAGE_BATCH_CONCURRENCY = parseInt(process.env.IMAGE_BATCH_CONCURRENCY) || 3;
+
+// 형식별 단일 이미지 변환 함수 (converter.task.js의 이미지 형식과 동일한 기본값)
+const IMAGE_CONVERTERS = {
+  'jpg-to-png': (input) => jpgToPng(input),
+  'png-to-jpg': (input, opts) => pngToJpg(input, opts.backgroundColor || '#ffffff'),
+  'jpg-to-webp': (input, opts) => jpgToWebp(input, opts.quality || 80),
+  'png-to-webp': (input, opts) => pngToWebp(input, opts.quality || 80),
+  'webp-to-jpg': (input) => webpToJpg(input),
+  'webp-to-png': (input) => webpToPng(input),
+  'heic-to-jpg': (input, opts) => heicToJpg(input, opts.quality || 90),
+  'heic-to-png': (input) => heicToPng(input),
+  'heic-to-webp': (input, opts) => heicToWebp(input, opts.quality || 80),
+  'resize': (input, opts) => resizeImage(input, opts.options),
+  'compress-image': (input, opts) => compressImageOnly(input, opts.options)
+};
+
+// 리사이즈/압축 출력 포맷 → 확장자
+const OUTPUT_FORMAT_EXTENSIONS = { jpeg: '.jpg', jpg: '.jpg', png: '.png', webp: '.webp' };
+
+/**
+ * 변환 결과 파일 확장자
+ * @param {string} format - 변환 형식 (예: heic-to-jpg, resize)
+ * @param {Object} [options] - resize/compress-image 옵션 ({ format })
+ * @returns {string} 예: '.jpg'
+ */
+function outputExtension(format, options = {}) {
+  if (format === 'resize' || format === 'compress-image') {
+    return OUTPUT_FORMAT_EXTENSIONS[String(options.format || 'jpeg').toLowerCase()] || '.jpg';
+  }
+  const target = format.split('-to-')[1];
+  return target === 'jpg' ? '.jpg' : `.${target}`;
+}
+
+/**
+ * ZIP 엔트리 이름 생성 (경로 제거 + 중복 시 번호 부여)
+ * @param {string} originalName - 원본 파일명
+ * @param {string} ext - 결과 확장자
+ * @param {Set<string>} usedNames - 이미 사용한 이름
+ */
+function entryName(originalName, ext, usedNames) {
+  const base = path.basename(originalName || 'image', path.extname(originalName || ''))
+    .replace(/[\\/:*?"<>|\x00-\x1f]/g, '_') || 'image';
+
+  let name = `${base}${ext}`;
+  for (let i = 2; usedNames.has(name.toLowerCase()); i++) {
+    name = `${base} (${i})${ext}`;
+  }
+  usedNames.add(name.toLowerCase());
+  return name;
+}
+
+/**
+ * 이미지 일괄 변환 → 무압축 ZIP
+ * @param {Array<string|Buffer>} imageInputs - 이미지 파일 경로 또는 버퍼 배열
+ * @param {Array<string>} fileNames - 원본 파일명 배열 (ZIP 엔트리 이름용)
+ * @param {string} format - 변환 형식 (jpg-to-png, heic-to-jpg, resize 등)
+ * @param {Object} batchOptions - { quality, backgroundColor, options } (모든 이미지에 동일 적용)
+ * @param {string} outputPath - ZIP 저장 경로
+ * @returns {Promise<{outputPath: string, items: Array<{fileName: string, entryName?: string, success: boolean, bytes?: number, error?: string}>}>}
+ */
+async function convertImageBatch(imageInputs, fileNames = [], format, batchOptions = {}, outputPath) {
+  const convertOne = IMAGE_CONVERTERS[format];
+  if (!convertOne) {
+    throw new Error(`일괄 변환을 지원하지 않는 형식: ${format}`);
+  }
+  if (!imageInputs || imageInputs.length === 0) {
+    throw new Error('변환할 이미지가 없습니다.');
+  }
+  if (!outputPath) {
+    throw new Error('일괄 변환 결과 경로가 지정되지 않았습니다.');
+  }
+
+  console.log(`🖼️ 이미지 일괄 변환 시작: ${imageInputs.length}개 (${format}, 동시 ${IMAGE_BATCH_CONCURRENCY}개)`);
+
+  const output = fs.createWriteStream(outputPath);
+  const archive = archiver('zip', { store: true });
+  const finished = new Promise((resolve, reject) => {
+    output.on('close', resolve);
+    output.on('error', reject);
+    archive.on('error', reject);
+  });
+  // 변환 중(아직 아무도 finished를 기다리지 않을 때) 스트림 오류가 나도 unhandled rejection이 되지 않도록
+  // (오류는 appendEntry의 race 또는 마지막 await finished에서 처리)
+  finished.catch(() => {});
+  archive.pipe(output);
+
+  // archiver는 append된 엔트리를 내부 큐에서 하나씩 순서대로 기록하고, 기록이 끝나면 'entry' 발생
+  // → append 순서대로 대기 중인 resolve를 꺼내 해당 엔트리 기록 완료를 알림
+  const pendingEntries = [];
+  archive.on('entry', () => {
+    const resolve = pendingEntries.shift();
+    if (resolve) resolve();
+  });
+  const appendEntry = (buffer, name) => {
+    const written = new Promise((resolve) => {
+      pendingEntries.push(resolve);
+      archive.append(buffer, { name });
+    });
+    // 아카이브 오류 시 대기 중인 워커도 함께 실패
+    return Promise.race([written, finished]);
+  };
+
+  const ext = outputExtension(format, batchOptions.options);
+  const usedNames = new Set();
+  const items = new Array(imageInputs.length);
+  let nextIndex = 0;
+
+  // 완료되는 순서대로 ZIP에 추가하고, 엔트리가 기록될 때까지 기다린 뒤 다음 이미지로 진행
+  // (결과 버퍼는 동시 변환 수만큼만 메모리에 유지)
+  async function runWorker() {
+    while (nextIndex < imageInputs.length) {
+      const index = nextIndex++;
+      const fileName = fileNames[index] || `image-${index + 1}`;
+
+      let buffer;
+      try {
+        buffer = await convertOne(imageInputs[index], batchOptions);
+      } catch (error) {
+        console.warn(`⚠️ 이미지 변환 실패 (건너뜀): ${fileName} - ${error.message}`);
+        items[index] = { fileName, success: false, error: error.message };
+        continue;
+      }
+
+      // ZIP 기록 실패는 이미지 하나가 아니라 일괄 변환 전체 실패
+      const name = entryName(fileName, ext, usedNames);
+      await appendEntry(buffer, name);
+      items[index] = { fileName, entryName: name, success: true, bytes: buffer.length };
+    }
+  }
+
+  try {
+    const workers = Math.min(IMAGE_BATCH_CONCURRENCY, imageInputs.length);
+    await Promise.all(Array.from({ length: workers }, runWorker));
+
+    const succeeded = items.filter((item) => item.success).length;
+    if (succeeded === 0) {
+      const error = new Error(`모든 이미지 변환 실패: ${items[0].error}`);
+      error.code = 'IMAGE_BATCH_ALL_FAILED';
+      throw error;
+    }
+
+    // 일부 실패 시 ZIP 안에 실패 목록도 포함
+    if (succeeded < items.length) {
+      const failures = items
+        .filter((item) => !item.success)
+        .map((item) => `${item.fileName}: ${item.error}`)
+        .join('\n');
+      archive.append(`${failures}\n`, { name: 'errors.txt' });
+    }
+
+    await archive.finalize();
+    await finished;
+
+    console.log(`✅ 이미지 일괄 변환 완료: 성공 ${succeeded}개 / 실패 ${items.length - succeeded}개`);
+    return { outputPath, items };
+  } catch (error) {
+    archive.abort();
+    output.destroy();
+    console.error(`❌ 이미지 일괄 변환 실패: ${error.message}`);
+    throw error;
+  }
+}
+
+module.exports = {
+  IMAGE_CONVERTERS,
+  convertImageBatch,
+  outputExtension
+};
@@ -0,0 +1,215 @@
+/**
+ * ================================
+ * 🧭 Media Conversion Planner
+ * ================================
+ * Decides per stream whether a conversion can stream-copy (remux)
+ * or must re-encode, based on ffprobe metadata
+ * - Copy when the source codec is allowed in the target container
+ *   and satisfies the explicitly requested limits (codec/resolution/bitrate)
+ * - Re-encode only the streams that need it
+ */
+
+const ffmpeg = require('fluent-ffmpeg');
+
+// Source bitrate may exceed the requested cap by this factor before re-encoding
+const BITRATE_TOLERANCE = 1.1;
+
+// ffprobe codec_name values each video container can hold without re-encoding
+const VIDEO_CONTAINERS = {
+  mp4: {
+    video: ['h264', 'hevc', 'mpeg4', 'av1'],
+    audio: ['aac', 'mp3', 'ac3', 'eac3', 'alac']
+  },
+  mov: {
+    video: ['h264', 'hevc', 'mpeg4', 'prores', 'mjpeg'],
+    audio: ['aac', 'mp3', 'alac', 'ac3', 'pcm_s16le', 'pcm_s24le']
+  },
+  mkv: {
+    video: ['h264', 'hevc', 'vp8', 'vp9', 'av1', 'mpeg4', 'mpeg2video', 'theora'],
+    audio: ['aac', 'mp3', 'opus', 'vorbis', 'flac', 'ac3', 'eac3', 'alac', 'pcm_s16le', 'pcm_s24le']
+  },
+  webm: {
+    video: ['vp8', 'vp9', 'av1'],
+    audio: ['opus', 'vorbis']
+  },
+  avi: {
+    video: ['mpeg4', 'h264', 'mjpeg', 'msmpeg4v3'],
+    audio: ['mp3', 'ac3', 'pcm_s16le']
+  }
+};
+
+// Audio target format → source codecs that can be copied as-is
+const AUDIO_TARGETS = {
+  mp3: ['mp3'],
+  wav: ['pcm_s16le'],
+  ogg: ['vorbis', 'opus'],
+  m4a: ['aac', 'alac'],
+  aac: ['aac']
+};
+
+// User-facing codec option → ffprobe codec_name
+const CODEC_NAMES = {
+  h264: 'h264',
+  h265: 'hevc',
+  vp8: 'vp8',
+  vp9: 'vp9'
+};
+
+// Audio output is capped at 2 channels by the encoder settings
+const MAX_AUDIO_CHANNELS = 2;
+
+/**
+ * Run ffprobe on a file
+ * @param {string} inputPath - Input media file path
+ * @returns {Promise<Object>} ffprobe metadata ({ streams, format })
+ */
+function probeMedia(inputPath) {
+  return new Promise((resolve, reject) => {
+    ffmpeg.ffprobe(inputPath, (err, metadata) => {
+      if (err) reject(err);
+      else resolve(metadata);
+    });
+  });
+}
+
+/**
+ * Bitrate of a stream in kbps (falls back to the container bitrate)
+ * @param {Object} stream - ffprobe stream
+ * @param {Object} metadata - ffprobe metadata
+ * @param {boolean} [useFormatBitrate=false] - Allow container bitrate fallback
+ * @returns {number|null} kbps, or null when unknown
+ */
+function streamBitrateKbps(stream, metadata, useFormatBitrate = false) {
+  const candidates = [stream?.bit_rate];
+  if (useFormatBitrate) candidates.push(metadata?.format?.bit_rate);
+
+  for (const value of candidates) {
+    const bps = Number(value);
+    if (Number.isFinite(bps) && bps > 0) return bps / 1000;
+  }
+  return null;
+}
+
+function findStream(metadata, type) {
+  return (metadata?.streams || []).find((stream) =>
+    stream.codec_type === type && !stream.disposition?.attached_pic
+  );
+}
+
+/**
+ * Plan a video conversion
+ * @param {Object} metadata - ffprobe metadata
+ * @param {string} format - Target container: mp4, mov, avi, mkv, webm
+ * @param {Object} options - Explicitly requested {codec, bitrate, resolution}
+ * @returns {{ video: 'copy'|'encode', audio: 'copy'|'encode'|'none', reasons: string[] }}
+ */
+function planVideoConversion(metadata, format, options = {}) {
+  const container = VIDEO_CONTAINERS[format];
+  const videoStream = findStream(metadata, 'video');
+  const audioStream = findStream(metadata, 'audio');
+  const reasons = [];
+
+  if (!container) {
+    reasons.push(`unknown container: ${format}`);
+  } else if (!videoStream) {
+    reasons.push('no video stream');
+  } else {
+    const codec = videoStream.codec_name;
+
+    if (!container.video.includes(codec)) {
+      reasons.push(`video codec ${codec} not allowed in ${format}`);
+    }
+
+    if (options.codec && CODEC_NAMES[options.codec] !== codec) {
+      reasons.push(`codec ${options.codec} requested (source ${codec})`);
+    }
+
+    if (options.resolution) {
+      const [width, height] = String(options.resolution).split('x').map(Number);
+      if (videoStream.width > width || videoStream.height > height) {
+        reasons.push(`resolution ${videoStream.width}x${videoStream.height} exceeds ${options.resolution}`);
+      }
+    }
+
+    if (options.bitrate) {
+      // The container bitrate includes audio, so only trust the stream's own value
+      const kbps = streamBitrateKbps(videoStream, metadata);
+      if (kbps === null || kbps > options.bitrate * BITRATE_TOLERANCE) {
+        reasons.push(`video bitrate ${kbps === null ? 'unknown' : Math.round(kbps)}kbps exceeds ${options.bitrate}kbps`);
+      }
+    }
+  }
+
+  let audio = 'none';
+  if (audioStream) {
+    audio = container && container.audio.includes(audioStream.codec_name) ? 'copy' : 'encode';
+  }
+
+  return {
+    video: reasons.length === 0 ? 'copy' : 'encode',
+    audio,
+    reasons
+  };
+}
+
+/**
+ * Plan an audio conversion
+ * @param {Object} metadata - ffprobe metadata
+ * @param {string} format - Target format: mp3, wav, ogg, m4a, aac
+ * @param {number} bitrate - Requested bitrate cap in kbps
+ * @returns {{ audio: 'copy'|'encode', reasons: string[] }}
+ */
+function planAudioConversion(metadata, format, bitrate) {
+  const allowed = AUDIO_TARGETS[format];
+  const audioStream = findStream(metadata, 'audio');
+  const reasons = [];
+
+  if (!allowed) {
+    reasons.push(`unknown audio format: ${format}`);
+  } else if (!audioStream) {
+    reasons.push('no audio stream');
+  } else {
+    const codec = audioStream.codec_name;
+
+    if (!allowed.includes(codec)) {
+      reasons.push(`audio codec ${codec} not allowed in ${format}`);
+    }
+
+    if ((audioStream.channels || 0) > MAX_AUDIO_CHANNELS) {
+      reasons.push(`${audioStream.channels} channels exceeds ${MAX_AUDIO_CHANNELS}`);
+    }
+
+    // PCM has no bitrate cap
+    if (format !== 'wav' && bitrate) {
+      const cap = Math.min(bitrate, 320);
+      const hasVideo = Boolean(findStream(metadata, 'video'));
+      const kbps = streamBitrateKbps(audioStream, metadata, !hasVideo);
+      if (kbps === null || kbps > cap * BITRATE_TOLERANCE) {
+        reasons.push(`audio bitrate ${kbps === null ? 'unknown' : Math.round(kbps)}kbps exceeds ${cap}kbps`);
+      }
+    }
+  }
+
+  return {
+    audio: reasons.length === 0 ? 'copy' : 'encode',
+    reasons
+  };
+}
+
+/**
+ * Plan that re-encodes everything (used when probing or remuxing fails)
+ * @returns {{ video: 'encode', audio: 'encode', reasons: string[] }}
+ */
+function fullEncodePlan(reason) {
+  return { video: 'encode', audio: 'encode', reasons: [reason] };
+}
+
+module.exports = {
+  VIDEO_CONTAINERS,
+  AUDIO_TARGETS,
+  probeMedia,
+  streamBitrateKbps,
+  planVideoConversion,
+  planAudioConversion,
+  fullEncodePlan
+};
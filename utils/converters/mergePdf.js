@@ -3,67 +3,83 @@
  * PDF 병합 (Merge) 변환기
  * ================================
  * 여러 PDF를 하나로 병합
- * pdf-lib 라이브러리 사용
+ * pikepdf(qpdf) 기반 Python 엔진을 사용하여 디스크 파일에서 직접 처리
+ * - 입력/출력 모두 파일 경로로 주고받아 메모리 사용량이 입력 총합에 비례하지 않음
+ * - 여러 입력에 동일하게 포함된 폰트는 하나의 객체로 공유
+ * - 사전 설치: `pip install pikepdf` (docs/CONVERTERS.md)
  */
 
-const { PDFDocument } = require('pdf-lib');
-const fs = require('fs');
 const path = require('path');
-const os = require('os');
+const { spawnSupervised } = require('../processSupervisor');
+const { profileEnv } = require('../profiler');
+
+const PYTHON_BIN = process.env.PDF_ENGINE_PYTHON_BIN || process.env.PYTHON_BIN || 'python3';
+const SCRIPT_PATH = path.resolve(__dirname, 'scripts/pdf_merge_split.py');
 
 /**
- * 여러 PDF 파일을 병합
- * @param {Array<Buffer>} pdfBuffers - PDF 버퍼 배열
- * @param {Array<string>} fileNames - 파일명 배열 (로깅 용)
- * @returns {Promise<Buffer>} 병합된 PDF 버퍼
+ * pdf_merge_split.py 실행
+ * @param {Array<string>} args - 스크립트 인자
+ * @returns {Promise<Object>} 스크립트가 stdout으로 출력한 요약 정보
  */
-async function mergePdf(pdfBuffers, fileNames = []) {
-  const tempDir = os.tmpdir();
-  const timestamp = Date.now();
-  const randomStr = Math.random().toString(36).substring(2, 8);
-
-  try {
-    console.log(`📄 PDF 병합 시작: ${fileNames.length}개 파일`);
+function runPdfEngine(args) {
+  return new Promise((resolve, reject) => {
+    const child = spawnSupervised(PYTHON_BIN, [SCRIPT_PATH, ...args], {
+      stdio: ['ignore', 'pipe', 'pipe'],
+      env: profileEnv('pdf_merge_split'),
+      label: 'pdf_merge_split'
+    });
 
-    // 1️⃣ 새로운 PDF 문서 생성
-    const mergedPdf = await PDFDocument.create();
+    let stdout = '';
+    let stderr = '';
+    child.stdout?.on('data', (chunk) => {
+      stdout += chunk.toString();
+    });
+    child.stderr?.on('data', (chunk) => {
+      stderr += chunk.toString();
+    });
 
-    // 2️⃣ 각 PDF를 로드하고 페이지 복사
-    for (let i = 0; i < pdfBuffers.length; i++) {
-      const fileName = fileNames[i] || `파일${i + 1}`;
-
-      try {
-        const pdfDoc = await PDFDocument.load(pdfBuffers[i]);
-        const pageCount = pdfDoc.getPageCount();
-
-        console.log(`  ✓ 로드: ${fileName} (${pageCount}페이지)`);
-
-        // 해당 PDF의 모든 페이지를 복사
-        const copiedPages = await mergedPdf.copyPages(pdfDoc, pdfDoc.getPageIndices());
+    child.on('error', (error) => reject(error));
+    child.on('close', (code) => {
+      if (code === 0) {
+        try {
+          resolve(JSON.parse(stdout.trim().split('\n').pop() || '{}'));
+        } catch (parseError) {
+          resolve({});
+        }
+      } else {
+        const err = new Error(
+          `PDF 엔진 프로세스가 실패했습니다 (exit=${code}${child.killReason ? `, ${child.killReason}` : ''}).${stderr ? `\n${stderr.trim()}` : ''}`
+        );
+        err.code = 'PDF_ENGINE_FAILED';
+        reject(err);
+      }
+    });
+  });
+}
 
-        copiedPages.forEach((page) => {
-          mergedPdf.addPage(page);
-        });
+/**
+ * 여러 PDF 파일을 병합
+ * @param {Array<string>} pdfPaths - 입력 PDF 파일 경로 배열
+ * @param {Array<string>} fileNames - 파일명 배열 (로깅 용)
+ * @param {string} outputPath - 병합된 PDF를 저장할 경로
+ * @returns {Promise<string>} 병합된 PDF 파일 경로
+ */
+async function mergePdf(pdfPaths, fileNames = [], outputPath) {
+  try {
+    console.log(`📄 PDF 병합 시작: ${pdfPaths.length}개 파일`);
 
-        console.log(`  ✓ 추가: ${fileName} - ${pageCount}페이지 병합 완료`);
-      } catch (error) {
-        console.error(`  ✗ 오류: ${fileName} 처리 실패 - ${error.message}`);
-        throw new Error(`"${fileName}" 로드 실패: ${error.message}`);
-      }
+    if (!outputPath) {
+      throw new Error('병합 결과 경로가 지정되지 않았습니다.');
     }
 
-    // 3️⃣ 병합된 PDF를 버퍼로 변환
-    const mergedPdfBytes = await mergedPdf.save();
-    const mergedBuffer = Buffer.from(mergedPdfBytes);
-
-    const totalPages = mergedPdf.getPageCount();
-    console.log(`✅ PDF 병합 완료 (총 ${totalPages}페이지, ${(mergedBuffer.length / 1024 / 1024).toFixed(2)}MB)`);
+    const summary = await runPdfEngine(['merge', outputPath, ...pdfPaths]);
 
-    return mergedBuffer;
+    console.log(`✅ PDF 병합 완료 (총 ${summary.pages ?? '?'}페이지, 공유 폰트 ${summary.sharedFonts ?? 0}개)`);
+    return outputPath;
   } catch (error) {
     console.error(`❌ PDF 병합 실패: ${error.message}`);
     throw error;
   }
 }
 
-module.exports = { mergePdf };
+module.exports = { mergePdf, runPdfEngine };
@@ -0,0 +1,99 @@
+/**
+ * ================================
+ * 🔗 다단계 변환 파이프라인
+ * ================================
+ * 기존 변환기를 한 워커 안에서 이어 실행 (예: DOCX → PDF → JPG ZIP)
+ * - 중간 결과는 작업별 스크래치 디렉토리에만 두고 다음 단계에 경로로 전달
+ * - 최종 결과만 반환 → 라우트가 R2 업로드/DB 기록을 한 번만 수행
+ * - 단계별 소요 시간/크기를 steps로 반환
+ * - 작업 마감 시각(deadlineAt)은 절대 시각 그대로 페이지 단위 단계에 전달
+ *   → 앞 단계에서 쓴 시간만큼 남은 시간이 줄어들고, 부분 결과는 converter.task.js가 takePartial로 보고
+ */
+
+const fs = require('fs/promises');
+const path = require('path');
+const { createScratchDir, removeScratchDir, inputSize } = require('../scratch');
+const convertOfficeToPdf = require('./convertOfficeToPdf');
+const convertToImage = require('./convertPdfToImage');
+const { compressPdf } = require('./compressPdf');
+const { PIPELINE_STEPS } = require('../constants');
+
+/**
+ * 단계 형식별 변환 함수
+ * - outputPath를 받는 변환기는 중간 결과를 스크래치 경로에 바로 기록 (Buffer 왕복 없음)
+ */
+const STEPS = {
+  word2pdf: { ext: '.pdf', run: (input, opts, outputPath) => convertOfficeToPdf(input, 'word', { outputPath }) },
+  excel2pdf: { ext: '.pdf', run: (input, opts, outputPath) => convertOfficeToPdf(input, 'excel', { outputPath }) },
+  ppt2pdf: { ext: '.pdf', run: (input, opts, outputPath) => convertOfficeToPdf(input, 'ppt', { outputPath }) },
+  jpg: { ext: '.zip', run: (input, opts) => convertToImage(input, 'jpg', { deadlineAt: opts.deadlineAt }) },
+  png: { ext: '.zip', run: (input, opts) => convertToImage(input, 'png', { deadlineAt: opts.deadlineAt }) },
+  compress: { ext: '.pdf', run: (input, opts) => compressPdf(input, opts.quality || 'medium') }
+};
+
+/**
+ * 파이프라인 형식인지 확인
+ * @param {string} format
+ * @returns {boolean}
+ */
+function isPipelineFormat(format) {
+  return Object.hasOwn(PIPELINE_STEPS, format);
+}
+
+/**
+ * 파이프라인 실행
+ * @param {string} format - 파이프라인 형식 (PIPELINE_STEPS 키)
+ * @param {string|Buffer} input - 첫 단계 입력 (디스크 경로 또는 버퍼)
+ * @param {Object} [options] - 단계 공통 옵션 (예: { quality, deadlineAt })
+ * @param {number} [options.deadlineAt] - 작업 마감 시각 (epoch ms, 페이지 단위 단계가 사용)
+ * @returns {Promise<{result: Buffer|string, steps: Array<{format: string, ms: number, bytes: number}>}>}
+ *          result는 마지막 단계의 반환값 (Buffer 또는 최종 파일 경로)
+ */
+async function runPipeline(format, input, options = {}) {
+  const stepFormats = isPipelineFormat(format) ? PIPELINE_STEPS[format] : null;
+  if (!stepFormats) {
+    throw new Error(`지원하지 않는 파이프라인: ${format}`);
+  }
+
+  const scratchDir = await createScratchDir('pipeline');
+  const steps = [];
+  let current = input;
+
+  try {
+    for (let i = 0; i < stepFormats.length; i++) {
+      const stepFormat = stepFormats[i];
+      const step = STEPS[stepFormat];
+      const isLast = i === stepFormats.length - 1;
+      const outputPath = path.join(scratchDir, `step-${i + 1}${step.ext}`);
+
+      console.log(`🔗 [파이프라인 ${format}] ${i + 1}/${stepFormats.length} 단계: ${stepFormat}`);
+      const startedAt = Date.now();
+      let output = await step.run(current, options, isLast ? undefined : outputPath);
+
+      // 중간 결과가 Buffer면 스크래치에 한 번 기록하고 다음 단계에는 경로만 전달
+      if (!isLast && Buffer.isBuffer(output)) {
+        await fs.writeFile(outputPath, output);
+        output = outputPath;
+      }
+
+      steps.push({ format: stepFormat, ms: Date.now() - startedAt, bytes: await inputSize(output) });
+      current = output;
+    }
+
+    // 최종 결과가 스크래치 안의 파일이면 디렉토리 정리 전에 읽어 둠
+    if (typeof current === 'string' && current.startsWith(scratchDir)) {
+      current = await fs.readFile(current);
+    }
+
+    console.log(`✅ [파이프라인 ${format}] 완료: ${steps.map((s) => `${s.format} ${s.ms}ms`).join(' → ')}`);
+    return { result: current, steps };
+  } finally {
+    await removeScratchDir(scratchDir);
+  }
+}
+
+module.exports = {
+  STEPS,
+  isPipelineFormat,
+  runPipeline
+};
@@ -6,10 +6,11 @@
  */
 
 const sharp = require('sharp');
+const { inputSize } = require('../scratch');
 
 /**
  * 이미지 리사이즈 및 압축
- * @param {Buffer} imageBuffer - 이미지 버퍼
+ * @param {string|Buffer} imageInput - 이미지 파일 경로 또는 버퍼
  * @param {Object} options - 옵션 {
  *   width: number,           // 너비 (픽셀)
  *   height: number,          // 높이 (픽셀)
@@ -19,7 +20,7 @@ const sharp = require('sharp');
  * }
  * @returns {Promise<Buffer>} 리사이즈된 이미지 버퍼
  */
-async function resizeImage(imageBuffer, options = {}) {
+async function resizeImage(imageInput, options = {}) {
   try {
     const {
       width,
@@ -33,10 +34,10 @@ async function resizeImage(imageBuffer, options = {}) {
     console.log(`  크기: ${width}x${height}, 방식: ${fit}, 품질: ${quality}`);
 
     // 이미지 메타데이터 가져오기
-    const metadata = await sharp(imageBuffer).metadata();
+    const metadata = await sharp(imageInput).metadata();
     console.log(`  원본: ${metadata.width}x${metadata.height} (${metadata.format})`);
 
-    let transform = sharp(imageBuffer).resize(width, height, {
+    let transform = sharp(imageInput).resize(width, height, {
       fit: fit,
       position: 'center'
     });
@@ -66,9 +67,10 @@ async function resizeImage(imageBuffer, options = {}) {
           .toBuffer();
     }
 
-    const originalSize = imageBuffer.length / 1024 / 1024;
+    const originalBytes = await inputSize(imageInput);
+    const originalSize = originalBytes / 1024 / 1024;
     const resizedSize = resizedBuffer.length / 1024 / 1024;
-    const sizeReduction = ((1 - resizedBuffer.length / imageBuffer.length) * 100).toFixed(1);
+    const sizeReduction = ((1 - resizedBuffer.length / originalBytes) * 100).toFixed(1);
 
     console.log(`✅ 이미지 리사이즈 완료`);
     console.log(`  결과: ${width}x${height} (${format})`);
@@ -83,21 +85,21 @@ async function resizeImage(imageBuffer, options = {}) {
 
 /**
  * 이미지 크기만 조정 (리사이즈 없음)
- * @param {Buffer} imageBuffer - 이미지 버퍼
+ * @param {string|Buffer} imageInput - 이미지 파일 경로 또는 버퍼
  * @param {Object} options - {width, height, fit}
  * @returns {Promise<Buffer>} 리사이즈된 이미지
  */
-async function resizeImageOnly(imageBuffer, options = {}) {
-  return resizeImage(imageBuffer, { ...options, quality: 100, format: 'png' });
+async function resizeImageOnly(imageInput, options = {}) {
+  return resizeImage(imageInput, { ...options, quality: 100, format: 'png' });
 }
 
 /**
  * 이미지 압축만 (크기 유지)
- * @param {Buffer} imageBuffer - 이미지 버퍼
+ * @param {string|Buffer} imageInput - 이미지 파일 경로 또는 버퍼
  * @param {Object} options - {quality, format}
  * @returns {Promise<Buffer>} 압축된 이미지
  */
-async function compressImageOnly(imageBuffer, options = {}) {
+async function compressImageOnly(imageInput, options = {}) {
   try {
     const {
       quality = 80,
@@ -110,29 +112,30 @@ async function compressImageOnly(imageBuffer, options = {}) {
     switch (format.toLowerCase()) {
       case 'jpeg':
       case 'jpg':
-        compressedBuffer = await sharp(imageBuffer)
+        compressedBuffer = await sharp(imageInput)
           .jpeg({ quality: Math.min(Math.max(quality, 1), 100), progressive: true })
           .toBuffer();
         break;
       case 'png':
-        compressedBuffer = await sharp(imageBuffer)
+        compressedBuffer = await sharp(imageInput)
           .png({ compressionLevel: 9 })
           .toBuffer();
         break;
       case 'webp':
-        compressedBuffer = await sharp(imageBuffer)
+        compressedBuffer = await sharp(imageInput)
           .webp({ quality: Math.min(Math.max(quality, 1), 100) })
           .toBuffer();
         break;
       default:
-        compressedBuffer = await sharp(imageBuffer)
+        compressedBuffer = await sharp(imageInput)
           .jpeg({ quality: Math.min(Math.max(quality, 1), 100), progressive: true })
           .toBuffer();
     }
 
-    const originalSize = imageBuffer.length / 1024 / 1024;
+    const originalBytes = await inputSize(imageInput);
+    const originalSize = originalBytes / 1024 / 1024;
     const compressedSize = compressedBuffer.length / 1024 / 1024;
-    const sizeReduction = ((1 - compressedBuffer.length / imageBuffer.length) * 100).toFixed(1);
+    const sizeReduction = ((1 - compressedBuffer.length / originalBytes) * 100).toFixed(1);
 
     console.log(`✅ 이미지 압축 완료`);
     console.log(`  크기: ${originalSize.toFixed(2)}MB → ${compressedSize.toFixed(2)}MB (-${sizeReduction}%)`);
@@ -0,0 +1,48 @@
+"""
+Deadline helpers shared by the page-oriented converter scripts.
+
+The Node side passes ``--deadline <epoch seconds>``: the moment the script
+should stop starting new pages so that it still has time to write a valid
+output before the supervisor timeout fires. Scripts process pages in order,
+check ``Deadline.reached()`` between pages (the first page is always
+processed) and report how far they got in the JSON summary line on stdout:
+
+    {"partial": true, "pages_done": 550, "pages_total": 600, ...}
+"""
+
+import json
+import sys
+import time
+
+
+class Deadline:
+    def __init__(self, at=None):
+        self.at = at
+
+    def reached(self):
+        return self.at is not None and time.time() >= self.at
+
+    def remaining(self):
+        """남은 시간(초), 마감이 없으면 None"""
+        return None if self.at is None else self.at - time.time()
+
+
+def add_deadline_argument(parser):
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="epoch seconds after which no new page is started",
+    )
+
+
+def page_summary(pages_done, pages_total):
+    return {
+        "partial": pages_done < pages_total,
+        "pages_done": pages_done,
+        "pages_total": pages_total,
+    }
+
+
+def write_summary(summary):
+    sys.stdout.write(json.dumps(summary) + "\n")
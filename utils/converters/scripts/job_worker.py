@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Standalone queue worker for the Python-based PDF converters.
+
+Claims jobs from the ``jobs`` table (same SQLite file as the web server,
+see utils/jobQueue.js) for the formats converted by the sibling scripts,
+downloads the input from R2 (or any S3-compatible endpoint), runs the
+script, uploads the result, records it in ``files`` and completes the job.
+Leases, heartbeats, retries and backoff follow the same SQL as the Node
+worker (jobWorker.js), so both kinds of worker can share one queue.
+
+Only the standard library is needed for the queue and storage side; the
+converter scripts keep their own dependencies (pdf2docx, pdfplumber, ...).
+
+Environment:
+    DB_PATH, R2_ENDPOINT, R2_BUCKET, R2_ACCESS_KEY_ID, R2_SECRET_ACCESS_KEY
+    JOB_LEASE_MS, JOB_RETRY_BASE_MS, JOB_RETRY_MAX_MS, CONVERTER_TIMEOUT
+
+Usage:
+    python job_worker.py [--formats word,excel,ppt] [--poll 1.0] [--once]
+"""
+
+import argparse
+import datetime
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import signal
+import socket
+import sqlite3
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+ROOT_DIR = SCRIPTS_DIR.parents[2]
+
+# 형식 → (스크립트, 추가 인자, 결과 확장자)
+CONVERTERS = {
+    "word": ("pdf_to_docx.py", [], ".docx"),
+    "excel": ("pdf_to_xlsx.py", ["--engine", os.environ.get("PDF2XLSX_ENGINE", "auto")], ".xlsx"),
+    "ppt": ("pdf_to_pptx.py", [], ".pptx"),
+}
+
+LEASE_MS = int(os.environ.get("JOB_LEASE_MS") or 60_000)
+RETRY_BASE_MS = int(os.environ.get("JOB_RETRY_BASE_MS") or 5_000)
+RETRY_MAX_MS = int(os.environ.get("JOB_RETRY_MAX_MS") or 300_000)
+# Node 워커와 같은 변환 시간 한도 / 마감 여유 (utils/deadline.js)
+TIMEOUT_MS = int(os.environ.get("CONVERTER_TIMEOUT") or 300_000)
+DEADLINE_MARGIN_MS = int(os.environ.get("CONVERTER_DEADLINE_MARGIN_MS") or 20_000)
+FILE_EXPIRY_MINUTES = 10
+
+BACKOFF_SQL = "MIN(:retry_base_ms * (1 << MAX(attempts - 1, 0)), :retry_max_ms)"
+
+CLAIM_SQL = """
+    UPDATE jobs
+    SET status = 'running',
+        attempts = attempts + 1,
+        lease_owner = :worker_id,
+        lease_expires_at = :now + :lease_ms,
+        updated_at = :now
+    WHERE id = (
+      SELECT id FROM jobs
+      WHERE status = 'queued' AND run_at <= :now
+        AND format IN (SELECT value FROM json_each(:formats))
+      ORDER BY priority DESC, run_at
+      LIMIT 1
+    )
+    RETURNING id, format, payload, attempts
+"""
+
+HEARTBEAT_SQL = """
+    UPDATE jobs
+    SET lease_expires_at = :now + :lease_ms, updated_at = :now
+    WHERE id = :id AND status = 'running' AND lease_owner = :worker_id
+"""
+
+COMPLETE_SQL = """
+    UPDATE jobs
+    SET status = 'succeeded', result = :result, error = NULL,
+        lease_owner = NULL, lease_expires_at = NULL, updated_at = :now
+    WHERE id = :id AND status = 'running' AND lease_owner = :worker_id
+"""
+
+FAIL_SQL = f"""
+    UPDATE jobs
+    SET status = CASE WHEN :retry = 1 AND attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+        run_at = :now + {BACKOFF_SQL},
+        error = :error,
+        lease_owner = NULL, lease_expires_at = NULL, updated_at = :now
+    WHERE id = :id AND status = 'running' AND lease_owner = :worker_id
+    RETURNING status, attempts
+"""
+
+RELEASE_SQL = """
+    UPDATE jobs
+    SET status = 'queued', attempts = MAX(attempts - 1, 0), run_at = :now,
+        lease_owner = NULL, lease_expires_at = NULL, updated_at = :now
+    WHERE id = :id AND status = 'running' AND lease_owner = :worker_id
+"""
+
+INSERT_FILE_SQL = """
+    INSERT INTO files (file_id, r2_path, file_type, expires_at, status)
+    VALUES (?, ?, 'converted', datetime('now', ?), 'active')
+"""
+
+
+class PermanentError(Exception):
+    """재시도해도 결과가 같은 실패 (입력 없음 등)"""
+
+
+class Released(Exception):
+    """종료 신호로 중단 → 시도 횟수 차감 없이 반납"""
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+def log(message):
+    stamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{stamp}] {message}", flush=True)
+
+
+def connect(db_path):
+    # 웹 서버/Node 워커와 같은 WAL DB, 쓰기 경합 시 대기 (config/db.js의 busy timeout과 동일)
+    conn = sqlite3.connect(
+        db_path,
+        timeout=int(os.environ.get("DB_BUSY_TIMEOUT_MS") or 5000) / 1000,
+        isolation_level=None,
+        check_same_thread=False,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    return conn
+
+
+def sanitize_filename(name):
+    """utils/sanitizer.js의 sanitizeFilename과 같은 규칙"""
+    if not name:
+        return "file"
+    name = name.replace("..", "")
+    name = re.sub(r"[/\\]", "", name)
+    name = re.sub(r"[^a-zA-Z0-9._\-]", "_", name)
+    name = re.sub(r"\.{2,}", ".", name)
+    name = re.sub(r"_+", "_", name)
+    return name[:255].strip().strip(".")
+
+
+def random_suffix():
+    return "".join(random.choices(string.ascii_lowercase + string.digits, k=6))
+
+
+class S3Client:
+    """R2/S3 호환 최소 클라이언트 (SigV4, path-style, 표준 라이브러리만 사용)"""
+
+    def __init__(self, endpoint, bucket, access_key, secret_key, region="auto"):
+        self.endpoint = endpoint.rstrip("/")
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+
+    def _request(self, method, key, body=None, headers=None):
+        url = urllib.parse.urlsplit(self.endpoint)
+        path = "/" + "/".join(
+            urllib.parse.quote(part, safe="-_.~") for part in [self.bucket, *key.split("/")]
+        )
+        amz_date = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        short_date = amz_date[:8]
+        scope = f"{short_date}/{self.region}/s3/aws4_request"
+
+        signed = {
+            "host": url.netloc,
+            "x-amz-content-sha256": "UNSIGNED-PAYLOAD",
+            "x-amz-date": amz_date,
+        }
+        canonical_headers = "".join(f"{name}:{signed[name]}\n" for name in sorted(signed))
+        signed_headers = ";".join(sorted(signed))
+        canonical_request = "\n".join(
+            [method, path, "", canonical_headers, signed_headers, "UNSIGNED-PAYLOAD"]
+        )
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode()).hexdigest(),
+            ]
+        )
+
+        key_bytes = f"AWS4{self.secret_key}".encode()
+        for part in (short_date, self.region, "s3", "aws4_request"):
+            key_bytes = hmac.new(key_bytes, part.encode(), hashlib.sha256).digest()
+        signature = hmac.new(key_bytes, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+        request = urllib.request.Request(
+            f"{url.scheme}://{url.netloc}{path}", data=body, method=method
+        )
+        for name, value in {**signed, **(headers or {})}.items():
+            if name != "host":
+                request.add_header(name, value)
+        request.add_header(
+            "Authorization",
+            f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}",
+        )
+        return urllib.request.urlopen(request, timeout=60)
+
+    def download(self, key, file_path):
+        try:
+            with self._request("GET", key) as response, open(file_path, "wb") as out:
+                while chunk := response.read(1024 * 1024):
+                    out.write(chunk)
+        except urllib.error.HTTPError as error:
+            if error.code == 404:
+                raise PermanentError(f"원본 없음: {key}") from error
+            raise
+
+    def upload(self, key, file_path, content_type="application/octet-stream"):
+        size = os.path.getsize(file_path)
+        with open(file_path, "rb") as body:
+            headers = {"Content-Type": content_type, "Content-Length": str(size)}
+            with self._request("PUT", key, body=body, headers=headers):
+                pass
+
+    def delete(self, key):
+        with self._request("DELETE", key):
+            pass
+
+
+class Heartbeat(threading.Thread):
+    """lease 연장 스레드 (lease를 잃으면 lost 설정 + 변환 프로세스 종료)"""
+
+    def __init__(self, db_path, job_id, worker_id):
+        super().__init__(daemon=True)
+        self.conn = connect(db_path)
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.stopped = threading.Event()
+        self.lost = False
+        self.process = None
+
+    def run(self):
+        interval = max(1.0, LEASE_MS / 3 / 1000)
+        while not self.stopped.wait(interval):
+            try:
+                changed = self.conn.execute(
+                    HEARTBEAT_SQL,
+                    {"id": self.job_id, "worker_id": self.worker_id, "lease_ms": LEASE_MS, "now": now_ms()},
+                ).rowcount
+            except sqlite3.Error as error:
+                log(f"❌ heartbeat 실패: {self.job_id} ({error})")
+                continue
+            if changed == 0:
+                log(f"⚠️  lease 상실 - 작업 취소: {self.job_id}")
+                self.lost = True
+                if self.process and self.process.poll() is None:
+                    self.process.kill()
+                return
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        self.conn.close()
+
+
+class Worker:
+    def __init__(self, db_path, formats, poll):
+        self.db_path = db_path
+        self.conn = connect(db_path)
+        self.formats = formats
+        self.poll = poll
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:py"
+        self.stopping = False
+        self.process = None
+        self.s3 = S3Client(
+            os.environ["R2_ENDPOINT"],
+            os.environ["R2_BUCKET"],
+            os.environ["R2_ACCESS_KEY_ID"],
+            os.environ["R2_SECRET_ACCESS_KEY"],
+        )
+
+    def stop(self, signum, _frame):
+        if self.stopping:
+            # 두 번째 신호: 진행 중 변환 중단 → 작업 반납 후 종료
+            if self.process and self.process.poll() is None:
+                self.process.kill()
+            return
+        log(f"🛑 {signal.Signals(signum).name} 수신 - 새 작업 점유 중단, 진행 중 작업 완료 대기...")
+        self.stopping = True
+
+    def claim(self):
+        # RETURNING 문장은 커서를 끝까지 읽어야 완료됨 (fetchone이면 쓰기 잠금이 남음)
+        rows = self.conn.execute(
+            CLAIM_SQL,
+            {
+                "worker_id": self.worker_id,
+                "formats": json.dumps(self.formats),
+                "lease_ms": LEASE_MS,
+                "now": now_ms(),
+            },
+        ).fetchall()
+        return dict(rows[0]) if rows else None
+
+    def convert(self, job, scratch, heartbeat):
+        payload = json.loads(job["payload"])
+        script, extra_args, ext = CONVERTERS[job["format"]]
+
+        input_path = Path(scratch) / "source.pdf"
+        output_path = Path(scratch) / f"output{ext}"
+        self.s3.download(payload["r2Path"], input_path)
+
+        deadline = (time.time() * 1000 + TIMEOUT_MS - DEADLINE_MARGIN_MS) / 1000
+        args = [sys.executable, str(SCRIPTS_DIR / script), str(input_path), str(output_path),
+                *extra_args, "--deadline", f"{deadline:.3f}"]
+        self.process = heartbeat.process = subprocess.Popen(
+            args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        try:
+            stdout, stderr = self.process.communicate(timeout=TIMEOUT_MS / 1000)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.communicate()
+            raise RuntimeError(f"변환 시간 초과 ({TIMEOUT_MS / 1000:.0f}초)")
+        finally:
+            returncode = self.process.returncode
+            self.process = None
+
+        if heartbeat.lost:
+            return None
+        if self.stopping and returncode < 0:
+            raise Released("종료 신호로 변환 중단")
+        if returncode != 0 or not output_path.exists():
+            raise RuntimeError(f"{script} 실패 (code={returncode}): {stderr.strip()[-500:]}")
+
+        summary = {}
+        lines = stdout.strip().splitlines()
+        if lines:
+            try:
+                summary = json.loads(lines[-1])
+            except json.JSONDecodeError:
+                pass
+
+        original = payload.get("originalName") or "file"
+        base = original.rsplit(".", 1)[0] if "." in original else original
+        file_name = f"{sanitize_filename(base)}_converted{ext}"
+        r2_path = f"converted/{now_ms()}-{random_suffix()}{ext}"
+        file_id = f"{now_ms()}-{random_suffix()}"
+
+        self.s3.upload(r2_path, output_path)
+        self.conn.execute(INSERT_FILE_SQL, (file_id, r2_path, f"+{FILE_EXPIRY_MINUTES} minutes"))
+
+        result = {"fileId": file_id, "r2Path": r2_path, "fileName": file_name}
+        if summary.get("partial"):
+            result.update(partial=True, pagesDone=summary["pages_done"], pagesTotal=summary["pages_total"])
+        return result
+
+    def process_job(self, job):
+        params = {"id": job["id"], "worker_id": self.worker_id}
+        log(f"📬 큐 작업 실행: {job['id']} ({job['format']}, {job['attempts']}번째 시도)")
+
+        heartbeat = Heartbeat(self.db_path, job["id"], self.worker_id)
+        heartbeat.start()
+        try:
+            with tempfile.TemporaryDirectory(prefix="job-") as scratch:
+                result = self.convert(job, scratch, heartbeat)
+        except Released as error:
+            self.conn.execute(RELEASE_SQL, {**params, "now": now_ms()})
+            log(f"↩️  큐 작업 반납: {job['id']} ({error})")
+            return
+        except Exception as error:
+            if heartbeat.lost:
+                return
+            outcome = self.conn.execute(
+                FAIL_SQL,
+                {
+                    **params,
+                    "error": str(error)[:1000],
+                    "retry": 0 if isinstance(error, PermanentError) else 1,
+                    "now": now_ms(),
+                    "retry_base_ms": RETRY_BASE_MS,
+                    "retry_max_ms": RETRY_MAX_MS,
+                },
+            ).fetchall()
+            outcome = outcome[0] if outcome else None
+            if outcome and outcome["status"] == "queued":
+                log(f"🔁 큐 작업 재시도 예약: {job['id']} ({outcome['attempts']}회 실패) - {error}")
+            else:
+                log(f"❌ 큐 작업 실패: {job['id']} - {error}")
+            return
+        finally:
+            heartbeat.stop()
+
+        if result is None:
+            return
+
+        completed = self.conn.execute(
+            COMPLETE_SQL, {**params, "result": json.dumps(result), "now": now_ms()}
+        ).rowcount
+        if not completed:
+            log(f"⚠️  lease 상실 - 결과 기록 안 함: {job['id']}")
+            return
+        log(f"✅ 큐 작업 완료: {job['id']} → {result['fileName']}")
+
+        # 완료 기록 후 원본 삭제 (최선의 노력)
+        try:
+            self.s3.delete(json.loads(job["payload"])["r2Path"])
+        except Exception as error:
+            log(f"⚠️  원본 파일 삭제 실패 (무시하고 계속): {error}")
+
+    def run(self, once=False):
+        log(f"🛠️  Python 변환 작업 워커 시작: {self.worker_id} (형식: {', '.join(self.formats)})")
+        while not self.stopping:
+            try:
+                job = self.claim()
+            except sqlite3.Error as error:
+                log(f"❌ 작업 점유 실패: {error}")
+                job = None
+
+            if job:
+                self.process_job(job)
+            elif once:
+                break
+            else:
+                time.sleep(self.poll)
+        log("✅ 워커 종료 완료")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite job queue worker for Python PDF converters")
+    parser.add_argument("--db", default=os.environ.get("DB_PATH") or str(ROOT_DIR / "db" / "database.db"))
+    parser.add_argument("--formats", default=",".join(CONVERTERS))
+    parser.add_argument("--poll", type=float, default=float(os.environ.get("JOB_POLL_MS") or 1000) / 1000)
+    parser.add_argument("--once", action="store_true", help="대기 작업이 없으면 종료")
+    args = parser.parse_args()
+
+    formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip() in CONVERTERS]
+    if not formats:
+        sys.stderr.write(f"처리할 형식이 없습니다. 지원 형식: {', '.join(CONVERTERS)}\n")
+        sys.exit(2)
+
+    missing = [
+        name for name in ("R2_ENDPOINT", "R2_BUCKET", "R2_ACCESS_KEY_ID", "R2_SECRET_ACCESS_KEY")
+        if not os.environ.get(name)
+    ]
+    if missing:
+        sys.stderr.write(f"필수 환경변수 없음: {', '.join(missing)}\n")
+        sys.exit(2)
+
+    worker = Worker(args.db, formats, args.poll)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run(once=args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,9 @@ import subprocess
 import shutil
 from pathlib import Path
 
+from proc_utils import install_termination_handler, run_in_group
+from sampling_profiler import profile_from_env
+
 
 def find_libreoffice():
     """Find LibreOffice executable."""
@@ -70,12 +73,8 @@ def convert_office_to_pdf(input_file, output_pdf):
             input_file
         ]
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minutes timeout
-        )
+        # soffice 헬퍼 프로세스까지 포함한 프로세스 그룹 단위로 실행/정리
+        result = run_in_group(cmd, timeout=300)  # 5 minutes timeout
 
         if result.returncode != 0:
             sys.stderr.write(f"LibreOffice 변환 실패:\n{result.stderr}\n")
@@ -110,6 +109,8 @@ def main():
 
     input_file, output_pdf = sys.argv[1:3]
 
+    install_termination_handler()
+
     # Validate input file extension
     valid_extensions = ['.docx', '.xlsx', '.pptx', '.doc', '.xls', '.ppt']
     file_ext = os.path.splitext(input_file)[1].lower()
@@ -123,4 +124,5 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    with profile_from_env():
+        sys.exit(main())
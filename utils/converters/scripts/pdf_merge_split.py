@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Merge or split PDFs from files on disk using pikepdf (qpdf).
+
+qpdf copies page objects lazily and streams content data from the source
+files while writing, so memory follows the largest single page instead of
+the sum of all inputs.
+
+Usage:
+    python pdf_merge_split.py merge <output_pdf> <input_pdf> [<input_pdf> ...]
+    python pdf_merge_split.py split <input_pdf> <output_zip> <ranges_json>
+
+ranges_json: '[{"start": 1, "end": 5}, {"start": 6, "end": 10}]' (1-indexed)
+"""
+
+import hashlib
+import json
+import sys
+import zipfile
+from contextlib import ExitStack
+
+from sampling_profiler import profile_from_env
+
+try:
+    import pikepdf
+except ImportError:
+    sys.stderr.write(
+        "pikepdf 모듈을 찾을 수 없습니다. `pip install pikepdf`로 설치하세요.\n"
+    )
+    sys.exit(2)
+
+
+FONT_FILE_KEYS = ("/FontFile", "/FontFile2", "/FontFile3")
+
+
+def iter_font_descriptors(pdf):
+    """Yield every FontDescriptor referenced from page-level font resources."""
+    seen = set()
+    for page in pdf.pages:
+        resources = page.obj.get("/Resources")
+        if resources is None:
+            continue
+        fonts = resources.get("/Font")
+        if fonts is None:
+            continue
+        for _, font in fonts.items():
+            candidates = [font]
+            descendants = font.get("/DescendantFonts")
+            if descendants is not None:
+                candidates.extend(descendants)
+            for candidate in candidates:
+                descriptor = candidate.get("/FontDescriptor")
+                if descriptor is None or not descriptor.is_indirect:
+                    continue
+                if descriptor.objgen in seen:
+                    continue
+                seen.add(descriptor.objgen)
+                yield descriptor
+
+
+def share_font_programs(pdf):
+    """
+    Point identical embedded font programs at a single stream object.
+
+    The same font embedded by several inputs would otherwise be written once
+    per input. Unreferenced duplicates are dropped by qpdf when saving.
+    """
+    canonical = {}
+    shared = 0
+
+    for descriptor in iter_font_descriptors(pdf):
+        for key in FONT_FILE_KEYS:
+            stream = descriptor.get(key)
+            if stream is None or not stream.is_indirect:
+                continue
+            digest = hashlib.sha256(stream.read_raw_bytes()).hexdigest()
+            fingerprint = (key, str(stream.get("/Filter")), digest)
+            existing = canonical.get(fingerprint)
+            if existing is None:
+                canonical[fingerprint] = stream
+            elif existing.objgen != stream.objgen:
+                descriptor[key] = existing
+                shared += 1
+
+    return shared
+
+
+def merge(output_pdf, input_pdfs):
+    with ExitStack() as stack:
+        merged = stack.enter_context(pikepdf.new())
+        for input_pdf in input_pdfs:
+            # 원본은 저장이 끝날 때까지 열려 있어야 함 (스트림 데이터를 지연 복사)
+            source = stack.enter_context(pikepdf.open(input_pdf))
+            merged.pages.extend(source.pages)
+
+        shared = share_font_programs(merged)
+        merged.save(output_pdf)
+        return {"pages": len(merged.pages), "sharedFonts": shared}
+
+
+def normalize_ranges(ranges, total_pages):
+    valid = []
+    for item in ranges:
+        start = max(1, min(int(item["start"]), total_pages))
+        end = max(1, min(int(item["end"]), total_pages))
+        if start <= end:
+            valid.append((start, end))
+    return valid
+
+
+def split(input_pdf, output_zip, ranges):
+    with pikepdf.open(input_pdf) as source:
+        total_pages = len(source.pages)
+        valid_ranges = normalize_ranges(ranges, total_pages)
+        if not valid_ranges:
+            raise ValueError("유효한 분할 범위가 없습니다.")
+
+        with zipfile.ZipFile(output_zip, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+            for idx, (start, end) in enumerate(valid_ranges, start=1):
+                name = f"split_{idx:03d}_{start}-{end}.pdf"
+                with pikepdf.new() as part:
+                    part.pages.extend(source.pages[start - 1:end])
+                    # 분할 결과를 임시 파일 없이 ZIP 엔트리로 바로 기록
+                    with archive.open(name, "w", force_zip64=True) as entry:
+                        part.save(entry)
+
+        return {"pages": total_pages, "files": len(valid_ranges)}
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("merge", "split"):
+        sys.stderr.write(__doc__)
+        return 1
+
+    mode = sys.argv[1]
+
+    try:
+        if mode == "merge":
+            if len(sys.argv) < 4:
+                sys.stderr.write("Usage: pdf_merge_split.py merge <output_pdf> <input_pdf>...\n")
+                return 1
+            summary = merge(sys.argv[2], sys.argv[3:])
+        else:
+            if len(sys.argv) != 5:
+                sys.stderr.write("Usage: pdf_merge_split.py split <input_pdf> <output_zip> <ranges_json>\n")
+                return 1
+            summary = split(sys.argv[2], sys.argv[3], json.loads(sys.argv[4]))
+    except Exception as exc:  # pylint: disable=broad-except
+        sys.stderr.write(f"PDF {mode} 실패: {exc}\n")
+        return 3
+
+    sys.stdout.write(json.dumps(summary) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    with profile_from_env():
+        sys.exit(main())
@@ -2,12 +2,22 @@
 """
 Convert PDF to DOCX using pdf2docx.
 
+Pages are parsed one at a time in order. With ``--deadline`` the remaining
+pages are skipped once the deadline passes and the DOCX is built from the
+pages parsed so far. Prints a JSON summary line to stdout:
+    {"partial", "pages_done", "pages_total"}
+
 Usage:
-    python pdf_to_docx.py <input_pdf_path> <output_docx_path>
+    python pdf_to_docx.py <input_pdf_path> <output_docx_path> [--deadline <epoch seconds>]
 """
 
+import argparse
+import logging
 import sys
 
+from deadline import Deadline, add_deadline_argument, page_summary, write_summary
+from sampling_profiler import profile_from_env
+
 try:
     from pdf2docx import Converter
 except ImportError:
@@ -17,23 +27,53 @@ except ImportError:
     sys.exit(2)
 
 
-def main():
-    if len(sys.argv) != 3:
-        sys.stderr.write("Usage: pdf_to_docx.py <input_pdf> <output_docx>\n")
-        return 1
+def convert(input_pdf, output_docx, deadline):
+    """
+    Converter.convert()의 단계(load → 문서 분석 → 페이지 파싱 → docx 생성)를 직접 실행
+    - 페이지 파싱 사이에 마감 확인, 첫 페이지는 항상 파싱 (빈 문서 방지)
+    - 파싱되지 않은 페이지는 make_docx가 건너뜀
+    @returns (완료 페이지 수, 전체 페이지 수)
+    """
+    converter = Converter(input_pdf)
+    try:
+        settings = converter.default_settings
+        converter.load_pages().parse_document(**settings)
 
-    input_pdf, output_docx = sys.argv[1:3]
+        pages = [page for page in converter.pages if not page.skip_parsing]
+        processed = 0
+        for page in pages:
+            if processed > 0 and deadline.reached():
+                break
+            processed += 1
+            try:
+                page.parse(**settings)
+            except Exception as exc:  # pylint: disable=broad-except
+                # pdf2docx 기본 동작(ignore_page_error)과 같이 실패한 페이지만 건너뜀
+                logging.error("Ignore page %d due to parsing page error: %s", page.id + 1, exc)
 
-    try:
-        converter = Converter(input_pdf)
-        converter.convert(output_docx, start=0, end=None)
+        converter.make_docx(output_docx, **settings)
+        return processed, len(pages)
+    finally:
         converter.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF to DOCX")
+    parser.add_argument("input_pdf")
+    parser.add_argument("output_docx")
+    add_deadline_argument(parser)
+    args = parser.parse_args()
+
+    try:
+        pages_done, pages_total = convert(args.input_pdf, args.output_docx, Deadline(args.deadline))
     except Exception as exc:  # pylint: disable=broad-except
         sys.stderr.write(f"변환에 실패했습니다: {exc}\n")
         return 3
 
+    write_summary(page_summary(pages_done, pages_total))
     return 0
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    with profile_from_env():
+        sys.exit(main())
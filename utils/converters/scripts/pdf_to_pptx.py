@@ -2,15 +2,25 @@
 """
 Convert PDF pages to PPTX slides using pdf2image and python-pptx.
 
+Pages are rendered in small chunks in order, so only one chunk of page
+images is held in memory. With ``--deadline`` no new chunk is started once
+the deadline passes and the PPTX is saved with the slides made so far.
+Prints a JSON summary line to stdout:
+    {"partial", "pages_done", "pages_total"}
+
 Usage:
-    python pdf_to_pptx.py <input_pdf_path> <output_pptx_path>
+    python pdf_to_pptx.py <input_pdf_path> <output_pptx_path> [--deadline <epoch seconds>]
 """
 
+import argparse
 import io
 import sys
 
+from deadline import Deadline, add_deadline_argument, page_summary, write_summary
+from sampling_profiler import profile_from_env
+
 try:
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
 except ImportError:
     sys.stderr.write(
         "pdf2image 모듈을 찾을 수 없습니다. `pip install pdf2image`로 설치하세요.\n"
@@ -26,61 +36,72 @@ except ImportError:
     )
     sys.exit(2)
 
+DPI = 200
+# pdftoppm 1회 실행으로 렌더링할 페이지 수 (마감 확인 단위)
+PAGES_PER_RENDER = 4
+
 
 def px_to_emu(px: int, dpi: int) -> int:
     # 1 inch = 914400 EMU
     return int(px / dpi * 914400)
 
 
-def main() -> int:
-    if len(sys.argv) != 3:
-        sys.stderr.write("Usage: pdf_to_pptx.py <input_pdf> <output_pptx>\n")
-        return 1
+def add_slide(prs, image) -> None:
+    # 첫 페이지 크기로 슬라이드 크기 결정
+    if len(prs.slides) == 0:
+        prs.slide_width = Emu(px_to_emu(image.width, DPI))
+        prs.slide_height = Emu(px_to_emu(image.height, DPI))
+
+    slide = prs.slides.add_slide(prs.slide_layouts[6])  # 빈 레이아웃
+    image_stream = io.BytesIO()
+    image.save(image_stream, format="PNG")
+    image_stream.seek(0)
+    slide.shapes.add_picture(
+        image_stream,
+        0,
+        0,
+        width=prs.slide_width,
+        height=prs.slide_height,
+    )
+
 
-    input_pdf, output_pptx = sys.argv[1:3]
+def main() -> int:
+    parser = argparse.ArgumentParser(description="PDF to PPTX")
+    parser.add_argument("input_pdf")
+    parser.add_argument("output_pptx")
+    add_deadline_argument(parser)
+    args = parser.parse_args()
 
-    dpi = 200
+    deadline = Deadline(args.deadline)
+    prs = Presentation()
+    pages_done = 0
 
     try:
-        images = convert_from_path(input_pdf, dpi=dpi, fmt="png")
+        pages_total = pdfinfo_from_path(args.input_pdf)["Pages"]
+        for first_page in range(1, pages_total + 1, PAGES_PER_RENDER):
+            if pages_done > 0 and deadline.reached():
+                break
+            last_page = min(first_page + PAGES_PER_RENDER - 1, pages_total)
+            images = convert_from_path(
+                args.input_pdf, dpi=DPI, fmt="png", first_page=first_page, last_page=last_page
+            )
+            for image in images:
+                add_slide(prs, image)
+            pages_done = last_page
     except Exception as exc:  # pylint: disable=broad-except
         sys.stderr.write(f"PDF 페이지를 이미지로 변환하는 중 오류가 발생했습니다: {exc}\n")
         return 3
 
-    if not images:
-        prs = Presentation()
-        prs.save(output_pptx)
-        return 0
-
-    prs = Presentation()
-
-    first_image = images[0]
-    prs.slide_width = Emu(px_to_emu(first_image.width, dpi))
-    prs.slide_height = Emu(px_to_emu(first_image.height, dpi))
-
-    blank_layout = prs.slide_layouts[6]
-
-    for image in images:
-        slide = prs.slides.add_slide(blank_layout)
-        image_stream = io.BytesIO()
-        image.save(image_stream, format="PNG")
-        image_stream.seek(0)
-        slide.shapes.add_picture(
-            image_stream,
-            0,
-            0,
-            width=prs.slide_width,
-            height=prs.slide_height,
-        )
-
     try:
-        prs.save(output_pptx)
+        prs.save(args.output_pptx)
     except Exception as exc:  # pylint: disable=broad-except
         sys.stderr.write(f"PPTX 저장에 실패했습니다: {exc}\n")
         return 4
 
+    write_summary(page_summary(pages_done, pages_total))
     return 0
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    with profile_from_env():
+        sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Process-tree helpers shared by the converter scripts.
+
+Helpers such as soffice fork their own children (soffice.bin, oosplash).
+``subprocess.run(..., timeout=...)`` only kills the direct child, so the
+helpers survive. ``run_in_group`` keeps the command in the caller's process
+group -- the group the Node supervisor owns and SIGKILLs on timeout, task
+reaping and after the script exits -- and kills the command's process tree
+on timeout and on SIGTERM from the Node supervisor.
+"""
+
+import os
+import signal
+import subprocess
+
+KILL_GRACE_SECONDS = 5
+
+_active_pids = set()
+
+
+def _children_by_parent():
+    """Map ppid -> [pid] from /proc (empty on platforms without /proc)."""
+    children = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return children
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue  # 읽는 사이 종료된 프로세스
+        # comm 필드에 공백/괄호가 들어갈 수 있으므로 마지막 ')' 이후를 파싱
+        fields = stat[stat.rfind(')') + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+
+def process_tree(pid):
+    """Return ``pid`` followed by all of its live descendants."""
+    children = _children_by_parent()
+    tree = [pid]
+    for current in tree:
+        tree.extend(children.get(current, ()))
+    return tree
+
+
+def kill_tree(pid, sig=signal.SIGKILL):
+    """Send ``sig`` to ``pid`` and its descendants; ignore processes that are gone."""
+    for target in process_tree(pid):
+        try:
+            os.kill(target, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def _terminate_children(signum, _frame):
+    # Node 감독자가 보낸 SIGTERM: 하위 프로세스 트리를 먼저 정리한 후 종료
+    for pid in list(_active_pids):
+        kill_tree(pid, signal.SIGKILL)
+    raise SystemExit(128 + signum)
+
+
+def install_termination_handler():
+    """Forward SIGTERM to every process tree started by ``run_in_group``."""
+    signal.signal(signal.SIGTERM, _terminate_children)
+
+
+def run_in_group(cmd, timeout):
+    """
+    Run ``cmd`` inside the supervised process group and return a CompletedProcess.
+
+    On timeout the command's process tree receives SIGTERM, then SIGKILL
+    after a short grace period, and ``subprocess.TimeoutExpired`` is raised.
+    Helpers that outlive a normal exit stay in this script's group and are
+    removed by the Node supervisor when the script exits.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    _active_pids.add(proc.pid)
+
+    try:
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_tree(proc.pid, signal.SIGTERM)
+            try:
+                proc.communicate(timeout=KILL_GRACE_SECONDS)
+            except subprocess.TimeoutExpired:
+                pass
+            if proc.poll() is None:
+                kill_tree(proc.pid, signal.SIGKILL)
+            proc.communicate()
+            raise
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+    finally:
+        _active_pids.discard(proc.pid)
@@ -0,0 +1,84 @@
+"""
+Low-overhead sampling profiler for the converter scripts.
+
+Enabled only when the Node side sets ``CONVERTER_PROFILE_OUTPUT`` for a
+profiled job. A daemon thread samples the main thread's stack via
+``sys._current_frames()`` and aggregates identical stacks, so the cost is a
+dictionary update per sample. On exit the result is written in the folded
+stack format (``frame;frame;frame count``) that flamegraph.pl and speedscope
+read directly.
+
+Usage:
+    with profile_from_env():
+        sys.exit(main())
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+DEFAULT_INTERVAL_MS = 10
+
+
+class StackSampler:
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._target = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)  # pylint: disable=protected-access
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_folded(self, output_path):
+        with open(output_path, "w", encoding="utf-8") as handle:
+            for stack, count in self.stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def profile_from_env():
+    """Profile the enclosed block if CONVERTER_PROFILE_OUTPUT is set."""
+    output_path = os.environ.get("CONVERTER_PROFILE_OUTPUT")
+    if not output_path:
+        yield
+        return
+
+    interval_ms = float(os.environ.get("CONVERTER_PROFILE_INTERVAL_MS", DEFAULT_INTERVAL_MS))
+    sampler = StackSampler(interval_ms / 1000.0)
+    started = time.monotonic()
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        try:
+            sampler.write_folded(output_path)
+            sys.stderr.write(
+                f"profile: {sampler.samples} samples in {time.monotonic() - started:.2f}s -> {output_path}\n"
+            )
+        except OSError as exc:
+            # 프로파일 저장 실패가 변환 결과에 영향을 주면 안 됨
+            sys.stderr.write(f"profile 저장 실패: {exc}\n")
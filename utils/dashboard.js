@@ -2,48 +2,35 @@ const db = require('../config/db');
 
 /**
  * 전체 변환 통계 조회
+ * files_rollup_daily/hourly 집계 테이블에서 한 번의 쿼리로 조회
+ * (지난 7일/30일은 시간 단위 버킷 기준)
  */
 const getConversionStats = () => {
   try {
-    // 총 변환 횟수
-    const totalConversions = db.prepare(
-      `SELECT COUNT(*) as count FROM files WHERE file_type='converted' AND status='active'`
-    ).get();
-
-    // 오늘 변환 횟수
-    const todayConversions = db.prepare(
-      `SELECT COUNT(*) as count FROM files
-       WHERE file_type='converted' AND status='active'
-       AND DATE(created_at) = DATE('now')`
-    ).get();
-
-    // 어제 변환 횟수
-    const yesterdayConversions = db.prepare(
-      `SELECT COUNT(*) as count FROM files
-       WHERE file_type='converted' AND status='active'
-       AND DATE(created_at) = DATE('now', '-1 day')`
-    ).get();
-
-    // 지난 7일 변환 횟수
-    const last7Days = db.prepare(
-      `SELECT COUNT(*) as count FROM files
-       WHERE file_type='converted' AND status='active'
-       AND created_at >= datetime('now', '-7 days')`
-    ).get();
-
-    // 지난 30일 변환 횟수
-    const last30Days = db.prepare(
-      `SELECT COUNT(*) as count FROM files
-       WHERE file_type='converted' AND status='active'
-       AND created_at >= datetime('now', '-30 days')`
+    const stats = db.prepare(
+      `SELECT
+        (SELECT SUM(count) FROM files_rollup_daily
+         WHERE file_type='converted' AND status='active') as total,
+        (SELECT SUM(count) FROM files_rollup_daily
+         WHERE file_type='converted' AND status='active'
+         AND bucket = DATE('now')) as today,
+        (SELECT SUM(count) FROM files_rollup_daily
+         WHERE file_type='converted' AND status='active'
+         AND bucket = DATE('now', '-1 day')) as yesterday,
+        (SELECT SUM(count) FROM files_rollup_hourly
+         WHERE file_type='converted' AND status='active'
+         AND bucket >= STRFTIME('%Y-%m-%d %H:00:00', 'now', '-7 days')) as last7Days,
+        (SELECT SUM(count) FROM files_rollup_hourly
+         WHERE file_type='converted' AND status='active'
+         AND bucket >= STRFTIME('%Y-%m-%d %H:00:00', 'now', '-30 days')) as last30Days`
     ).get();
 
     return {
-      total: totalConversions.count || 0,
-      today: todayConversions.count || 0,
-      yesterday: yesterdayConversions.count || 0,
-      last7Days: last7Days.count || 0,
-      last30Days: last30Days.count || 0
+      total: stats.total || 0,
+      today: stats.today || 0,
+      yesterday: stats.yesterday || 0,
+      last7Days: stats.last7Days || 0,
+      last30Days: stats.last30Days || 0
     };
   } catch (error) {
     console.error('❌ Error getting conversion stats:', error.message);
@@ -59,32 +46,16 @@ const getConversionStats = () => {
 
 /**
  * 포맷별 변환 통계
+ * 형식 라벨은 트리거에서 r2_path 확장자로 계산 (config/db.js FORMAT_LABEL_SQL)
  */
 const getFormatStats = () => {
   try {
     const stats = db.prepare(
-      `SELECT
-        CASE
-          WHEN r2_path LIKE '%.docx' THEN 'Word (.docx)'
-          WHEN r2_path LIKE '%.xlsx' THEN 'Excel (.xlsx)'
-          WHEN r2_path LIKE '%.pptx' THEN 'PowerPoint (.pptx)'
-          WHEN r2_path LIKE '%.zip' THEN 'Image (.zip)'
-          WHEN r2_path LIKE '%.pdf' THEN 'PDF'
-          WHEN r2_path LIKE '%.mp3' THEN 'MP3'
-          WHEN r2_path LIKE '%.wav' THEN 'WAV'
-          WHEN r2_path LIKE '%.ogg' THEN 'OGG'
-          WHEN r2_path LIKE '%.m4a' THEN 'M4A'
-          WHEN r2_path LIKE '%.aac' THEN 'AAC'
-          WHEN r2_path LIKE '%.mp4' THEN 'MP4'
-          WHEN r2_path LIKE '%.mov' THEN 'MOV'
-          WHEN r2_path LIKE '%.webm' THEN 'WebM'
-          WHEN r2_path LIKE '%.mkv' THEN 'MKV'
-          ELSE 'Other'
-        END as format,
-        COUNT(*) as count
-       FROM files
+      `SELECT format, SUM(count) as count
+       FROM files_rollup_daily
        WHERE file_type='converted' AND status='active'
        GROUP BY format
+       HAVING count > 0
        ORDER BY count DESC`
     ).all();
 
@@ -102,11 +73,11 @@ const getHourlyStats = () => {
   try {
     const stats = db.prepare(
       `SELECT
-        STRFTIME('%H', created_at) as hour,
-        COUNT(*) as count
-       FROM files
+        SUBSTR(bucket, 12, 2) as hour,
+        SUM(count) as count
+       FROM files_rollup_hourly
        WHERE file_type='converted' AND status='active'
-       AND created_at >= datetime('now', '-24 hours')
+       AND bucket > STRFTIME('%Y-%m-%d %H:00:00', 'now', '-24 hours')
        GROUP BY hour
        ORDER BY hour ASC`
     ).all();
@@ -145,7 +116,7 @@ const getFilesList = (page = 1, limit = 20) => {
        LIMIT ? OFFSET ?`
     ).all(limit, offset);
 
-    const total = db.prepare('SELECT COUNT(*) as count FROM files').get();
+    const total = db.prepare('SELECT SUM(count) as count FROM files_rollup_daily').get();
 
     const filesWithInfo = files.map(file => {
       // 확장자 추출
@@ -233,31 +204,34 @@ const getFileById = (fileId) => {
  */
 const getSystemStatus = () => {
   try {
-    // DB 상태
+    // DB 상태 (상태별 파일 수를 집계 테이블에서 한 번에 조회)
+    const statusCounts = db.prepare(
+      `SELECT
+        SUM(count) as fileCount,
+        SUM(CASE WHEN status='active' THEN count ELSE 0 END) as activeFiles,
+        SUM(CASE WHEN status='deleted' THEN count ELSE 0 END) as deletedFiles,
+        SUM(CASE WHEN status='failed' THEN count ELSE 0 END) as failedFiles
+       FROM files_rollup_daily`
+    ).get();
+
     const dbStatus = {
       connected: true,
-      fileCount: db.prepare('SELECT COUNT(*) as count FROM files').get().count || 0,
-      activeFiles: db.prepare(
-        `SELECT COUNT(*) as count FROM files WHERE status='active'`
-      ).get().count || 0,
-      deletedFiles: db.prepare(
-        `SELECT COUNT(*) as count FROM files WHERE status='deleted'`
-      ).get().count || 0,
-      failedFiles: db.prepare(
-        `SELECT COUNT(*) as count FROM files WHERE status='failed'`
-      ).get().count || 0
+      fileCount: statusCounts.fileCount || 0,
+      activeFiles: statusCounts.activeFiles || 0,
+      deletedFiles: statusCounts.deletedFiles || 0,
+      failedFiles: statusCounts.failedFiles || 0
     };
 
-    // 저장소 상태 (DB 파일 크기로 추정)
+    // 저장소 상태 (DB 파일 + WAL 크기로 추정)
+    // 경로는 실제로 연 DB 기준 (config/db.js의 DB_PATH, 메모리 DB면 0)
     const fs = require('fs');
-    const path = require('path');
-    const dbPath = path.resolve(__dirname, '../db/database.db');
     let dbSize = 0;
-    try {
-      const stats = fs.statSync(dbPath);
-      dbSize = stats.size;
-    } catch (e) {
-      // DB 파일 없음
+    for (const file of [db.name, `${db.name}-wal`]) {
+      try {
+        dbSize += fs.statSync(file).size;
+      } catch (e) {
+        // DB 파일 없음 (메모리 DB 또는 체크포인트 후 WAL 없음)
+      }
     }
 
     return {
@@ -302,7 +276,7 @@ const getDeletedFiles = (page = 1, limit = 20) => {
     ).all(limit, offset);
 
     const total = db.prepare(
-      'SELECT COUNT(*) as count FROM files WHERE status=\'deleted\''
+      'SELECT SUM(count) as count FROM files_rollup_daily WHERE status=\'deleted\''
     ).get();
 
     const filesWithInfo = files.map(file => ({
@@ -334,6 +308,129 @@ const getDeletedFiles = (page = 1, limit = 20) => {
   }
 };
 
+/**
+ * 형식별 변환 지연 시간 백분위 (p50/p95/p99)
+ * 윈도 함수로 형식별 순위를 매겨 nearest-rank 방식으로 계산
+ * @param {number} windowMinutes - 조회 구간 (분)
+ * @param {string|null} format - 특정 형식만 조회 (null이면 전체)
+ */
+const getLatencyStats = (windowMinutes = 60 * 24, format = null) => {
+  try {
+    const since = `-${windowMinutes} minutes`;
+
+    const percentiles = db.prepare(
+      `WITH ranked AS (
+        SELECT
+          format,
+          total_ms,
+          queue_wait_ms,
+          run_ms,
+          ROW_NUMBER() OVER (PARTITION BY format ORDER BY total_ms) AS rn,
+          COUNT(*) OVER (PARTITION BY format) AS cnt
+        FROM conversion_metrics
+        WHERE outcome = 'success'
+        AND created_at >= datetime('now', ?)
+        AND (? IS NULL OR format = ?)
+      )
+      SELECT
+        format,
+        MAX(cnt) as count,
+        MIN(CASE WHEN rn >= 0.50 * cnt THEN total_ms END) as p50,
+        MIN(CASE WHEN rn >= 0.95 * cnt THEN total_ms END) as p95,
+        MIN(CASE WHEN rn >= 0.99 * cnt THEN total_ms END) as p99,
+        MAX(total_ms) as max,
+        ROUND(AVG(queue_wait_ms)) as avgQueueWaitMs,
+        ROUND(AVG(run_ms)) as avgRunMs
+      FROM ranked
+      GROUP BY format
+      ORDER BY count DESC`
+    ).all(since, format, format);
+
+    const outcomes = db.prepare(
+      `SELECT
+        format,
+        COUNT(*) as total,
+        SUM(CASE WHEN outcome = 'success' THEN 1 ELSE 0 END) as succeeded,
+        SUM(CASE WHEN outcome = 'failed' THEN 1 ELSE 0 END) as failed,
+        SUM(CASE WHEN outcome = 'timeout' THEN 1 ELSE 0 END) as timedOut,
+        SUM(CASE WHEN outcome = 'aborted' THEN 1 ELSE 0 END) as aborted,
+        ROUND(AVG(input_bytes)) as avgInputBytes,
+        ROUND(AVG(output_bytes)) as avgOutputBytes,
+        MAX(peak_rss_bytes) as maxPeakRssBytes
+       FROM conversion_metrics
+       WHERE created_at >= datetime('now', ?)
+       AND (? IS NULL OR format = ?)
+       GROUP BY format`
+    ).all(since, format, format);
+
+    const latencyByFormat = new Map(percentiles.map(row => [row.format, row]));
+
+    return outcomes
+      .map(row => {
+        const latency = latencyByFormat.get(row.format);
+        return {
+          format: row.format,
+          total: row.total,
+          succeeded: row.succeeded,
+          failed: row.failed,
+          timedOut: row.timedOut,
+          aborted: row.aborted,
+          latencyMs: latency ? {
+            p50: latency.p50,
+            p95: latency.p95,
+            p99: latency.p99,
+            max: latency.max
+          } : null,
+          avgQueueWaitMs: latency ? latency.avgQueueWaitMs : null,
+          avgRunMs: latency ? latency.avgRunMs : null,
+          avgInputBytes: row.avgInputBytes,
+          avgOutputBytes: row.avgOutputBytes,
+          maxPeakRssBytes: row.maxPeakRssBytes
+        };
+      })
+      .sort((a, b) => b.total - a.total);
+  } catch (error) {
+    console.error('❌ Error getting latency stats:', error.message);
+    return [];
+  }
+};
+
+/**
+ * 시간 구간별 형식별 처리량
+ * @param {number} windowMinutes - 조회 구간 (분)
+ * @param {number} bucketMinutes - 집계 단위 (분)
+ * @param {string|null} format - 특정 형식만 조회 (null이면 전체)
+ */
+const getThroughputStats = (windowMinutes = 60 * 24, bucketMinutes = 60, format = null) => {
+  try {
+    const bucketSeconds = bucketMinutes * 60;
+
+    const rows = db.prepare(
+      `SELECT
+        DATETIME((CAST(STRFTIME('%s', created_at) AS INTEGER) / ?) * ?, 'unixepoch') as bucket,
+        format,
+        COUNT(*) as count,
+        SUM(CASE WHEN outcome = 'success' THEN 1 ELSE 0 END) as succeeded,
+        SUM(CASE WHEN outcome != 'success' THEN 1 ELSE 0 END) as failed,
+        COALESCE(SUM(input_bytes), 0) as inputBytes,
+        COALESCE(SUM(output_bytes), 0) as outputBytes
+       FROM conversion_metrics
+       WHERE created_at >= datetime('now', ?)
+       AND (? IS NULL OR format = ?)
+       GROUP BY bucket, format
+       ORDER BY bucket ASC, count DESC`
+    ).all(bucketSeconds, bucketSeconds, `-${windowMinutes} minutes`, format, format);
+
+    return rows.map(row => ({
+      ...row,
+      perMinute: Number((row.count / bucketMinutes).toFixed(2))
+    }));
+  } catch (error) {
+    console.error('❌ Error getting throughput stats:', error.message);
+    return [];
+  }
+};
+
 module.exports = {
   getConversionStats,
   getFormatStats,
@@ -341,5 +438,7 @@ module.exports = {
   getFilesList,
   getFileById,
   getSystemStatus,
-  getDeletedFiles
+  getDeletedFiles,
+  getLatencyStats,
+  getThroughputStats
 };
@@ -4,10 +4,88 @@
  * ================================
  * better-sqlite3의 transaction 메서드를 사용한 안전한 데이터 처리
  * 성공하면 자동 커밋, 실패하면 자동 롤백
+ * - prepared statement는 DB 인스턴스별로 한 번만 생성해 재사용 (호출마다 SQL 파싱 없음)
+ * - 변환 경로의 INSERT/UPDATE는 FileWriteBatcher로 모아 틱당 트랜잭션 1회로 기록
  */
 
 const { withTime } = require('./logger');
 
+// files 테이블 쿼리 (statement() 로 DB별 1회 prepare)
+const SQL = {
+  insertFile: `
+    INSERT INTO files (file_id, r2_path, file_type, expires_at, status)
+    VALUES (?, ?, ?, ?, ?)
+  `,
+  updateStatus: `
+    UPDATE files
+    SET status = ?
+    WHERE file_id = ?
+  `,
+  updateStatusDeleted: `
+    UPDATE files
+    SET status = ?, deleted_at = ?
+    WHERE file_id = ?
+  `,
+  selectFile: `
+    SELECT * FROM files
+    WHERE file_id = ?
+  `,
+  selectExpired: `
+    SELECT * FROM files
+    WHERE status = 'active' AND expires_at <= datetime('now')
+  `,
+  // idx_files_active_expires_covering (부분 + 커버링 인덱스)만으로 처리됨
+  selectExpiredKeys: `
+    SELECT file_id, r2_path FROM files
+    WHERE status = 'active' AND expires_at <= datetime('now')
+    ORDER BY expires_at
+    LIMIT ?
+  `,
+  markDeleted: `
+    UPDATE files
+    SET status = 'deleted', deleted_at = CURRENT_TIMESTAMP
+    WHERE status = 'active' AND file_id IN (SELECT value FROM json_each(?))
+  `,
+  markFailed: `
+    UPDATE files
+    SET status = 'failed'
+    WHERE status = 'active' AND file_id IN (SELECT value FROM json_each(?))
+  `
+};
+
+// DB 인스턴스 → (SQL → prepared statement)
+const statementCache = new WeakMap();
+
+/**
+ * 캐시된 prepared statement 반환 (DB 인스턴스별로 SQL당 처음 사용할 때 1회 prepare)
+ * 다른 테이블 모듈(jobQueue 등)도 같은 캐시를 사용
+ * @param {Database} db - better-sqlite3 Database instance
+ * @param {string} sql - SQL 문
+ * @returns {Statement}
+ */
+const cachedStatement = (db, sql) => {
+  let statements = statementCache.get(db);
+  if (!statements) {
+    statements = new Map();
+    statementCache.set(db, statements);
+  }
+
+  let stmt = statements.get(sql);
+  if (!stmt) {
+    stmt = db.prepare(sql);
+    statements.set(sql, stmt);
+  }
+  return stmt;
+};
+
+/**
+ * files 테이블 쿼리의 캐시된 prepared statement
+ * @param {Database} db - better-sqlite3 Database instance
+ * @param {string} name - SQL 키
+ * @returns {Statement}
+ */
+const statement = (db, name) => cachedStatement(db, SQL[name]);
+
 /**
  * 트랜잭션 내에서 파일 메타데이터 삽입
  * @param {Database} db - better-sqlite3 Database instance
@@ -17,13 +95,8 @@ const { withTime } = require('./logger');
 const insertFileMetadata = (db, fileData) => {
   const { fileId, r2Path, fileType, expiresAt, status = 'active' } = fileData;
 
-  const stmt = db.prepare(`
-    INSERT INTO files (file_id, r2_path, file_type, expires_at, status)
-    VALUES (?, ?, ?, ?, ?)
-  `);
-
   try {
-    const result = stmt.run(fileId, r2Path, fileType, expiresAt, status);
+    const result = statement(db, 'insertFile').run(fileId, r2Path, fileType, expiresAt, status);
     return {
       success: true,
       fileId: fileId,
@@ -44,24 +117,9 @@ const insertFileMetadata = (db, fileData) => {
  * @returns {Object} 업데이트 결과
  */
 const updateFileStatus = (db, fileId, status, deletedAt = null) => {
-  let stmt;
-  let result;
-
-  if (deletedAt) {
-    stmt = db.prepare(`
-      UPDATE files
-      SET status = ?, deleted_at = ?
-      WHERE file_id = ?
-    `);
-    result = stmt.run(status, deletedAt, fileId);
-  } else {
-    stmt = db.prepare(`
-      UPDATE files
-      SET status = ?
-      WHERE file_id = ?
-    `);
-    result = stmt.run(status, fileId);
-  }
+  const result = deletedAt
+    ? statement(db, 'updateStatusDeleted').run(status, deletedAt, fileId)
+    : statement(db, 'updateStatus').run(status, fileId);
 
   return {
     success: true,
@@ -78,11 +136,7 @@ const updateFileStatus = (db, fileId, status, deletedAt = null) => {
  * @returns {Object|null} 파일 정보 또는 null
  */
 const getFileMetadata = (db, fileId) => {
-  const stmt = db.prepare(`
-    SELECT * FROM files
-    WHERE file_id = ?
-  `);
-  return stmt.get(fileId);
+  return statement(db, 'selectFile').get(fileId);
 };
 
 /**
@@ -91,16 +145,135 @@ const getFileMetadata = (db, fileId) => {
  * @returns {Array} 만료된 파일 목록
  */
 const getExpiredFiles = (db) => {
-  const stmt = db.prepare(`
-    SELECT * FROM files
-    WHERE status = 'active' AND expires_at <= datetime('now')
-  `);
-  return stmt.all();
+  return statement(db, 'selectExpired').all();
+};
+
+/**
+ * 정리 대상 만료 파일 조회 (스케줄러용, 필요한 컬럼만 / 만료 순)
+ * @param {Database} db - better-sqlite3 Database instance
+ * @param {number} limit - 최대 건수
+ * @returns {Array<{file_id: string, r2_path: string}>}
+ */
+const getExpiredFileKeys = (db, limit) => {
+  return statement(db, 'selectExpiredKeys').all(limit);
+};
+
+/**
+ * ================================
+ * 📦 파일 메타데이터 쓰기 배처
+ * ================================
+ * 동시에 끝난 변환들의 INSERT/UPDATE를 큐에 모았다가 다음 틱에 트랜잭션 1회로 기록
+ * - 작업마다 SAVEPOINT(중첩 트랜잭션)로 실행 → 한 작업 실패(UNIQUE 위반 등)가 다른 작업을 롤백하지 않음
+ * - 각 호출은 자기 작업의 결과/에러로 resolve/reject (커밋 이후)
+ * - 큐 순서대로 실행되므로 같은 파일의 INSERT → UPDATE 순서가 보장됨
+ */
+class FileWriteBatcher {
+  /**
+   * @param {Database} db - better-sqlite3 Database instance
+   * @param {Object} [options]
+   * @param {number} [options.maxBatch=500] - 트랜잭션 1회당 최대 작업 수 (넘으면 즉시 기록)
+   */
+  constructor(db, { maxBatch = 500 } = {}) {
+    this.db = db;
+    this.maxBatch = maxBatch;
+    this.pending = [];
+    this.scheduled = null;
+    this.stats = { batches: 0, writes: 0 };
+
+    this.runOne = db.transaction((op) => op.run());
+    this.runBatch = db.transaction((ops) => {
+      for (const op of ops) {
+        try {
+          op.result = this.runOne(op);
+        } catch (error) {
+          op.error = error;
+        }
+      }
+    });
+  }
+
+  /**
+   * 파일 메타데이터 삽입 예약
+   * @param {Object} fileData - insertFileMetadata와 같은 형식
+   * @returns {Promise<Object>} 삽입 결과
+   */
+  insert(fileData) {
+    return this.enqueue(() => insertFileMetadata(this.db, fileData));
+  }
+
+  /**
+   * 파일 상태 변경 예약
+   * @returns {Promise<Object>} 업데이트 결과
+   */
+  updateStatus(fileId, status, deletedAt = null) {
+    return this.enqueue(() => updateFileStatus(this.db, fileId, status, deletedAt));
+  }
+
+  enqueue(run) {
+    return new Promise((resolve, reject) => {
+      this.pending.push({ run, resolve, reject });
+
+      if (this.pending.length >= this.maxBatch) {
+        this.flush();
+      } else if (!this.scheduled) {
+        this.scheduled = setImmediate(() => this.flush());
+      }
+    });
+  }
+
+  /**
+   * 대기 중인 작업을 트랜잭션 1회로 기록
+   * @returns {number} 처리한 작업 수
+   */
+  flush() {
+    if (this.scheduled) {
+      clearImmediate(this.scheduled);
+      this.scheduled = null;
+    }
+    if (this.pending.length === 0) return 0;
+
+    const ops = this.pending;
+    this.pending = [];
+
+    try {
+      this.runBatch(ops);
+    } catch (error) {
+      // 커밋 자체가 실패하면 전체 롤백 → 모든 작업 실패
+      console.error(withTime(`❌ DB 배치 기록 실패 (${ops.length}건): ${error.message}`));
+      for (const op of ops) op.reject(error);
+      return 0;
+    }
+
+    this.stats.batches += 1;
+    this.stats.writes += ops.length;
+    for (const op of ops) {
+      if (op.error) op.reject(op.error);
+      else op.resolve(op.result);
+    }
+    return ops.length;
+  }
+}
+
+// DB 인스턴스 → 공유 배처
+const batcherCache = new WeakMap();
+
+/**
+ * DB 인스턴스별 공유 쓰기 배처
+ * @param {Database} db - better-sqlite3 Database instance
+ * @returns {FileWriteBatcher}
+ */
+const getFileWriteBatcher = (db) => {
+  let batcher = batcherCache.get(db);
+  if (!batcher) {
+    batcher = new FileWriteBatcher(db);
+    batcherCache.set(db, batcher);
+  }
+  return batcher;
 };
 
 /**
  * 안전한 파일 메타데이터 삽입 (트랜잭션)
- * 실패 시 자동 롤백
+ * 실패 시 자동 롤백 (같은 틱의 다른 쓰기와 한 트랜잭션으로 묶임)
  * @param {Database} db - better-sqlite3 Database instance
  * @param {Object} fileData - 파일 데이터
  * @returns {Promise<Object>} 삽입 결과
@@ -109,13 +282,7 @@ const safeInsertFileMetadata = async (db, fileData) => {
   const { fileId } = fileData;
 
   try {
-    // 트랜잭션 함수 생성
-    const insertTransaction = db.transaction(() => {
-      return insertFileMetadata(db, fileData);
-    });
-
-    // 트랜잭션 실행 (성공 시 자동 커밋, 실패 시 자동 롤백)
-    const result = insertTransaction();
+    const result = await getFileWriteBatcher(db).insert(fileData);
     console.log(withTime(`✅ DB 트랜잭션 완료 (삽입): ${fileId}`));
     return result;
   } catch (error) {
@@ -135,13 +302,7 @@ const safeInsertFileMetadata = async (db, fileData) => {
  */
 const safeUpdateFileStatus = async (db, fileId, status, deletedAt = null) => {
   try {
-    // 트랜잭션 함수 생성
-    const updateTransaction = db.transaction(() => {
-      return updateFileStatus(db, fileId, status, deletedAt);
-    });
-
-    // 트랜잭션 실행
-    const result = updateTransaction();
+    const result = await getFileWriteBatcher(db).updateStatus(fileId, status, deletedAt);
     console.log(withTime(`✅ DB 트랜잭션 완료 (업데이트): ${fileId} → ${status}`));
     return result;
   } catch (error) {
@@ -167,12 +328,8 @@ const safeConversionWithTransaction = async (db, r2Operation, fileData) => {
     const r2Result = await r2Operation();
     console.log(withTime(`✅ R2 작업 완료: ${fileId}`));
 
-    // 2️⃣ R2 성공 후 DB 트랜잭션 처리 (동기 - 원자성 보장)
-    const dbTransaction = db.transaction(() => {
-      return insertFileMetadata(db, fileData);
-    });
-
-    const dbResult = dbTransaction();
+    // 2️⃣ R2 성공 후 DB 기록 (동시에 끝난 변환과 한 트랜잭션으로 묶임, 작업별 SAVEPOINT로 원자성 보장)
+    const dbResult = await getFileWriteBatcher(db).insert(fileData);
     console.log(withTime(`✅ DB 트랜잭션 완료: ${fileId}`));
 
     return {
@@ -204,12 +361,8 @@ const safeCleanupWithTransaction = async (db, r2DeleteOperation, fileId) => {
     console.log(withTime(`✅ R2 삭제 완료: ${fileId}`));
 
     // 2️⃣ R2 삭제 성공 후 DB 상태 업데이트
-    const cleanupTransaction = db.transaction(() => {
-      const now = new Date().toISOString().replace('T', ' ').substring(0, 19);
-      return updateFileStatus(db, fileId, 'deleted', now);
-    });
-
-    const dbResult = cleanupTransaction();
+    const now = new Date().toISOString().replace('T', ' ').substring(0, 19);
+    const dbResult = await getFileWriteBatcher(db).updateStatus(fileId, 'deleted', now);
     console.log(withTime(`✅ DB 트랜잭션 완료: ${fileId}`));
 
     return {
@@ -223,16 +376,51 @@ const safeCleanupWithTransaction = async (db, r2DeleteOperation, fileId) => {
   }
 };
 
+/**
+ * 일괄 정리 결과 반영 (트랜잭션 1회, 집합 단위 UPDATE)
+ * - 삭제 성공: status='deleted', deleted_at 기록
+ * - 삭제 실패: status='failed'
+ * ID 목록은 json_each로 전달하여 SQLite 바인딩 변수 개수 제한을 피함
+ * @param {Database} db - better-sqlite3 Database instance
+ * @param {Array<string>} deletedFileIds - R2 삭제에 성공한 파일 ID
+ * @param {Array<string>} failedFileIds - R2 삭제에 실패한 파일 ID
+ * @returns {{deleted: number, failed: number}} 변경된 행 수
+ */
+const markCleanupResults = (db, deletedFileIds, failedFileIds) => {
+  const markTransaction = db.transaction(() => {
+    const deleted = deletedFileIds.length === 0
+      ? 0
+      : statement(db, 'markDeleted').run(JSON.stringify(deletedFileIds)).changes;
+
+    const failed = failedFileIds.length === 0
+      ? 0
+      : statement(db, 'markFailed').run(JSON.stringify(failedFileIds)).changes;
+
+    return { deleted, failed };
+  });
+
+  return markTransaction();
+};
+
 module.exports = {
+  // prepared statement 캐시
+  cachedStatement,
+
   // 기본 함수
   insertFileMetadata,
   updateFileStatus,
   getFileMetadata,
   getExpiredFiles,
+  getExpiredFileKeys,
+
+  // 쓰기 배처
+  FileWriteBatcher,
+  getFileWriteBatcher,
 
   // 안전한 함수 (트랜잭션)
   safeInsertFileMetadata,
   safeUpdateFileStatus,
   safeConversionWithTransaction,
-  safeCleanupWithTransaction
+  safeCleanupWithTransaction,
+  markCleanupResults
 };
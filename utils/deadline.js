@@ -0,0 +1,110 @@
+/**
+ * ================================
+ * ⏳ 변환 마감 시간 (부분 결과)
+ * ================================
+ * 타임아웃이 발생하면 그때까지의 작업이 모두 버려지므로, 페이지 단위 변환기
+ * (PDF → Word/PowerPoint/Excel/이미지)는 마감 시간 전에 새 페이지 처리를 멈추고
+ * 완료한 페이지만으로 유효한 결과를 만들어 반환
+ * - 마감 = min(작업 마감, 외부 프로세스 타임아웃) - 마무리 여유(DEADLINE_MARGIN_MS)
+ * - 부분 결과 여부는 워커 스레드 로컬 상태로 보고 → converter.task.js가 결과에 포함
+ * - 전체 페이지 수도 같은 방식으로 보고 → 프로파일 메타데이터에 사용 (PDF를 다시 읽지 않음)
+ *   (워커당 동시 작업 1개라 setCurrentTask와 같은 방식으로 안전)
+ */
+
+const { DEFAULT_TIMEOUT_MS } = require('./processSupervisor');
+
+// 마감 후 결과 파일 저장/압축에 남겨둘 시간
+const DEADLINE_MARGIN_MS = parseInt(process.env.CONVERTER_DEADLINE_MARGIN_MS) || 20000;
+
+let currentPartial = null;
+let currentPageCount = null;
+
+/**
+ * 새 페이지 처리를 멈출 시각 계산
+ * @param {number} [deadlineAt] - 작업 마감 시각 (epoch ms, 없으면 외부 프로세스 타임아웃만 적용)
+ * @param {number} [timeoutMs] - 지금 시작하는 외부 프로세스의 타임아웃
+ * @returns {number} epoch ms
+ */
+function stopAt(deadlineAt, timeoutMs = DEFAULT_TIMEOUT_MS) {
+  const limit = Math.min(deadlineAt || Infinity, Date.now() + timeoutMs);
+  return limit - DEADLINE_MARGIN_MS;
+}
+
+/**
+ * 변환 스크립트 인자 (--deadline <epoch 초>)
+ * @param {number} [deadlineAt] - 작업 마감 시각 (epoch ms)
+ * @returns {Array<string>}
+ */
+function deadlineArgs(deadlineAt) {
+  return ['--deadline', (stopAt(deadlineAt) / 1000).toFixed(3)];
+}
+
+/**
+ * 변환 스크립트 stdout 마지막 줄의 JSON 요약 파싱 (없거나 깨졌으면 빈 객체)
+ * @param {string} stdout
+ * @returns {Object}
+ */
+function parseScriptSummary(stdout) {
+  try {
+    return JSON.parse(stdout.trim().split('\n').pop() || '{}');
+  } catch (error) {
+    return {};
+  }
+}
+
+/**
+ * 부분 결과 보고 (완료 페이지가 전체보다 적을 때만 기록)
+ * @param {number} pagesDone
+ * @param {number} pagesTotal
+ */
+function reportPartial(pagesDone, pagesTotal) {
+  currentPageCount = pagesTotal;
+  if (pagesDone < pagesTotal) {
+    currentPartial = { pagesDone, pagesTotal };
+    console.warn(`⏳ 마감 시간 도달: ${pagesTotal}페이지 중 ${pagesDone}페이지만 변환`);
+  }
+}
+
+/**
+ * 스크립트 요약({ partial, pages_done, pages_total })으로 부분 결과 보고
+ * @param {Object} summary
+ */
+function reportScriptSummary(summary) {
+  if (Number.isInteger(summary.pages_total)) {
+    currentPageCount = summary.pages_total;
+  }
+  if (summary.partial) {
+    reportPartial(summary.pages_done, summary.pages_total);
+  }
+}
+
+/**
+ * 현재 작업의 부분 결과 정보를 꺼내고 초기화
+ * @returns {{ pagesDone: number, pagesTotal: number }|null}
+ */
+function takePartial() {
+  const partial = currentPartial;
+  currentPartial = null;
+  return partial;
+}
+
+/**
+ * 현재 작업에서 변환기가 보고한 전체 페이지 수를 꺼내고 초기화
+ * @returns {number|null} 페이지 단위 변환기가 아니면 null
+ */
+function takePageCount() {
+  const pageCount = currentPageCount;
+  currentPageCount = null;
+  return pageCount;
+}
+
+module.exports = {
+  DEADLINE_MARGIN_MS,
+  stopAt,
+  deadlineArgs,
+  parseScriptSummary,
+  reportPartial,
+  reportScriptSummary,
+  takePartial,
+  takePageCount
+};
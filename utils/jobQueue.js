@@ -0,0 +1,245 @@
+/**
+ * ================================
+ * 📬 SQLite 기반 변환 작업 큐
+ * ================================
+ * jobs 테이블에 변환 작업을 저장하고 워커 프로세스(jobWorker.js, job_worker.py)가 점유해 실행
+ * - 점유: UPDATE ... WHERE id = (SELECT ...) RETURNING 단일 문장 → 여러 프로세스가 동시에 점유해도 중복 없음
+ * - lease: 점유한 워커가 heartbeat로 연장, 워커가 죽어 끊기면 recoverExpiredJobs가 다시 큐로 돌림
+ * - 재시도: 실패 시 max_attempts까지 지수 backoff (run_at 이후 재점유)
+ * - 우선순위: priority 큰 작업 먼저, 같으면 run_at 순
+ * - 재시작해도 큐/진행 중 작업이 DB에 남아 있음 (Piscina 메모리 큐와 달리 유실 없음)
+ *
+ * 시각은 모두 epoch ms (Python 워커도 같은 SQL 사용, scripts/job_worker.py)
+ */
+
+const crypto = require('crypto');
+const { cachedStatement } = require('./dbTransaction');
+
+const JOB_LEASE_MS = parseInt(process.env.JOB_LEASE_MS) || 60 * 1000;
+const JOB_MAX_ATTEMPTS = parseInt(process.env.JOB_MAX_ATTEMPTS) || 3;
+const JOB_RETRY_BASE_MS = parseInt(process.env.JOB_RETRY_BASE_MS) || 5 * 1000;
+const JOB_RETRY_MAX_MS = parseInt(process.env.JOB_RETRY_MAX_MS) || 5 * 60 * 1000;
+// 완료/실패 작업 보관 시간 (변환 파일 만료 10분보다 길게)
+const JOB_RETENTION_MS = parseInt(process.env.JOB_RETENTION_MS) || 60 * 60 * 1000;
+
+// n번째 시도 실패 후 대기 시간: base * 2^(n-1), 최대 max
+const BACKOFF_SQL = 'MIN(@retryBaseMs * (1 << MAX(attempts - 1, 0)), @retryMaxMs)';
+
+const SQL = {
+  insert: `
+    INSERT INTO jobs (id, format, payload, priority, max_attempts, run_at, created_at, updated_at)
+    VALUES (@id, @format, @payload, @priority, @maxAttempts, @now, @now, @now)
+  `,
+  // 점유 가능한 작업 중 우선순위가 가장 높은 1건 (formats: 처리 가능한 형식 JSON 배열, NULL이면 전체)
+  claim: `
+    UPDATE jobs
+    SET status = 'running',
+        attempts = attempts + 1,
+        lease_owner = @workerId,
+        lease_expires_at = @now + @leaseMs,
+        updated_at = @now
+    WHERE id = (
+      SELECT id FROM jobs
+      WHERE status = 'queued' AND run_at <= @now
+        AND (@formats IS NULL OR format IN (SELECT value FROM json_each(@formats)))
+      ORDER BY priority DESC, run_at
+      LIMIT 1
+    )
+    RETURNING *
+  `,
+  heartbeat: `
+    UPDATE jobs
+    SET lease_expires_at = @now + @leaseMs, updated_at = @now
+    WHERE id = @id AND status = 'running' AND lease_owner = @workerId
+  `,
+  complete: `
+    UPDATE jobs
+    SET status = 'succeeded', result = @result, error = NULL,
+        lease_owner = NULL, lease_expires_at = NULL, updated_at = @now
+    WHERE id = @id AND status = 'running' AND lease_owner = @workerId
+  `,
+  // retry=1이고 시도 횟수가 남았으면 backoff 후 재시도, 아니면 실패 확정
+  fail: `
+    UPDATE jobs
+    SET status = CASE WHEN @retry = 1 AND attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+        run_at = @now + ${BACKOFF_SQL},
+        error = @error,
+        lease_owner = NULL, lease_expires_at = NULL, updated_at = @now
+    WHERE id = @id AND status = 'running' AND lease_owner = @workerId
+    RETURNING status, attempts, run_at
+  `,
+  // 워커 종료 시 실행하지 못한 작업 반납 (시도 횟수 차감 없음)
+  release: `
+    UPDATE jobs
+    SET status = 'queued', attempts = MAX(attempts - 1, 0), run_at = @now,
+        lease_owner = NULL, lease_expires_at = NULL, updated_at = @now
+    WHERE id = @id AND status = 'running' AND lease_owner = @workerId
+  `,
+  // heartbeat가 끊긴 작업 회수 (워커 크래시/재시작)
+  recoverExpired: `
+    UPDATE jobs
+    SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+        run_at = @now + ${BACKOFF_SQL},
+        error = 'lease 만료 (워커 응답 없음)',
+        lease_owner = NULL, lease_expires_at = NULL, updated_at = @now
+    WHERE status = 'running' AND lease_expires_at <= @now
+    RETURNING id, status
+  `,
+  select: 'SELECT * FROM jobs WHERE id = ?',
+  countQueued: `SELECT COUNT(*) AS count FROM jobs WHERE status = 'queued'`,
+  pruneFinished: `
+    DELETE FROM jobs
+    WHERE status IN ('succeeded', 'failed') AND updated_at <= ?
+  `
+};
+
+// DB 인스턴스별 캐시된 prepared statement (dbTransaction과 같은 캐시)
+const statement = (db, name) => cachedStatement(db, SQL[name]);
+
+const backoffParams = () => ({ retryBaseMs: JOB_RETRY_BASE_MS, retryMaxMs: JOB_RETRY_MAX_MS });
+
+/**
+ * jobs 행 → 작업 객체 (JSON 컬럼 파싱)
+ * @param {Object} row
+ * @returns {Object|null}
+ */
+const parseJob = (row) => {
+  if (!row) return null;
+  return {
+    ...row,
+    payload: JSON.parse(row.payload),
+    result: row.result ? JSON.parse(row.result) : null
+  };
+};
+
+/**
+ * 작업 등록
+ * @param {Database} db - better-sqlite3 Database instance
+ * @param {Object} job
+ * @param {string} job.format - 변환 형식
+ * @param {Object} job.payload - 입력 (r2Path, originalName, quality 등)
+ * @param {number} [job.priority=0] - 클수록 먼저 처리
+ * @param {number} [job.maxAttempts] - 최대 시도 횟수 (기본 JOB_MAX_ATTEMPTS)
+ * @returns {Object} 등록된 작업
+ */
+const enqueueJob = (db, { format, payload, priority = 0, maxAttempts = JOB_MAX_ATTEMPTS }) => {
+  const id = crypto.randomUUID();
+  statement(db, 'insert').run({
+    id,
+    format,
+    payload: JSON.stringify(payload),
+    priority,
+    maxAttempts,
+    now: Date.now()
+  });
+  return getJob(db, id);
+};
+
+/**
+ * 작업 1건 점유 (없으면 null)
+ * @param {Database} db - better-sqlite3 Database instance
+ * @param {Object} options
+ * @param {string} options.workerId - 워커 ID (lease 소유자)
+ * @param {Array<string>} [options.formats] - 처리 가능한 형식 (생략 시 전체)
+ * @param {number} [options.leaseMs] - lease 길이 (기본 JOB_LEASE_MS)
+ * @returns {Object|null} 점유한 작업
+ */
+const claimJob = (db, { workerId, formats, leaseMs = JOB_LEASE_MS }) => {
+  const row = statement(db, 'claim').get({
+    workerId,
+    formats: formats ? JSON.stringify(formats) : null,
+    leaseMs,
+    now: Date.now()
+  });
+  return parseJob(row);
+};
+
+/**
+ * lease 연장
+ * @returns {boolean} false면 lease를 잃음 (만료 후 다른 워커가 재점유) → 결과를 기록하지 말 것
+ */
+const heartbeatJob = (db, id, workerId, leaseMs = JOB_LEASE_MS) => {
+  return statement(db, 'heartbeat').run({ id, workerId, leaseMs, now: Date.now() }).changes === 1;
+};
+
+/**
+ * 작업 성공 기록
+ * @param {Object} result - 폴링 응답에 포함할 결과 (fileId, r2Path, fileName 등)
+ * @returns {boolean} false면 lease를 잃어 기록하지 못함
+ */
+const completeJob = (db, id, workerId, result) => {
+  return statement(db, 'complete').run({ id, workerId, result: JSON.stringify(result), now: Date.now() }).changes === 1;
+};
+
+/**
+ * 작업 실패 기록 (시도 횟수가 남았으면 backoff 후 재시도)
+ * @param {string} error - 실패 사유
+ * @param {Object} [options]
+ * @param {boolean} [options.retry=true] - false면 재시도 없이 실패 확정 (입력 없음 등)
+ * @returns {{status: string, attempts: number, run_at: number}|null} lease를 잃었으면 null
+ */
+const failJob = (db, id, workerId, error, { retry = true } = {}) => {
+  const row = statement(db, 'fail').get({
+    id,
+    workerId,
+    error: String(error).slice(0, 1000),
+    retry: retry ? 1 : 0,
+    now: Date.now(),
+    ...backoffParams()
+  });
+  return row || null;
+};
+
+/**
+ * 점유한 작업 반납 (워커 종료 시)
+ * @returns {boolean}
+ */
+const releaseJob = (db, id, workerId) => {
+  return statement(db, 'release').run({ id, workerId, now: Date.now() }).changes === 1;
+};
+
+/**
+ * lease가 만료된 작업 회수
+ * @returns {Array<{id: string, status: string}>} 회수한 작업 (queued: 재시도 / failed: 시도 횟수 초과)
+ */
+const recoverExpiredJobs = (db) => {
+  return statement(db, 'recoverExpired').all({ now: Date.now(), ...backoffParams() });
+};
+
+/**
+ * 작업 조회
+ * @returns {Object|null}
+ */
+const getJob = (db, id) => {
+  return parseJob(statement(db, 'select').get(id));
+};
+
+/**
+ * 대기 중인 작업 수
+ * @returns {number}
+ */
+const countQueuedJobs = (db) => {
+  return statement(db, 'countQueued').get().count;
+};
+
+/**
+ * 보관 시간이 지난 완료/실패 작업 삭제
+ * @returns {number} 삭제한 행 수
+ */
+const pruneFinishedJobs = (db, retentionMs = JOB_RETENTION_MS) => {
+  return statement(db, 'pruneFinished').run(Date.now() - retentionMs).changes;
+};
+
+module.exports = {
+  JOB_LEASE_MS,
+  enqueueJob,
+  claimJob,
+  heartbeatJob,
+  completeJob,
+  failJob,
+  releaseJob,
+  recoverExpiredJobs,
+  getJob,
+  countQueuedJobs,
+  pruneFinishedJobs
+};
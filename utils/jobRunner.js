@@ -0,0 +1,153 @@
+/**
+ * ================================
+ * 🏃 큐 작업 실행기
+ * ================================
+ * jobs 테이블의 작업 1건을 실행 (POST /api/convert 와 같은 단계, 응답 대신 결과 객체 반환)
+ * 1. R2에서 원본을 스크래치 디렉토리로 다운로드
+ * 2. 이 프로세스의 Piscina 풀에서 변환
+ * 3. 결과를 R2에 업로드 + files 테이블 기록
+ *
+ * 원본 삭제는 워커가 completeJob 성공 후 처리 (lease를 잃은 실행이 원본을 지워 재시도를 막지 않도록)
+ */
+
+const path = require('path');
+const { EXTENSION_MAP, PIPELINE_STEPS, FILE_EXPIRY_MINUTES } = require('./constants');
+const { downloadFromR2ToFileWithHash, uploadToR2, generateR2Path } = require('../config/r2');
+const { convert: convertWithPiscina } = require('./converterPool');
+const db = require('../config/db');
+const { withTime } = require('./logger');
+const { sanitizeFilename } = require('./sanitizer');
+const { safeConversionWithTransaction } = require('./dbTransaction');
+const { createScratchDir, removeScratchDir, safeExtension } = require('./scratch');
+
+const IMAGE_FORMATS = [
+  'jpg-to-png', 'png-to-jpg', 'jpg-to-webp', 'png-to-webp', 'webp-to-jpg', 'webp-to-png',
+  'heic-to-jpg', 'heic-to-png', 'heic-to-webp', 'resize', 'compress-image'
+];
+const QUALITY_IMAGE_FORMATS = ['jpg-to-webp', 'png-to-webp', 'heic-to-jpg', 'heic-to-webp'];
+
+// 큐로 처리하는 형식 (입력 파일 1개 → 결과 파일 1개, merge/split/image-batch 제외)
+const JOB_FORMATS = [
+  'word', 'excel', 'ppt', 'jpg', 'png',
+  'word2pdf', 'excel2pdf', 'ppt2pdf',
+  'compress',
+  ...IMAGE_FORMATS,
+  'mp3', 'wav', 'ogg', 'm4a', 'aac',
+  'mp4', 'mov', 'webm', 'mkv',
+  'compress-video', 'gif',
+  ...Object.keys(PIPELINE_STEPS)
+];
+
+/**
+ * 재시도해도 결과가 같은 실패 (failJob retry=false)
+ * @param {Error} error
+ * @returns {boolean}
+ */
+function isPermanentFailure(error) {
+  return error.name === 'NoSuchKey'
+    || error.$metadata?.httpStatusCode === 404
+    || error.code === 'INVALID_CONVERSION_OPTIONS'
+    || error.retryable === false;
+}
+
+/**
+ * 형식별 워커 추가 데이터 (convertRoutes의 /, /compress, /image 와 같은 기본값)
+ * @param {string} format
+ * @param {Object} payload - { quality, backgroundColor, options }
+ * @returns {any}
+ */
+function jobArguments(format, payload) {
+  if (Object.hasOwn(PIPELINE_STEPS, format)) return { quality: payload.quality };
+  if (format === 'compress') return payload.quality || 'medium';
+  if (format === 'png-to-jpg') return payload.backgroundColor || '#ffffff';
+  if (QUALITY_IMAGE_FORMATS.includes(format)) return payload.quality || 80;
+  if (['resize', 'compress-image'].includes(format)) return payload.options;
+  return [];
+}
+
+/**
+ * 변환 결과 파일명 ("<원본 이름>_converted<확장자>")
+ * @param {string} format
+ * @param {string} [originalName]
+ * @returns {string}
+ */
+function resultFileName(format, originalName) {
+  const ext = EXTENSION_MAP[format] || '.bin';
+  const baseName = originalName && originalName.includes('.')
+    ? originalName.substring(0, originalName.lastIndexOf('.'))
+    : originalName || 'file';
+  return `${sanitizeFilename(baseName)}_converted${ext}`;
+}
+
+/**
+ * 큐 작업 1건 실행
+ * @param {Object} job - claimJob 결과 (format, payload: { r2Path, originalName, quality, backgroundColor, options })
+ * @param {Object} [options]
+ * @param {AbortSignal} [options.signal] - 워커 종료/lease 상실 시 변환 취소
+ * @returns {Promise<{fileId, r2Path, fileName, partial?, pagesDone?, pagesTotal?}>}
+ */
+async function runConversionJob(job, { signal } = {}) {
+  const { format, payload } = job;
+
+  if (!JOB_FORMATS.includes(format)) {
+    const error = new Error(`지원하지 않는 형식입니다: ${format}`);
+    error.retryable = false;
+    throw error;
+  }
+
+  let scratchDir;
+  try {
+    console.log(withTime(`📬 큐 작업 실행: ${job.id} (${format}, ${job.attempts}번째 시도)`));
+
+    scratchDir = await createScratchDir('job');
+    const ext = safeExtension(payload.originalName) || safeExtension(payload.r2Path);
+    const inputPath = path.join(scratchDir, `source${ext}`);
+    const { sha256 } = await downloadFromR2ToFileWithHash(payload.r2Path, inputPath);
+
+    const result = await convertWithPiscina(inputPath, format, jobArguments(format, payload), { signal, inputHash: sha256 });
+    if (!result.success) {
+      const workerError = new Error(result.error || '워커 변환 작업이 실패했습니다.');
+      if (result.code) {
+        workerError.code = result.code;
+      }
+      throw workerError;
+    }
+
+    const fileName = resultFileName(format, payload.originalName);
+    const convertedR2Path = generateR2Path(fileName, 'converted');
+    const fileId = `${Date.now()}-${Math.random().toString(36).substring(2, 8)}`;
+    const expiresAt = new Date(Date.now() + FILE_EXPIRY_MINUTES * 60 * 1000)
+      .toISOString().replace('T', ' ').substring(0, 19);
+
+    await safeConversionWithTransaction(db, async () => {
+      await uploadToR2(convertedR2Path, result.buffer, 'application/octet-stream');
+      return { success: true, r2Path: convertedR2Path };
+    }, {
+      fileId,
+      r2Path: convertedR2Path,
+      fileType: 'converted',
+      expiresAt
+    });
+
+    return {
+      fileId,
+      r2Path: convertedR2Path,
+      fileName,
+      ...(result.partial && {
+        partial: true,
+        pagesDone: result.partial.pagesDone,
+        pagesTotal: result.partial.pagesTotal
+      })
+    };
+  } finally {
+    await removeScratchDir(scratchDir);
+  }
+}
+
+module.exports = {
+  JOB_FORMATS,
+  jobArguments,
+  resultFileName,
+  isPermanentFailure,
+  runConversionJob
+};
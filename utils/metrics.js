@@ -0,0 +1,130 @@
+/**
+ * ================================
+ * 📊 변환 작업 지표 기록
+ * ================================
+ * 작업별 형식/입출력 크기/대기 시간/실행 시간/최대 RSS/결과를
+ * conversion_metrics 테이블에 기록
+ * - 요청 경로에서는 메모리 버퍼에 추가만 하고, 일정 개수 또는 주기마다
+ *   하나의 트랜잭션으로 묶어 기록 (better-sqlite3 쓰기 경합 최소화)
+ */
+
+const db = require('../config/db');
+const { withTime } = require('./logger');
+
+const BATCH_SIZE = parseInt(process.env.METRICS_BATCH_SIZE) || 100;
+const FLUSH_INTERVAL_MS = parseInt(process.env.METRICS_FLUSH_MS) || 2000;
+const MAX_PENDING = 10000; // DB 장애 시 메모리 상한
+
+let pending = [];
+let flushTimer = null;
+let insertMany = null;
+
+/**
+ * Date → SQLite DATETIME 문자열 (UTC, CURRENT_TIMESTAMP와 같은 형식)
+ * @param {Date} date
+ * @returns {string}
+ */
+function toSqliteDatetime(date) {
+  return date.toISOString().replace('T', ' ').slice(0, 19);
+}
+
+function getInsertMany() {
+  if (!insertMany) {
+    const stmt = db.prepare(`
+      INSERT INTO conversion_metrics
+        (format, outcome, input_bytes, output_bytes, queue_wait_ms, run_ms, total_ms, peak_rss_bytes, error_code, created_at)
+      VALUES
+        (@format, @outcome, @inputBytes, @outputBytes, @queueWaitMs, @runMs, @totalMs, @peakRssBytes, @errorCode, @createdAt)
+    `);
+    insertMany = db.transaction((rows) => {
+      for (const row of rows) stmt.run(row);
+    });
+  }
+  return insertMany;
+}
+
+/**
+ * 버퍼에 쌓인 지표를 한 번의 트랜잭션으로 기록
+ * @returns {number} 기록한 행 수
+ */
+function flushMetrics() {
+  if (flushTimer) {
+    clearTimeout(flushTimer);
+    flushTimer = null;
+  }
+  if (pending.length === 0) return 0;
+
+  const rows = pending;
+  pending = [];
+
+  try {
+    getInsertMany()(rows);
+    return rows.length;
+  } catch (error) {
+    console.error(withTime(`❌ 변환 지표 기록 실패 (${rows.length}건): ${error.message}`));
+    // 다음 flush에서 재시도 (상한 초과분은 오래된 것부터 버림)
+    pending = rows.concat(pending).slice(-MAX_PENDING);
+    scheduleFlush();
+    return 0;
+  }
+}
+
+function scheduleFlush() {
+  if (flushTimer) return;
+  flushTimer = setTimeout(flushMetrics, FLUSH_INTERVAL_MS);
+  flushTimer.unref();
+}
+
+/**
+ * 변환 작업 지표 추가 (동기 DB 쓰기 없음)
+ * @param {Object} metric
+ * @param {string} metric.format - 변환 형식
+ * @param {string} metric.outcome - 'success' | 'failed' | 'timeout' | 'aborted'
+ * @param {number} [metric.inputBytes]
+ * @param {number} [metric.outputBytes]
+ * @param {number} [metric.queueWaitMs]
+ * @param {number} [metric.runMs]
+ * @param {number} metric.totalMs
+ * @param {number} [metric.peakRssBytes]
+ * @param {string} [metric.errorCode]
+ */
+function recordConversion(metric) {
+  pending.push({
+    format: metric.format,
+    outcome: metric.outcome,
+    inputBytes: metric.inputBytes ?? null,
+    outputBytes: metric.outputBytes ?? null,
+    queueWaitMs: metric.queueWaitMs ?? null,
+    runMs: metric.runMs ?? null,
+    totalMs: metric.totalMs,
+    peakRssBytes: metric.peakRssBytes ?? null,
+    errorCode: metric.errorCode ?? null,
+    createdAt: toSqliteDatetime(new Date())
+  });
+
+  if (pending.length > MAX_PENDING) {
+    pending.shift();
+  }
+
+  if (pending.length >= BATCH_SIZE) {
+    flushMetrics();
+  } else {
+    scheduleFlush();
+  }
+}
+
+/**
+ * 아직 기록되지 않은 지표 수
+ */
+function getPendingCount() {
+  return pending.length;
+}
+
+// 종료 시 남은 지표 기록
+process.on('exit', flushMetrics);
+
+module.exports = {
+  recordConversion,
+  flushMetrics,
+  getPendingCount
+};
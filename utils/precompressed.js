@@ -0,0 +1,181 @@
+/**
+ * ================================
+ * 🗜️ 사전 압축 정적 자산 서빙
+ * ================================
+ * compress_static.py가 만든 .br / .gz 형제 파일을 Accept-Encoding에 맞춰 그대로 전송
+ * - 요청마다 compression() 미들웨어로 gzip 하지 않음 (Content-Encoding이 이미 설정되면 건너뜀)
+ * - 시작 시 public 디렉토리를 한 번 스캔해 인덱스 생성 (요청마다 stat 하지 않음)
+ * - 원본보다 오래된 형제 파일은 무시 (빌드 후 원본만 수정된 경우 → 동적 압축으로 폴백)
+ * - 형제 파일이 없는 경로는 next()로 express.static에 넘김
+ */
+
+const fs = require('fs');
+const path = require('path');
+const { withTime } = require('./logger');
+
+// compress_static.py 의 COMPRESSIBLE_EXTENSIONS 와 같아야 함
+const COMPRESSIBLE_EXTENSIONS = new Set(['.html', '.css', '.js', '.svg', '.xml', '.txt', '.json']);
+
+// 서버 선호 순서 (같은 q면 앞쪽 우선)
+const ENCODINGS = [
+  { name: 'br', ext: '.br' },
+  { name: 'gzip', ext: '.gz' }
+];
+
+/**
+ * public 디렉토리 스캔 → URL 경로별 사용 가능한 형제 파일
+ * @param {string} rootDir
+ * @returns {Map<string, Object<string, string>>} '/styles.css' → { br: '/abs/styles.css.br', gzip: ... }
+ */
+function buildIndex(rootDir) {
+  const index = new Map();
+  rootDir = path.resolve(rootDir);
+
+  const walk = (dir) => {
+    let entries;
+    try {
+      entries = fs.readdirSync(dir, { withFileTypes: true });
+    } catch {
+      return;
+    }
+
+    for (const entry of entries) {
+      const fullPath = path.join(dir, entry.name);
+      if (entry.isDirectory()) {
+        walk(fullPath);
+        continue;
+      }
+      if (!COMPRESSIBLE_EXTENSIONS.has(path.extname(entry.name))) continue;
+
+      const sourceMtime = fs.statSync(fullPath).mtimeMs;
+      const variants = {};
+      for (const { name, ext } of ENCODINGS) {
+        try {
+          // 원본보다 오래된 형제 파일은 내용이 다를 수 있음
+          if (fs.statSync(fullPath + ext).mtimeMs >= sourceMtime) {
+            variants[name] = fullPath + ext;
+          }
+        } catch {
+          // 형제 파일 없음
+        }
+      }
+
+      if (Object.keys(variants).length > 0) {
+        const urlPath = '/' + path.relative(rootDir, fullPath).split(path.sep).join('/');
+        index.set(urlPath, variants);
+      }
+    }
+  };
+
+  walk(rootDir);
+  return index;
+}
+
+/**
+ * Accept-Encoding 파싱 → 인코딩별 q 값
+ * @param {string} header - 예: 'gzip, deflate, br;q=0.9'
+ * @returns {Map<string, number>}
+ */
+function parseAcceptEncoding(header) {
+  const accepted = new Map();
+  for (const part of (header || '').split(',')) {
+    const [coding, ...params] = part.trim().toLowerCase().split(';');
+    if (!coding) continue;
+
+    let q = 1;
+    for (const param of params) {
+      const [key, value] = param.trim().split('=');
+      if (key === 'q') q = Number(value) || 0;
+    }
+    accepted.set(coding, q);
+  }
+  return accepted;
+}
+
+/**
+ * 전송할 인코딩 선택 (q가 가장 높은 것, 같으면 br 우선)
+ * @param {string} header - Accept-Encoding
+ * @param {Object<string, string>} variants - 사용 가능한 형제 파일
+ * @returns {string|null}
+ */
+function selectEncoding(header, variants) {
+  const accepted = parseAcceptEncoding(header);
+  let best = null;
+  let bestQ = 0;
+
+  for (const { name } of ENCODINGS) {
+    if (!variants[name]) continue;
+    const q = accepted.has(name) ? accepted.get(name) : (accepted.get('*') ?? 0);
+    if (q > bestQ) {
+      best = name;
+      bestQ = q;
+    }
+  }
+  return best;
+}
+
+/**
+ * 사전 압축 자산 미들웨어 (express.static 앞에 등록)
+ * @param {string} rootDir - public 디렉토리
+ * @param {Object} [options]
+ * @param {string} [options.index='index.html'] - 디렉토리 요청 시 파일
+ * @param {Function} [options.setHeaders] - (res, 원본 파일 경로) express.static과 같은 형식
+ * @returns {Function} Express 미들웨어
+ */
+function servePrecompressed(rootDir, { index: indexFile = 'index.html', setHeaders } = {}) {
+  const index = buildIndex(rootDir);
+  console.log(withTime(`🗜️  사전 압축 자산 ${index.size}개 로드`));
+  if (index.size === 0 && process.env.NODE_ENV === 'production') {
+    // .br/.gz는 커밋되지 않으므로 배포 빌드(npm run build)를 건너뛰면 매 요청 실시간 압축
+    console.warn(withTime('⚠️  사전 압축 자산이 없습니다 - 배포 시 `npm run build`를 실행하세요 (docs/STATIC_ASSETS.md)'));
+  }
+
+  return (req, res, next) => {
+    if (req.method !== 'GET' && req.method !== 'HEAD') return next();
+
+    let urlPath;
+    try {
+      urlPath = decodeURIComponent(req.path);
+    } catch {
+      return next();
+    }
+    if (urlPath.endsWith('/')) urlPath += indexFile;
+
+    const variants = index.get(urlPath);
+    if (!variants) return next();
+
+    // 압축 여부와 관계없이 캐시가 인코딩별로 저장되도록
+    res.vary('Accept-Encoding');
+
+    const encoding = selectEncoding(req.headers['accept-encoding'], variants);
+    if (!encoding) return next();
+
+    // Content-Type은 원본 확장자 기준 (send는 이미 설정된 Content-Type을 덮어쓰지 않음)
+    res.type(path.extname(urlPath));
+    res.set('Content-Encoding', encoding);
+    if (setHeaders) {
+      setHeaders(res, variants[encoding].slice(0, -path.extname(variants[encoding]).length));
+    }
+
+    res.sendFile(variants[encoding], (err) => {
+      if (!err) return;
+      // 형제 파일이 사라졌으면 원본으로 폴백
+      if (!res.headersSent) {
+        res.removeHeader('Content-Encoding');
+        res.removeHeader('Content-Type');
+        res.removeHeader('Cache-Control');
+        index.delete(urlPath);
+        return next();
+      }
+      next(err);
+    });
+  };
+}
+
+module.exports = {
+  COMPRESSIBLE_EXTENSIONS,
+  buildIndex,
+  parseAcceptEncoding,
+  selectEncoding,
+  servePrecompressed
+};
@@ -0,0 +1,453 @@
+/**
+ * ================================
+ * 🛡️ 변환 서브프로세스 감독자
+ * ================================
+ * 모든 변환기 외부 프로세스(gs, soffice, pdftoppm, python 등)를 공통으로 관리
+ * - 각 프로세스를 독립된 프로세스 그룹으로 실행 (detached → setsid)
+ * - 타임아웃/취소/메모리 초과 시 그룹 전체(손자 프로세스 포함)를 종료
+ * - 정상 종료 후에도 그룹에 남은 헬퍼 프로세스(soffice.bin 등) 정리
+ * - /proc 샘플링으로 그룹 단위 CPU/메모리 사용량 집계 (cgroup 방식)
+ * - 살아있는 그룹을 SharedArrayBuffer 레지스트리에 기록하여
+ *   메인 스레드가 Piscina 타임아웃 후에도 남은 그룹을 정리할 수 있게 함
+ */
+
+const { spawn } = require('child_process');
+const fs = require('fs');
+
+const DEFAULT_TIMEOUT_MS = parseInt(process.env.SUPERVISOR_TIMEOUT_MS) || 300000; // 5분
+const KILL_GRACE_MS = parseInt(process.env.SUPERVISOR_KILL_GRACE_MS) || 5000;
+const SAMPLE_INTERVAL_MS = parseInt(process.env.SUPERVISOR_SAMPLE_MS) || 1000;
+const DEFAULT_MEMORY_LIMIT = parseInt(process.env.SUPERVISOR_MEMORY_LIMIT_MB) * 1024 * 1024 || 0; // 0 = 제한 없음
+
+// ============ 공유 레지스트리 ============
+// slots: [target, taskId] 쌍 REGISTRY_SLOTS개, counters: COUNTER 인덱스 참고
+// target > 0 이면 프로세스 그룹 ID, target < 0 이면 단일 프로세스 PID (-pid)
+const REGISTRY_SLOTS = 256;
+const COUNTER = { spawned: 0, timedOut: 1, memoryKilled: 2, aborted: 3, reaped: 4 };
+const COUNTER_SIZE = 8;
+
+const PAGE_SIZE = 4096;
+const CLOCK_TICKS = 100; // Linux USER_HZ
+
+let registry = null;
+let currentTaskId = 0;
+let currentTaskUsage = { processes: 0, cpuMs: 0, peakRssBytes: 0 };
+const liveChildren = new Map(); // target → { child, kind, peakRssBytes, cpuTicks, ... }
+let sampler = null;
+
+/**
+ * 공유 레지스트리 버퍼 생성 (메인 스레드에서 한 번 호출)
+ * @returns {SharedArrayBuffer}
+ */
+function createRegistryBuffer() {
+  return new SharedArrayBuffer(Int32Array.BYTES_PER_ELEMENT * (REGISTRY_SLOTS * 2 + COUNTER_SIZE));
+}
+
+/**
+ * 공유 레지스트리 연결 (메인 스레드/워커 스레드 모두)
+ * @param {SharedArrayBuffer} buffer
+ */
+function attachRegistry(buffer) {
+  if (!buffer) return;
+  const view = new Int32Array(buffer);
+  registry = {
+    slots: view.subarray(0, REGISTRY_SLOTS * 2),
+    counters: view.subarray(REGISTRY_SLOTS * 2)
+  };
+}
+
+/**
+ * 현재 워커 스레드가 처리 중인 작업 ID 설정 (워커당 1개 작업)
+ * @param {number} taskId
+ */
+function setCurrentTask(taskId) {
+  currentTaskId = taskId || 0;
+  currentTaskUsage = { processes: 0, cpuMs: 0, peakRssBytes: 0 };
+}
+
+/**
+ * 현재 작업에서 종료된 외부 프로세스들의 사용량 합계 (워커 결과 보고용)
+ * peakRssBytes는 프로세스별 최대 RSS 중 최댓값 (변환기는 프로세스를 순차 실행)
+ * @returns {{processes: number, cpuMs: number, peakRssBytes: number}}
+ */
+function getTaskUsage() {
+  return { ...currentTaskUsage };
+}
+
+function bumpCounter(name) {
+  if (registry) {
+    Atomics.add(registry.counters, COUNTER[name], 1);
+  }
+}
+
+function register(target, taskId) {
+  if (!registry) return;
+  for (let i = 0; i < REGISTRY_SLOTS; i++) {
+    if (Atomics.compareExchange(registry.slots, i * 2, 0, target) === 0) {
+      Atomics.store(registry.slots, i * 2 + 1, taskId);
+      return;
+    }
+  }
+  console.warn(`⚠️  프로세스 레지스트리가 가득 찼습니다 (target=${target})`);
+}
+
+function unregister(target) {
+  if (!registry) return;
+  for (let i = 0; i < REGISTRY_SLOTS; i++) {
+    if (Atomics.load(registry.slots, i * 2) === target) {
+      Atomics.store(registry.slots, i * 2 + 1, 0);
+      Atomics.store(registry.slots, i * 2, 0);
+      return;
+    }
+  }
+}
+
+/**
+ * 레지스트리 대상에 시그널 전송 (이미 종료된 대상은 무시)
+ * @param {number} target - 양수: 프로세스 그룹 ID, 음수: 단일 PID
+ */
+function killTarget(target, signal = 'SIGKILL') {
+  try {
+    // 그룹은 -pgid, 단일 프로세스는 pid로 전송
+    process.kill(-target, signal);
+    return true;
+  } catch (error) {
+    return false;
+  }
+}
+
+// ============ /proc 기반 그룹 사용량 집계 ============
+
+/**
+ * 프로세스 그룹에 속한 모든 프로세스의 CPU tick 합계와 RSS 합계
+ * @param {Set<number>} pgids
+ * @returns {Map<number, {cpuTicks: number, rssBytes: number, processes: number}>}
+ */
+function readGroupUsage(pgids) {
+  const usage = new Map();
+  let entries;
+  try {
+    entries = fs.readdirSync('/proc');
+  } catch (error) {
+    return usage; // /proc 미지원 플랫폼
+  }
+
+  for (const entry of entries) {
+    if (entry.charCodeAt(0) < 48 || entry.charCodeAt(0) > 57) continue;
+    let stat;
+    try {
+      stat = fs.readFileSync(`/proc/${entry}/stat`, 'utf8');
+    } catch (error) {
+      continue; // 읽는 사이 종료된 프로세스
+    }
+    // comm 필드에 공백/괄호가 들어갈 수 있으므로 마지막 ')' 이후를 파싱
+    const fields = stat.slice(stat.lastIndexOf(')') + 2).split(' ');
+    const pgrp = parseInt(fields[2], 10);
+    if (!pgids.has(pgrp)) continue;
+
+    const current = usage.get(pgrp) || { cpuTicks: 0, rssBytes: 0, processes: 0 };
+    current.cpuTicks += parseInt(fields[11], 10) + parseInt(fields[12], 10); // utime + stime
+    current.rssBytes += parseInt(fields[21], 10) * PAGE_SIZE;
+    current.processes += 1;
+    usage.set(pgrp, current);
+  }
+
+  return usage;
+}
+
+/**
+ * 단일 프로세스의 CPU tick과 RSS
+ * @param {number} pid
+ * @returns {{cpuTicks: number, rssBytes: number, processes: number}|null}
+ */
+function readProcessUsage(pid) {
+  try {
+    const stat = fs.readFileSync(`/proc/${pid}/stat`, 'utf8');
+    const fields = stat.slice(stat.lastIndexOf(')') + 2).split(' ');
+    return {
+      cpuTicks: parseInt(fields[11], 10) + parseInt(fields[12], 10),
+      rssBytes: parseInt(fields[21], 10) * PAGE_SIZE,
+      processes: 1
+    };
+  } catch (error) {
+    return null;
+  }
+}
+
+function sampleGroups() {
+  if (liveChildren.size === 0) return;
+
+  const groupTargets = new Set();
+  for (const [target, entry] of liveChildren) {
+    if (entry.kind === 'group') groupTargets.add(target);
+  }
+  const usage = groupTargets.size > 0 ? readGroupUsage(groupTargets) : new Map();
+
+  for (const [target, entry] of liveChildren) {
+    const groupUsage = entry.kind === 'group' ? usage.get(target) : readProcessUsage(-target);
+    if (!groupUsage) continue;
+
+    entry.cpuTicks = Math.max(entry.cpuTicks, groupUsage.cpuTicks);
+    entry.peakRssBytes = Math.max(entry.peakRssBytes, groupUsage.rssBytes);
+    entry.processes = groupUsage.processes;
+
+    if (entry.memoryLimit && groupUsage.rssBytes > entry.memoryLimit) {
+      terminate(entry, 'memory-limit');
+    }
+  }
+}
+
+function ensureSampler() {
+  if (sampler || process.platform !== 'linux') return;
+  sampler = setInterval(sampleGroups, SAMPLE_INTERVAL_MS);
+  sampler.unref();
+}
+
+function stopSamplerIfIdle() {
+  if (sampler && liveChildren.size === 0) {
+    clearInterval(sampler);
+    sampler = null;
+  }
+}
+
+/**
+ * 강제 종료: SIGTERM 후 유예 시간 뒤 SIGKILL
+ * (python 래퍼가 SIGTERM을 받아 자신이 만든 하위 프로세스 트리를 먼저 정리할 시간을 줌)
+ */
+function terminate(entry, reason) {
+  if (entry.child.killReason) return;
+  entry.child.killReason = reason;
+  bumpCounter(reason === 'timeout' ? 'timedOut' : reason === 'memory-limit' ? 'memoryKilled' : 'aborted');
+
+  console.warn(`⚠️  프로세스 종료 (${reason}): ${entry.label} target=${entry.target}`);
+  killTarget(entry.target, 'SIGTERM');
+  entry.killTimer = setTimeout(() => killTarget(entry.target, 'SIGKILL'), KILL_GRACE_MS);
+  entry.killTimer.unref();
+}
+
+/**
+ * 감독 대상 등록 및 타임아웃/취소 연결
+ * @returns {Function} 해제 함수
+ */
+function track(child, target, kind, { timeoutMs, memoryLimitBytes, signal, label }) {
+  const entry = {
+    child,
+    target,
+    kind,
+    label,
+    memoryLimit: memoryLimitBytes,
+    cpuTicks: 0,
+    peakRssBytes: 0,
+    processes: 1,
+    killTimer: null,
+    startedAt: Date.now()
+  };
+
+  liveChildren.set(target, entry);
+  register(target, currentTaskId);
+  bumpCounter('spawned');
+  ensureSampler();
+
+  const timeoutTimer = timeoutMs > 0
+    ? setTimeout(() => terminate(entry, 'timeout'), timeoutMs)
+    : null;
+
+  const onAbort = () => terminate(entry, 'aborted');
+  if (signal) {
+    if (signal.aborted) onAbort();
+    else signal.addEventListener('abort', onAbort, { once: true });
+  }
+
+  let released = false;
+  return () => {
+    if (released) return;
+    released = true;
+    if (timeoutTimer) clearTimeout(timeoutTimer);
+    if (entry.killTimer) clearTimeout(entry.killTimer);
+    if (signal) signal.removeEventListener('abort', onAbort);
+
+    liveChildren.delete(target);
+    unregister(target);
+    stopSamplerIfIdle();
+
+    child.usage = {
+      durationMs: Date.now() - entry.startedAt,
+      cpuMs: Math.round(entry.cpuTicks * 1000 / CLOCK_TICKS),
+      peakRssBytes: entry.peakRssBytes
+    };
+
+    currentTaskUsage.processes += 1;
+    currentTaskUsage.cpuMs += child.usage.cpuMs;
+    currentTaskUsage.peakRssBytes = Math.max(currentTaskUsage.peakRssBytes, entry.peakRssBytes);
+  };
+}
+
+/**
+ * 감독 하에 외부 프로세스 실행 (child_process.spawn 대체)
+ * 반환된 ChildProcess는 기존과 동일하게 'close'/'error' 이벤트를 사용하며,
+ * 강제 종료된 경우 child.killReason('timeout' | 'memory-limit' | 'aborted')이 설정됨.
+ * 'close' 이후 child.usage에 { durationMs, cpuMs, peakRssBytes } 집계가 기록됨.
+ *
+ * @param {string} command - 실행 파일
+ * @param {Array<string>} args - 인자
+ * @param {Object} options - spawn 옵션 + 감독 옵션
+ * @param {number} [options.timeoutMs] - 그룹 전체 타임아웃 (기본 SUPERVISOR_TIMEOUT_MS)
+ * @param {number} [options.memoryLimitBytes] - 그룹 RSS 합계 제한 (0 = 제한 없음)
+ * @param {AbortSignal} [options.signal] - 취소 신호
+ * @param {string} [options.label] - 로그용 이름
+ * @returns {import('child_process').ChildProcess}
+ */
+function spawnSupervised(command, args = [], options = {}) {
+  const {
+    timeoutMs = DEFAULT_TIMEOUT_MS,
+    memoryLimitBytes = DEFAULT_MEMORY_LIMIT,
+    signal,
+    label = command,
+    ...spawnOptions
+  } = options;
+
+  const child = spawn(command, args, { ...spawnOptions, detached: true });
+
+  if (!child.pid) {
+    // spawn 실패 ('error' 이벤트로 전달됨)
+    return child;
+  }
+
+  const pgid = child.pid;
+  const release = track(child, pgid, 'group', { timeoutMs, memoryLimitBytes, signal, label });
+
+  child.once('exit', () => {
+    // 그룹 리더 종료 시점의 마지막 샘플 후, 남은 헬퍼 프로세스까지 정리
+    if (process.platform === 'linux') {
+      sampleGroups();
+    }
+    killTarget(pgid, 'SIGKILL');
+  });
+  child.once('close', release);
+
+  return child;
+}
+
+/**
+ * fluent-ffmpeg 명령 감독 (fluent-ffmpeg가 직접 spawn하므로 그룹 대신 PID 단위로 관리)
+ * ffmpeg는 자식 프로세스를 만들지 않으므로 직접 kill로 충분함
+ * @param {Object} command - fluent-ffmpeg 명령 객체
+ * @param {Object} options - { timeoutMs, signal, label }
+ * @returns {Object} command (체이닝용)
+ */
+function superviseFfmpeg(command, options = {}) {
+  const { timeoutMs = DEFAULT_TIMEOUT_MS, signal, label = 'ffmpeg' } = options;
+  let release = null;
+
+  command.on('start', () => {
+    const proc = command.ffmpegProc;
+    if (!proc?.pid) return;
+
+    release = track(proc, -proc.pid, 'process', { timeoutMs, memoryLimitBytes: 0, signal, label });
+    proc.once('close', release);
+  });
+
+  const cleanup = () => {
+    if (release) release();
+  };
+  command.on('end', cleanup);
+  command.on('error', cleanup);
+
+  return command;
+}
+
+// ============ 메인 스레드용 정리/통계 ============
+
+/**
+ * 특정 작업(taskId)이 남긴 프로세스 그룹을 모두 강제 종료
+ * Piscina taskTimeout/취소로 워커 스레드가 종료되어도 손자 프로세스를 정리하기 위해 사용
+ * @param {number} taskId
+ * @returns {number} 종료한 그룹 수
+ */
+function reapTask(taskId) {
+  if (!registry || !taskId) return 0;
+  let reaped = 0;
+  for (let i = 0; i < REGISTRY_SLOTS; i++) {
+    const target = Atomics.load(registry.slots, i * 2);
+    if (target !== 0 && Atomics.load(registry.slots, i * 2 + 1) === taskId) {
+      killTarget(target, 'SIGKILL');
+      Atomics.store(registry.slots, i * 2 + 1, 0);
+      Atomics.store(registry.slots, i * 2, 0);
+      reaped++;
+    }
+  }
+  if (reaped > 0) {
+    Atomics.add(registry.counters, COUNTER.reaped, reaped);
+    console.warn(`⚠️  작업 ${taskId}의 잔여 프로세스 그룹 ${reaped}개 정리`);
+  }
+  return reaped;
+}
+
+/**
+ * 레지스트리에 등록된 모든 프로세스 그룹 강제 종료 (종료 시)
+ * @returns {number} 종료한 그룹 수
+ */
+function reapAll() {
+  if (!registry) return 0;
+  let reaped = 0;
+  for (let i = 0; i < REGISTRY_SLOTS; i++) {
+    const target = Atomics.load(registry.slots, i * 2);
+    if (target !== 0) {
+      killTarget(target, 'SIGKILL');
+      Atomics.store(registry.slots, i * 2, 0);
+      reaped++;
+    }
+  }
+  return reaped;
+}
+
+/**
+ * 감독 중인 프로세스 통계 (모든 스레드 합계)
+ */
+function getSupervisorStats() {
+  if (!registry) {
+    return { liveGroups: liveChildren.size };
+  }
+
+  let liveGroups = 0;
+  for (let i = 0; i < REGISTRY_SLOTS; i++) {
+    if (Atomics.load(registry.slots, i * 2) !== 0) liveGroups++;
+  }
+
+  return {
+    liveGroups,
+    spawned: Atomics.load(registry.counters, COUNTER.spawned),
+    timedOut: Atomics.load(registry.counters, COUNTER.timedOut),
+    memoryKilled: Atomics.load(registry.counters, COUNTER.memoryKilled),
+    aborted: Atomics.load(registry.counters, COUNTER.aborted),
+    reaped: Atomics.load(registry.counters, COUNTER.reaped)
+  };
+}
+
+/**
+ * 현재 스레드에서 감독 중인 그룹의 누적 사용량 (워커 결과 보고용)
+ */
+function getLiveUsage() {
+  return Array.from(liveChildren.values()).map((entry) => ({
+    label: entry.label,
+    target: entry.target,
+    processes: entry.processes,
+    cpuMs: Math.round(entry.cpuTicks * 1000 / CLOCK_TICKS),
+    peakRssBytes: entry.peakRssBytes
+  }));
+}
+
+module.exports = {
+  DEFAULT_TIMEOUT_MS,
+  createRegistryBuffer,
+  attachRegistry,
+  setCurrentTask,
+  getTaskUsage,
+  spawnSupervised,
+  superviseFfmpeg,
+  reapTask,
+  reapAll,
+  getSupervisorStats,
+  getLiveUsage,
+  readGroupUsage
+};
@@ -0,0 +1,215 @@
+/**
+ * ================================
+ * 🔬 운영용 샘플링 프로파일러
+ * ================================
+ * 느린 변환을 사용자 파일 없이 재현하기 위한 옵트인 프로파일링
+ * - 1/N 확률 또는 지정한 형식의 작업만 프로파일링
+ * - 워커 스레드: V8 샘플링 프로파일러 (node:inspector) → .cpuprofile
+ * - Python 스크립트: sampling_profiler.py → folded stacks (.folded)
+ * - 결과는 형식/페이지 수/소요 시간 메타데이터와 함께 회전 디렉토리에 저장
+ *
+ * 환경 변수:
+ * - PROFILE_SAMPLE_RATE: N (1/N 작업 프로파일링, 0 = 비활성화)
+ * - PROFILE_FORMATS: 항상 프로파일링할 형식 (쉼표 구분, 예: word,excel)
+ * - PROFILE_DIR: 출력 디렉토리
+ * - PROFILE_MAX_MB / PROFILE_MAX_FILES: 디렉토리 크기/파일 수 상한
+ * - PROFILE_INTERVAL_US: V8 샘플링 간격 (마이크로초)
+ */
+
+const fs = require('fs/promises');
+const os = require('os');
+const path = require('path');
+const { randomBytes } = require('crypto');
+
+const SAMPLE_RATE = parseInt(process.env.PROFILE_SAMPLE_RATE || '0', 10);
+const PROFILE_FORMATS = new Set(
+  (process.env.PROFILE_FORMATS || '')
+    .split(',')
+    .map((f) => f.trim())
+    .filter(Boolean)
+);
+const PROFILE_DIR = process.env.PROFILE_DIR || path.join(os.tmpdir(), 'convert-for-you-profiles');
+const MAX_DIR_BYTES = parseInt(process.env.PROFILE_MAX_MB || '200', 10) * 1024 * 1024;
+const MAX_FILES = parseInt(process.env.PROFILE_MAX_FILES || '200', 10);
+const INTERVAL_US = parseInt(process.env.PROFILE_INTERVAL_US || '1000', 10);
+
+// 현재 워커에서 진행 중인 프로파일 (워커는 한 번에 하나의 작업만 실행)
+let activeProfile = null;
+
+/**
+ * 프로파일링 기능 활성화 여부
+ * @returns {boolean}
+ */
+function isEnabled() {
+  return SAMPLE_RATE > 0 || PROFILE_FORMATS.size > 0;
+}
+
+/**
+ * 이번 작업을 프로파일링할지 결정
+ * @param {string} format - 변환 형식
+ * @param {Function} random - 난수 함수 (테스트용)
+ * @returns {boolean}
+ */
+function shouldProfile(format, random = Math.random) {
+  if (PROFILE_FORMATS.has(format)) return true;
+  if (SAMPLE_RATE <= 0) return false;
+  return random() < 1 / SAMPLE_RATE;
+}
+
+function inspectorPost(session, method, params = {}) {
+  return new Promise((resolve, reject) => {
+    session.post(method, params, (error, result) => (error ? reject(error) : resolve(result)));
+  });
+}
+
+/**
+ * 작업 프로파일링 시작 (실패해도 변환에는 영향 없음)
+ * @param {string} format - 변환 형식
+ * @returns {Promise<Object|null>} 프로파일 핸들 (프로파일링하지 않으면 null)
+ */
+async function startProfile(format) {
+  if (!isEnabled() || activeProfile || !shouldProfile(format)) {
+    return null;
+  }
+
+  const id = `${Date.now()}-${format}-${randomBytes(4).toString('hex')}`;
+  const handle = {
+    id,
+    format,
+    startedAt: Date.now(),
+    session: null,
+    pythonProfiles: []
+  };
+
+  try {
+    await fs.mkdir(PROFILE_DIR, { recursive: true });
+
+    // 워커 스레드 자체 인스펙터에 연결 (외부 포트 개방 없음)
+    const inspector = require('node:inspector');
+    const session = new inspector.Session();
+    session.connect();
+    await inspectorPost(session, 'Profiler.enable');
+    await inspectorPost(session, 'Profiler.setSamplingInterval', { interval: INTERVAL_US });
+    await inspectorPost(session, 'Profiler.start');
+    handle.session = session;
+  } catch (error) {
+    console.warn(`⚠️  [프로파일러] V8 프로파일링 시작 실패: ${error.message}`);
+  }
+
+  activeProfile = handle;
+  return handle;
+}
+
+/**
+ * 현재 프로파일 중인 작업에서 실행할 Python 스크립트용 환경 변수
+ * 프로파일링 중이 아니면 process.env를 그대로 반환
+ * @param {string} label - 스크립트 이름 (파일명에 사용)
+ * @returns {Object} spawn env
+ */
+function profileEnv(label) {
+  if (!activeProfile) {
+    return process.env;
+  }
+
+  const output = path.join(PROFILE_DIR, `${activeProfile.id}.${label}.folded`);
+  activeProfile.pythonProfiles.push(path.basename(output));
+  return { ...process.env, CONVERTER_PROFILE_OUTPUT: output };
+}
+
+/**
+ * 프로파일링 종료 및 결과 저장
+ * @param {Object|null} handle - startProfile 반환값
+ * @param {Object} meta - 추가 메타데이터 (pages, inputBytes, success 등)
+ */
+async function stopProfile(handle, meta = {}) {
+  if (!handle) return;
+  if (activeProfile === handle) {
+    activeProfile = null;
+  }
+
+  const durationMs = Date.now() - handle.startedAt;
+  const files = [...handle.pythonProfiles];
+
+  try {
+    if (handle.session) {
+      const { profile } = await inspectorPost(handle.session, 'Profiler.stop');
+      handle.session.disconnect();
+      const profileFile = `${handle.id}.cpuprofile`;
+      await fs.writeFile(path.join(PROFILE_DIR, profileFile), JSON.stringify(profile));
+      files.unshift(profileFile);
+    }
+
+    const metadata = {
+      id: handle.id,
+      format: handle.format,
+      startedAt: new Date(handle.startedAt).toISOString(),
+      durationMs,
+      ...meta,
+      files
+    };
+    await fs.writeFile(path.join(PROFILE_DIR, `${handle.id}.json`), JSON.stringify(metadata, null, 2));
+
+    console.log(`🔬 [프로파일러] 저장 완료: ${handle.id} (${durationMs}ms)`);
+    await rotateProfiles();
+  } catch (error) {
+    console.warn(`⚠️  [프로파일러] 결과 저장 실패: ${error.message}`);
+  }
+}
+
+/**
+ * 출력 디렉토리를 크기/개수 상한 이하로 유지 (오래된 작업부터 삭제)
+ * 같은 작업의 파일(.cpuprofile, .folded, .json)은 함께 삭제
+ * @param {string} dir - 프로파일 디렉토리
+ * @param {Object} limits - { maxBytes, maxFiles }
+ * @returns {Promise<number>} 삭제한 파일 수
+ */
+async function rotateProfiles(dir = PROFILE_DIR, { maxBytes = MAX_DIR_BYTES, maxFiles = MAX_FILES } = {}) {
+  const names = await fs.readdir(dir);
+  const jobs = new Map();
+  let totalBytes = 0;
+  let totalFiles = 0;
+
+  for (const name of names) {
+    let stat;
+    try {
+      stat = await fs.stat(path.join(dir, name));
+    } catch (error) {
+      continue; // 다른 워커가 이미 삭제
+    }
+    if (!stat.isFile()) continue;
+
+    // 파일명 첫 '.' 앞이 작업 ID
+    const jobId = name.split('.')[0];
+    const job = jobs.get(jobId) || { files: [], bytes: 0, mtimeMs: stat.mtimeMs };
+    job.files.push(name);
+    job.bytes += stat.size;
+    job.mtimeMs = Math.min(job.mtimeMs, stat.mtimeMs);
+    jobs.set(jobId, job);
+
+    totalBytes += stat.size;
+    totalFiles += 1;
+  }
+
+  const oldestFirst = [...jobs.values()].sort((a, b) => a.mtimeMs - b.mtimeMs);
+  let removed = 0;
+
+  for (const job of oldestFirst) {
+    if (totalBytes <= maxBytes && totalFiles <= maxFiles) break;
+    await Promise.all(job.files.map((name) => fs.rm(path.join(dir, name), { force: true })));
+    totalBytes -= job.bytes;
+    totalFiles -= job.files.length;
+    removed += job.files.length;
+  }
+
+  return removed;
+}
+
+module.exports = {
+  PROFILE_DIR,
+  isEnabled,
+  shouldProfile,
+  startProfile,
+  stopProfile,
+  profileEnv,
+  rotateProfiles
+};
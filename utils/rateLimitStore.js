@@ -0,0 +1,150 @@
+/**
+ * ================================
+ * 🚦 SQLite 기반 rate limit 저장소
+ * ================================
+ * express-rate-limit의 Store 구현 (rate_limits 테이블)
+ * - 클러스터 모드에서 여러 HTTP 프로세스가 같은 DB 파일(WAL)을 공유하므로
+ *   메모리 저장소와 달리 프로세스 수와 관계없이 한도가 정확히 적용됨
+ * - 증가는 UPSERT ... RETURNING 단일 문장 → 프로세스 간 경쟁에도 원자적
+ * - 만료된 행은 스케줄러가 pruneRateLimits로 정리
+ * - 요청 경로에서 쓰기 잠금을 오래 기다리지 않도록 짧은 busy timeout의 전용 연결 사용
+ *   (better-sqlite3의 busy 대기는 동기식이라 이벤트 루프 전체를 멈춤)
+ * - 잠금 대기 초과 등 DB 오류 시 로그만 남기고 요청을 통과시킴 (fail open)
+ */
+
+const { withTime } = require('./logger');
+
+// 다른 프로세스의 쓰기 잠금을 기다리는 최대 시간 (초과 시 fail open)
+const RATE_LIMIT_BUSY_TIMEOUT_MS = parseInt(process.env.RATE_LIMIT_BUSY_TIMEOUT_MS) || 50;
+// 잠금 경합 중 로그 폭주 방지 (리미터별 경고 간격)
+const FAIL_OPEN_LOG_INTERVAL_MS = 10 * 1000;
+
+// 창이 지났으면 1부터 다시 세고 reset_at 갱신
+const INCREMENT_SQL = `
+  INSERT INTO rate_limits (prefix, key, hits, reset_at)
+  VALUES (@prefix, @key, 1, @resetAt)
+  ON CONFLICT (prefix, key) DO UPDATE SET
+    hits = CASE WHEN reset_at <= @now THEN 1 ELSE hits + 1 END,
+    reset_at = CASE WHEN reset_at <= @now THEN excluded.reset_at ELSE reset_at END
+  RETURNING hits, reset_at
+`;
+
+class SqliteRateLimitStore {
+  /**
+   * @param {Object} options
+   * @param {string} options.prefix - 리미터 이름 (리미터마다 다른 키 공간)
+   * @param {Database} [options.db] - better-sqlite3 Database (기본: config/db 파일의 전용 연결, 처음 사용할 때 생성)
+   */
+  constructor({ prefix, db } = {}) {
+    this.prefix = prefix;
+    this.db = db;
+    this.windowMs = 60 * 1000;
+    this.statements = null;
+    this.lastFailOpenLogAt = 0;
+    // 여러 프로세스가 공유하는 저장소
+    this.localKeys = false;
+  }
+
+  /**
+   * express-rate-limit가 리미터 생성 시 호출
+   * @param {Object} options - 리미터 옵션 (windowMs 사용)
+   */
+  init(options) {
+    this.windowMs = options.windowMs;
+  }
+
+  /**
+   * 공유 DB 파일에 짧은 busy timeout으로 별도 연결 (스키마는 config/db가 생성)
+   * 메모리 DB는 연결마다 별개이므로 공유 연결을 그대로 사용
+   */
+  openDatabase() {
+    const shared = require('../config/db');
+    if (shared.memory) return shared;
+
+    const Database = require('better-sqlite3');
+    return new Database(shared.name, { timeout: RATE_LIMIT_BUSY_TIMEOUT_MS });
+  }
+
+  getStatements() {
+    if (!this.statements) {
+      if (!this.db) this.db = this.openDatabase();
+      const db = this.db;
+      this.statements = {
+        increment: db.prepare(INCREMENT_SQL),
+        decrement: db.prepare(`
+          UPDATE rate_limits SET hits = MAX(hits - 1, 0)
+          WHERE prefix = ? AND key = ? AND reset_at > ?
+        `),
+        get: db.prepare(`
+          SELECT hits, reset_at FROM rate_limits
+          WHERE prefix = ? AND key = ? AND reset_at > ?
+        `),
+        resetKey: db.prepare('DELETE FROM rate_limits WHERE prefix = ? AND key = ?'),
+        resetAll: db.prepare('DELETE FROM rate_limits WHERE prefix = ?')
+      };
+    }
+    return this.statements;
+  }
+
+  /**
+   * DB 오류 시 요청을 막지 않고 로그 후 fallback 반환 (fail open)
+   * @param {string} operation - 로그용 작업 이름
+   * @param {Function} fn - 저장소 작업
+   * @param {*} fallback - 실패 시 반환값
+   */
+  failOpen(operation, fn, fallback) {
+    try {
+      return fn();
+    } catch (error) {
+      const now = Date.now();
+      if (now - this.lastFailOpenLogAt >= FAIL_OPEN_LOG_INTERVAL_MS) {
+        this.lastFailOpenLogAt = now;
+        console.warn(withTime(`⚠️  rate limit 저장소 오류 - 제한 없이 통과 (${this.prefix}.${operation}): ${error.code || error.message}`));
+      }
+      return fallback;
+    }
+  }
+
+  async get(key) {
+    return this.failOpen('get', () => {
+      const row = this.getStatements().get.get(this.prefix, key, Date.now());
+      return row ? { totalHits: row.hits, resetTime: new Date(row.reset_at) } : undefined;
+    }, undefined);
+  }
+
+  async increment(key) {
+    const now = Date.now();
+    // 실패 시 0회로 보고 → 한도 검사를 통과
+    return this.failOpen('increment', () => {
+      const row = this.getStatements().increment.get({ prefix: this.prefix, key, resetAt: now + this.windowMs, now });
+      return { totalHits: row.hits, resetTime: new Date(row.reset_at) };
+    }, { totalHits: 0, resetTime: new Date(now + this.windowMs) });
+  }
+
+  async decrement(key) {
+    this.failOpen('decrement', () => this.getStatements().decrement.run(this.prefix, key, Date.now()));
+  }
+
+  async resetKey(key) {
+    this.failOpen('resetKey', () => this.getStatements().resetKey.run(this.prefix, key));
+  }
+
+  async resetAll() {
+    this.failOpen('resetAll', () => this.getStatements().resetAll.run(this.prefix));
+  }
+}
+
+/**
+ * 만료된 rate limit 행 삭제
+ * @param {Database} db - better-sqlite3 Database instance
+ * @returns {number} 삭제한 행 수
+ */
+function pruneRateLimits(db) {
+  return db.prepare('DELETE FROM rate_limits WHERE reset_at <= ?').run(Date.now()).changes;
+}
+
+module.exports = {
+  RATE_LIMIT_BUSY_TIMEOUT_MS,
+  SqliteRateLimitStore,
+  pruneRateLimits
+};
@@ -2,85 +2,130 @@
  * ================================
  * 📅 자동 삭제 스케줄러
  * ================================
- * 10분마다 실행되어 만료된 파일을 R2에서 삭제
+ * 2분마다 실행되어 만료된 파일을 R2에서 삭제
  * - DB에서 expires_at이 현재 시간보다 이전인 파일 조회
- * - R2에서 해당 파일 삭제
- * - DB의 파일 상태를 'deleted'로 업데이트 (트랜잭션)
+ * - R2에서 해당 파일 일괄 삭제 (DeleteObjects)
+ * - DB의 파일 상태를 'deleted'/'failed'로 집합 단위 업데이트 (트랜잭션)
+ * - 만료된 rate limit 카운터 정리
+ * - lease가 끊긴 큐 작업 회수, 보관 시간이 지난 완료 작업 삭제
+ * - 클러스터 모드에서는 primary 프로세스에서만 실행 (cluster.js)
  */
 
 const schedule = require('node-schedule');
 const db = require('../config/db');
-const { deleteFromR2 } = require('../config/r2');
+const { deleteManyFromR2 } = require('../config/r2');
 const { withTime } = require('./logger');
-const { safeCleanupWithTransaction } = require('./dbTransaction');
+const { getExpiredFileKeys, markCleanupResults } = require('./dbTransaction');
+const { pruneRateLimits } = require('./rateLimitStore');
+const { recoverExpiredJobs, pruneFinishedJobs } = require('./jobQueue');
+
+// 1회 실행당 최대 정리 건수 (남은 파일은 다음 주기에 처리)
+const CLEANUP_MAX_FILES = parseInt(process.env.CLEANUP_MAX_FILES) || 20000;
+
+// 이전 실행이 끝나지 않았으면 다음 주기는 건너뜀
+let cleanupRunning = false;
 
 /**
- * 만료된 파일 정리 작업 (트랜잭션)
- * - DB에서 만료된 파일 조회
- * - R2에서 파일 삭제
- * - DB 상태 업데이트 (트랜잭션으로 원자성 보장)
+ * 만료된 파일 정리 작업
+ * - DB에서 만료된 파일 조회 (필요한 컬럼만)
+ * - R2 DeleteObjects로 최대 1000개씩 일괄 삭제 (동시 요청 수 제한)
+ * - 배치 응답마다 성공/실패 키를 집합 단위 UPDATE로 한 번에 반영
+ * @returns {Promise<{deleted: number, failed: number}>}
  */
 const cleanupExpiredFiles = async () => {
+  if (cleanupRunning) {
+    console.log(withTime(`⏭️  이전 정리 작업 진행 중 - 이번 주기 건너뜀`));
+    return { deleted: 0, failed: 0 };
+  }
+  cleanupRunning = true;
+
   try {
     console.log(withTime(`🔍 만료된 파일 정리 시작...`));
 
-    // DB에서 만료된 파일 조회 (status = 'active' and expires_at <= NOW)
-    const stmt = db.prepare(`
-      SELECT * FROM files
-      WHERE status = 'active' AND expires_at <= datetime('now')
-    `);
-    const expiredFiles = stmt.all();
+    // DB에서 만료된 파일 조회 (status = 'active' and expires_at <= NOW, 부분 인덱스 사용)
+    const expiredFiles = getExpiredFileKeys(db, CLEANUP_MAX_FILES);
 
     if (expiredFiles.length === 0) {
       console.log(withTime(`✅ 정리할 파일이 없습니다.`));
-      return;
+      return { deleted: 0, failed: 0 };
     }
 
     console.log(withTime(`⏰ 만료된 파일 ${expiredFiles.length}개 발견`));
 
-    let successCount = 0;
-    let failureCount = 0;
-
-    // 각 파일에 대해 R2 삭제 + DB 업데이트 (트랜잭션)
+    // R2 경로 → 파일 ID 목록 (같은 경로를 가리키는 행이 여러 개일 수 있음)
+    const fileIdsByKey = new Map();
     for (const file of expiredFiles) {
-      try {
-        // R2 삭제 작업을 함수로 래핑
-        const deleteOperation = async () => {
-          console.log(withTime(`🗑️ R2에서 삭제: ${file.r2_path}`));
-          await deleteFromR2(file.r2_path);
-          return { success: true, r2_path: file.r2_path };
-        };
-
-        // R2 삭제 + DB 상태 업데이트를 트랜잭션으로 처리
-        const cleanupResult = await safeCleanupWithTransaction(db, deleteOperation, file.file_id);
-
-        console.log(withTime(`✅ 정리 완료: ${file.file_id}`));
-        successCount++;
-      } catch (error) {
-        console.error(withTime(`❌ 파일 정리 실패 (${file.file_id}): ${error.message}`));
-        failureCount++;
-
-        // 실패한 파일 상태를 'failed'로 업데이트 (별도 트랜잭션)
+      const ids = fileIdsByKey.get(file.r2_path) || [];
+      ids.push(file.file_id);
+      fileIdsByKey.set(file.r2_path, ids);
+    }
+
+    let deletedCount = 0;
+    let failedCount = 0;
+
+    await deleteManyFromR2([...fileIdsByKey.keys()], {
+      onBatch: ({ deleted, errors, retry }) => {
+        const deletedIds = deleted.flatMap((key) => fileIdsByKey.get(key) || []);
+        const failedIds = errors.flatMap((err) => fileIdsByKey.get(err.key) || []);
+
+        // 요청 자체가 실패한 배치는 'active'로 남겨 다음 주기에 재시도
+        if (retry.length > 0) {
+          console.warn(withTime(`⏳ R2 요청 실패로 ${retry.length}개 파일 정리 보류 (다음 주기에 재시도)`));
+        }
+
+        for (const err of errors) {
+          console.error(withTime(`❌ 파일 정리 실패 (${err.key}): ${err.code} ${err.message || ''}`));
+        }
+
         try {
-          const failTransaction = db.transaction(() => {
-            const failStmt = db.prepare(`
-              UPDATE files
-              SET status = 'failed'
-              WHERE file_id = ?
-            `);
-            return failStmt.run(file.file_id);
-          });
-          failTransaction();
-          console.log(withTime(`⚠️  ${file.file_id} 상태를 'failed'로 표시`));
-        } catch (statusError) {
-          console.error(withTime(`❌ 실패 상태 업데이트 불가: ${statusError.message}`));
+          const result = markCleanupResults(db, deletedIds, failedIds);
+          deletedCount += result.deleted;
+          failedCount += result.failed;
+        } catch (error) {
+          // 상태 반영 실패 시 'active'로 남아 다음 주기에 재시도 (R2 삭제는 멱등)
+          console.error(withTime(`❌ 정리 결과 DB 반영 실패: ${error.message}`));
         }
       }
-    }
+    });
 
-    console.log(withTime(`🎉 만료된 파일 정리 완료 (성공: ${successCount}, 실패: ${failureCount})`));
+    console.log(withTime(`🎉 만료된 파일 정리 완료 (성공: ${deletedCount}, 실패: ${failedCount})`));
+    return { deleted: deletedCount, failed: failedCount };
   } catch (error) {
     console.error(withTime(`❌ 스케줄러 실행 중 오류: ${error.message}`));
+    return { deleted: 0, failed: 0 };
+  } finally {
+    cleanupRunning = false;
+  }
+};
+
+/**
+ * 창이 끝난 rate limit 카운터 삭제 (만료된 행은 increment 시 어차피 초기화되므로 용량 관리용)
+ * @returns {number} 삭제한 행 수
+ */
+const cleanupRateLimits = () => {
+  try {
+    return pruneRateLimits(db);
+  } catch (error) {
+    console.error(withTime(`❌ rate limit 정리 실패: ${error.message}`));
+    return 0;
+  }
+};
+
+/**
+ * 큐 작업 정리
+ * - 워커가 모두 죽어 있어도 lease 만료 작업이 재시도/실패로 정리되도록 워커와 별도로 실행
+ * @returns {{recovered: number, pruned: number}}
+ */
+const cleanupJobs = () => {
+  try {
+    const recovered = recoverExpiredJobs(db);
+    if (recovered.length > 0) {
+      console.warn(withTime(`♻️  lease 만료 작업 회수: ${recovered.length}개`));
+    }
+    return { recovered: recovered.length, pruned: pruneFinishedJobs(db) };
+  } catch (error) {
+    console.error(withTime(`❌ 큐 작업 정리 실패: ${error.message}`));
+    return { recovered: 0, pruned: 0 };
   }
 };
 
@@ -95,6 +140,8 @@ const startScheduler = () => {
   // 매 2분마다 실행
   schedule.scheduleJob('*/2 * * * *', async () => {
     await cleanupExpiredFiles();
+    cleanupRateLimits();
+    cleanupJobs();
   });
 
   // 서버 시작 시 즉시 한 번 실행
@@ -103,5 +150,7 @@ const startScheduler = () => {
 
 module.exports = {
   startScheduler,
-  cleanupExpiredFiles
+  cleanupExpiredFiles,
+  cleanupRateLimits,
+  cleanupJobs
 };
@@ -0,0 +1,93 @@
+/**
+ * ================================
+ * 📁 로컬 스크래치 디렉토리
+ * ================================
+ * 변환 작업의 입력/출력 파일을 디스크에 두기 위한 작업별 임시 디렉토리
+ * - 큰 파일을 메모리 Buffer 대신 파일 경로로 주고받기 위해 사용
+ */
+
+const fs = require('fs/promises');
+const os = require('os');
+const path = require('path');
+const { randomBytes } = require('crypto');
+
+const SCRATCH_ROOT = process.env.CONVERTER_SCRATCH_DIR || path.join(os.tmpdir(), 'convert-for-you');
+
+/**
+ * 작업별 스크래치 디렉토리 생성
+ * @param {string} prefix - 디렉토리 접두사 (예: merge, split)
+ * @returns {Promise<string>} 생성된 디렉토리 경로
+ */
+async function createScratchDir(prefix = 'job') {
+  const dir = path.join(SCRATCH_ROOT, `${prefix}-${Date.now()}-${randomBytes(6).toString('hex')}`);
+  await fs.mkdir(dir, { recursive: true });
+  return dir;
+}
+
+/**
+ * 스크래치 디렉토리 삭제 (실패는 로그만 남김)
+ * @param {string} dir - 삭제할 디렉토리
+ */
+async function removeScratchDir(dir) {
+  if (!dir) return;
+  try {
+    await fs.rm(dir, { recursive: true, force: true });
+  } catch (error) {
+    console.warn(`⚠️  스크래치 디렉토리 정리 실패: ${dir}`, error.message);
+  }
+}
+
+/**
+ * 파일명/경로에서 스크래치 파일에 쓸 안전한 확장자만 추출 (경로 조작 방지)
+ * @param {string} name - 원본 파일명 또는 R2 경로
+ * @returns {string} 예: '.pdf' (없거나 이상하면 빈 문자열)
+ */
+function safeExtension(name) {
+  const ext = path.extname(name || '').toLowerCase();
+  return /^\.[a-z0-9]{1,8}$/.test(ext) ? ext : '';
+}
+
+/**
+ * 변환기 입력(디스크 경로 또는 Buffer)을 지정한 임시 경로에 준비
+ * - 경로: 원본을 복사하지 않고 심볼릭 링크 생성 (임시 경로를 지워도 원본은 유지)
+ * - Buffer: 임시 경로에 기록
+ * @param {string|Buffer} input - 입력 파일 경로 또는 버퍼
+ * @param {string} targetPath - 변환기가 사용할 임시 경로 (확장자 지정용)
+ * @returns {Promise<string>} targetPath
+ */
+async function materializeInput(input, targetPath) {
+  if (typeof input === 'string') {
+    await fs.symlink(path.resolve(input), targetPath);
+  } else {
+    await fs.writeFile(targetPath, input);
+  }
+  return targetPath;
+}
+
+/**
+ * 변환기 입력을 Buffer로 읽기 (Buffer만 받는 라이브러리용)
+ * @param {string|Buffer} input
+ * @returns {Promise<Buffer>}
+ */
+async function readInput(input) {
+  return typeof input === 'string' ? fs.readFile(input) : input;
+}
+
+/**
+ * 변환기 입력 크기 (바이트)
+ * @param {string|Buffer} input
+ * @returns {Promise<number>}
+ */
+async function inputSize(input) {
+  return typeof input === 'string' ? (await fs.stat(input)).size : input.length;
+}
+
+module.exports = {
+  SCRATCH_ROOT,
+  createScratchDir,
+  removeScratchDir,
+  safeExtension,
+  materializeInput,
+  readInput,
+  inputSize
+};
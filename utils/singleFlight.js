@@ -0,0 +1,152 @@
+/**
+ * ================================
+ * 🛫 동일 요청 합치기 (Single-flight)
+ * ================================
+ * 같은 키의 작업이 이미 진행 중이면 새로 실행하지 않고 결과를 공유
+ * - 실패도 모든 대기자에게 동일하게 전달
+ * - 대기자는 각자 AbortSignal로 이탈 가능, 모든 대기자가 이탈하면 작업 자체를 취소
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+
+/**
+ * AbortError 생성 (Piscina/fetch와 같은 name 사용)
+ */
+function abortError(message = '작업이 취소되었습니다.') {
+  const error = new Error(message);
+  error.name = 'AbortError';
+  return error;
+}
+
+class SingleFlight {
+  constructor() {
+    this.flights = new Map();
+    this.stats = { leaders: 0, coalesced: 0, cancelled: 0 };
+  }
+
+  /**
+   * 키별로 작업을 한 번만 실행
+   * @param {string} key - 작업 식별 키
+   * @param {(signal: AbortSignal) => Promise<any>} fn - 실제 작업 (모든 대기자가 이탈하면 signal이 abort됨)
+   * @param {Object} [options]
+   * @param {AbortSignal} [options.signal] - 이 대기자의 취소 신호
+   * @returns {Promise<any>}
+   */
+  do(key, fn, options = {}) {
+    const { signal } = options;
+    if (signal?.aborted) {
+      return Promise.reject(abortError());
+    }
+
+    let flight = this.flights.get(key);
+    if (flight) {
+      this.stats.coalesced++;
+    } else {
+      flight = this._start(key, fn);
+      this.stats.leaders++;
+    }
+
+    flight.waiters++;
+    return this._wait(key, flight, signal);
+  }
+
+  _start(key, fn) {
+    const controller = new AbortController();
+    const flight = { controller, waiters: 0, promise: null };
+
+    flight.promise = Promise.resolve()
+      .then(() => fn(controller.signal))
+      .finally(() => {
+        // 같은 키로 새 작업이 시작된 경우 지우지 않음
+        if (this.flights.get(key) === flight) this.flights.delete(key);
+      });
+    // 모든 대기자가 이탈한 뒤 실패해도 unhandled rejection이 되지 않도록
+    flight.promise.catch(() => {});
+
+    this.flights.set(key, flight);
+    return flight;
+  }
+
+  _wait(key, flight, signal) {
+    if (!signal) {
+      return flight.promise;
+    }
+
+    return new Promise((resolve, reject) => {
+      const onAbort = () => {
+        reject(abortError());
+        this._leave(key, flight);
+      };
+
+      signal.addEventListener('abort', onAbort, { once: true });
+      flight.promise.then(resolve, reject).finally(() => {
+        signal.removeEventListener('abort', onAbort);
+      });
+    });
+  }
+
+  _leave(key, flight) {
+    flight.waiters--;
+    if (flight.waiters > 0) return;
+
+    // 결과를 기다리는 쪽이 없으므로 작업 취소, 다음 요청은 새로 실행
+    this.stats.cancelled++;
+    if (this.flights.get(key) === flight) this.flights.delete(key);
+    flight.controller.abort();
+  }
+
+  /**
+   * 합치기 통계
+   * @returns {{inFlight: number, leaders: number, coalesced: number, cancelled: number}}
+   */
+  getStats() {
+    return { inFlight: this.flights.size, ...this.stats };
+  }
+}
+
+/**
+ * 옵션 객체를 키 순서와 무관한 문자열로 변환
+ */
+function stableStringify(value) {
+  if (value === undefined) return 'null';
+  if (value === null || typeof value !== 'object') return JSON.stringify(value);
+  if (Array.isArray(value)) return `[${value.map(stableStringify).join(',')}]`;
+  return `{${Object.keys(value).sort()
+    .filter((key) => value[key] !== undefined)
+    .map((key) => `${JSON.stringify(key)}:${stableStringify(value[key])}`)
+    .join(',')}}`;
+}
+
+/**
+ * 입력 내용 해시 (Buffer 또는 디스크 경로, 경로 배열은 순서대로)
+ * 단일 입력은 내용의 sha256 그대로 (업로드/다운로드 중 계산한 해시와 같은 값)
+ * @param {Buffer|string|Array<string|Buffer>} input
+ * @returns {Promise<string>} sha256 hex
+ */
+async function hashInput(input) {
+  const hash = crypto.createHash('sha256');
+  const inputs = Array.isArray(input) ? input : [input];
+
+  for (const [index, item] of inputs.entries()) {
+    // 배열 경계 구분
+    if (index > 0) hash.update('\0');
+
+    if (Buffer.isBuffer(item)) {
+      hash.update(item);
+    } else {
+      for await (const chunk of fs.createReadStream(item)) {
+        hash.update(chunk);
+      }
+    }
+  }
+
+  return hash.digest('hex');
+}
+
+module.exports = {
+  SingleFlight,
+  abortError,
+  stableStringify,
+  hashInput
+};